@@ -0,0 +1,135 @@
+"""
+Benchmark action GIF latency: provider chain per action vs the GIF pool.
+
+"Before" is how get_action_gif_bytes used to work: ask the providers in
+order until one returns a URL, then download that GIF. "After" is
+ActionGifPool.get_bytes with a warm pool: a random pooled GIF read from
+disk while refills run in the background.
+
+Runs fully offline against a local fake provider server (aiohttp.web)
+that mimics the four APIs and a CDN, with configurable latency. The
+primary provider can be made to fail so the chain has to fall through,
+and a final pass stops the server to check the pool keeps serving with
+every provider down.
+
+Usage:
+    python3 scripts/bench_action_gifs.py [--runs 200] [--latency 80] [--primary-down]
+"""
+
+import argparse
+import asyncio
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from fake_gif_providers import fake_server, providers  # noqa: E402
+from src.services.actions.pool import ActionGifPool, GifProvider  # noqa: E402
+from src.utils.http import FAST_TIMEOUT, http_session  # noqa: E402
+
+ENDPOINTS = ["hug", "kiss", "slap", "pat", "lick", "sad"]
+
+
+# =============================================================================
+# Provider Chain (reference)
+# =============================================================================
+
+async def chain_bytes(chain: List[GifProvider], endpoint: str) -> Optional[io.BytesIO]:
+    """Sequential provider walk + download per action, as before the pool."""
+    gif_url = None
+    for provider in chain:
+        if not provider.supports(endpoint):
+            continue
+        try:
+            async with http_session.get(provider.url.format(endpoint=endpoint), timeout=FAST_TIMEOUT) as resp:
+                if resp.status == 200:
+                    gif_url = provider.parse(await resp.json())
+        except Exception:
+            pass
+        if gif_url:
+            break
+    if not gif_url:
+        return None
+    async with http_session.get(gif_url, timeout=FAST_TIMEOUT) as resp:
+        return io.BytesIO(await resp.read()) if resp.status == 200 else None
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+async def time_calls(call: Callable[[str], Awaitable[object]], runs: int) -> List[float]:
+    times = []
+    for i in range(runs):
+        start = time.perf_counter()
+        result = await call(ENDPOINTS[i % len(ENDPOINTS)])
+        times.append((time.perf_counter() - start) * 1000)
+        if result is None:
+            raise SystemExit("no GIF returned")
+    return times
+
+
+def report(label: str, times: List[float], baseline: float = 0.0) -> float:
+    times = sorted(times)
+    p50 = statistics.median(times)
+    p99 = times[max(0, int(len(times) * 0.99) - 1)]
+    speedup = f"  ({baseline / p50:.0f}x)" if baseline else ""
+    print(f"  {label:<16} p50 {p50:8.2f} ms   p99 {p99:8.2f} ms{speedup}")
+    return p50
+
+
+async def run(runs: int, latency_ms: float, primary_down: bool) -> None:
+    runner = web.AppRunner(fake_server(latency_ms, primary_down))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    chain = providers(base)
+
+    with tempfile.TemporaryDirectory() as store:
+        pool = ActionGifPool(chain, store_dir=Path(store))
+        try:
+            print(f"latency {latency_ms:.0f} ms per request, primary {'down' if primary_down else 'up'}")
+            baseline = report("provider chain", await time_calls(lambda e: chain_bytes(chain, e), runs))
+
+            # Fill every pool before timing the warm path
+            for endpoint in ENDPOINTS:
+                await pool._refill(endpoint)
+            report("pool (warm)", await time_calls(pool.get_bytes, runs), baseline)
+
+            await runner.cleanup()
+            report("pool (all down)", await time_calls(pool.get_bytes, runs), baseline)
+
+            stats = pool.get_stats()
+            print(f"  pool: {stats['gifs']} GIFs, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+                  f"hit rate {stats['hit_rate']:.0%}")
+            for name, health in stats["providers"].items():
+                print(f"  {name:<14} score {health['score']:.2f}  ok {health['successes']:>4}  "
+                      f"failed {health['failures']:>3}  benched {health['benched']}")
+        finally:
+            await pool.close()
+            await runner.cleanup()
+            await http_session.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=80.0, help="ms added to every fake response")
+    parser.add_argument("--primary-down", action="store_true", help="nekos.best answers 503")
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.latency, args.primary_down))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Load-test the API middleware stack.
+
+Serves a /api/syria/leaderboard stub through a local uvicorn server twice:
+once behind BaseHTTPMiddleware versions of the logging and rate limit
+middleware (the previous implementation), once behind the raw ASGI ones.
+Reports requests/sec and p50/p99 latency for each.
+
+The stub returns a cached-size leaderboard payload from memory so the
+numbers measure the middleware stack, not SQLite. The server runs in its
+own process so the load generator doesn't share its event loop.
+
+Usage:
+    python3 scripts/bench_api_middleware.py [--seconds 10] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.api.middleware.logging import LoggingMiddleware  # noqa: E402
+from src.api.middleware.rate_limit import RateLimiter, RateLimitMiddleware  # noqa: E402
+
+PATH = "/api/syria/leaderboard"
+PAYLOAD = {
+    "leaderboard": [
+        {"rank": i, "user_id": str(10**17 + i), "xp": 100000 - i * 37, "level": 40 - i // 3}
+        for i in range(1, 51)
+    ],
+    "total": 50,
+}
+
+
+# =============================================================================
+# Previous BaseHTTPMiddleware implementation (for comparison)
+# =============================================================================
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """Request ID + timing, as the BaseHTTPMiddleware version did."""
+
+    async def dispatch(self, request: Request, call_next):
+        request.state.request_id = str(uuid.uuid4())[:8]
+        start = time.time()
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        _ = (time.time() - start) * 1000
+        return response
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """Token bucket check + headers, as the BaseHTTPMiddleware version did."""
+
+    def __init__(self, app, rate_limiter: RateLimiter) -> None:
+        super().__init__(app)
+        self._limiter = rate_limiter
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        allowed, retry_after, remaining, limit = self._limiter.check(client_ip, request.url.path)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(limit)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        return response
+
+
+def build_app(variant: str) -> FastAPI:
+    """Build the stub app behind one middleware stack."""
+    app = FastAPI()
+
+    @app.get(PATH)
+    async def leaderboard() -> JSONResponse:
+        return JSONResponse(content=PAYLOAD)
+
+    # Effectively unlimited so 429s don't skew the comparison
+    limiter = RateLimiter(default_limit=10**9, default_window=1)
+    if variant == "base":
+        app.add_middleware(LegacyRateLimitMiddleware, rate_limiter=limiter)
+        app.add_middleware(LegacyLoggingMiddleware)
+    else:
+        app.add_middleware(RateLimitMiddleware, rate_limiter=limiter)
+        app.add_middleware(LoggingMiddleware)
+    return app
+
+
+# =============================================================================
+# Load Generator
+# =============================================================================
+
+async def run_load(port: int, seconds: float, concurrency: int) -> list:
+    """Hammer the endpoint and return per-request latencies in ms."""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                resp = await client.get(PATH)
+                resp.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies
+
+
+def serve(variant: str, port: int) -> None:
+    """Run uvicorn for one variant (in its own process)."""
+    uvicorn.run(build_app(variant), host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+async def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    """Wait until the server accepts connections."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+async def bench(variant: str, port: int, seconds: float, concurrency: int) -> dict:
+    """Start uvicorn for one variant in a separate process, warm up, then measure."""
+    server = multiprocessing.Process(target=serve, args=(variant, port), daemon=True)
+    server.start()
+    try:
+        await wait_for_port(port)
+        await run_load(port, 1.0, concurrency)  # Warm-up
+        latencies = await run_load(port, seconds, concurrency)
+    finally:
+        server.terminate()
+        server.join()
+
+    latencies.sort()
+    return {
+        "variant": variant,
+        "requests": len(latencies),
+        "rps": len(latencies) / seconds,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = []
+    for variant in ("base", "asgi"):
+        results.append(await bench(variant, args.port, args.seconds, args.concurrency))
+
+    print(f"{'Stack':<8}{'Requests':>10}{'Req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['variant']:<8}{r['requests']:>10}{r['rps']:>10.0f}{r['p50']:>10.2f}{r['p99']:>10.2f}")
+
+    base, asgi = results
+    print(f"\nThroughput: {asgi['rps'] / base['rps']:.2f}x   p99: {base['p99'] / asgi['p99']:.2f}x lower")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
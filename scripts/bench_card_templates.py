@@ -0,0 +1,176 @@
+"""
+Benchmark HTML card render latency: fresh document vs hot template page.
+
+"Before" is how every HTML card used to render: take a pooled page,
+navigate to about:blank, set_content the whole document (which parses
+it, loads the fonts and fetches every image again), wait for network
+idle, then screenshot. The same template document is used with its
+payload bound after load, so both sides draw the identical card.
+"After" is card_templates.render: the document stays loaded in its own
+page and each render only binds the payload and screenshots the clip.
+
+Reports p50/p99 per card type (ship, meter, family, roulette result).
+Avatars are synthetic data URLs so no network is needed. Needs the
+Playwright Chromium build the bot uses (playwright install chromium).
+
+Usage:
+    python3 scripts/bench_card_templates.py [--runs 50]
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.card_templates import CardTemplate, build_document, card_templates  # noqa: E402
+from src.services.family_card import FAMILY_TEMPLATE, FamilyData, FamilyMember, _family_payload  # noqa: E402
+from src.services.fun.card import METER_TEMPLATE, SHIP_TEMPLATE, _meter_payload, _ship_payload  # noqa: E402
+from src.services.roulette.graphics import (  # noqa: E402
+    WHEEL_TEMPLATE,
+    RoulettePlayer,
+    _wheel_payload,
+    landing_rotation,
+)
+from src.services.xp.card import _get_page, _return_page, cleanup, get_render_semaphore  # noqa: E402
+
+
+# =============================================================================
+# Synthetic Payloads
+# =============================================================================
+
+def _avatar(rng: random.Random) -> str:
+    img = Image.new("RGB", (128, 128), tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def _payloads(rng: random.Random) -> Dict[str, Tuple[CardTemplate, Callable[[], Dict[str, Any]]]]:
+    avatars = [_avatar(rng) for _ in range(12)]
+
+    def ship() -> Dict[str, Any]:
+        pct = rng.randrange(101)
+        return _ship_payload("سارة", rng.choice(avatars), "Omar", rng.choice(avatars), pct, "Meant to be", None)
+
+    def meter() -> Dict[str, Any]:
+        kind = rng.choice(["howsimp", "gay", "smart", "howfat"])
+        return _meter_payload("Khaled", rng.choice(avatars), rng.randrange(101), "Certified", kind, None)
+
+    def family() -> Dict[str, Any]:
+        members = [FamilyMember(i, f"Member {i}", rng.choice(avatars)) for i in range(12)]
+        return _family_payload(FamilyData(
+            display_name="Layla",
+            username="layla",
+            avatar_url=rng.choice(avatars),
+            spouse=members[0],
+            married_at=1_700_000_000,
+            parents=members[1:3],
+            adopted_at=1_690_000_000,
+            children=members[3:3 + rng.randrange(6)],
+            siblings=members[8:8 + rng.randrange(5)],
+        ))
+
+    def roulette() -> Dict[str, Any]:
+        count = rng.randrange(3, 11)
+        weights = [rng.random() + 0.2 for _ in range(count)]
+        total = sum(weights)
+        players = [
+            RoulettePlayer(i, f"Player {i}", rng.choice(avatars), weight=w / total)
+            for i, w in enumerate(weights)
+        ]
+        winner = rng.randrange(count)
+        return _wheel_payload(players, "Roulette", winner, landing_rotation(players, winner))
+
+    return {
+        "ship": (SHIP_TEMPLATE, ship),
+        "meter": (METER_TEMPLATE, meter),
+        "family": (FAMILY_TEMPLATE, family),
+        "roulette": (WHEEL_TEMPLATE, roulette),
+    }
+
+
+# =============================================================================
+# Fresh Document (reference)
+# =============================================================================
+
+async def render_fresh(template: CardTemplate, payload: Dict[str, Any]) -> bytes:
+    """Full document load per render, as the cards did before the hot pages."""
+    async with get_render_semaphore():
+        page = await _get_page()
+        await page.goto("about:blank")
+        width, height = template.viewport
+        await page.set_viewport_size({"width": width, "height": height})
+        await page.set_content(build_document(template), wait_until="networkidle")
+        await page.evaluate("data => window.__bindCard(data)", {
+            **payload,
+            "selector": template.selector,
+            "decodeTimeout": template.decode_timeout,
+        })
+        screenshot = await page.screenshot(type="png", omit_background=True)
+        await _return_page(page)
+        return screenshot
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+async def time_renders(
+    render: Callable[[CardTemplate, Dict[str, Any]], Awaitable[bytes]],
+    template: CardTemplate,
+    make_payload: Callable[[], Dict[str, Any]],
+    runs: int,
+) -> List[float]:
+    await render(template, make_payload())  # Warm-up (browser launch, first page load)
+    times = []
+    for _ in range(runs):
+        payload = make_payload()
+        start = time.perf_counter()
+        await render(template, payload)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(label: str, times: List[float], baseline: float = 0.0) -> float:
+    times = sorted(times)
+    p50 = statistics.median(times)
+    p99 = times[max(0, int(len(times) * 0.99) - 1)]
+    speedup = f"  ({baseline / p50:.1f}x)" if baseline else ""
+    print(f"  {label:<8} p50 {p50:7.1f} ms   p99 {p99:7.1f} ms{speedup}")
+    return p50
+
+
+async def run(runs: int, seed: int) -> None:
+    rng = random.Random(seed)
+    try:
+        for name, (template, make_payload) in _payloads(rng).items():
+            print(name)
+            baseline = report("before", await time_renders(render_fresh, template, make_payload, runs))
+            report("after", await time_renders(card_templates.render, template, make_payload, runs), baseline)
+    finally:
+        await card_templates.close()
+        await cleanup()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
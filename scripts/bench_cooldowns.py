@@ -0,0 +1,163 @@
+"""
+Microbenchmark cooldown checks at ~100k active keys: per-handler dicts vs the cooldown engine.
+
+"Before" are the two patterns the handlers used: a plain dict that, once
+over its cap, sorts every entry by timestamp and drops the oldest fifth
+(FAQ), and an OrderedDict that, once over its cap, scans every entry for
+expired ones (action/fun/reply/family). Both caps are raised to the
+key count so they hold the same keys as the engine. "After" is a
+CooldownNamespace per policy (Cooldown, SlidingWindow, TokenBucket).
+
+Uses a simulated clock (one tick per check) so runs are repeatable and
+the number of live keys is controlled. Reports mean ns per check-and-set
+plus the p99 and worst 1000-check batches, which is where stop-the-world
+cleanups show up.
+
+Usage:
+    python3 scripts/bench_cooldowns.py [--keys 100000] [--checks 1000000]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.utils.cooldowns import (  # noqa: E402
+    Cooldown,
+    CooldownNamespace,
+    SlidingWindow,
+    TokenBucket,
+)
+
+COOLDOWN = 60.0
+BATCH = 1000
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# =============================================================================
+# Per-Handler Dicts (reference)
+# =============================================================================
+
+class SortingDict:
+    """FAQ: dict of timestamps, sorted and trimmed by a fifth when over the cap."""
+
+    def __init__(self, clock: Clock, cap: int) -> None:
+        self._clock = clock
+        self._cap = cap
+        self._entries: Dict[Hashable, float] = {}
+
+    def hit(self, key: Hashable) -> float:
+        now = self._clock()
+        last = self._entries.get(key)
+        if last is not None and now - last < COOLDOWN:
+            return COOLDOWN - (now - last)
+        self._entries[key] = now
+        if len(self._entries) > self._cap:
+            for old, _ in sorted(self._entries.items(), key=lambda x: x[1])[:self._cap // 5]:
+                del self._entries[old]
+        return 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ScanningDict:
+    """Action/fun/reply/family: OrderedDict, full scan for expired keys when over the cap."""
+
+    def __init__(self, clock: Clock, cap: int) -> None:
+        self._clock = clock
+        self._cap = cap
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def hit(self, key: Hashable) -> float:
+        now = self._clock()
+        last = self._entries.get(key, 0.0)
+        if key in self._entries and now - last < COOLDOWN:
+            return COOLDOWN - (now - last)
+        self._entries[key] = now
+        if len(self._entries) > self._cap:
+            expired = [k for k, ts in list(self._entries.items()) if now - ts > COOLDOWN]
+            for k in expired:
+                self._entries.pop(k, None)
+            while len(self._entries) > self._cap:
+                self._entries.popitem(last=False)
+        return 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def run_one(
+    make: Callable[[Clock], object],
+    keys: List[int],
+    tick: float,
+) -> Tuple[float, float, float, int]:
+    clock = Clock()
+    limiter = make(clock)
+    hit = limiter.hit
+
+    batch_ns: List[int] = []
+    start_all = time.perf_counter_ns()
+    for offset in range(0, len(keys), BATCH):
+        start = time.perf_counter_ns()
+        for key in keys[offset:offset + BATCH]:
+            clock.now += tick
+            hit(key)
+        batch_ns.append(time.perf_counter_ns() - start)
+    total_ns = time.perf_counter_ns() - start_all
+    batch_ns.sort()
+    p99 = batch_ns[max(0, int(len(batch_ns) * 0.99) - 1)]
+    return total_ns / len(keys), p99 / BATCH, batch_ns[-1] / BATCH, len(limiter)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=100_000, help="target live keys")
+    parser.add_argument("--checks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Each key is written about once per cooldown, so `keys` of them are live at once
+    rng = random.Random(args.seed)
+    space = args.keys * 2
+    keys = [rng.randrange(space) for _ in range(args.checks)]
+    tick = COOLDOWN / args.keys
+
+    cap = args.keys
+    candidates = [
+        ("sorting dict (FAQ)", lambda c: SortingDict(c, cap)),
+        ("scanning dict (handlers)", lambda c: ScanningDict(c, cap)),
+        ("engine: Cooldown", lambda c: CooldownNamespace("bench", Cooldown(COOLDOWN), 2 * cap, c)),
+        ("engine: SlidingWindow", lambda c: CooldownNamespace("bench", SlidingWindow(3, COOLDOWN), 2 * cap, c)),
+        ("engine: TokenBucket", lambda c: CooldownNamespace("bench", TokenBucket(3, 3 / COOLDOWN), 2 * cap, c)),
+    ]
+
+    print(f"{args.checks:,} checks over {space:,} keys, cooldown {COOLDOWN:.0f}s, cap {cap:,}")
+    for label, make in candidates:
+        gc.collect()
+        mean_ns, p99_ns, worst_ns, live = run_one(make, keys, tick)
+        print(f"  {label:<26} mean {mean_ns:6.0f}   p99 batch {p99_ns:7.0f}   "
+              f"worst batch {worst_ns:7.0f} ns/check   keys {live:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
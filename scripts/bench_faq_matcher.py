@@ -0,0 +1,94 @@
+"""
+Benchmark and check the FAQ topic matcher.
+
+Runs a corpus of question-shaped messages (the kind that get past the
+auto-responder's length and question filters) through both the old
+matcher - every pattern searched one by one, then a Levenshtein scan of
+every word against every keyword variant - and the compiled FAQMatcher,
+and reports per-message latency for each.
+
+The golden cases, the reference matcher and the corpus builder live in
+tests/faq_golden.py, shared with tests/test_faq_matcher.py. Before timing, the golden cases and the whole
+corpus with random typos injected must get exactly the same
+(topic, was_fuzzy) from both matchers. Exits non-zero on any
+disagreement.
+
+Usage:
+    python3 scripts/bench_faq_matcher.py [--messages 5000] [--seed 0]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from faq_golden import GOLDEN, ReferenceMatcher, build_corpus  # noqa: E402
+from src.handlers.faq import FAQ_PATTERNS, FUZZY_KEYWORDS  # noqa: E402
+from src.services.faq.matcher import FAQMatcher  # noqa: E402
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def time_matcher(match: Callable[[str], Tuple[Optional[str], bool]], corpus: List[str]) -> List[float]:
+    times = []
+    for text in corpus:
+        start = time.perf_counter()
+        match(text)
+        times.append((time.perf_counter() - start) * 1_000_000)
+    return times
+
+
+def report(label: str, times: List[float], baseline: float = 0.0) -> float:
+    times = sorted(times)
+    median = statistics.median(times)
+    speedup = f"  ({baseline / median:.1f}x)" if baseline else ""
+    print(f"{label:<22} median {median:7.1f} us   p90 {times[int(len(times) * 0.9) - 1]:7.1f} us"
+          f"   p99 {times[int(len(times) * 0.99) - 1]:7.1f} us{speedup}")
+    return median
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    compiled = FAQMatcher(FAQ_PATTERNS, FUZZY_KEYWORDS)
+    print(f"Matcher build (once at startup): {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{len(compiled.corrector)} index keys\n")
+    reference = ReferenceMatcher()
+
+    failures = 0
+    for text, topic, fuzzy in GOLDEN:
+        for name, matcher in (("reference", reference), ("compiled", compiled)):
+            got = matcher.match(text)
+            if got != (topic, fuzzy):
+                failures += 1
+                print(f"GOLDEN {name}: {text!r} -> {got}, expected {(topic, fuzzy)}")
+
+    corpus = build_corpus(args.messages, args.seed)
+    for text in corpus:
+        if reference.match(text) != compiled.match(text):
+            failures += 1
+            print(f"MISMATCH: {text!r} reference={reference.match(text)} compiled={compiled.match(text)}")
+
+    print(f"{len(GOLDEN)} golden cases, {len(corpus)} corpus messages, {failures} disagreements\n")
+
+    # Fresh matcher so the word cache starts cold
+    compiled = FAQMatcher(FAQ_PATTERNS, FUZZY_KEYWORDS)
+    baseline = report("before (per pattern)", time_matcher(reference.match, corpus))
+    report("after (compiled)", time_matcher(compiled.match, corpus), baseline)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Benchmark the animated GIF encoders used by /convert.
+
+Captions a synthetic multi-hundred-frame GIF (or one passed with --input)
+with each encoder: the streamed shared-palette encoder, the Pillow
+per-frame ADAPTIVE path and the Wand/ImageMagick path (skipped when
+ImageMagick isn't installed). Reports wall time, peak RSS and output size.
+
+Every run happens in a fresh process so ru_maxrss is that encoder's own
+high-water mark. Both the absolute peak and the growth over the peak
+reached before encoding (imports + input) are shown; a growth of ~0 means
+the encoder never needed more memory than loading the bot modules did.
+
+Usage:
+    python3 scripts/bench_gif_encoder.py [--frames 300 600] [--size 480x360] [--input clip.gif]
+"""
+
+import argparse
+import io
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+ENCODERS = {
+    "streamed": "_process_animated_gif_streamed",
+    "pillow": "_process_animated_gif_pillow",
+    "wand": "_process_animated_gif_wand",
+}
+CAPTION = "when the build passes on the first try"
+
+
+# =============================================================================
+# Input
+# =============================================================================
+
+def make_gif(frames: int, size: tuple[int, int]) -> bytes:
+    """Moving shapes over a drifting gradient, like a typical reaction GIF."""
+    width, height = size
+    gradient = Image.linear_gradient("L").resize(size)
+    out = []
+    for i in range(frames):
+        shift = (i * 3) % 256
+        frame = Image.merge("RGB", (
+            gradient.point(lambda v, s=shift: (v + s) % 256),
+            gradient.transpose(Image.Transpose.ROTATE_90).resize(size),
+            Image.new("L", size, 90),
+        ))
+        draw = ImageDraw.Draw(frame)
+        for k in range(5):
+            x = (i * 5 + k * width // 5) % width
+            y = height // 6 + k * height // 7
+            draw.ellipse((x, y, x + width // 8, y + width // 8), fill=(255 - k * 40, k * 50, 200))
+        out.append(frame.convert("P", palette=Image.Palette.ADAPTIVE))
+
+    buffer = io.BytesIO()
+    out[0].save(buffer, format="GIF", save_all=True, append_images=out[1:], duration=40, loop=0)
+    return buffer.getvalue()
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def max_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_encoder(encoder: str, data: bytes, queue: multiprocessing.Queue) -> None:
+    """Encode once in this (fresh) process and report the numbers."""
+    from src.services.convert.service import convert_service, WAND_AVAILABLE
+
+    if encoder == "wand" and not WAND_AVAILABLE:
+        queue.put({"encoder": encoder, "skipped": "ImageMagick not available"})
+        return
+
+    img = Image.open(io.BytesIO(data))
+    baseline = max_rss_kb()
+    start = time.perf_counter()
+    result = getattr(convert_service, ENCODERS[encoder])(img, CAPTION, "top")
+    elapsed = time.perf_counter() - start
+
+    if not result.success:
+        queue.put({"encoder": encoder, "skipped": result.error})
+        return
+    queue.put({
+        "encoder": encoder,
+        "seconds": elapsed,
+        "peak_mb": max_rss_kb() / 1024,
+        "growth_mb": (max_rss_kb() - baseline) / 1024,
+        "size_kb": len(result.gif_bytes) / 1024,
+        "frames": Image.open(io.BytesIO(result.gif_bytes)).n_frames,
+    })
+
+
+def bench(encoder: str, data: bytes) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=run_encoder, args=(encoder, data, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, nargs="+", default=[300, 600])
+    parser.add_argument("--size", default="480x360")
+    parser.add_argument("--input", type=Path, help="Benchmark this GIF instead of synthetic ones")
+    args = parser.parse_args()
+
+    if args.input:
+        inputs = [(args.input.name, args.input.read_bytes())]
+    else:
+        size = tuple(int(v) for v in args.size.split("x"))
+        inputs = [(f"{n} frames {args.size}", make_gif(n, size)) for n in args.frames]
+
+    for label, data in inputs:
+        print(f"\n{label} ({len(data) / 1024:.0f} KB in)")
+        print(f"{'Encoder':<10}{'Wall s':>9}{'Peak MB':>10}{'Growth MB':>11}{'Out KB':>10}{'Frames':>8}")
+        results = {}
+        for encoder in ENCODERS:
+            r = bench(encoder, data)
+            if "skipped" in r:
+                print(f"{encoder:<10}  skipped: {r['skipped']}")
+                continue
+            results[encoder] = r
+            print(
+                f"{encoder:<10}{r['seconds']:>9.2f}{r['peak_mb']:>10.1f}{r['growth_mb']:>11.1f}"
+                f"{r['size_kb']:>10.0f}{r['frames']:>8}"
+            )
+
+        streamed = results.get("streamed")
+        for name, r in results.items():
+            if name == "streamed" or not streamed:
+                continue
+            print(
+                f"vs {name}: {r['seconds'] / streamed['seconds']:.2f}x faster, "
+                f"peak RSS {r['peak_mb']:.0f} -> {streamed['peak_mb']:.0f} MB, "
+                f"{r['size_kb'] / streamed['size_kb']:.2f}x smaller"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark per-quote render time with and without the quote layer cache.
+
+"Before" is the renderer as it was prior to the layer cache: the vignette,
+fade mask, overlays and film grain rebuilt for every quote, and the
+avatar resized/ghosted/tinted/faded every time. "After" is the current
+QuoteService._render with warm static layers, for a returning author
+(avatar section cached) and a new one (avatar section built once).
+
+Text, avatar and banner are synthetic so no network is needed.
+
+Usage:
+    python3 scripts/bench_quote_render.py [--runs 20]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.quote.service import (  # noqa: E402
+    AVATAR_SECTION_WIDTH,
+    BG_COLOR,
+    IMAGE_HEIGHT,
+    IMAGE_WIDTH,
+    THEME_COLOR,
+    QuoteService,
+)
+
+TEXT = "the build finally passed after three days and nobody knows which commit fixed it"
+
+
+# =============================================================================
+# Uncached Renderer (reference)
+# =============================================================================
+
+def _fresh_grain() -> Image.Image:
+    noise = np.random.randint(108, 148, (IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
+    alpha = np.random.randint(0, 12, (IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
+    mask = np.random.random((IMAGE_HEIGHT, IMAGE_WIDTH)) < 0.3
+    alpha = (alpha * mask).astype(np.uint8)
+    return Image.fromarray(np.dstack([noise, noise, noise, alpha]), "RGBA")
+
+
+class _FreshLayers:
+    """Stands in for QuoteLayerCache: a new grain every time, no avatar cache."""
+
+    def static(self, *_):
+        return SimpleNamespace(grain=(_fresh_grain(),))
+
+    def get_avatar(self, _):
+        return None
+
+
+class UncachedQuoteService(QuoteService):
+    """QuoteService with the per-quote background pipeline from before the layer cache."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._layers = _FreshLayers()
+
+    def _create_image(self, avatar_img=None, banner_img=None, avatar_key=None) -> Image.Image:
+        if banner_img:
+            img = banner_img.convert("RGBA")
+            img = Image.alpha_composite(img, Image.new("RGBA", img.size, (0, 0, 0, 140)))
+        else:
+            img = Image.new("RGBA", (IMAGE_WIDTH, IMAGE_HEIGHT), (*BG_COLOR, 255))
+
+        x = np.linspace(-1, 1, IMAGE_WIDTH)
+        y = np.linspace(-1, 1, IMAGE_HEIGHT)
+        xx, yy = np.meshgrid(x, y)
+        dist = np.sqrt(xx**2 * 0.6 + yy**2)
+        alpha = np.clip(dist ** 1.8 * 180, 0, 255).astype(np.uint8)
+        zeros = np.zeros((IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
+        vignette = Image.fromarray(np.dstack([zeros, zeros, zeros, alpha]), "RGBA")
+        img = Image.alpha_composite(img, vignette.filter(ImageFilter.GaussianBlur(30)))
+
+        if avatar_img:
+            avatar_img = avatar_img.convert("RGBA")
+            avatar_width = int(avatar_img.width * (IMAGE_HEIGHT / avatar_img.height))
+            avatar = avatar_img.resize((avatar_width, IMAGE_HEIGHT), Image.Resampling.LANCZOS)
+            section_width = AVATAR_SECTION_WIDTH + 400
+            left_section = Image.new("RGBA", (section_width, IMAGE_HEIGHT), (0, 0, 0, 0))
+            avatar_x = (AVATAR_SECTION_WIDTH - avatar_width) // 2
+            if avatar_x < 0:
+                avatar = avatar.crop((-avatar_x, 0, -avatar_x + section_width, IMAGE_HEIGHT))
+                avatar_x = 0
+            left_section.paste(avatar, (avatar_x, 0))
+            left_section = Image.alpha_composite(
+                left_section, Image.new("RGBA", left_section.size, (255, 255, 255, 40)))
+            left_section = Image.alpha_composite(
+                left_section, Image.new("RGBA", left_section.size, (*THEME_COLOR, 60)))
+            xs = np.linspace(0, 1, section_width)
+            alpha_row = (255 * (1 - xs ** 0.35)).astype(np.uint8)
+            fade_mask = Image.fromarray(np.tile(alpha_row, (IMAGE_HEIGHT, 1)), "L")
+            left_section.putalpha(fade_mask.filter(ImageFilter.GaussianBlur(50)))
+            img.paste(left_section, (-30, 0), left_section)
+
+        return img
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def time_renders(service: QuoteService, runs: int, avatar: Image.Image, banner: Image.Image,
+                 avatar_key) -> list[float]:
+    times = []
+    for i in range(runs):
+        key = avatar_key(i)
+        start = time.perf_counter()
+        service._render(TEXT, "Author", "author", "Today at 8:00 PM", avatar, key, banner.copy())
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(label: str, times: list[float], baseline: float = 0.0) -> float:
+    median = statistics.median(times)
+    speedup = f"  ({baseline / median:.1f}x)" if baseline else ""
+    print(f"{label:<34} median {median:7.1f} ms   p90 {sorted(times)[int(len(times) * 0.9) - 1]:7.1f} ms{speedup}")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    avatar = Image.fromarray(rng.integers(0, 255, (512, 512, 3), dtype=np.uint8), "RGB")
+    # Banners arrive pre-blurred from _get_banner
+    banner = Image.fromarray(rng.integers(0, 255, (IMAGE_HEIGHT, IMAGE_WIDTH, 3), dtype=np.uint8), "RGB")
+    banner = banner.filter(ImageFilter.GaussianBlur(8))
+
+    before = UncachedQuoteService()
+    after = QuoteService()
+
+    start = time.perf_counter()
+    after._layers.static(IMAGE_WIDTH, IMAGE_HEIGHT, AVATAR_SECTION_WIDTH + 400)
+    print(f"Static layer build (once at startup): {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    baseline = report("before (uncached)", time_renders(before, args.runs, avatar, banner, lambda i: None))
+    report("after, returning author", time_renders(after, args.runs, avatar, banner, lambda i: "same"), baseline)
+    report("after, new author every quote", time_renders(after, args.runs, avatar, banner, lambda i: f"new-{i}"),
+           baseline)
+
+
+if __name__ == "__main__":
+    main()
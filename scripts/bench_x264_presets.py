@@ -0,0 +1,120 @@
+"""
+Measure x264 preset speed and size for the downloader's size-targeted encoder.
+
+For each preset, encodes a clip (one passed with --input, or ffmpeg's
+synthetic testsrc2 at 720p) and records:
+
+- pass-2 speed in 720p-equivalent frames per second, from a two-pass
+  encode at a fixed bitrate (what the encoder actually runs);
+- pass-1 time relative to pass 2 (ENCODE_PASS1_COST);
+- size at equal quality relative to medium, from a CRF 23 encode (how
+  far each bit goes, used to decide when to step resolution down).
+
+Prints an X264_PRESETS block to paste into
+src/services/downloader/config.py. Run it on the bot's host: the numbers
+depend on its CPU and core count. Needs stock ffmpeg/ffprobe on PATH.
+
+Usage:
+    python3 scripts/bench_x264_presets.py [--input clip.mp4] [--seconds 20] [--bitrate 2000]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.downloader.config import X264_PRESETS  # noqa: E402
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def run(cmd: list[str]) -> float:
+    """Run a command, return its wall time."""
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def probe(path: Path) -> tuple[int, int, float]:
+    """Frame count scaled to 720p pixels, plus width/height for the report."""
+    out = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-select_streams", "v:0", "-count_packets",
+            "-show_entries", "stream=width,height,nb_read_packets", "-of", "json", str(path),
+        ],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    stream = json.loads(out)["streams"][0]
+    width, height = int(stream["width"]), int(stream["height"])
+    frames_720p = int(stream["nb_read_packets"]) * width * height / (1280 * 720)
+    return width, height, frames_720p
+
+
+def make_clip(path: Path, seconds: int) -> None:
+    """Synthetic 720p30 clip with motion and fine detail."""
+    run([
+        "ffmpeg", "-y", "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-crf", "12", "-c:a", "aac", str(path),
+    ])
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def bench_preset(preset: str, source: Path, workdir: Path, bitrate: int) -> dict:
+    passlog = workdir / f"log_{preset}"
+    common = ["-c:v", "libx264", "-preset", preset, "-b:v", f"{bitrate}k", "-pix_fmt", "yuv420p"]
+    pass1 = run(["ffmpeg", "-y", "-i", str(source), *common, "-pass", "1",
+                 "-passlogfile", str(passlog), "-an", "-f", "null", "-"])
+    pass2 = run(["ffmpeg", "-y", "-i", str(source), *common, "-pass", "2",
+                 "-passlogfile", str(passlog), "-an", str(workdir / f"2pass_{preset}.mp4")])
+
+    crf_out = workdir / f"crf_{preset}.mp4"
+    run(["ffmpeg", "-y", "-i", str(source), "-c:v", "libx264", "-preset", preset,
+         "-crf", "23", "-pix_fmt", "yuv420p", "-an", str(crf_out)])
+
+    return {"pass1": pass1, "pass2": pass2, "crf_bytes": crf_out.stat().st_size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", type=Path, help="Clip to measure instead of a synthetic one")
+    parser.add_argument("--seconds", type=int, default=20, help="Length of the synthetic clip")
+    parser.add_argument("--bitrate", type=int, default=2000, help="Two-pass video bitrate (kbps)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        source = args.input
+        if source is None:
+            source = workdir / "source.mp4"
+            make_clip(source, args.seconds)
+        width, height, frames_720p = probe(source)
+        print(f"Source: {source.name} {width}x{height}, {frames_720p:.0f} frames at 720p scale\n")
+
+        results = {}
+        for preset in X264_PRESETS:
+            results[preset] = r = bench_preset(preset, source, workdir, args.bitrate)
+            print(f"{preset:<10} pass1 {r['pass1']:6.2f}s  pass2 {r['pass2']:6.2f}s  crf23 {r['crf_bytes'] / 1024:8.0f} KB")
+
+    medium = results["medium"]["crf_bytes"]
+    pass1_cost = sum(r["pass1"] / r["pass2"] for r in results.values()) / len(results)
+    print("\nX264_PRESETS = {")
+    for preset, r in results.items():
+        print(f'    "{preset}": ({frames_720p / r["pass2"]:.1f}, {r["crf_bytes"] / medium:.2f}),')
+    print("}")
+    print(f"ENCODE_PASS1_COST = {pass1_cost:.2f}")
+
+
+if __name__ == "__main__":
+    main()
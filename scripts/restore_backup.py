@@ -0,0 +1,67 @@
+"""
+Restore an hourly database snapshot from the incremental backup store.
+
+Downloads the snapshot's manifest and chunks, reassembles the database,
+checks it against the manifest's size and SHA-256 and runs
+PRAGMA quick_check before writing the output file.
+
+The remote defaults to the bot's R2 folder (needs rclone configured with
+the r2 remote); pass a directory to restore from a local copy.
+
+Usage:
+    python3 scripts/restore_backup.py --list
+    python3 scripts/restore_backup.py [--snapshot 2026-02-25T20] [--output restored.db]
+    python3 scripts/restore_backup.py --remote /mnt/backups/Syria --snapshot 2026-02-25T20
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.services.backup.engine import BackupEngine, BackupError, make_remote  # noqa: E402
+from src.services.backup.scheduler import BOT_NAME, R2_BUCKET  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--remote", default=f"r2:{R2_BUCKET}/{BOT_NAME.capitalize()}",
+                        help="rclone remote (name:path) or local directory")
+    parser.add_argument("--list", action="store_true", help="List available snapshots and exit")
+    parser.add_argument("--snapshot", help="Snapshot name (default: newest)")
+    parser.add_argument("--output", type=Path, default=Path("restored.db"), help="Where to write the database")
+    args = parser.parse_args()
+
+    engine = BackupEngine(make_remote(args.remote))
+    try:
+        snapshots = engine.list_snapshots()
+        if args.list:
+            for name in snapshots:
+                print(name)
+            return 0
+
+        if not snapshots:
+            print(f"No snapshots in {engine.remote}", file=sys.stderr)
+            return 1
+        name = args.snapshot or snapshots[-1]
+
+        if args.output.exists():
+            print(f"Refusing to overwrite {args.output}", file=sys.stderr)
+            return 1
+
+        ok, message = engine.restore(name, args.output)
+    except BackupError as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 1
+
+    if not ok:
+        print(f"Snapshot {name} failed verification: {message}", file=sys.stderr)
+        return 1
+    print(f"Restored {name} to {args.output} (quick_check: {message})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,25 @@ SyriaBot - Logging Middleware
 
 Request/response logging for API monitoring.
 
+Implemented as raw ASGI middleware: the response is passed straight
+through to the server, only the start message is inspected.
+
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
 import time
 import uuid
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.core.logger import logger
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
-    FastAPI middleware for request/response logging.
+    ASGI middleware for request/response logging.
 
     Features:
     - Request ID generation and tracking
@@ -40,26 +42,40 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         "/robots.txt",
     )
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Skip logging for certain paths
-        path = request.url.path
+        path = scope["path"]
         if path in self.SKIP_PATHS or path.startswith(self.SKIP_PREFIXES):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        # Generate request ID
+        # Generate request ID (exposed as request.state.request_id)
         request_id = str(uuid.uuid4())[:8]
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
         # Record start time
         start_time = time.time()
+        method = scope["method"]
+        status = 500
 
-        # Get request info
-        method = request.method
-        client_ip = self._get_client_ip(request)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
         # Process request
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Log error
             duration_ms = (time.time() - start_time) * 1000
@@ -71,49 +87,42 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             ])
             raise
 
-        # Calculate duration
+        # Calculate duration (includes streaming the body)
         duration_ms = (time.time() - start_time) * 1000
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-
         # Log response based on status code
-        status = response.status_code
-        log_data = [
-            ("ID", request_id),
-            ("Method", method),
-            ("Path", path[:50]),
-            ("Status", str(status)),
-            ("Duration", f"{duration_ms:.0f}ms"),
-            ("IP", client_ip),
-        ]
-
-        if status >= 500:
-            logger.tree("API Response", log_data, emoji="🔴")
-        elif status in (403, 429):
-            logger.tree("API Response", log_data, emoji="⚠️")
-        elif status >= 400:
-            # 401s and other 4xx errors are debug level (expected behavior)
-            pass
-        else:
-            # Success responses - only log if slow (>500ms)
-            if duration_ms > 500:
+        if status >= 500 or status in (403, 429) or (status < 400 and duration_ms > 500):
+            log_data = [
+                ("ID", request_id),
+                ("Method", method),
+                ("Path", path[:50]),
+                ("Status", str(status)),
+                ("Duration", f"{duration_ms:.0f}ms"),
+                ("IP", self._get_client_ip(scope)),
+            ]
+            if status >= 500:
+                logger.tree("API Response", log_data, emoji="🔴")
+            elif status in (403, 429):
+                logger.tree("API Response", log_data, emoji="⚠️")
+            else:
+                # Success responses - only logged when slow (>500ms)
                 logger.tree("API Response (Slow)", log_data, emoji="🐢")
+        # 401s and other 4xx errors are debug level (expected behavior)
 
-        return response
-
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope) -> str:
         """Extract client IP, considering proxies."""
-        forwarded = request.headers.get("X-Forwarded-For")
+        headers = Headers(scope=scope)
+        forwarded = headers.get("X-Forwarded-For")
         if forwarded:
             return forwarded.split(",")[0].strip()
 
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
 
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         return "unknown"
 
 
@@ -4,18 +4,22 @@ SyriaBot - Rate Limiting Middleware
 
 Token bucket rate limiting for API endpoints.
 
+Implemented as raw ASGI middleware. Stale buckets are expired from a
+min-heap of deadlines instead of scanning every bucket.
+
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
+import heapq
 import time
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.core.logger import logger
 from src.api.config import get_api_config
@@ -66,9 +70,16 @@ class TokenBucket:
 class RateLimiter:
     """
     Manages rate limiting across multiple clients with LRU eviction.
+
+    Each bucket has one entry in a min-heap of (expires_at, key). Cleanup
+    pops only the entries whose deadline has passed; a bucket touched since
+    its entry was pushed is re-armed with its new deadline instead of
+    being removed. Cost is proportional to expired entries, not to the
+    number of tracked buckets.
     """
 
     MAX_TRACKED_IPS = 10000
+    STALE_AFTER = 120  # Seconds without use before a bucket is dropped
 
     def __init__(
         self,
@@ -81,8 +92,8 @@ class RateLimiter:
         self._burst_limit = burst_limit
         # Use OrderedDict for LRU eviction
         self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
-        self._last_cleanup = time.time()
-        self._cleanup_interval = 120  # 2 minutes
+        # Expiry heap: (expires_at, key) - one entry per live bucket
+        self._expiry: List[Tuple[float, str]] = []
 
     def _get_bucket_key(self, client_ip: str, path: str) -> str:
         """Generate a unique key for the rate limit bucket."""
@@ -107,23 +118,24 @@ class RateLimiter:
     def _cleanup_stale_buckets(self) -> None:
         """Remove buckets that haven't been used recently."""
         now = time.time()
-        if now - self._last_cleanup < self._cleanup_interval:
-            return
-
-        self._last_cleanup = now
-        stale_threshold = now - 120  # 2 minutes
-
-        stale_keys = [
-            key for key, bucket in self._buckets.items()
-            if bucket.last_update < stale_threshold
-        ]
-
-        for key in stale_keys:
+        removed = 0
+
+        while self._expiry and self._expiry[0][0] <= now:
+            _, key = heapq.heappop(self._expiry)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue  # Already evicted by LRU
+            expires_at = bucket.last_update + self.STALE_AFTER
+            if expires_at > now:
+                # Used since this deadline was armed - re-arm
+                heapq.heappush(self._expiry, (expires_at, key))
+                continue
             del self._buckets[key]
+            removed += 1
 
-        if stale_keys:
+        if removed >= 100:
             logger.tree("Rate Limit Cleanup", [
-                ("Removed", str(len(stale_keys))),
+                ("Removed", str(removed)),
                 ("Remaining", str(len(self._buckets))),
             ], emoji="🧹")
 
@@ -159,6 +171,7 @@ class RateLimiter:
                 capacity=self._default_limit,
                 refill_rate=self._default_limit / self._default_window,
             )
+            heapq.heappush(self._expiry, (time.time() + self.STALE_AFTER, key))
             self._evict_if_needed()
 
         bucket = self._buckets[key]
@@ -176,23 +189,26 @@ class RateLimiter:
 # Middleware
 # =============================================================================
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
-    FastAPI middleware for rate limiting.
+    ASGI middleware for rate limiting.
     """
 
-    def __init__(self, app: Any, rate_limiter: Optional[RateLimiter] = None) -> None:
-        super().__init__(app)
+    SKIP_PATHS = ("/health", "/api/syria/health")
+
+    def __init__(self, app: ASGIApp, rate_limiter: Optional[RateLimiter] = None) -> None:
+        self.app = app
         self._limiter = rate_limiter or get_rate_limiter()
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip rate limiting for health checks
-        if request.url.path in ("/health", "/api/syria/health"):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip rate limiting for non-HTTP traffic and health checks
+        if scope["type"] != "http" or scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
 
         # Get client info
-        client_ip = self._get_client_ip(request)
-        path = request.url.path
+        client_ip = self._get_client_ip(scope)
+        path = scope["path"]
 
         # Check rate limit
         allowed, retry_after, remaining, limit = self._limiter.check(client_ip, path)
@@ -204,37 +220,46 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 ("Retry After", f"{retry_after}s"),
             ], emoji="⚠️")
 
-            response = Response(
-                content='{"error": "Rate limit exceeded", "retry_after": ' + str(retry_after) + '}',
-                status_code=HTTP_429_TOO_MANY_REQUESTS,
-                media_type="application/json",
-            )
-            response.headers["Retry-After"] = str(retry_after)
-            response.headers["X-RateLimit-Limit"] = str(limit)
-            response.headers["X-RateLimit-Remaining"] = "0"
-            return response
-
-        # Process request
-        response = await call_next(request)
+            body = ('{"error": "Rate limit exceeded", "retry_after": ' + str(retry_after) + '}').encode()
+            await send({
+                "type": "http.response.start",
+                "status": HTTP_429_TOO_MANY_REQUESTS,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    (b"x-ratelimit-limit", str(limit).encode()),
+                    (b"x-ratelimit-remaining", b"0"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
 
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(limit)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+            await send(message)
 
-        return response
+        # Process request
+        await self.app(scope, receive, send_wrapper)
 
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope) -> str:
         """Extract client IP, considering proxies."""
-        forwarded = request.headers.get("X-Forwarded-For")
+        headers = Headers(scope=scope)
+        forwarded = headers.get("X-Forwarded-For")
         if forwarded:
             return forwarded.split(",")[0].strip()
 
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
 
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         return "unknown"
 
 
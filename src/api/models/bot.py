@@ -154,6 +154,39 @@ class LatencyHistoryResponse(BaseModel):
     data: LatencyHistoryData
 
 
+# =============================================================================
+# Media Engine
+# =============================================================================
+
+class MediaStatsResponse(BaseModel):
+    """Media engine stats API response."""
+
+    success: bool = True
+    data: Dict[str, Any]
+
+
+# =============================================================================
+# Message Pipeline
+# =============================================================================
+
+class PipelineStatsResponse(BaseModel):
+    """Message pipeline stage latency API response."""
+
+    success: bool = True
+    data: Dict[str, Any]
+
+
+# =============================================================================
+# Invite Attribution
+# =============================================================================
+
+class InviteStatsResponse(BaseModel):
+    """Invite attribution burst and accuracy API response."""
+
+    success: bool = True
+    data: Dict[str, Any]
+
+
 __all__ = [
     "SystemInfo",
     "HealthInfo",
@@ -169,4 +202,7 @@ __all__ = [
     "LatencyReportResponse",
     "LatencyHistoryData",
     "LatencyHistoryResponse",
+    "MediaStatsResponse",
+    "PipelineStatsResponse",
+    "InviteStatsResponse",
 ]
@@ -31,11 +31,17 @@ from src.api.models.bot import (
     LatencyStatsResponse,
     LatencyReportResponse,
     LatencyReportData,
+    MediaStatsResponse,
+    PipelineStatsResponse,
+    InviteStatsResponse,
 )
 from src.api.services.log_storage import get_log_storage
 from src.api.services.health_tracker import get_health_tracker
 from src.api.services.latency_storage import get_latency_storage
 from src.api.errors import APIError, ErrorCode
+from src.services.convert.cache import convert_cache
+from src.services.convert.engine import media_engine
+from src.services.reply_targets import reply_targets
 
 
 router = APIRouter(prefix="/api/syria/bot", tags=["Bot Status"])
@@ -297,4 +303,69 @@ async def report_latency(
     )
 
 
+# =============================================================================
+# Media Engine
+# =============================================================================
+
+@router.get("/media", response_model=MediaStatsResponse)
+async def get_media_stats(
+    _: int = Depends(require_auth),
+) -> MediaStatsResponse:
+    """
+    Get /convert media engine status.
+
+    Returns worker/queue counts, average per-stage timings
+    (decode, layout, quantize, encode, queue wait) per job kind
+    and output cache counters.
+    """
+    return MediaStatsResponse(data={
+        **media_engine.get_stats(),
+        "cache": convert_cache.get_stats(),
+    })
+
+
+# =============================================================================
+# Message Pipeline
+# =============================================================================
+
+@router.get("/pipeline", response_model=PipelineStatsResponse)
+async def get_pipeline_stats(
+    bot: Any = Depends(get_bot_optional),
+    _: int = Depends(require_auth),
+) -> PipelineStatsResponse:
+    """
+    Get on_message stage latency.
+
+    Returns a latency histogram per pipeline stage (plus "total"),
+    with timeout and error counts, the most recent expensive
+    messages with their per-stage breakdown, and reply-target
+    resolution counters (hit rate, REST fetches made and avoided).
+    """
+    cog = bot.get_cog("MessageHandler") if bot else None
+    stats = cog.pipeline.stats.to_dict() if cog else {"stages": {}, "expensive": []}
+    return PipelineStatsResponse(data={
+        **stats,
+        "reply_targets": reply_targets.get_stats(),
+    })
+
+
+# =============================================================================
+# Invite Attribution
+# =============================================================================
+
+@router.get("/invites", response_model=InviteStatsResponse)
+async def get_invite_stats(
+    bot: Any = Depends(get_bot_optional),
+    _: int = Depends(require_auth),
+) -> InviteStatsResponse:
+    """
+    Get invite attribution counters.
+
+    Returns join burst sizes, REST fetches saved by batching, and
+    attribution accuracy (exact, ambiguous, unattributed joins).
+    """
+    cog = bot.get_cog("MemberHandler") if bot else None
+    return InviteStatsResponse(data=cog.invites.get_stats() if cog else {})
+
+
 __all__ = ["router"]
@@ -41,9 +41,11 @@ from src.services.tempvoice import TempVoiceService
 from src.services.sync_profile import ProfileSyncService
 from src.services.xp import XPService
 from src.services.xp import card as rank_card
+from src.services.card_templates import card_templates
 from src.api import APIService
 from src.services.backup import BackupScheduler
 from src.services.afk import AFKService
+from src.services.family_graph import family_graph
 from src.services.gallery import GalleryService
 from src.services.presence import PresenceService
 from src.services.bump import bump_service
@@ -53,6 +55,8 @@ from src.services.actions import action_service
 from src.services.actions.panel import ActionsPanelService
 from src.services.family_panel import FamilyPanelService
 from src.services.quote import quote_service
+from src.services.convert import media_engine
+from src.services.downloader import downloader
 from src.services.birthday import get_birthday_service, BirthdayService
 from src.services.faq import setup_persistent_views
 from src.services.confessions.views import setup_confession_views
@@ -326,6 +330,7 @@ class SyriaBot(commands.Bot):
         phase2_tasks = [
             _init("Backup", self.backup_scheduler.start),
             _init("AFK", self.afk_service.setup),
+            _init("FamilyGraph", family_graph.setup),
             _init("Gallery", self.gallery_service.setup),
             _init("Presence", self.presence_handler.setup),
             _init("Confessions", self.confession_service.setup),
@@ -361,6 +366,18 @@ class SyriaBot(commands.Bot):
         from src.services.xp.card import prewarm as prewarm_rank_card
         create_safe_task(prewarm_rank_card(), "Rank Card Pre-warm")
 
+        # Build the quote renderer's static layers before the first quote
+        create_safe_task(quote_service.prewarm(), "Quote Layers Pre-build")
+
+        # Load the stored action GIF pool and start prefetching common actions
+        create_safe_task(action_service.start(), "Action GIF Pool Start")
+
+        # Start media workers so the first /convert doesn't wait for them
+        create_safe_task(media_engine.start(), "Media Engine Start")
+
+        # Reclaim download temp dirs left by crashed or cancelled jobs
+        downloader.start()
+
         # Start connection health monitor
         self._health_task = create_safe_task(self._health_check_loop(), "Health Check Loop")
 
@@ -478,7 +495,10 @@ class SyriaBot(commands.Bot):
         if self.currency_service:
             async_tasks.append(_stop("Currency", self.currency_service.stop()))
         async_tasks.append(_stop("QuoteService", quote_service.close()))
+        async_tasks.append(_stop("MediaEngine", media_engine.close()))
+        async_tasks.append(_stop("Downloader", downloader.stop()))
         async_tasks.append(_stop("HTTP", http_session.close()))
+        async_tasks.append(_stop("CardTemplates", card_templates.close()))
         async_tasks.append(_stop("RankCard", rank_card.cleanup()))
         async_tasks.append(_stop("ActionService", action_service.close()))
         async_tasks.append(_stop("LoggerWebhook", logger.close_webhook_session()))
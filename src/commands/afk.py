@@ -20,7 +20,6 @@ from src.core.config import config
 from src.core.logger import logger
 from src.core.colors import COLOR_SYRIA_GREEN
 from src.services.actions import action_service
-from src.services.database import db
 
 
 class AFKCog(commands.Cog):
@@ -75,10 +74,10 @@ class AFKCog(commands.Cog):
             return
 
         # Check if user is already AFK
-        existing_afk = db.get_afk(interaction.user.id, interaction.guild.id)
+        existing_afk = self.bot.afk_service.registry.get(interaction.user.id, interaction.guild.id)
         if existing_afk:
             await interaction.response.send_message(
-                f"You're already AFK since <t:{existing_afk['timestamp']}:R>",
+                f"You're already AFK since <t:{existing_afk.timestamp}:R>",
                 ephemeral=True
             )
             logger.tree("AFK Command Rejected", [
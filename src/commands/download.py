@@ -11,18 +11,35 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
+import asyncio
+import time
+from typing import Optional
 from urllib.parse import urlparse
 
 import discord
-from discord import app_commands
+from discord import app_commands, ui
 from discord.ext import commands
 
 from src.core.logger import logger
 from src.core.config import config
-from src.core.colors import COLOR_ERROR, COLOR_WARNING, EMOJI_SAVE
+from src.core.colors import COLOR_ERROR, COLOR_WARNING, EMOJI_SAVE, EMOJI_BLOCK
 from src.core.constants import DELETE_DELAY_MEDIUM
-from src.services.downloader import downloader
+from src.services.downloader import (
+    downloader,
+    download_scheduler,
+    DownloadJob,
+    DownloadCancelled,
+    DownloadQueueFull,
+    JOB_QUEUED,
+    JOB_TRANSCODING,
+    JOB_UPLOADING,
+    PRIORITY_STAFF,
+    PRIORITY_BOOSTER,
+    PRIORITY_DEFAULT,
+)
+from src.services.downloader.config import DOWNLOAD_PROGRESS_INTERVAL, upload_limit_mb
 from src.services.database import db
+from src.utils.async_utils import create_safe_task
 from src.utils.permissions import create_cooldown
 from src.services.tempvoice.utils import is_booster
 
@@ -48,9 +65,157 @@ async def _check_download_limit(user: discord.Member) -> tuple[bool, int, str]:
     return (True, remaining, "")
 
 
+def _download_priority(user: discord.Member | discord.User) -> int:
+    """Queue priority: staff first, then boosters, then everyone else."""
+    if config.OWNER_ID and user.id == config.OWNER_ID:
+        return PRIORITY_STAFF
+    if isinstance(user, discord.Member):
+        if config.MOD_ROLE_ID and user.get_role(config.MOD_ROLE_ID):
+            return PRIORITY_STAFF
+        if is_booster(user):
+            return PRIORITY_BOOSTER
+    return PRIORITY_DEFAULT
+
+
 MAX_URL_LENGTH = 2048  # Reasonable limit for URLs
 
 
+# =============================================================================
+# Progress
+# =============================================================================
+
+class DownloadCancelView(ui.View):
+    """Cancel button on the progress message (requester only)."""
+
+    def __init__(self, job: DownloadJob) -> None:
+        super().__init__(timeout=None)
+        self.job = job
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only allow the requester to cancel."""
+        if interaction.user.id != self.job.user_id:
+            embed = discord.Embed(description="⚠️ Only the person who started this download can cancel it", color=COLOR_WARNING)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return False
+        return True
+
+    @ui.button(label="Cancel", emoji=EMOJI_BLOCK, style=discord.ButtonStyle.secondary)
+    async def cancel_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
+        """Cancel the download (the command deletes the progress message)."""
+        await interaction.response.defer()
+        if not download_scheduler.cancel(self.job.id):
+            logger.tree("Download Cancel Ignored", [
+                ("User", f"{interaction.user.name}"),
+                ("Job", self.job.id),
+                ("State", self.job.state),
+            ], emoji="⚠️")
+
+
+class DownloadProgress:
+    """
+    The single progress message of a download job.
+
+    DESIGN:
+        Job state changes arrive synchronously through on_change. Edits
+        are coalesced: at most one flush task runs, it waits until
+        DOWNLOAD_PROGRESS_INTERVAL has passed since the last edit and then
+        shows the latest text, so a job moving through several states
+        quickly (or a queue shuffling positions) costs one edit, not many.
+    """
+
+    def __init__(self, platform: str, user: discord.Member | discord.User) -> None:
+        self.platform = platform
+        self.user = user
+        self.files = 0
+        self.message: Optional[discord.Message] = None
+        self._view: Optional[DownloadCancelView] = None
+        self._text = ""
+        self._shown = ""
+        self._last_edit = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def render(self, job: DownloadJob) -> str:
+        if job.state == JOB_QUEUED:
+            return f"{EMOJI_SAVE} Queued for **{self.platform}** (position **{max(job.position, 1)}**)..."
+        if job.state == JOB_TRANSCODING:
+            return f"{EMOJI_SAVE} Processing video from **{self.platform}**..."
+        if job.state == JOB_UPLOADING:
+            return f"{EMOJI_SAVE} Uploading **{self.files}** file(s)..."
+        return f"{EMOJI_SAVE} Downloading from **{self.platform}**..."
+
+    async def send(self, destination: discord.Interaction | discord.abc.Messageable, job: DownloadJob) -> None:
+        """Send the progress message (a followup for slash commands)."""
+        self._view = DownloadCancelView(job)
+        self._text = self._shown = self.render(job)
+        try:
+            if isinstance(destination, discord.Interaction):
+                self.message = await destination.followup.send(self._text, view=self._view, wait=True)
+            else:
+                self.message = await destination.send(self._text, view=self._view)
+            self._last_edit = time.monotonic()
+            logger.tree("Download Progress Sent", [
+                ("User", f"{self.user.name}"),
+                ("Platform", self.platform),
+            ], emoji="💬")
+        except discord.HTTPException as e:
+            logger.tree("Download Progress Send Failed", [
+                ("User", f"{self.user.name}"),
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+
+    def update(self, job: DownloadJob) -> None:
+        """on_change callback: schedule an edit to the job's current state."""
+        self._text = self.render(job)
+        if self._closed or self.message is None:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = create_safe_task(self._flush(), "Download Progress")
+
+    async def _flush(self) -> None:
+        while self._text != self._shown and not self._closed:
+            delay = self._last_edit + DOWNLOAD_PROGRESS_INTERVAL - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            text = self._text
+            try:
+                await self.message.edit(content=text)
+            except discord.HTTPException as e:
+                logger.tree("Download Progress Update Failed", [
+                    ("User", f"{self.user.name}"),
+                    ("Error", str(e)[:50]),
+                ], emoji="⚠️")
+                return
+            self._shown = text
+            self._last_edit = time.monotonic()
+
+    async def delete(self, reason: str) -> None:
+        """Remove the progress message; no more edits after this."""
+        self.close()
+        if self.message is None:
+            return
+        message, self.message = self.message, None
+        try:
+            await message.delete()
+            logger.tree("Download Progress Deleted", [
+                ("Reason", reason),
+            ], emoji="🗑️")
+        except discord.HTTPException as e:
+            logger.tree("Progress Delete Failed", [
+                ("User", f"{self.user.name}"),
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+
+    def close(self) -> None:
+        """Stop pending edits and the Cancel button."""
+        self._closed = True
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        if self._view:
+            self._view.stop()
+
+
 async def handle_download(
     interaction_or_message: discord.Interaction | discord.Message,
     url: str,
@@ -195,60 +360,71 @@ async def handle_download(
     # (don't delete early - user needs the URL if download fails)
     reply_to_delete = interaction_or_message if is_reply and isinstance(interaction_or_message, discord.Message) else None
 
-    # Send progress message
-    progress_msg = None
-    try:
-        if is_interaction:
-            progress_msg = await interaction_or_message.followup.send(
-                f"{EMOJI_SAVE} Downloading from **{platform.title()}**...",
-                wait=True
-            )
-        else:
-            progress_msg = await channel.send(
-                f"{EMOJI_SAVE} Downloading from **{platform.title()}**..."
-            )
-        logger.tree("Download Progress Sent", [
-            ("User", f"{user.name}"),
-            ("Platform", platform.title()),
-        ], emoji="💬")
-    except discord.HTTPException as e:
-        logger.tree("Download Progress Send Failed", [
-            ("User", f"{user.name}"),
-            ("Error", str(e)[:50]),
-        ], emoji="⚠️")
-
-    # Download
-    result = await downloader.download(url)
+    # Progress message (queue position, then stage) with a Cancel button
+    progress = DownloadProgress(platform.title(), user)
+    job = DownloadJob(
+        user_id=user.id,
+        url=url,
+        priority=_download_priority(user),
+        on_change=progress.update,
+    )
+    await progress.send(interaction_or_message if is_interaction else channel, job)
 
-    # Update progress message
-    if progress_msg and result.success and len(result.files) > 0:
+    try:
+        await download_scheduler.run(job, lambda job: _run_download(
+            job, interaction_or_message, url, user, channel, platform, remaining, reply_to_delete, progress,
+        ))
+    except DownloadQueueFull:
+        await progress.delete("Queue full")
+        embed = discord.Embed(
+            title="Download Queue Full",
+            description="Too many downloads are waiting right now, or you already have some pending. Try again in a few minutes.",
+            color=COLOR_WARNING
+        )
         try:
-            await progress_msg.edit(
-                content=f"{EMOJI_SAVE} Processing **{len(result.files)}** file(s)..."
-            )
-            logger.tree("Download Progress Updated", [
-                ("User", f"{user.name}"),
-                ("Files", str(len(result.files))),
-            ], emoji="💬")
+            if is_interaction:
+                await interaction_or_message.followup.send(embed=embed, ephemeral=True)
+            else:
+                msg = await channel.send(embed=embed)
+                await msg.delete(delay=DELETE_DELAY_MEDIUM)
         except discord.HTTPException as e:
-            logger.tree("Download Progress Update Failed", [
+            logger.tree("Download Queue Full Reply Failed", [
                 ("User", f"{user.name}"),
                 ("Error", str(e)[:50]),
             ], emoji="⚠️")
+    except DownloadCancelled:
+        await progress.delete("Cancelled")
+        logger.tree("Download Cancelled", [
+            ("User", f"{user.name} ({user.display_name})"),
+            ("ID", str(user.id)),
+            ("Platform", platform.title()),
+            ("Job", job.id),
+        ], emoji="🛑")
+    finally:
+        progress.close()
+
+
+async def _run_download(
+    job: DownloadJob,
+    interaction_or_message: discord.Interaction | discord.Message,
+    url: str,
+    user: discord.Member | discord.User,
+    channel: discord.abc.Messageable,
+    platform: str,
+    remaining: int,
+    reply_to_delete: Optional[discord.Message],
+    progress: "DownloadProgress",
+) -> None:
+    """Download, upload and clean up once the scheduler gives the job a slot."""
+    is_interaction = isinstance(interaction_or_message, discord.Interaction)
+
+    # Download (videos are encoded to fit this server's upload limit)
+    guild = getattr(channel, "guild", None)
+    result = await downloader.download(url, upload_limit_mb(guild.filesize_limit if guild else None))
 
     if not result.success:
         # Delete progress message
-        if progress_msg:
-            try:
-                await progress_msg.delete()
-                logger.tree("Download Progress Deleted", [
-                    ("Reason", "Download failed"),
-                ], emoji="🗑️")
-            except discord.HTTPException as e:
-                logger.tree("Progress Delete Failed", [
-                    ("User", f"{user.name}"),
-                    ("Error", str(e)[:50]),
-                ], emoji="⚠️")
+        await progress.delete("Download failed")
 
         # Send ephemeral-like error (auto-delete for replies)
         embed = discord.Embed(
@@ -277,6 +453,9 @@ async def handle_download(
         ], emoji="❌")
         return
 
+    progress.files = len(result.files) or len(result.links)
+    job.set_state(JOB_UPLOADING)
+
     # Record usage (only for non-boosters)
     if remaining != -1:
         new_remaining = db.record_download_usage(user.id, config.DOWNLOAD_WEEKLY_LIMIT)
@@ -289,7 +468,7 @@ async def handle_download(
         new_remaining = -1
 
     # Record lifetime download stats
-    db.record_download_stats(user.id, platform, file_count=len(result.files))
+    db.record_download_stats(user.id, platform, file_count=len(result.files) or len(result.links))
 
     # Upload files - just the video + ping, no embed
     try:
@@ -302,20 +481,14 @@ async def handle_download(
             files.append(discord_file)
 
         # Delete progress message before sending files
-        if progress_msg:
-            try:
-                await progress_msg.delete()
-                logger.tree("Download Progress Deleted", [
-                    ("Reason", "Sending files"),
-                ], emoji="🗑️")
-            except discord.HTTPException as e:
-                logger.tree("Progress Delete Failed", [
-                    ("User", f"{user.name}"),
-                    ("Error", str(e)[:50]),
-                ], emoji="⚠️")
+        await progress.delete("Sending files")
 
-        # Send just files with ping - no embed
-        await channel.send(content=f"<@{user.id}>", files=files)
+        # Send just files with ping - no embed (or the links of a recent identical upload)
+        if result.links:
+            await channel.send(content=f"<@{user.id}>\n" + "\n".join(result.links))
+        else:
+            sent = await channel.send(content=f"<@{user.id}>", files=files)
+            downloader.remember_upload(result, [a.url for a in sent.attachments])
 
         # Delete the original reply message NOW (after success)
         if reply_to_delete:
@@ -335,24 +508,14 @@ async def handle_download(
             ("User", f"{user.name} ({user.display_name})"),
             ("ID", str(user.id)),
             ("Platform", platform.title()),
-            ("Files", str(len(files))),
-            ("Size", downloader.format_size(total_size)),
+            ("Files", str(len(files) or len(result.links))),
+            ("Size", downloader.format_size(total_size) if files else "Reused upload"),
             ("Remaining", "Unlimited" if new_remaining == -1 else str(new_remaining)),
         ], emoji="✅")
 
     except discord.HTTPException as e:
         # Delete progress message on error too
-        if progress_msg:
-            try:
-                await progress_msg.delete()
-                logger.tree("Download Progress Deleted", [
-                    ("Reason", "Upload failed"),
-                ], emoji="🗑️")
-            except discord.HTTPException as del_e:
-                logger.tree("Progress Delete Failed", [
-                    ("User", f"{user.name}"),
-                    ("Error", str(del_e)[:50]),
-                ], emoji="⚠️")
+        await progress.delete("Upload failed")
 
         embed = discord.Embed(
             title="Upload Failed",
@@ -373,10 +536,8 @@ async def handle_download(
         ], emoji="❌")
 
     finally:
-        # Cleanup temp files
-        if result.files:
-            download_dir = result.files[0].parent
-            downloader.cleanup([download_dir])
+        # Release temp files (removed once every request sharing them is done)
+        downloader.release(result)
 
 
 class DownloadCog(commands.Cog):
@@ -82,6 +82,29 @@ MAX_DIMENSION = 2000                 # Max width/height for images
 MAX_VIDEO_DURATION = 15  # Max video duration in seconds
 GIF_FPS = 15             # Frames per second for output GIF
 GIF_MAX_WIDTH = 480      # Max GIF width (height scaled proportionally)
+GIF_PALETTE_SAMPLES = 16  # Frames sampled to build an animated GIF's global palette
+
+# Editor preview (thumbnail for short clips, frame strip for longer ones)
+PREVIEW_SAMPLE_FPS = 1           # Frames sampled per second in the preview pass
+PREVIEW_THUMB_WIDTH = 400        # Single thumbnail width
+PREVIEW_STRIP_FRAMES = 5         # Frames in the preview strip
+PREVIEW_STRIP_FRAME_WIDTH = 160  # Width of each strip frame
+PREVIEW_SHORT_CLIP = 10          # Clips shorter than this (seconds) get a thumbnail
+
+# Image editor live preview (full resolution is only rendered on Save)
+EDITOR_PREVIEW_MAX_SIZE = 640    # Longest side of editor previews
+EDITOR_PREVIEW_QUALITY = 80      # Lossy WebP/JPEG quality for editor previews
+
+
+# =============================================================================
+# Media Engine (Process Pool)
+# =============================================================================
+
+MEDIA_MAX_WORKERS = 3             # Upper bound on media worker processes
+MEDIA_MAX_PENDING_PER_USER = 3    # Queued + running jobs allowed per user
+MEDIA_TIMING_WINDOW = 200         # Recent jobs kept per kind for stage averages
+MEDIA_SHM_HEADROOM = 64 * 1024 * 1024  # Free /dev/shm required before using shared memory
+CONVERT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Disk budget for cached convert outputs
 
 
 # =============================================================================
@@ -126,6 +149,11 @@ QUOTE_SUBTEXT_COLOR = (156, 156, 156)  # Gray for username
 QUOTE_AVATAR_SECTION_WIDTH_RATIO = 0.38  # 38% for avatar side
 QUOTE_MAX_BANNER_CACHE_SIZE = 10
 
+# Quote rendering
+QUOTE_AVATAR_CACHE_SIZE = 64    # Processed avatar sections kept (LRU)
+QUOTE_GRAIN_VARIANTS = 4        # Pre-generated film grain layers to pick from
+QUOTE_RENDER_WORKERS = 2        # Executor threads for quote rendering
+
 
 # =============================================================================
 # TempVoice Limits
@@ -229,3 +257,67 @@ MAX_CHILDREN = 5                # Max children per household
 ANCESTOR_MAX_DEPTH = 20         # Max depth for circular ancestry checks
 FAMILY_VIEW_TIMEOUT = 60        # Timeout for proposal/adoption views (seconds)
 FAMILY_CONFIRM_TIMEOUT = 30     # Timeout for confirmation views (seconds)
+
+
+# =============================================================================
+# Invite Attribution
+# =============================================================================
+
+INVITE_BURST_WINDOW = 2.0       # Seconds to collect joins before one invite fetch
+INVITE_BURST_MAX = 50           # Flush early once this many joins are queued
+INVITE_FETCH_TIMEOUT = 10.0     # Timeout for a single guild.invites() fetch
+
+
+# =============================================================================
+# Message Pipeline
+# =============================================================================
+
+MESSAGE_STAGE_TIMEOUT = 5.0         # Budget for a side-effect stage (counters, XP, AFK, ...)
+MESSAGE_FETCH_STAGE_TIMEOUT = 10.0  # Budget for stages that may hit the API (reply fetch, sticky panel)
+MESSAGE_CLAIM_STAGE_TIMEOUT = 15.0  # Budget for confession/gallery before the message is let through
+EXPENSIVE_MESSAGE_MS = 1000         # Messages slower than this end to end are sampled
+EXPENSIVE_MESSAGE_SAMPLES = 50      # Recent expensive messages kept for inspection
+EXPENSIVE_MESSAGE_LOG_INTERVAL = 60  # At most one expensive-message log per this many seconds
+
+
+# =============================================================================
+# Reply Targets
+# =============================================================================
+
+REPLY_TARGET_CHANNEL_SIZE = 512     # Recent message -> author entries kept per channel
+REPLY_TARGET_MAX_CHANNELS = 256     # Channels tracked (least recently active dropped first)
+REPLY_FETCH_RATE = 0.5              # REST fetches per second allowed for index misses
+REPLY_FETCH_BURST = 5               # Fetches allowed back to back before the rate applies
+REPLY_FETCH_MAX_INFLIGHT = 4        # Concurrent fetches; further misses are dropped
+
+
+# =============================================================================
+# HTML Card Templates
+# =============================================================================
+
+CARD_TEMPLATE_MAX_PAGES = 3         # Hot template pages kept open (least recently used closed first)
+CARD_TEMPLATE_MAX_RENDERS = 200     # Reload a template page after this many renders (memory)
+CARD_IMAGE_DECODE_TIMEOUT = 3000    # ms to wait for avatars/banners before screenshotting anyway
+
+
+# =============================================================================
+# Action GIF Pool
+# =============================================================================
+
+ACTION_GIF_POOL_SIZE = 8            # GIFs kept ready per action endpoint
+ACTION_GIF_MAX_SERVES = 4           # Serves before a pooled GIF is replaced by a fresh one
+ACTION_GIF_RECENT = 3               # Last served GIFs per endpoint skipped when picking
+ACTION_GIF_MAX_BYTES = 8 * 1024 * 1024          # Larger GIFs are not stored (attachment limit)
+ACTION_GIF_STORE_MAX_BYTES = 256 * 1024 * 1024  # On-disk pool budget across all endpoints
+ACTION_GIF_REFILL_CONCURRENCY = 2   # Background downloads in flight at once
+ACTION_PROVIDER_FAILURES = 3        # Consecutive failures before a provider is benched
+ACTION_PROVIDER_BACKOFF = 60        # Seconds benched; doubles on each repeat bench
+ACTION_PROVIDER_BACKOFF_MAX = 1800  # Longest bench (seconds)
+
+
+# =============================================================================
+# Cooldown Engine
+# =============================================================================
+
+COOLDOWN_MAX_KEYS = 10_000          # Default per-namespace key bound (least recently used dropped first)
+COOLDOWN_EXPIRE_BATCH = 8           # Expired keys reclaimed per check (amortized expiry)
@@ -11,7 +11,6 @@ Server: discord.gg/syria
 
 import asyncio
 import time
-from collections import OrderedDict
 
 import discord
 
@@ -21,13 +20,10 @@ from src.core.colors import COLOR_ERROR, COLOR_GOLD
 from src.core.constants import DELETE_DELAY_SHORT
 from src.services.actions import action_service
 from src.services.database import db
+from src.utils.cooldowns import Cooldown, cooldowns
 from src.utils.permissions import is_cooldown_exempt
 
 
-# Max cooldown cache size before cleanup
-MAX_COOLDOWN_CACHE_SIZE = 100
-
-
 class ActionHandler:
     """
     Handler for action commands with GIF responses.
@@ -48,30 +44,7 @@ class ActionHandler:
 
         Sets up cooldown tracking for rate limiting.
         """
-        self._cooldowns: OrderedDict[int, float] = OrderedDict()
-        self._cooldown_lock = asyncio.Lock()
-
-    async def _cleanup_cooldowns(self) -> None:
-        """Remove expired cooldowns to prevent unbounded growth (thread-safe)."""
-        if len(self._cooldowns) <= MAX_COOLDOWN_CACHE_SIZE:
-            return
-
-        async with self._cooldown_lock:
-            now = time.time()
-            # Build list of expired users safely
-            expired_users = [
-                uid for uid, ts in list(self._cooldowns.items())
-                if now - ts > self.ACTION_COOLDOWN
-            ]
-            for uid in expired_users:
-                self._cooldowns.pop(uid, None)  # Use pop to avoid KeyError
-
-            # Evict oldest if still over limit
-            while len(self._cooldowns) > MAX_COOLDOWN_CACHE_SIZE:
-                try:
-                    self._cooldowns.popitem(last=False)
-                except KeyError:
-                    break  # Dict is empty
+        self._cooldowns = cooldowns.namespace("action", Cooldown(self.ACTION_COOLDOWN))
 
     async def handle(self, message: discord.Message) -> bool:
         """
@@ -106,23 +79,13 @@ class ActionHandler:
         user_id = message.author.id
         guild_id = message.guild.id
 
-        # Check cooldown (atomically with lock to prevent race conditions)
+        # Check and record cooldown in one step (no await in between, so no race)
         # Exempt users (developer, mods) bypass cooldowns
-        on_cooldown = False
-        cooldown_ends = 0
+        remaining = 0.0
         if not is_cooldown_exempt(message.author):
-            async with self._cooldown_lock:
-                last_use = self._cooldowns.get(user_id, 0)
-                time_since = time.time() - last_use
-                if time_since < self.ACTION_COOLDOWN:
-                    remaining = self.ACTION_COOLDOWN - time_since
-                    cooldown_ends = int(time.time() + remaining)
-                    # Release lock before async operations
-                    on_cooldown = True
-                else:
-                    # Record cooldown immediately while we have the lock
-                    self._cooldowns[user_id] = time.time()
-                    on_cooldown = False
+            remaining = self._cooldowns.hit(user_id)
+        on_cooldown = remaining > 0
+        cooldown_ends = int(time.time() + remaining)
 
         if on_cooldown:
             cooldown_msg = await message.reply(
@@ -142,9 +105,6 @@ class ActionHandler:
             ], emoji="⏳")
             return True
 
-        # Cleanup old cooldowns (after releasing the main lock)
-        await self._cleanup_cooldowns()
-
         # Build targets list
         targets = []
         is_self_action = action_service.is_self_action(action)
@@ -202,8 +162,7 @@ class ActionHandler:
                     return_exceptions=True
                 )
                 # Remove cooldown since action didn't execute
-                async with self._cooldown_lock:
-                    self._cooldowns.pop(user_id, None)
+                self._cooldowns.reset(user_id)
                 return True
 
             # If no valid targets, treat as self-action (hug alone = self hug)
@@ -225,8 +184,7 @@ class ActionHandler:
                         return_exceptions=True
                     )
                     # Remove cooldown since action didn't execute
-                    async with self._cooldown_lock:
-                        self._cooldowns.pop(user_id, None)
+                    self._cooldowns.reset(user_id)
                     return True
 
                 targets = [None]  # None means self-target
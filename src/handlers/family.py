@@ -13,7 +13,6 @@ Server: discord.gg/syria
 import asyncio
 import io
 import time
-from collections import OrderedDict
 from typing import Optional
 
 import discord
@@ -26,6 +25,8 @@ from src.core.constants import (
     FAMILY_VIEW_TIMEOUT, FAMILY_CONFIRM_TIMEOUT,
 )
 from src.services.database import db
+from src.services.family_graph import family_graph
+from src.utils.cooldowns import Cooldown, cooldowns
 from src.utils.permissions import is_cooldown_exempt
 
 
@@ -49,7 +50,6 @@ from src.services.family_card import (
 FAMILY_COMMANDS = {"marry", "divorce", "adopt", "disown", "runaway", "family"}
 COOLDOWN_24H: int = 86400
 FAMILY_COOLDOWN: int = 10  # seconds between family commands per user
-MAX_COOLDOWN_CACHE_SIZE: int = 100
 
 # GIF endpoints for each family action
 FAMILY_GIFS = {
@@ -76,13 +76,12 @@ class FamilyHandler:
     """
 
     def __init__(self) -> None:
-        self._cooldowns: OrderedDict[int, float] = OrderedDict()
-        self._cooldown_lock = asyncio.Lock()
+        self._cooldowns = cooldowns.namespace("family", Cooldown(FAMILY_COOLDOWN))
         # Track active outgoing proposals/adopt requests per user
         self._active_proposals: dict[int, float] = {}
 
-    async def _cleanup_cooldowns(self) -> None:
-        """Remove expired cooldowns and stale proposals to prevent unbounded growth."""
+    def _cleanup_proposals(self) -> None:
+        """Remove stale proposals to prevent unbounded growth."""
         now = time.time()
 
         # Clean expired proposals (60s lifetime)
@@ -93,23 +92,6 @@ class FamilyHandler:
         for uid in expired_proposals:
             self._active_proposals.pop(uid, None)
 
-        if len(self._cooldowns) <= MAX_COOLDOWN_CACHE_SIZE:
-            return
-
-        async with self._cooldown_lock:
-            expired = [
-                uid for uid, ts in list(self._cooldowns.items())
-                if now - ts > FAMILY_COOLDOWN
-            ]
-            for uid in expired:
-                self._cooldowns.pop(uid, None)
-
-            while len(self._cooldowns) > MAX_COOLDOWN_CACHE_SIZE:
-                try:
-                    self._cooldowns.popitem(last=False)
-                except KeyError:
-                    break
-
     async def _check_cooldown(self, message: discord.Message) -> bool:
         """Check and apply cooldown. Returns True if on cooldown."""
         user_id = message.author.id
@@ -117,21 +99,10 @@ class FamilyHandler:
         if is_cooldown_exempt(message.author):
             return False
 
-        # Check cooldown under lock, but release before Discord API calls
-        on_cooldown = False
-        cooldown_ends = 0
-
-        async with self._cooldown_lock:
-            last_use = self._cooldowns.get(user_id, 0)
-            time_since = time.time() - last_use
-            if time_since < FAMILY_COOLDOWN:
-                remaining = FAMILY_COOLDOWN - time_since
-                cooldown_ends = int(time.time() + remaining)
-                on_cooldown = True
-            else:
-                self._cooldowns[user_id] = time.time()
-
-        if on_cooldown:
+        # Check and record in one step, before any Discord API calls
+        remaining = self._cooldowns.hit(user_id)
+        if remaining:
+            cooldown_ends = int(time.time() + remaining)
             cooldown_msg = await message.reply(
                 f"You're on cooldown. Try again <t:{cooldown_ends}:R>",
                 mention_author=False,
@@ -152,8 +123,7 @@ class FamilyHandler:
 
     async def _remove_cooldown(self, user_id: int) -> None:
         """Remove cooldown for a user (when command didn't actually execute)."""
-        async with self._cooldown_lock:
-            self._cooldowns.pop(user_id, None)
+        self._cooldowns.reset(user_id)
 
     async def _fetch_gif(self, key: str) -> Optional[str]:
         """Fetch a GIF for a family event. Returns URL or None."""
@@ -217,7 +187,7 @@ class FamilyHandler:
         if await self._check_cooldown(message):
             return True
 
-        await self._cleanup_cooldowns()
+        self._cleanup_proposals()
 
         try:
             if command == "marry":
@@ -289,7 +259,7 @@ class FamilyHandler:
             return
 
         # Validation: proposer already married
-        if db.get_spouse(user.id, guild_id):
+        if family_graph.get_spouse(user.id, guild_id):
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You're already married. Divorce first.")
             logger.tree("Marry Rejected", [
@@ -299,7 +269,7 @@ class FamilyHandler:
             return
 
         # Validation: target already married
-        if db.get_spouse(target.id, guild_id):
+        if family_graph.get_spouse(target.id, guild_id):
             await self._remove_cooldown(user.id)
             await self._send_error(message, f"❌ {target.mention} is already married.")
             logger.tree("Marry Rejected", [
@@ -373,7 +343,7 @@ class FamilyHandler:
         user = message.author
         guild_id = message.guild.id
 
-        spouse_id: Optional[int] = db.get_spouse(user.id, guild_id)
+        spouse_id: Optional[int] = family_graph.get_spouse(user.id, guild_id)
         if not spouse_id:
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You're not married.")
@@ -440,7 +410,7 @@ class FamilyHandler:
             return
 
         # Validation: must be married to adopt
-        spouse_id: Optional[int] = db.get_spouse(user.id, guild_id)
+        spouse_id: Optional[int] = family_graph.get_spouse(user.id, guild_id)
         if not spouse_id:
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You must be married before you can adopt.")
@@ -462,7 +432,7 @@ class FamilyHandler:
             return
 
         # Validation: already your child through marriage (spouse_id always set — marriage required)
-        spouse_children = db.get_children(spouse_id, guild_id)
+        spouse_children = family_graph.get_children(spouse_id, guild_id)
         if target.id in spouse_children:
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ This user is already your child through marriage.")
@@ -474,7 +444,7 @@ class FamilyHandler:
             return
 
         # Validation: can't adopt your parent
-        if db.get_parent(user.id, guild_id) == target.id:
+        if family_graph.get_parent(user.id, guild_id) == target.id:
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You can't adopt your own parent.")
             logger.tree("Adopt Rejected", [
@@ -485,7 +455,7 @@ class FamilyHandler:
             return
 
         # Validation: max household children
-        household_count: int = db.get_household_children_count(user.id, guild_id)
+        household_count: int = family_graph.get_household_children_count(user.id, guild_id)
         if household_count >= MAX_CHILDREN:
             await self._remove_cooldown(user.id)
             await self._send_error(message, f"❌ Your household already has {MAX_CHILDREN} children (max).")
@@ -497,7 +467,7 @@ class FamilyHandler:
             return
 
         # Validation: target already has a parent
-        if db.get_parent(target.id, guild_id):
+        if family_graph.get_parent(target.id, guild_id):
             await self._remove_cooldown(user.id)
             await self._send_error(message, f"❌ {target.mention} already has a parent.")
             logger.tree("Adopt Rejected", [
@@ -508,7 +478,7 @@ class FamilyHandler:
             return
 
         # Validation: circular — can't adopt your ancestor (check both user and spouse)
-        if db.is_ancestor(target.id, user.id, guild_id, ANCESTOR_MAX_DEPTH):
+        if family_graph.is_ancestor(target.id, user.id, guild_id, ANCESTOR_MAX_DEPTH):
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You can't adopt your ancestor.")
             logger.tree("Adopt Rejected", [
@@ -518,7 +488,7 @@ class FamilyHandler:
             ], emoji="⚠️")
             return
 
-        if db.is_ancestor(target.id, spouse_id, guild_id, ANCESTOR_MAX_DEPTH):
+        if family_graph.is_ancestor(target.id, spouse_id, guild_id, ANCESTOR_MAX_DEPTH):
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You can't adopt your ancestor.")
             logger.tree("Adopt Rejected", [
@@ -582,13 +552,13 @@ class FamilyHandler:
             return
 
         # Check user's own children first, then spouse's
-        children = db.get_children(user.id, guild_id)
+        children = family_graph.get_children(user.id, guild_id)
         actual_parent_id = user.id
 
         if target.id not in children:
-            spouse_id = db.get_spouse(user.id, guild_id)
+            spouse_id = family_graph.get_spouse(user.id, guild_id)
             if spouse_id:
-                spouse_children = db.get_children(spouse_id, guild_id)
+                spouse_children = family_graph.get_children(spouse_id, guild_id)
                 if target.id in spouse_children:
                     actual_parent_id = spouse_id
                 else:
@@ -611,7 +581,7 @@ class FamilyHandler:
                 return
 
         # Check if married — skip user confirm, go straight to spouse approval
-        spouse_id = db.get_spouse(user.id, guild_id)
+        spouse_id = family_graph.get_spouse(user.id, guild_id)
         if spouse_id:
             embed = discord.Embed(
                 description=f"⚠️ {user.mention} wants to disown {target.mention}. Waiting for {_member_name(message.guild, spouse_id)} to approve.",
@@ -659,7 +629,7 @@ class FamilyHandler:
         user = message.author
         guild_id = message.guild.id
 
-        parent_id: Optional[int] = db.get_parent(user.id, guild_id)
+        parent_id: Optional[int] = family_graph.get_parent(user.id, guild_id)
         if not parent_id:
             await self._remove_cooldown(user.id)
             await self._send_error(message, "❌ You don't have a parent.")
@@ -670,7 +640,7 @@ class FamilyHandler:
             return
 
         # Show confirmation with both parents
-        parent_spouse_id: Optional[int] = db.get_spouse(parent_id, guild_id)
+        parent_spouse_id: Optional[int] = family_graph.get_spouse(parent_id, guild_id)
         if parent_spouse_id:
             description = f"⚠️ {user.mention}, are you sure you want to run away from {_member_name(message.guild, parent_id)} & {_member_name(message.guild, parent_spouse_id)}?"
         else:
@@ -701,11 +671,11 @@ class FamilyHandler:
         # Optional target — mention, reply, or default to self
         target = self._get_target_or_self(message)
 
-        # Gather family data from DB
-        spouse_id: Optional[int] = db.get_spouse(target.id, guild_id)
-        parent_id: Optional[int] = db.get_parent(target.id, guild_id)
-        children: list[int] = db.get_household_children(target.id, guild_id)
-        siblings: list[int] = db.get_siblings(target.id, guild_id)
+        # Gather family data from the in-memory graph
+        spouse_id: Optional[int] = family_graph.get_spouse(target.id, guild_id)
+        parent_id: Optional[int] = family_graph.get_parent(target.id, guild_id)
+        children: list[int] = family_graph.get_household_children(target.id, guild_id)
+        siblings: list[int] = family_graph.get_siblings(target.id, guild_id)
 
         # Build FamilyData with resolved members
         data = FamilyData(
@@ -718,15 +688,15 @@ class FamilyHandler:
         # Resolve spouse
         if spouse_id:
             data.spouse = await resolve_family_member(guild, spouse_id)
-            data.married_at = db.get_marriage_timestamp(target.id, guild_id)
+            data.married_at = family_graph.get_marriage_timestamp(target.id, guild_id)
 
         # Resolve parents
         if parent_id:
-            data.adopted_at = db.get_adoption_timestamp(target.id, guild_id)
+            data.adopted_at = family_graph.get_adoption_timestamp(target.id, guild_id)
             parent_member = await resolve_family_member(guild, parent_id)
             data.parents.append(parent_member)
             # Check if parent has a spouse (second parent)
-            parent_spouse_id: Optional[int] = db.get_spouse(parent_id, guild_id)
+            parent_spouse_id: Optional[int] = family_graph.get_spouse(parent_id, guild_id)
             if parent_spouse_id:
                 parent_spouse_member = await resolve_family_member(guild, parent_spouse_id)
                 data.parents.append(parent_spouse_member)
@@ -20,7 +20,7 @@ from src.core.constants import (
     FAMILY_VIEW_TIMEOUT, FAMILY_CONFIRM_TIMEOUT,
 )
 from src.core.logger import logger
-from src.services.database import db
+from src.services.family_graph import family_graph
 from src.services.actions import action_service
 
 
@@ -85,7 +85,7 @@ class ProposalView(ui.View):
                 return
 
             # Re-validate: neither married in the meantime
-            if db.get_spouse(self.proposer.id, interaction.guild.id):
+            if family_graph.get_spouse(self.proposer.id, interaction.guild.id):
                 embed = discord.Embed(
                     description=f"❌ {self.proposer.mention} is already married to someone else.",
                     color=COLOR_ERROR,
@@ -94,7 +94,7 @@ class ProposalView(ui.View):
                 self.stop()
                 return
 
-            if db.get_spouse(self.target.id, interaction.guild.id):
+            if family_graph.get_spouse(self.target.id, interaction.guild.id):
                 embed = discord.Embed(
                     description=f"❌ {self.target.mention} is already married to someone else.",
                     color=COLOR_ERROR,
@@ -103,7 +103,7 @@ class ProposalView(ui.View):
                 self.stop()
                 return
 
-            db.marry(self.proposer.id, self.target.id, interaction.guild.id)
+            family_graph.marry(self.proposer.id, self.target.id, interaction.guild.id)
 
             embed = discord.Embed(
                 title="💍 Married!",
@@ -222,7 +222,7 @@ class AdoptApprovalView(ui.View):
         guild_id = interaction.guild.id
 
         # Re-validate before completing
-        if db.get_parent(self.target.id, guild_id):
+        if family_graph.get_parent(self.target.id, guild_id):
             embed = discord.Embed(
                 description=f"❌ {self.target.mention} already has a parent.",
                 color=COLOR_ERROR,
@@ -231,7 +231,7 @@ class AdoptApprovalView(ui.View):
             self.stop()
             return
 
-        if db.get_household_children_count(self.requester.id, guild_id) >= MAX_CHILDREN:
+        if family_graph.get_household_children_count(self.requester.id, guild_id) >= MAX_CHILDREN:
             embed = discord.Embed(
                 description=f"❌ {self.requester.mention}'s household already has {MAX_CHILDREN} children (max).",
                 color=COLOR_ERROR,
@@ -240,7 +240,7 @@ class AdoptApprovalView(ui.View):
             self.stop()
             return
 
-        if db.get_spouse(self.requester.id, guild_id) != self.spouse_id:
+        if family_graph.get_spouse(self.requester.id, guild_id) != self.spouse_id:
             embed = discord.Embed(
                 description="❌ You are no longer married — adoption cancelled.",
                 color=COLOR_ERROR,
@@ -249,7 +249,7 @@ class AdoptApprovalView(ui.View):
             self.stop()
             return
 
-        if db.is_ancestor(self.target.id, self.requester.id, guild_id, ANCESTOR_MAX_DEPTH):
+        if family_graph.is_ancestor(self.target.id, self.requester.id, guild_id, ANCESTOR_MAX_DEPTH):
             embed = discord.Embed(
                 description="❌ Can't adopt — circular family relationship detected.",
                 color=COLOR_ERROR,
@@ -258,7 +258,7 @@ class AdoptApprovalView(ui.View):
             self.stop()
             return
 
-        if db.is_ancestor(self.target.id, self.spouse_id, guild_id, ANCESTOR_MAX_DEPTH):
+        if family_graph.is_ancestor(self.target.id, self.spouse_id, guild_id, ANCESTOR_MAX_DEPTH):
             embed = discord.Embed(
                 description="❌ Can't adopt — circular family relationship detected.",
                 color=COLOR_ERROR,
@@ -267,7 +267,7 @@ class AdoptApprovalView(ui.View):
             self.stop()
             return
 
-        db.adopt(self.requester.id, self.target.id, guild_id)
+        family_graph.adopt(self.requester.id, self.target.id, guild_id)
 
         embed = discord.Embed(
             title="👨‍👧 Adopted!",
@@ -413,9 +413,9 @@ class DivorceView(ui.View):
             guild_id = interaction.guild.id
 
             # Gather all household children BEFORE divorce (need spouse link)
-            all_children = db.get_household_children(self.user.id, guild_id)
+            all_children = family_graph.get_household_children(self.user.id, guild_id)
 
-            ex_spouse_id = db.divorce(self.user.id, guild_id)
+            ex_spouse_id = family_graph.divorce(self.user.id, guild_id)
 
             if not ex_spouse_id:
                 embed = discord.Embed(
@@ -428,9 +428,9 @@ class DivorceView(ui.View):
 
             # Remove all children from both parents
             for child_id in all_children:
-                parent_of_child = db.get_parent(child_id, guild_id)
+                parent_of_child = family_graph.get_parent(child_id, guild_id)
                 if parent_of_child:
-                    db.disown(parent_of_child, child_id, guild_id)
+                    family_graph.disown(parent_of_child, child_id, guild_id)
 
             # Build description
             guild = interaction.guild
@@ -549,7 +549,7 @@ class DisownView(ui.View):
             guild_id = interaction.guild.id
 
             # Check if parent has a spouse — need spouse approval
-            spouse_id = db.get_spouse(self.parent.id, guild_id)
+            spouse_id = family_graph.get_spouse(self.parent.id, guild_id)
             if spouse_id:
                 embed = discord.Embed(
                     description=f"⚠️ {self.parent.mention} wants to disown {self.child.mention}. Waiting for {_member_name(interaction.guild, spouse_id)} to approve.",
@@ -573,7 +573,7 @@ class DisownView(ui.View):
                     ("Guild", str(guild_id)),
                 ], emoji="⏳")
             else:
-                deleted = db.disown(self.actual_parent_id, self.child.id, guild_id)
+                deleted = family_graph.disown(self.actual_parent_id, self.child.id, guild_id)
 
                 if not deleted:
                     embed = discord.Embed(
@@ -701,7 +701,7 @@ class SpouseApprovalView(ui.View):
                 return
 
             # Re-validate: still married?
-            if db.get_spouse(self.initiator.id, self.guild_id) != self.spouse_id:
+            if family_graph.get_spouse(self.initiator.id, self.guild_id) != self.spouse_id:
                 embed = discord.Embed(
                     description="❌ You are no longer married — action cancelled.",
                     color=COLOR_ERROR,
@@ -712,7 +712,7 @@ class SpouseApprovalView(ui.View):
 
             if self.action == "adopt":
                 # Re-validate before completing
-                if db.get_parent(self.target.id, self.guild_id):
+                if family_graph.get_parent(self.target.id, self.guild_id):
                     embed = discord.Embed(
                         description=f"❌ {self.target.mention} already has a parent.",
                         color=COLOR_ERROR,
@@ -721,7 +721,7 @@ class SpouseApprovalView(ui.View):
                     self.stop()
                     return
 
-                if db.get_household_children_count(self.initiator.id, self.guild_id) >= MAX_CHILDREN:
+                if family_graph.get_household_children_count(self.initiator.id, self.guild_id) >= MAX_CHILDREN:
                     embed = discord.Embed(
                         description=f"❌ Your household already has {MAX_CHILDREN} children (max).",
                         color=COLOR_ERROR,
@@ -730,7 +730,7 @@ class SpouseApprovalView(ui.View):
                     self.stop()
                     return
 
-                db.adopt(self.initiator.id, self.target.id, self.guild_id)
+                family_graph.adopt(self.initiator.id, self.target.id, self.guild_id)
 
                 embed = discord.Embed(
                     title="👨‍👧 Adopted!",
@@ -750,7 +750,7 @@ class SpouseApprovalView(ui.View):
                 ], emoji="👨‍👧")
 
             elif self.action == "disown":
-                deleted = db.disown(self.actual_parent_id, self.target.id, self.guild_id)
+                deleted = family_graph.disown(self.actual_parent_id, self.target.id, self.guild_id)
 
                 if not deleted:
                     embed = discord.Embed(
@@ -870,9 +870,9 @@ class RunawayView(ui.View):
             guild_id = interaction.guild.id
 
             # Fetch parent's spouse BEFORE runaway deletes the child link
-            parent_spouse_id = db.get_spouse(self.parent_id, guild_id)
+            parent_spouse_id = family_graph.get_spouse(self.parent_id, guild_id)
 
-            parent_id = db.runaway(self.child.id, guild_id)
+            parent_id = family_graph.runaway(self.child.id, guild_id)
 
             if not parent_id:
                 embed = discord.Embed(
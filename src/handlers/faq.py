@@ -9,33 +9,37 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
-import re
-import time
 import discord
 from typing import Optional
 
 from src.core.config import config
 from src.core.logger import logger
 from src.core.colors import COLOR_SYRIA_GREEN
+from src.utils.cooldowns import Cooldown, cooldowns
 from src.utils.permissions import is_cooldown_exempt
-from src.services.faq import FAQ_DATA, faq_analytics, FAQView
+from src.services.faq import FAQ_DATA, faq_analytics, FAQView, FAQMatcher
 
 
 # =============================================================================
 # Cooldowns
 # =============================================================================
 
-# Per-user cooldown: {user_id: last_faq_time}
-_user_cooldowns: dict[int, float] = {}
 USER_COOLDOWN = 300  # 5 minutes per user
-
-# Per-channel cooldown for same topic: {(channel_id, topic): last_time}
-_channel_topic_cooldowns: dict[tuple[int, str], float] = {}
 CHANNEL_TOPIC_COOLDOWN = 120  # 2 minutes for same topic in same channel
 
 # Max tracked entries (memory management)
 MAX_COOLDOWN_ENTRIES = 500
 
+# Per-user cooldown: user_id
+_user_cooldowns = cooldowns.namespace(
+    "faq.user", Cooldown(USER_COOLDOWN), max_keys=MAX_COOLDOWN_ENTRIES,
+)
+
+# Per-channel cooldown for same topic: (channel_id, topic)
+_channel_topic_cooldowns = cooldowns.namespace(
+    "faq.channel_topic", Cooldown(CHANNEL_TOPIC_COOLDOWN), max_keys=MAX_COOLDOWN_ENTRIES,
+)
+
 
 # =============================================================================
 # Fuzzy Matching
@@ -61,66 +65,6 @@ FUZZY_KEYWORDS = {
 }
 
 
-def _levenshtein(s1: str, s2: str) -> int:
-    """Calculate Levenshtein edit distance between two strings."""
-    if len(s1) < len(s2):
-        return _levenshtein(s2, s1)
-
-    if len(s2) == 0:
-        return len(s1)
-
-    prev_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        curr_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = prev_row[j + 1] + 1
-            deletions = curr_row[j] + 1
-            substitutions = prev_row[j] + (c1 != c2)
-            curr_row.append(min(insertions, deletions, substitutions))
-        prev_row = curr_row
-
-    return prev_row[-1]
-
-
-def _fuzzy_correct(text: str) -> str:
-    """
-    Correct typos in text using fuzzy matching.
-
-    Replaces misspelled keywords with correct versions.
-    """
-    words = text.lower().split()
-    corrected = []
-
-    for word in words:
-        # Skip short words (less prone to meaningful typos)
-        if len(word) < 4:
-            corrected.append(word)
-            continue
-
-        best_match = word
-        best_distance = float('inf')
-
-        # Check against all fuzzy keywords
-        for correct, variants in FUZZY_KEYWORDS.items():
-            for variant in variants:
-                # Skip if lengths differ too much
-                if abs(len(word) - len(variant)) > 2:
-                    continue
-
-                distance = _levenshtein(word, variant)
-
-                # Threshold: 1 edit for short words, 2 for longer
-                threshold = 1 if len(variant) <= 5 else 2
-
-                if distance <= threshold and distance < best_distance:
-                    best_distance = distance
-                    best_match = correct
-
-        corrected.append(best_match)
-
-    return " ".join(corrected)
-
-
 # =============================================================================
 # FAQ Patterns (for auto-detection)
 # =============================================================================
@@ -193,7 +137,9 @@ class FAQAutoResponder:
 
     DESIGN:
         Watches messages for common question patterns about server features.
-        Uses regex matching with fuzzy typo correction (Levenshtein distance).
+        Matching goes through an FAQMatcher compiled once at startup: one
+        regex call covers every topic, and typo correction uses a
+        symmetric-delete keyword index instead of scanning every variant.
         Includes per-user and per-channel+topic cooldowns to prevent spam.
         Tracks analytics for popular FAQ topics.
     """
@@ -202,15 +148,9 @@ class FAQAutoResponder:
         """
         Initialize the FAQ auto-responder.
 
-        Compiles regex patterns for efficient matching.
+        Compiles the topic patterns and the fuzzy keyword index.
         """
-        # Compile regex patterns for efficiency
-        self._compiled_patterns: dict[str, list[re.Pattern]] = {}
-        for topic, patterns in FAQ_PATTERNS.items():
-            self._compiled_patterns[topic] = [
-                re.compile(pattern, re.IGNORECASE)
-                for pattern in patterns
-            ]
+        self._matcher = FAQMatcher(FAQ_PATTERNS, FUZZY_KEYWORDS)
 
     def _check_cooldowns(self, user_id: int, channel_id: int, topic: str) -> bool:
         """Check if we should respond (cooldowns not active)."""
@@ -218,37 +158,20 @@ class FAQAutoResponder:
         if is_cooldown_exempt(user_id):
             return True
 
-        now = time.time()
-
         # Check user cooldown
-        if user_id in _user_cooldowns:
-            if now - _user_cooldowns[user_id] < USER_COOLDOWN:
-                return False
+        if _user_cooldowns.remaining(user_id):
+            return False
 
         # Check channel+topic cooldown
-        key = (channel_id, topic)
-        if key in _channel_topic_cooldowns:
-            if now - _channel_topic_cooldowns[key] < CHANNEL_TOPIC_COOLDOWN:
-                return False
+        if _channel_topic_cooldowns.remaining((channel_id, topic)):
+            return False
 
         return True
 
     def _update_cooldowns(self, user_id: int, channel_id: int, topic: str) -> None:
         """Update cooldowns after sending FAQ."""
-        now = time.time()
-        _user_cooldowns[user_id] = now
-        _channel_topic_cooldowns[(channel_id, topic)] = now
-
-        # Memory cleanup - evict old entries
-        if len(_user_cooldowns) > MAX_COOLDOWN_ENTRIES:
-            sorted_entries = sorted(_user_cooldowns.items(), key=lambda x: x[1])
-            for uid, _ in sorted_entries[:MAX_COOLDOWN_ENTRIES // 5]:
-                del _user_cooldowns[uid]
-
-        if len(_channel_topic_cooldowns) > MAX_COOLDOWN_ENTRIES:
-            sorted_entries = sorted(_channel_topic_cooldowns.items(), key=lambda x: x[1])
-            for key, _ in sorted_entries[:MAX_COOLDOWN_ENTRIES // 5]:
-                del _channel_topic_cooldowns[key]
+        _user_cooldowns.record(user_id)
+        _channel_topic_cooldowns.record((channel_id, topic))
 
     def _detect_question(self, content: str) -> bool:
         """Check if message looks like a genuine question about server features."""
@@ -268,23 +191,9 @@ class FAQAutoResponder:
 
         return starts_with_question or (has_question_mark and len(content) < 100)
 
-    def _match_topic(self, content: str) -> Optional[str]:
-        """Match content to a FAQ topic with fuzzy typo correction."""
-        # First try exact match
-        for topic, patterns in self._compiled_patterns.items():
-            for pattern in patterns:
-                if pattern.search(content):
-                    return topic
-
-        # If no match, try with fuzzy corrected content
-        corrected = _fuzzy_correct(content)
-        if corrected != content.lower():
-            for topic, patterns in self._compiled_patterns.items():
-                for pattern in patterns:
-                    if pattern.search(corrected):
-                        return topic
-
-        return None
+    def _match_topic(self, content: str) -> tuple[Optional[str], bool]:
+        """Match content to a FAQ topic with fuzzy typo correction. Returns (topic, was_fuzzy)."""
+        return self._matcher.match(content)
 
     async def handle(self, message: discord.Message) -> bool:
         """
@@ -315,16 +224,10 @@ class FAQAutoResponder:
             return False
 
         # Try to match a topic (with fuzzy correction for typos)
-        topic = self._match_topic(content)
+        topic, was_fuzzy = self._match_topic(content)
         if not topic:
             return False
 
-        # Check if fuzzy matching was used
-        corrected = _fuzzy_correct(content)
-        was_fuzzy = corrected != content.lower() and not any(
-            p.search(content) for patterns in self._compiled_patterns.values() for p in patterns
-        )
-
         # Check if topic exists in FAQ_DATA
         if topic not in FAQ_DATA:
             return False
@@ -13,7 +13,6 @@ import asyncio
 import difflib
 import io
 import time
-from collections import OrderedDict
 from typing import Optional
 
 import discord
@@ -23,13 +22,10 @@ from src.core.config import config
 from src.core.colors import COLOR_ERROR, COLOR_WARNING, COLOR_SYRIA_GREEN
 from src.core.constants import DELETE_DELAY_SHORT
 from src.services.fun import fun_service, generate_ship_card, generate_meter_card
+from src.utils.cooldowns import Cooldown, cooldowns
 from src.utils.permissions import is_cooldown_exempt
 
 
-# Max cooldown cache size before cleanup
-MAX_COOLDOWN_CACHE_SIZE = 100
-
-
 class FunHandler:
     """
     Handler for fun commands with visual card generation.
@@ -56,35 +52,11 @@ class FunHandler:
 
         Sets up cooldown tracking and sticky message state.
         """
-        self._cooldowns: OrderedDict[int, float] = OrderedDict()
-        self._cooldown_lock = asyncio.Lock()
+        self._cooldowns = cooldowns.namespace("fun", Cooldown(self.FUN_COOLDOWN))
         self._channel_msg_count: int = 0
         self._sticky_message_id: Optional[int] = None
         self._sticky_lock = asyncio.Lock()  # Lock for sticky message counter
 
-    async def _cleanup_cooldowns(self) -> None:
-        """Remove expired cooldowns to prevent unbounded growth (thread-safe)."""
-        async with self._cooldown_lock:
-            # Check inside lock to avoid race condition
-            if len(self._cooldowns) <= MAX_COOLDOWN_CACHE_SIZE:
-                return
-
-            now = time.time()
-            # Build list of expired users safely
-            expired_users = [
-                uid for uid, ts in list(self._cooldowns.items())
-                if now - ts > self.FUN_COOLDOWN
-            ]
-            for uid in expired_users:
-                self._cooldowns.pop(uid, None)  # Use pop to avoid KeyError
-
-            # Evict oldest if still over limit
-            while len(self._cooldowns) > MAX_COOLDOWN_CACHE_SIZE:
-                try:
-                    self._cooldowns.popitem(last=False)
-                except KeyError:
-                    break  # Dict is empty
-
     async def _send_sticky(self, channel: discord.TextChannel) -> None:
         """Send sticky message for fun commands channel."""
         # Delete previous sticky if exists
@@ -183,11 +155,9 @@ class FunHandler:
 
         # Check cooldown (exempt users bypass)
         if not exempt:
-            last_use = self._cooldowns.get(user_id, 0)
-            time_since = time.time() - last_use
-            if time_since < self.FUN_COOLDOWN:
+            remaining = self._cooldowns.remaining(user_id)
+            if remaining:
                 # Calculate when cooldown ends as Discord timestamp
-                remaining = self.FUN_COOLDOWN - time_since
                 cooldown_ends = int(time.time() + remaining)
                 cooldown_msg = await message.reply(
                     f"You're on cooldown. Try again <t:{cooldown_ends}:R>",
@@ -228,8 +198,7 @@ class FunHandler:
 
             # Only apply cooldown on successful image generation (not validation errors)
             if result and not exempt:
-                self._cooldowns[user_id] = time.time()
-                await self._cleanup_cooldowns()
+                self._cooldowns.record(user_id)
 
             # Track message count and send sticky every N messages (atomic)
             if result:
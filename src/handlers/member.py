@@ -9,10 +9,8 @@ Server: discord.gg/syria
 """
 
 
-import asyncio
 import random
 import re
-import time
 from pathlib import Path
 
 import discord
@@ -22,9 +20,12 @@ from src.core.config import config
 from src.core.colors import COLOR_BOOST, COLOR_GOLD, COLOR_SYRIA_GREEN
 from src.core.logger import logger
 from src.services.database import db
+from src.services.family_graph import family_graph
 from src.services.actions import action_service
+from src.services.invites import InviteAttributionService
 from src.api.services.websocket import get_ws_manager
 from src.api.services.event_logger import event_logger
+from src.utils.cooldowns import Cooldown, cooldowns
 
 WELCOME_BANNER = Path(__file__).resolve().parent.parent.parent / "assets" / "welcome" / "welcome.png"
 
@@ -52,9 +53,9 @@ WELCOME_GREETINGS = [
 _wave_tracker: dict[int, set[int]] = {}
 _WAVE_TRACKER_MAX = 200  # Max tracked messages before cleanup
 
-# Per-user cooldown for wave button (seconds)
+# Per-user cooldown for wave button (seconds): user_id
 _WAVE_COOLDOWN = 5
-_wave_cooldowns: dict[int, float] = {}
+_wave_cooldowns = cooldowns.namespace("member.wave", Cooldown(_WAVE_COOLDOWN))
 
 
 def _cleanup_wave_tracker() -> None:
@@ -63,12 +64,6 @@ def _cleanup_wave_tracker() -> None:
         oldest = next(iter(_wave_tracker))
         _wave_tracker.pop(oldest, None)
 
-    # Clean expired cooldowns (>5s old) to prevent unbounded growth
-    now = time.monotonic()
-    expired = [uid for uid, ts in _wave_cooldowns.items() if now - ts > _WAVE_COOLDOWN]
-    for uid in expired:
-        _wave_cooldowns.pop(uid, None)
-
 
 class WaveButton(discord.ui.DynamicItem[discord.ui.Button], template=r"wave:(?P<member_id>\d+)"):
     """Persistent wave button that survives bot restarts. One wave per user per welcome."""
@@ -104,18 +99,15 @@ class WaveButton(discord.ui.DynamicItem[discord.ui.Button], template=r"wave:(?P<
             )
             return
 
-        # Per-user cooldown
-        now = time.monotonic()
-        last_used = _wave_cooldowns.get(user_id, 0)
-        if now - last_used < _WAVE_COOLDOWN:
+        # Per-user cooldown (check-and-set)
+        if _wave_cooldowns.hit(user_id):
             await interaction.response.send_message(
                 "Slow down! Try again in a few seconds.", ephemeral=True,
             )
             return
 
-        # Mark as waved and set cooldown before deferring
+        # Mark as waved before deferring
         _wave_tracker.setdefault(msg_id, set()).add(user_id)
-        _wave_cooldowns[user_id] = now
         _cleanup_wave_tracker()
 
         await interaction.response.defer()
@@ -149,7 +141,7 @@ class MemberHandler(commands.Cog):
     Handler for member join/leave/update events.
 
     DESIGN:
-        Tracks member joins with invite attribution.
+        Tracks member joins with burst-batched invite attribution.
         Handles boost events with special announcements.
         Manages auto-role assignment on join.
     """
@@ -158,22 +150,18 @@ class MemberHandler(commands.Cog):
         """
         Initialize the members handler.
 
-        Sets up invite tracking cache for join attribution.
+        Sets up burst-aware invite attribution for join tracking.
 
         Args:
             bot: Main bot instance for Discord API access.
         """
         self.bot = bot
-        # Cache invites for tracking: {invite_code: uses}
-        self._invite_cache: dict[str, int] = {}
-        self._invite_lock = asyncio.Lock()
-        # Flag to prevent duplicate caching on reconnects
-        self._invites_cached: bool = False
+        self.invites = InviteAttributionService(bot)
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """Cache invites on bot ready (only once, not on reconnects)."""
-        if not self._invites_cached:
+        if not self.invites.cached:
             await self._cache_invites()
 
     async def _cache_invites(self) -> None:
@@ -185,60 +173,7 @@ class MemberHandler(commands.Cog):
         if not guild:
             return
 
-        try:
-            # Add timeout to prevent hanging
-            invites = await asyncio.wait_for(guild.invites(), timeout=30.0)
-            self._invite_cache = {inv.code: inv.uses for inv in invites}
-            self._invites_cached = True
-            logger.tree("Invite Cache Loaded", [
-                ("Guild", guild.name),
-                ("Invites Cached", str(len(self._invite_cache))),
-            ], emoji="🔗")
-        except asyncio.TimeoutError:
-            logger.tree("Invite Cache Timeout", [
-                ("Guild", guild.name),
-                ("Timeout", "30s"),
-                ("Impact", "Join tracking unavailable until next cache"),
-            ], emoji="⏳")
-        except discord.HTTPException as e:
-            logger.error_tree("Invite Cache Failed", e, [
-                ("Guild", guild.name),
-            ])
-
-    async def _find_used_invite(self, guild: discord.Guild) -> discord.Invite | None:
-        """
-        Find which invite was used by comparing with cache.
-
-        Args:
-            guild: The guild to check invites for
-
-        Returns:
-            The invite that was used, or None if not found
-        """
-        try:
-            # Add timeout to prevent hanging
-            new_invites = await asyncio.wait_for(guild.invites(), timeout=10.0)
-            async with self._invite_lock:
-                for invite in new_invites:
-                    cached_uses = self._invite_cache.get(invite.code, 0)
-                    if invite.uses > cached_uses:
-                        # This invite was used, update cache
-                        self._invite_cache[invite.code] = invite.uses
-                        return invite
-
-                # Update cache with any new invites
-                self._invite_cache = {inv.code: inv.uses for inv in new_invites}
-        except asyncio.TimeoutError as e:
-            logger.error_tree("Invite Fetch Timeout", e, [
-                ("Guild", guild.name),
-                ("Timeout", "10s"),
-            ])
-        except discord.HTTPException as e:
-            logger.error_tree("Invite Fetch Failed", e, [
-                ("Guild", guild.name),
-            ])
-
-        return None
+        await self.invites.cache_invites(guild)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
@@ -261,56 +196,18 @@ class MemberHandler(commands.Cog):
             event_logger.log_bot_add(member, added_by)
             return
 
-        # Track who invited them
-        inviter_id = None
-        invite = await self._find_used_invite(member.guild)
-        if invite and invite.inviter:
-            inviter_id = invite.inviter.id
-            try:
-                db.set_invited_by(member.id, member.guild.id, inviter_id)
-                logger.tree("Invite Tracked", [
-                    ("New Member", f"{member.name} ({member.id})"),
-                    ("Invited By", f"{invite.inviter.name} ({inviter_id})"),
-                    ("Invite Code", invite.code),
-                ], emoji="🔗")
-            except Exception as e:
-                logger.error_tree("Invite Track Failed", e, [
-                    ("New Member", f"{member.name} ({member.id})"),
-                    ("Inviter ID", str(inviter_id)),
-                ])
-
-        # Track new member for daily stats
-        try:
-            from datetime import datetime
-            from src.core.constants import TIMEZONE_EST
-            today = datetime.now(TIMEZONE_EST).strftime("%Y-%m-%d")
-            db.increment_new_members(member.guild.id, today)
-        except Exception as e:
-            logger.error_tree("New Member Track Failed", e, [
-                ("Member", f"{member.name} ({member.id})"),
-            ])
-
-        # Record member join event for growth tracking
-        try:
-            db.record_member_event(member.guild.id, member.id, "join")
-        except Exception as e:
-            logger.error_tree("Member Event Track Failed", e, [
-                ("Member", f"{member.name} ({member.id})"),
-                ("Event", "join"),
-            ])
+        # Queue invite attribution (batched per join burst, also records join stats).
+        # Only the attribution waits for the burst window; onboarding runs now.
+        attribution = self.invites.queue(member)
 
         # Give auto-role
+        role_added = False
         if config.AUTO_ROLE_ID:
             role = member.guild.get_role(config.AUTO_ROLE_ID)
             if role:
                 try:
                     await member.add_roles(role, reason="Auto-role on join")
-                    # Log to events system (for dashboard Events tab)
-                    event_logger.log_join(
-                        member=member,
-                        invite_code=invite.code if invite else None,
-                        inviter=invite.inviter if invite else None,
-                    )
+                    role_added = True
                 except discord.HTTPException as e:
                     logger.error_tree("Auto-Role Failed", e, [
                         ("User", f"{member.name} ({member.id})"),
@@ -355,6 +252,15 @@ class MemberHandler(commands.Cog):
         except Exception as e:
             logger.error_tree("WS Member Broadcast Error", e)
 
+        # Log to events system (for dashboard Events tab) once the burst is attributed
+        invite = await attribution
+        if role_added:
+            event_logger.log_join(
+                member=member,
+                invite_code=invite.code if invite else None,
+                inviter=invite.inviter if invite else None,
+            )
+
     async def _send_welcome_message(self, member: discord.Member) -> None:
         """Send a welcome message in general chat with a wave button."""
         if not config.GENERAL_CHANNEL_ID:
@@ -409,7 +315,7 @@ class MemberHandler(commands.Cog):
 
         # Clean up family data (divorce, orphan children, remove from parent)
         try:
-            result = db.cleanup_family_on_leave(member.id, member.guild.id)
+            result = family_graph.cleanup_on_leave(member.id, member.guild.id)
             total = result["divorces"] + result["orphaned_children"] + result["removed_from_parent"]
             if total > 0:
                 logger.tree("Family Cleanup on Leave", [
@@ -744,7 +650,7 @@ class MemberHandler(commands.Cog):
         event_logger.log_invite_create(invite)
 
         # Update invite cache
-        self._invite_cache[invite.code] = invite.uses or 0
+        self.invites.on_invite_create(invite)
 
     @commands.Cog.listener()
     async def on_invite_delete(self, invite: discord.Invite) -> None:
@@ -755,7 +661,7 @@ class MemberHandler(commands.Cog):
         event_logger.log_invite_delete(invite)
 
         # Remove from cache
-        self._invite_cache.pop(invite.code, None)
+        self.invites.on_invite_delete(invite)
 
 
 async def setup(bot: commands.Bot) -> None:
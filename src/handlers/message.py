@@ -11,6 +11,7 @@ Server: discord.gg/syria
 
 import asyncio
 import re
+from typing import Callable
 
 import discord
 from discord.ext import commands
@@ -18,21 +19,36 @@ from discord.ext import commands
 from src.core.logger import logger
 from src.core.config import config
 from src.utils.divider import send_divider, is_divider_message, is_divider_channel
-from src.core.constants import DISBOARD_BOT_ID
+from src.core.constants import (
+    DISBOARD_BOT_ID,
+    MESSAGE_CLAIM_STAGE_TIMEOUT,
+    MESSAGE_FETCH_STAGE_TIMEOUT,
+    MESSAGE_STAGE_TIMEOUT,
+)
 from src.services.bump import bump_service
 from src.services.database import db
+from src.services.reply_targets import reply_targets
 from src.api.services.websocket import get_ws_manager
 from src.handlers.fun import fun
 from src.handlers.action import action
 from src.handlers.family import family
 from src.handlers.reply import ReplyHandler
 from src.handlers.faq import faq
+from src.handlers.pipeline import MessagePipeline, Stage
 from src.api.services.event_logger import event_logger
 
 # URL regex pattern for link tracking
 URL_PATTERN = re.compile(r'https?://\S+')
 
 
+def _in_guild(message: discord.Message) -> bool:
+    return message.guild is not None
+
+
+def _in_main_guild(message: discord.Message) -> bool:
+    return message.guild is not None and message.guild.id == config.GUILD_ID
+
+
 class MessageHandler(commands.Cog):
     """
     Central message handler that dispatches to specialized handlers.
@@ -43,6 +59,9 @@ class MessageHandler(commands.Cog):
         - ActionHandler: Action GIF commands (slap, hug, etc.)
         - ReplyHandler: Reply-based commands (convert, quote, translate)
         - FAQHandler: Automatic FAQ responses
+        on_message is a MessagePipeline: confession/gallery may claim the
+        message first, then counters, XP, AFK etc. run concurrently under
+        per-stage budgets while the command handlers run in order.
     """
 
     def __init__(self, bot: commands.Bot) -> None:
@@ -54,10 +73,56 @@ class MessageHandler(commands.Cog):
         """
         self.bot = bot
         self.reply = ReplyHandler(bot)
+        self.pipeline = MessagePipeline(
+            claim=[
+                Stage("confession", self._confession_stage, "Confession Handler Error",
+                      MESSAGE_CLAIM_STAGE_TIMEOUT, self._has_service("confession_service")),
+                Stage("gallery", self._gallery_stage, "Gallery Handler Error",
+                      MESSAGE_CLAIM_STAGE_TIMEOUT, self._has_service("gallery_service")),
+            ],
+            side_effects=[
+                Stage("divider", self._divider_stage, "Divider Send Error",
+                      MESSAGE_FETCH_STAGE_TIMEOUT, lambda m: is_divider_channel(m.channel.id)),
+                Stage("tempvoice", self._tempvoice_stage, "TempVoice Handler Error",
+                      MESSAGE_FETCH_STAGE_TIMEOUT, self._has_service("tempvoice")),
+                Stage("roulette", self._roulette_stage, "Roulette Activity Track Error",
+                      MESSAGE_STAGE_TIMEOUT, self._has_service("roulette_service")),
+                Stage("message_count", self._message_count_stage, "Message Count Error",
+                      MESSAGE_STAGE_TIMEOUT, _in_main_guild),
+                Stage("xp", self._xp_stage, "XP Handler Error",
+                      MESSAGE_STAGE_TIMEOUT, self._has_service("xp_service")),
+                Stage("images", self._images_stage, "Image Track Failed",
+                      MESSAGE_STAGE_TIMEOUT, lambda m: _in_main_guild(m) and bool(m.attachments)),
+                Stage("social", self._social_stage, "Social Track Failed",
+                      MESSAGE_FETCH_STAGE_TIMEOUT,
+                      lambda m: _in_main_guild(m) and bool(m.mentions or (m.reference and m.reference.message_id))),
+                Stage("links", self._links_stage, "Link Track Failed",
+                      MESSAGE_STAGE_TIMEOUT, lambda m: _in_main_guild(m) and bool(URL_PATTERN.search(m.content))),
+                Stage("afk", self._afk_stage, "AFK Handler Error",
+                      MESSAGE_STAGE_TIMEOUT, lambda m: m.guild is not None and self._has_service("afk_service")(m)),
+            ],
+            # Command-like handlers: in order, first one that handles the message wins.
+            # No budget: they reply, render and download on the user's behalf.
+            commands=[
+                Stage("faq", faq.handle, "FAQ Handler Error", applies=_in_guild),
+                Stage("action", action.handle, "Action Handler Error", applies=_in_guild),
+                Stage("family", family.handle, "Family Handler Error", applies=_in_guild),
+                Stage("fun", fun.handle, "Fun Handler Error", applies=_in_guild),
+                Stage("reply", self.reply.handle, "Reply Handler Error"),
+            ],
+        )
+
+    def _has_service(self, attr: str) -> Callable[[discord.Message], bool]:
+        """Stage predicate: the bot has the optional service attribute set."""
+        return lambda message: bool(getattr(self.bot, attr, None))
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Handle incoming messages - dispatch to specialized handlers."""
+        # Index every guild message's author so replies to it resolve locally
+        if message.guild:
+            reply_targets.record(message)
+
         # Check for Disboard bump confirmation (before skipping bots)
         if message.author.id == DISBOARD_BOT_ID:
             if message.embeds:
@@ -73,256 +138,135 @@ class MessageHandler(commands.Cog):
         if message.author.bot:
             return
 
-        # Confession channel (auto-delete messages to keep it clean)
-        if hasattr(self.bot, 'confession_service') and self.bot.confession_service:
-            try:
-                if await self.bot.confession_service.handle_message(message):
-                    return  # Message was deleted
-            except Exception as e:
-                logger.error_tree("Confession Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
+        await self.pipeline.run(message)
 
+    # =========================================================================
+    # Claim Stages
+    # =========================================================================
 
-        # Gallery service (media-only channel)
-        if hasattr(self.bot, 'gallery_service') and self.bot.gallery_service:
-            try:
-                if await self.bot.gallery_service.on_message(message):
-                    return  # Gallery handled it
-            except Exception as e:
-                logger.error_tree("Gallery Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                    ("Channel", str(message.channel.id)),
-                ])
+    async def _confession_stage(self, message: discord.Message) -> bool:
+        """Confession channel (auto-delete messages to keep it clean)."""
+        return await self.bot.confession_service.handle_message(message)
 
-        # Divider channels - send divider after each post
-        if is_divider_channel(message.channel.id):
-            await send_divider(message.channel)
+    async def _gallery_stage(self, message: discord.Message) -> bool:
+        """Gallery service (media-only channel)."""
+        return await self.bot.gallery_service.on_message(message)
 
-        # TempVoice sticky panel
-        if hasattr(self.bot, 'tempvoice') and self.bot.tempvoice:
-            try:
-                await self.bot.tempvoice.on_message(message)
-            except Exception as e:
-                logger.error_tree("TempVoice Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
+    # =========================================================================
+    # Side-Effect Stages
+    # =========================================================================
 
-        # Roulette activity tracking (for spawn timing)
-        if hasattr(self.bot, 'roulette_service') and self.bot.roulette_service:
-            try:
-                self.bot.roulette_service.on_message(message)
-            except Exception as e:
-                logger.error_tree("Roulette Activity Track Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
+    async def _divider_stage(self, message: discord.Message) -> None:
+        """Divider channels - send divider after each post."""
+        await send_divider(message.channel)
+
+    async def _tempvoice_stage(self, message: discord.Message) -> None:
+        """TempVoice sticky panel."""
+        await self.bot.tempvoice.on_message(message)
+
+    async def _roulette_stage(self, message: discord.Message) -> None:
+        """Roulette activity tracking (for spawn timing)."""
+        self.bot.roulette_service.on_message(message)
+
+    async def _message_count_stage(self, message: discord.Message) -> None:
+        """Track message count (every message, regardless of XP cooldown)."""
+        new_total = await asyncio.to_thread(
+            db.increment_message_count,
+            message.author.id,
+            message.guild.id
+        )
+
+        # Broadcast to WebSocket clients immediately
+        ws_manager = get_ws_manager()
+        if ws_manager.connection_count > 0:
+            await ws_manager.broadcast_message_count(new_total)
+
+    async def _xp_stage(self, message: discord.Message) -> None:
+        """XP gain from messages (with cooldown)."""
+        await self.bot.xp_service.on_message(message)
+
+    async def _images_stage(self, message: discord.Message) -> None:
+        """Track images shared."""
+        await asyncio.to_thread(db.increment_images_shared, message.author.id, message.guild.id)
+
+    async def _social_stage(self, message: discord.Message) -> None:
+        """
+        Social interaction tracking (mentions + replies).
+
+        Handled together because Discord includes the replied-to user in
+        message.mentions, so they are excluded to avoid double-counting.
+        The replied-to author is resolved once and reused.
+        """
+        replied_to_id: int | None = None
+
+        # Determine replied-to author (if this is a reply): usually answered
+        # locally, a rate-budgeted REST fetch otherwise
+        target = await reply_targets.resolve(message)
+        if target and not target.bot and target.author_id != message.author.id:
+            replied_to_id = target.author_id
 
-        # Track message count (every message, regardless of XP cooldown)
-        if message.guild and message.guild.id == config.GUILD_ID:
+        # Track replies (if we found a valid replied-to author)
+        if replied_to_id:
             try:
-                # Increment message count and get new total
-                new_total = await asyncio.to_thread(
-                    db.increment_message_count,
+                # Track reply count in user_xp
+                await asyncio.to_thread(
+                    db.increment_replies_sent,
                     message.author.id,
                     message.guild.id
                 )
-
-                # Broadcast to WebSocket clients immediately
-                ws_manager = get_ws_manager()
-                if ws_manager.connection_count > 0:
-                    await ws_manager.broadcast_message_count(new_total)
-            except Exception as e:
-                logger.error_tree("Message Count Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
-
-        # XP gain from messages (with cooldown)
-        if hasattr(self.bot, 'xp_service') and self.bot.xp_service:
-            try:
-                await self.bot.xp_service.on_message(message)
+                # Track interaction (who they replied to)
+                await asyncio.to_thread(
+                    db.increment_interaction_reply,
+                    message.author.id,
+                    replied_to_id,
+                    message.guild.id
+                )
             except Exception as e:
-                logger.error_tree("XP Handler Error", e, [
+                logger.error_tree("Reply Track Failed", e, [
                     ("User", f"{message.author.name} ({message.author.display_name})"),
                     ("ID", str(message.author.id)),
+                    ("Replied To", str(replied_to_id)),
                 ])
 
-        # Track images shared (non-blocking)
-        if message.guild and message.guild.id == config.GUILD_ID and message.attachments:
+        # Track mentions (excluding replied-to user to avoid double-counting)
+        if message.mentions:
             try:
-                await asyncio.to_thread(db.increment_images_shared, message.author.id, message.guild.id)
-            except Exception as e:
-                logger.error_tree("Image Track Failed", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
-
-        # =================================================================
-        # Social Interaction Tracking (mentions + replies)
-        # =================================================================
-        # We handle these together because Discord includes the replied-to
-        # user in message.mentions, so we need to exclude them to avoid
-        # double-counting. Fetch replied-to author ONCE and reuse.
-        # =================================================================
-
-        if message.guild and message.guild.id == config.GUILD_ID:
-            replied_to_author: discord.Member | None = None
-
-            # Determine replied-to author (if this is a reply)
-            if message.reference and message.reference.message_id:
-                try:
-                    # Try cached first (fast path)
-                    ref_msg = message.reference.resolved
-                    if not ref_msg:
-                        # Not cached, fetch from API (slow path)
-                        ref_msg = await message.channel.fetch_message(message.reference.message_id)
-
-                    if ref_msg and ref_msg.author and not ref_msg.author.bot:
-                        if ref_msg.author.id != message.author.id:
-                            replied_to_author = ref_msg.author
-                except discord.NotFound:
-                    pass  # Original message was deleted
-                except discord.HTTPException as e:
-                    logger.error_tree("Reply Fetch Failed", e, [
-                        ("User", f"{message.author.name} ({message.author.display_name})"),
-                        ("ID", str(message.author.id)),
-                        ("Reference", str(message.reference.message_id)),
-                    ])
-
-            # Track replies (if we found a valid replied-to author)
-            if replied_to_author:
-                try:
-                    # Track reply count in user_xp
-                    await asyncio.to_thread(
-                        db.increment_replies_sent,
-                        message.author.id,
-                        message.guild.id
-                    )
-                    # Track interaction (who they replied to)
+                valid_mentions = [
+                    m for m in message.mentions
+                    if m.id != message.author.id and not m.bot and m.id != replied_to_id
+                ]
+                for mentioned_user in valid_mentions:
+                    # Track in user_xp (mentions_received for the mentioned user)
                     await asyncio.to_thread(
-                        db.increment_interaction_reply,
-                        message.author.id,
-                        replied_to_author.id,
-                        message.guild.id
+                        db.increment_mentions_received,
+                        mentioned_user.id,
+                        message.guild.id,
+                        1
                     )
-                except Exception as e:
-                    logger.error_tree("Reply Track Failed", e, [
-                        ("User", f"{message.author.name} ({message.author.display_name})"),
-                        ("ID", str(message.author.id)),
-                        ("Replied To", str(replied_to_author.id)),
-                    ])
-
-            # Track mentions (excluding replied-to user to avoid double-counting)
-            if message.mentions:
-                try:
-                    replied_to_id = replied_to_author.id if replied_to_author else None
-                    valid_mentions = [
-                        m for m in message.mentions
-                        if m.id != message.author.id and not m.bot and m.id != replied_to_id
-                    ]
-                    for mentioned_user in valid_mentions:
-                        # Track in user_xp (mentions_received for the mentioned user)
-                        await asyncio.to_thread(
-                            db.increment_mentions_received,
-                            mentioned_user.id,
-                            message.guild.id,
-                            1
-                        )
-                        # Track in user_interactions (who the author mentions)
-                        await asyncio.to_thread(
-                            db.increment_interaction_mention,
-                            message.author.id,
-                            mentioned_user.id,
-                            message.guild.id
-                        )
-                except Exception as e:
-                    logger.error_tree("Mention Track Failed", e, [
-                        ("User", f"{message.author.name} ({message.author.display_name})"),
-                        ("ID", str(message.author.id)),
-                    ])
-
-        # Track links shared (non-blocking)
-        if message.guild and message.guild.id == config.GUILD_ID:
-            if URL_PATTERN.search(message.content):
-                try:
+                    # Track in user_interactions (who the author mentions)
                     await asyncio.to_thread(
-                        db.increment_links_shared,
+                        db.increment_interaction_mention,
                         message.author.id,
+                        mentioned_user.id,
                         message.guild.id
                     )
-                except Exception as e:
-                    logger.error_tree("Link Track Failed", e, [
-                        ("User", f"{message.author.name} ({message.author.display_name})"),
-                        ("ID", str(message.author.id)),
-                    ])
-
-        # AFK service
-        if message.guild and hasattr(self.bot, 'afk_service') and self.bot.afk_service:
-            try:
-                await self.bot.afk_service.on_message(message)
             except Exception as e:
-                logger.error_tree("AFK Handler Error", e, [
+                logger.error_tree("Mention Track Failed", e, [
                     ("User", f"{message.author.name} ({message.author.display_name})"),
                     ("ID", str(message.author.id)),
                 ])
 
-        # FAQ auto-responder (watches for questions)
-        if message.guild:
-            try:
-                if await faq.handle(message):
-                    return  # FAQ was sent
-            except Exception as e:
-                logger.error_tree("FAQ Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
+    async def _links_stage(self, message: discord.Message) -> None:
+        """Track links shared."""
+        await asyncio.to_thread(
+            db.increment_links_shared,
+            message.author.id,
+            message.guild.id
+        )
 
-        # Action commands (slap @user, hug @user, cry, etc.)
-        if message.guild:
-            try:
-                if await action.handle(message):
-                    return  # Action was handled
-            except Exception as e:
-                logger.error_tree("Action Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
-
-        # Family commands (marry @user, divorce, adopt @user, etc.)
-        if message.guild:
-            try:
-                if await family.handle(message):
-                    return  # Family command was handled
-            except Exception as e:
-                logger.error_tree("Family Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
-
-        # Fun commands (ship, howsimp, howgay, howsmart, howfat)
-        if message.guild:
-            try:
-                if await fun.handle(message):
-                    return  # Fun command was handled
-            except Exception as e:
-                logger.error_tree("Fun Handler Error", e, [
-                    ("User", f"{message.author.name} ({message.author.display_name})"),
-                    ("ID", str(message.author.id)),
-                ])
-
-        # Reply commands (convert, quote, translate, download)
-        try:
-            if await self.reply.handle(message):
-                return  # Reply command was handled
-        except Exception as e:
-            logger.error_tree("Reply Handler Error", e, [
-                ("User", f"{message.author.name} ({message.author.display_name})"),
-                ("ID", str(message.author.id)),
-            ])
+    async def _afk_stage(self, message: discord.Message) -> None:
+        """AFK status return and mention notices."""
+        await self.bot.afk_service.on_message(message)
 
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User) -> None:
@@ -410,6 +354,8 @@ class MessageHandler(commands.Cog):
     @commands.Cog.listener()
     async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
         """Handle raw message deletions for persistent panels and event logging."""
+        reply_targets.forget(payload.channel_id, payload.message_id)
+
         # Actions panel auto-resend on delete
         if hasattr(self.bot, 'actions_panel') and self.bot.actions_panel:
             try:
@@ -445,6 +391,9 @@ class MessageHandler(commands.Cog):
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
         """Handle bulk message deletions (purge commands)."""
+        for message_id in payload.message_ids:
+            reply_targets.forget(payload.channel_id, message_id)
+
         if payload.guild_id != config.GUILD_ID:
             return
 
@@ -510,6 +459,8 @@ class MessageHandler(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
         """Handle channel deletion for event logging."""
+        reply_targets.forget_channel(channel.id)
+
         if channel.guild.id != config.GUILD_ID:
             return
 
@@ -0,0 +1,326 @@
+"""
+SyriaBot - Message Pipeline
+===========================
+
+Declarative stage pipeline for on_message, with per-stage budgets,
+latency histograms and an expensive-message sampler.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import bisect
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+import discord
+
+from src.core.constants import (
+    EXPENSIVE_MESSAGE_LOG_INTERVAL,
+    EXPENSIVE_MESSAGE_MS,
+    EXPENSIVE_MESSAGE_SAMPLES,
+)
+from src.core.logger import logger
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+# =============================================================================
+# Stages
+# =============================================================================
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of message handling.
+
+    Attributes:
+        name: Short name used in histograms and samples
+        run: Coroutine taking the message; claiming stages return True
+             when they consumed it
+        error_title: Title for logger.error_tree when the stage raises
+        timeout: Budget in seconds (None = unbounded, e.g. downloads)
+        applies: Cheap predicate; stages that do not apply are not run
+                 and not timed
+    """
+    name: str
+    run: Callable[[discord.Message], Awaitable[Optional[bool]]]
+    error_title: str
+    timeout: Optional[float] = None
+    applies: Callable[[discord.Message], bool] = lambda message: True
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket latency histogram for one stage."""
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    timeouts: int = 0
+    errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile (max for the open bucket)."""
+        count = self.count
+        if not count:
+            return 0.0
+        rank = p / 100 * count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, object]:
+        count = self.count
+        return {
+            "count": count,
+            "avg_ms": round(self.total_ms / count, 2) if count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "buckets": {
+                (f"le_{bound}" if i < len(LATENCY_BUCKETS_MS) else "inf"): n
+                for i, (bound, n) in enumerate(zip((*LATENCY_BUCKETS_MS, None), self.counts))
+            },
+        }
+
+
+@dataclass
+class ExpensiveMessage:
+    """Per-stage breakdown of one slow message."""
+    timestamp: float
+    message_id: int
+    channel_id: int
+    author_id: int
+    total_ms: float
+    stages: Dict[str, float]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "timestamp": self.timestamp,
+            "message_id": self.message_id,
+            "channel_id": self.channel_id,
+            "author_id": self.author_id,
+            "total_ms": round(self.total_ms, 2),
+            "stages": {name: round(ms, 2) for name, ms in self.stages.items()},
+        }
+
+
+class PipelineStats:
+    """Histograms per stage (plus "total") and a ring of expensive messages."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.expensive: Deque[ExpensiveMessage] = deque(maxlen=EXPENSIVE_MESSAGE_SAMPLES)
+        self._last_expensive_log = 0.0
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyHistogram()
+        return hist
+
+    def sample(self, message: discord.Message, total_ms: float, stages: Dict[str, float]) -> None:
+        """Keep the breakdown of a slow message; log it at most once per interval."""
+        self.expensive.append(ExpensiveMessage(
+            timestamp=time.time(),
+            message_id=message.id,
+            channel_id=message.channel.id,
+            author_id=message.author.id,
+            total_ms=total_ms,
+            stages=stages,
+        ))
+
+        now = time.monotonic()
+        if now - self._last_expensive_log < EXPENSIVE_MESSAGE_LOG_INTERVAL:
+            return
+        self._last_expensive_log = now
+
+        slowest = sorted(stages.items(), key=lambda item: item[1], reverse=True)[:3]
+        logger.tree("Expensive Message", [
+            ("Total", f"{total_ms:.0f}ms"),
+            ("Channel", str(message.channel.id)),
+            ("Slowest", ", ".join(f"{name} {ms:.0f}ms" for name, ms in slowest)),
+        ], emoji="🐢")
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "stages": {name: hist.to_dict() for name, hist in self.histograms.items()},
+            "expensive": [sample.to_dict() for sample in self.expensive],
+        }
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+class MessagePipeline:
+    """
+    Runs a message through three groups of stages.
+
+    DESIGN:
+        claim stages run in order first; one returning True consumes the
+        message and nothing else runs (confessions are deleted, gallery
+        posts are moderated). Otherwise the side-effect stages (counters,
+        XP, AFK, ...) and the command chain start together: side effects
+        all run concurrently, each under its own timeout, so a slow stage
+        only costs its own budget and never delays the others. Command
+        stages keep their order and stop at the first that handles the
+        message. Every stage is timed into its histogram. A stage that
+        raises is logged and treated as not having claimed the message,
+        as before. A side-effect stage that runs over budget is logged,
+        left to finish in the background (never cancelled) and timed when
+        it completes. A claim stage over budget is logged too, but still
+        awaited: whether it consumed the message decides if anything
+        downstream may see it. The "total" histogram and the expensive
+        message sampler cover the bounded work only (claims and side
+        effects); command stages have no budget (downloads can take
+        minutes), so they only feed their own histograms.
+    """
+
+    def __init__(
+        self,
+        claim: Sequence[Stage],
+        side_effects: Sequence[Stage],
+        commands: Sequence[Stage],
+    ) -> None:
+        self.claim = tuple(claim)
+        self.side_effects = tuple(side_effects)
+        self.commands = tuple(commands)
+        self.stats = PipelineStats()
+
+    async def run(self, message: discord.Message) -> None:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        commands: Optional[asyncio.Future] = None
+        try:
+            for stage in self.claim:
+                if await self._run_stage(stage, message, timings, settle=True):
+                    return
+
+            commands = asyncio.ensure_future(self._run_commands(message, timings))
+            await asyncio.gather(
+                *(self._run_stage(stage, message, timings) for stage in self.side_effects),
+            )
+        except BaseException:
+            if commands is not None:
+                commands.cancel()
+            raise
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            self.stats.histogram("total").record(total_ms)
+            if total_ms >= EXPENSIVE_MESSAGE_MS:
+                self.stats.sample(message, total_ms, timings)
+
+        await commands
+
+    async def _run_commands(self, message: discord.Message, timings: Dict[str, float]) -> None:
+        for stage in self.commands:
+            if await self._run_stage(stage, message, timings):
+                return
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        message: discord.Message,
+        timings: Dict[str, float],
+        settle: bool = False,
+    ) -> bool:
+        """
+        Run one stage under its budget. Returns True if it claimed the message.
+
+        settle=True (claim stages) waits for a stage that ran over budget
+        instead of letting it go, so its verdict is never lost.
+        """
+        if not stage.applies(message):
+            return False
+
+        start = time.perf_counter()
+        try:
+            if stage.timeout is None:
+                result = await stage.run(message)
+            else:
+                task = asyncio.ensure_future(stage.run(message))
+                try:
+                    # Shielded: a stage over budget is let go, not cancelled, so
+                    # half-applied work (a level-up's role grant) still finishes
+                    result = await asyncio.wait_for(asyncio.shield(task), stage.timeout)
+                except asyncio.TimeoutError:
+                    self._over_budget(stage, message, start, timings)
+                    if not settle:
+                        self._finish_later(stage, message, task, start)
+                        return False
+                    result = await task
+        except Exception as e:
+            self._failed(stage, message, e)
+            result = False
+
+        self._record(stage, start, timings)
+        return bool(result)
+
+    def _record(self, stage: Stage, start: float, timings: Dict[str, float]) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats.histogram(stage.name).record(elapsed_ms)
+        if stage.timeout is not None:
+            timings[stage.name] = elapsed_ms
+
+    def _failed(self, stage: Stage, message: discord.Message, e: BaseException) -> None:
+        self.stats.histogram(stage.name).errors += 1
+        logger.error_tree(stage.error_title, e, [
+            ("User", f"{message.author.name} ({message.author.display_name})"),
+            ("ID", str(message.author.id)),
+            ("Channel", str(message.channel.id)),
+        ])
+
+    def _over_budget(
+        self,
+        stage: Stage,
+        message: discord.Message,
+        start: float,
+        timings: Dict[str, float],
+    ) -> None:
+        """Log a stage that blew its budget."""
+        self.stats.histogram(stage.name).timeouts += 1
+        timings[stage.name] = (time.perf_counter() - start) * 1000
+        logger.tree("Message Stage Over Budget", [
+            ("Stage", stage.name),
+            ("Budget", f"{stage.timeout:g}s"),
+            ("User", f"{message.author.name} ({message.author.display_name})"),
+            ("Channel", str(message.channel.id)),
+        ], emoji="⏱️")
+
+    def _finish_later(self, stage: Stage, message: discord.Message, task: asyncio.Future, start: float) -> None:
+        """Time and check a stage that was let go when it does finish."""
+        def _done(done: asyncio.Future) -> None:
+            self.stats.histogram(stage.name).record((time.perf_counter() - start) * 1000)
+            if not done.cancelled() and done.exception() is not None:
+                self._failed(stage, message, done.exception())
+
+        task.add_done_callback(_done)
+
+
+__all__ = ["Stage", "MessagePipeline", "PipelineStats", "LatencyHistogram", "ExpensiveMessage"]
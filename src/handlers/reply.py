@@ -9,11 +9,8 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
-import asyncio
 import io
 import re
-import time
-from collections import OrderedDict
 from typing import Optional, TYPE_CHECKING
 
 import discord
@@ -21,6 +18,7 @@ import discord
 from src.core.logger import logger
 from src.core.constants import MAX_IMAGE_SIZE, MAX_VIDEO_SIZE, DELETE_DELAY_SHORT
 from src.core.colors import COLOR_ERROR, COLOR_WARNING
+from src.utils.cooldowns import Cooldown, cooldowns
 from src.utils.permissions import is_cooldown_exempt
 from src.services.convert import convert_service
 from src.services.quote import quote_service
@@ -65,9 +63,6 @@ DOWNLOAD_URL_PATTERN = re.compile(
     re.IGNORECASE
 )
 
-# Max cooldown cache size before cleanup
-MAX_COOLDOWN_CACHE_SIZE = 100
-
 
 class ReplyHandler:
     """
@@ -111,30 +106,9 @@ class ReplyHandler:
             bot: Main bot instance for channel lookups and API access.
         """
         self.bot = bot
-        self._download_cooldowns: OrderedDict[int, float] = OrderedDict()
-        self._cooldown_lock = asyncio.Lock()
-
-    async def _cleanup_download_cooldowns(self) -> None:
-        """Remove expired cooldowns to prevent unbounded growth (thread-safe)."""
-        if len(self._download_cooldowns) <= MAX_COOLDOWN_CACHE_SIZE:
-            return
-
-        async with self._cooldown_lock:
-            now = time.time()
-            # Build list of expired users safely
-            expired_users = [
-                uid for uid, ts in list(self._download_cooldowns.items())
-                if now - ts > self.DOWNLOAD_REPLY_COOLDOWN
-            ]
-            for uid in expired_users:
-                self._download_cooldowns.pop(uid, None)  # Use pop to avoid KeyError
-
-            # Evict oldest if still over limit
-            while len(self._download_cooldowns) > MAX_COOLDOWN_CACHE_SIZE:
-                try:
-                    self._download_cooldowns.popitem(last=False)
-                except KeyError:
-                    break  # Dict is empty
+        self._download_cooldowns = cooldowns.namespace(
+            "reply.download", Cooldown(self.DOWNLOAD_REPLY_COOLDOWN),
+        )
 
     def _is_translate_trigger(self, content: str) -> bool:
         """Check if content starts with a translate trigger (with typo tolerance)."""
@@ -609,10 +583,8 @@ class ReplyHandler:
 
         # Check cooldown (exempt users bypass, boosters only get unlimited weekly downloads)
         if not exempt:
-            last_use = self._download_cooldowns.get(user_id, 0)
-            time_since = time.time() - last_use
-            if time_since < self.DOWNLOAD_REPLY_COOLDOWN:
-                remaining = self.DOWNLOAD_REPLY_COOLDOWN - time_since
+            remaining = self._download_cooldowns.remaining(user_id)
+            if remaining:
                 embed = discord.Embed(
                     description=f"Please wait **{remaining:.0f}s** before downloading again.",
                     color=COLOR_WARNING
@@ -681,10 +653,9 @@ class ReplyHandler:
 
         url = urls[0]
 
-        # Record cooldown and cleanup old entries (skip for exempt users)
+        # Record cooldown (skip for exempt users)
         if not exempt:
-            self._download_cooldowns[user_id] = time.time()
-            await self._cleanup_download_cooldowns()
+            self._download_cooldowns.record(user_id)
 
         logger.tree("Reply Download", [
             ("User", f"{message.author.name} ({message.author.display_name})"),
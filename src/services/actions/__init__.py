@@ -8,6 +8,7 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
+from .pool import ActionGifPool
 from .service import (
     ActionService,
     action_service,
@@ -16,6 +17,7 @@ from .service import (
 )
 
 __all__ = [
+    "ActionGifPool",
     "ActionService",
     "action_service",
     "ACTIONS",
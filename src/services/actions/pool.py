@@ -0,0 +1,633 @@
+"""
+SyriaBot - Action GIF Pool
+==========================
+
+Prefetched, disk-backed pool of action GIFs with provider health tracking.
+
+Every hug/slap/kiss used to walk the provider chain (nekos.best,
+purrbot.site, otakugifs.xyz, waifu.pics) one request at a time and then
+download the GIF it was pointed at. The pool keeps a few GIFs per
+endpoint on disk and serves from them; refills happen in the background
+after a serve, so an action costs a file read instead of HTTP round-trips.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import random
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+import aiohttp
+
+from src.core.config import DATA_DIR
+from src.core.constants import (
+    ACTION_GIF_MAX_BYTES,
+    ACTION_GIF_MAX_SERVES,
+    ACTION_GIF_POOL_SIZE,
+    ACTION_GIF_RECENT,
+    ACTION_GIF_REFILL_CONCURRENCY,
+    ACTION_GIF_STORE_MAX_BYTES,
+    ACTION_PROVIDER_BACKOFF,
+    ACTION_PROVIDER_BACKOFF_MAX,
+    ACTION_PROVIDER_FAILURES,
+)
+from src.core.logger import logger
+from src.utils.async_utils import create_safe_task
+from src.utils.http import DOWNLOAD_TIMEOUT, FAST_TIMEOUT, http_session
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+STORE_DIR = DATA_DIR / "action_gifs"
+MANIFEST_NAME = "manifest.json"
+GIF_SUFFIX = ".gif"
+
+# Endpoints filled at startup (the ones used outside /action too: AFK, welcome)
+PREWARM_ENDPOINTS = ("hug", "kiss", "slap", "pat", "wave", "sleep", "yawn", "cuddle")
+
+# Success-rate smoothing for provider scores
+SCORE_DECAY = 0.8
+
+# Providers scoring below this are tried after every healthier one
+SCORE_DEMOTE = 0.5
+
+
+# =============================================================================
+# Providers
+# =============================================================================
+
+@dataclass(frozen=True)
+class GifProvider:
+    """
+    One GIF API.
+
+    Attributes:
+        name: Display name used in logs and stats
+        url: Request URL template with an {endpoint} placeholder
+        parse: Pulls the GIF URL out of the JSON response (None if absent)
+        actions: Endpoints this provider has (None = try it for everything)
+    """
+    name: str
+    url: str
+    parse: Callable[[Dict[str, Any]], Optional[str]]
+    actions: Optional[FrozenSet[str]] = None
+
+    def supports(self, endpoint: str) -> bool:
+        return self.actions is None or endpoint in self.actions
+
+
+def _parse_nekos_best(data: Dict[str, Any]) -> Optional[str]:
+    # nekos.best returns {"results": [{"url": "..."}]}
+    results = data.get("results") or []
+    return results[0].get("url") if results else None
+
+
+def _parse_purrbot(data: Dict[str, Any]) -> Optional[str]:
+    return None if data.get("error") else data.get("link")
+
+
+def _parse_url(data: Dict[str, Any]) -> Optional[str]:
+    # waifu.pics and otakugifs.xyz return {"url": "..."}
+    return data.get("url")
+
+
+def default_providers(
+    nekos_best_api: str,
+    purrbot_api: str,
+    otakugifs_api: str,
+    waifu_pics_api: str,
+    nekos_best_actions: FrozenSet[str],
+    purrbot_actions: FrozenSet[str],
+    otakugifs_actions: FrozenSet[str],
+) -> List[GifProvider]:
+    """The provider chain in preference order (best curated first, widest last)."""
+    return [
+        GifProvider("nekos.best", nekos_best_api + "/{endpoint}", _parse_nekos_best, nekos_best_actions),
+        GifProvider("purrbot.site", purrbot_api + "/{endpoint}/gif", _parse_purrbot, purrbot_actions),
+        GifProvider("otakugifs.xyz", otakugifs_api + "?reaction={endpoint}", _parse_url, otakugifs_actions),
+        GifProvider("waifu.pics", waifu_pics_api + "/{endpoint}", _parse_url),
+    ]
+
+
+class ProviderHealth:
+    """
+    Rolling health of one provider.
+
+    DESIGN:
+        score is an exponentially smoothed success rate (1.0 = healthy).
+        Only transport failures count against it: timeouts, connection
+        errors, 5xx and unparseable bodies. A 4xx or an empty result means
+        the provider has no GIF for that endpoint, which says nothing about
+        whether it is up. After ACTION_PROVIDER_FAILURES failures in a row
+        the provider is benched (skipped entirely) for a backoff that
+        doubles on each repeat bench; the first success resets it.
+    """
+
+    __slots__ = ("score", "successes", "failures", "consecutive", "strikes", "benched_until", "latency_ms")
+
+    def __init__(self) -> None:
+        self.score = 1.0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive = 0
+        self.strikes = 0
+        self.benched_until = 0.0
+        self.latency_ms = 0.0
+
+    def available(self, now: float) -> bool:
+        return now >= self.benched_until
+
+    def record_success(self, latency_ms: float) -> bool:
+        """Returns True if this success ends a bench."""
+        recovered = self.strikes > 0
+        self.successes += 1
+        self.consecutive = 0
+        self.strikes = 0
+        self.score = self.score * SCORE_DECAY + (1 - SCORE_DECAY)
+        self.latency_ms = latency_ms if not self.latency_ms else self.latency_ms * 0.8 + latency_ms * 0.2
+        return recovered
+
+    def record_failure(self, now: float) -> Optional[float]:
+        """Returns the bench length in seconds if this failure benches the provider."""
+        self.failures += 1
+        self.consecutive += 1
+        self.score *= SCORE_DECAY
+        if self.consecutive < ACTION_PROVIDER_FAILURES:
+            return None
+        backoff = min(ACTION_PROVIDER_BACKOFF * (2 ** self.strikes), ACTION_PROVIDER_BACKOFF_MAX)
+        self.strikes += 1
+        self.consecutive = 0
+        self.benched_until = now + backoff
+        return backoff
+
+
+class _ProviderError(Exception):
+    """Transport-level provider failure (counts against health)."""
+
+
+# =============================================================================
+# Pool
+# =============================================================================
+
+class PooledGif:
+    __slots__ = ("digest", "url", "size", "serves")
+
+    def __init__(self, digest: str, url: str, size: int, serves: int = 0) -> None:
+        self.digest = digest
+        self.url = url
+        self.size = size
+        self.serves = serves
+
+
+class ActionGifPool:
+    """
+    Per-endpoint GIF pools stored on disk.
+
+    DESIGN:
+        Each endpoint keeps up to ACTION_GIF_POOL_SIZE GIFs, stored once
+        per content hash as DATA_DIR/action_gifs/<sha256>.gif with a JSON
+        manifest (endpoint -> [hash, source URL]) rewritten atomically on
+        change, so the pool survives restarts. A serve picks at random
+        among entries not in the endpoint's last ACTION_GIF_RECENT serves.
+        Once an entry has been served ACTION_GIF_MAX_SERVES times, or the
+        pool is short, a single background refill per endpoint fetches
+        fresh GIFs; each new GIF displaces the most-served one, so content
+        rotates while providers are up. Only an empty pool makes a caller
+        wait on the provider APIs. get_bytes serves the stored files and
+        keeps working when every provider is down; get_url hands out the
+        source URL of a pooled GIF, which saves the API round-trip but is
+        only as available as the provider's CDN.
+        The whole store is capped at ACTION_GIF_STORE_MAX_BYTES by
+        trimming the oldest entry of the largest pool.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[GifProvider],
+        store_dir: Path = STORE_DIR,
+        max_bytes: int = ACTION_GIF_STORE_MAX_BYTES,
+    ) -> None:
+        self._providers = list(providers)
+        self._health: Dict[str, ProviderHealth] = {p.name: ProviderHealth() for p in self._providers}
+        self._dir = store_dir
+        self._max_bytes = max_bytes
+        self._pools: Dict[str, List[PooledGif]] = {}
+        self._recent: Dict[str, Deque[str]] = {}
+        self._refilling: Set[str] = set()
+        self._refill_sem = asyncio.Semaphore(ACTION_GIF_REFILL_CONCURRENCY)
+        self._loaded = False
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.stores = 0
+
+    # =========================================================================
+    # Store
+    # =========================================================================
+
+    def _path(self, digest: str) -> Path:
+        return self._dir / f"{digest}{GIF_SUFFIX}"
+
+    def _load_manifest(self) -> Dict[str, List[PooledGif]]:
+        """Read the manifest, dropping entries whose file is gone and files no entry uses."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        try:
+            raw = json.loads((self._dir / MANIFEST_NAME).read_text("utf-8"))
+        except FileNotFoundError:
+            raw = {}
+        except (OSError, ValueError) as e:
+            logger.error_tree("Action GIF Manifest Unreadable", e, [
+                ("Path", str(self._dir)),
+                ("Impact", "Starting with an empty pool"),
+            ])
+            raw = {}
+
+        pools: Dict[str, List[PooledGif]] = {}
+        for endpoint, items in raw.items():
+            for digest, url in items[:ACTION_GIF_POOL_SIZE]:
+                try:
+                    size = self._path(digest).stat().st_size
+                except OSError:
+                    continue
+                pools.setdefault(endpoint, []).append(PooledGif(digest, url, size))
+
+        used = {gif.digest for pool in pools.values() for gif in pool}
+        for entry in os.scandir(self._dir):
+            if entry.name == MANIFEST_NAME:
+                continue
+            if not entry.name.endswith(GIF_SUFFIX) or entry.name[:-len(GIF_SUFFIX)] not in used:
+                # Orphan or leftover temp file from an interrupted write
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+        return pools
+
+    def _write_manifest(self, snapshot: Dict[str, List[Tuple[str, str]]]) -> None:
+        tmp_path = self._dir / f"{MANIFEST_NAME}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            tmp_path.write_text(json.dumps(snapshot, separators=(",", ":")), "utf-8")
+            os.replace(tmp_path, self._dir / MANIFEST_NAME)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.tree("Action GIF Manifest Write Failed", [
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+
+    async def _save(self) -> None:
+        snapshot = {
+            endpoint: [[gif.digest, gif.url] for gif in pool]
+            for endpoint, pool in self._pools.items() if pool
+        }
+        await asyncio.to_thread(self._write_manifest, snapshot)
+
+    def _write_gif(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        if path.exists():
+            return
+        tmp_path = self._dir / f"{digest}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _unlink_unused(self, digests: List[str]) -> None:
+        used = {gif.digest for pool in self._pools.values() for gif in pool}
+        for digest in digests:
+            if digest not in used:
+                self._path(digest).unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        seen: Dict[str, int] = {}
+        for pool in self._pools.values():
+            for gif in pool:
+                seen[gif.digest] = gif.size
+        return sum(seen.values())
+
+    async def start(self) -> None:
+        """Load the stored pool and start filling the common endpoints."""
+        if self._loaded:
+            return
+        try:
+            self._pools = await asyncio.to_thread(self._load_manifest)
+        except OSError as e:
+            logger.error_tree("Action GIF Pool Load Failed", e, [
+                ("Path", str(self._dir)),
+            ])
+            self._pools = {}
+        self._loaded = True
+
+        for endpoint in PREWARM_ENDPOINTS:
+            self._schedule_refill(endpoint)
+
+        logger.tree("Action GIF Pool Loaded", [
+            ("Endpoints", str(len(self._pools))),
+            ("GIFs", str(sum(len(pool) for pool in self._pools.values()))),
+            ("Size", f"{self.total_bytes() / 1024 / 1024:.1f} MB"),
+            ("Prewarm", str(len(PREWARM_ENDPOINTS))),
+        ], emoji="🎞️")
+
+    # =========================================================================
+    # Providers
+    # =========================================================================
+
+    def _candidates(self, endpoint: str) -> List[GifProvider]:
+        """Providers to try for an endpoint: benched ones skipped, weak ones last."""
+        now = time.monotonic()
+        candidates = [
+            p for p in self._providers
+            if p.supports(endpoint) and self._health[p.name].available(now)
+        ]
+        # Stable sort keeps the preference order within each group
+        candidates.sort(key=lambda p: self._health[p.name].score < SCORE_DEMOTE)
+        return candidates
+
+    async def _ask(self, provider: GifProvider, endpoint: str) -> Optional[str]:
+        url = provider.url.format(endpoint=endpoint)
+        try:
+            async with http_session.get(url, timeout=FAST_TIMEOUT) as response:
+                if response.status >= 500:
+                    raise _ProviderError(f"HTTP {response.status}")
+                if response.status != 200:
+                    return None
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError as e:
+                    raise _ProviderError("Invalid JSON") from e
+        except asyncio.TimeoutError as e:
+            raise _ProviderError("Timeout") from e
+        except aiohttp.ClientError as e:
+            raise _ProviderError(type(e).__name__) from e
+        return provider.parse(data) if isinstance(data, dict) else None
+
+    async def fetch_url(self, endpoint: str) -> Optional[str]:
+        """Walk the healthy providers for a GIF URL, recording their health."""
+        for provider in self._candidates(endpoint):
+            health = self._health[provider.name]
+            start = time.monotonic()
+            try:
+                gif_url = await self._ask(provider, endpoint)
+            except _ProviderError as e:
+                backoff = health.record_failure(time.monotonic())
+                logger.tree("Action Provider Failed", [
+                    ("Provider", provider.name),
+                    ("Endpoint", endpoint),
+                    ("Error", str(e)),
+                    ("Score", f"{health.score:.2f}"),
+                ], emoji="⏳")
+                if backoff is not None:
+                    logger.tree("Action Provider Benched", [
+                        ("Provider", provider.name),
+                        ("For", f"{backoff:.0f}s"),
+                        ("Failures", str(health.failures)),
+                    ], emoji="🚫")
+                continue
+            except Exception as e:
+                logger.error_tree("Action Provider Error", e, [
+                    ("Provider", provider.name),
+                    ("Endpoint", endpoint),
+                ])
+                continue
+
+            if health.record_success((time.monotonic() - start) * 1000):
+                logger.tree("Action Provider Recovered", [
+                    ("Provider", provider.name),
+                ], emoji="✅")
+            if gif_url:
+                self.fetches += 1
+                return gif_url
+        return None
+
+    async def _download(self, gif_url: str, timeout: aiohttp.ClientTimeout) -> Optional[bytes]:
+        try:
+            async with http_session.get(gif_url, timeout=timeout) as resp:
+                if resp.status != 200:
+                    return None
+                if resp.content_length and resp.content_length > ACTION_GIF_MAX_BYTES:
+                    return None
+                data = await resp.read()
+        except asyncio.TimeoutError:
+            logger.tree("Action GIF Download Timeout", [
+                ("URL", gif_url[:80]),
+            ], emoji="⏳")
+            return None
+        except Exception as e:
+            logger.error_tree("Action GIF Download Failed", e, [
+                ("URL", gif_url[:80]),
+            ])
+            return None
+        return data if len(data) <= ACTION_GIF_MAX_BYTES else None
+
+    # =========================================================================
+    # Refill
+    # =========================================================================
+
+    def _needs_refill(self, endpoint: str) -> bool:
+        pool = self._pools.get(endpoint, [])
+        return len(pool) < ACTION_GIF_POOL_SIZE or any(g.serves >= ACTION_GIF_MAX_SERVES for g in pool)
+
+    async def _store(
+        self,
+        endpoint: str,
+        gif_url: str,
+        timeout: aiohttp.ClientTimeout = DOWNLOAD_TIMEOUT,
+    ) -> Optional[PooledGif]:
+        """Download a GIF into the endpoint's pool, displacing the most-served entry if full."""
+        data = await self._download(gif_url, timeout)
+        if not data:
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        pool = self._pools.setdefault(endpoint, [])
+        for gif in pool:
+            if gif.digest == digest:
+                return gif
+
+        try:
+            await asyncio.to_thread(self._write_gif, digest, data)
+        except OSError as e:
+            logger.tree("Action GIF Store Failed", [
+                ("Endpoint", endpoint),
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+            return None
+
+        for gif in pool:
+            if gif.digest == digest:
+                # Same GIF stored by a concurrent call while we were writing
+                return gif
+        gif = PooledGif(digest, gif_url, len(data))
+        pool.append(gif)
+        self.stores += 1
+
+        dropped: List[str] = []
+        if len(pool) > ACTION_GIF_POOL_SIZE:
+            # Most served first; the oldest (lowest index) among equals
+            stale = max(range(len(pool) - 1), key=lambda i: (pool[i].serves, -i))
+            dropped.append(pool.pop(stale).digest)
+        while self.total_bytes() > self._max_bytes:
+            largest = max(self._pools.values(), key=len)
+            if len(largest) <= 1:
+                break
+            dropped.append(largest.pop(0).digest)
+
+        if dropped:
+            await asyncio.to_thread(self._unlink_unused, dropped)
+        await self._save()
+        return gif
+
+    async def _refill(self, endpoint: str) -> None:
+        try:
+            async with self._refill_sem:
+                # One GIF per pass; give up on the first failure and let a later serve retry
+                for _ in range(ACTION_GIF_POOL_SIZE):
+                    if self._closed or not self._needs_refill(endpoint):
+                        break
+                    gif_url = await self.fetch_url(endpoint)
+                    if not gif_url or not await self._store(endpoint, gif_url):
+                        break
+        finally:
+            self._refilling.discard(endpoint)
+
+    def _schedule_refill(self, endpoint: str) -> None:
+        if self._closed or endpoint in self._refilling or not self._needs_refill(endpoint):
+            return
+        self._refilling.add(endpoint)
+        create_safe_task(self._refill(endpoint), f"Action GIF Refill ({endpoint})")
+
+    # =========================================================================
+    # Serving
+    # =========================================================================
+
+    def _pick(self, endpoint: str) -> Optional[PooledGif]:
+        """Random pooled GIF, avoiding the endpoint's most recent serves."""
+        pool = self._pools.get(endpoint)
+        if not pool:
+            return None
+        recent = self._recent.setdefault(endpoint, deque(maxlen=ACTION_GIF_RECENT))
+        fresh = [gif for gif in pool if gif.digest not in recent] or pool
+        gif = random.choice(fresh)
+        gif.serves += 1
+        recent.append(gif.digest)
+        self._schedule_refill(endpoint)
+        return gif
+
+    def _drop(self, endpoint: str, gif: PooledGif) -> None:
+        pool = self._pools.get(endpoint, [])
+        if gif in pool:
+            pool.remove(gif)
+
+    async def get_url(self, endpoint: str) -> Optional[Tuple[str, str]]:
+        """
+        GIF URL for an endpoint.
+
+        Pooled entries return their source URL on the provider's CDN, so
+        the caller still depends on that CDN; use get_bytes to serve the
+        stored file when providers may be down.
+
+        Returns:
+            (url, source) where source is "pool" or the provider name, or None.
+        """
+        gif = self._pick(endpoint)
+        if gif:
+            self.hits += 1
+            return gif.url, "pool"
+
+        # Empty pool: answer from the providers now, keep the GIF for next time
+        self.misses += 1
+        gif_url = await self.fetch_url(endpoint)
+        if not gif_url:
+            return None
+        create_safe_task(self._store(endpoint, gif_url), f"Action GIF Store ({endpoint})")
+        return gif_url, "provider"
+
+    async def get_bytes(self, endpoint: str) -> Optional[Tuple[io.BytesIO, str]]:
+        """
+        GIF bytes for an endpoint.
+
+        Returns:
+            (BytesIO buffer, source) or None.
+        """
+        while True:
+            gif = self._pick(endpoint)
+            if not gif:
+                break
+            try:
+                data = await asyncio.to_thread(self._path(gif.digest).read_bytes)
+            except OSError:
+                # File removed under us: forget it and try the next one
+                self._drop(endpoint, gif)
+                continue
+            self.hits += 1
+            return io.BytesIO(data), "pool"
+
+        self.misses += 1
+        gif_url = await self.fetch_url(endpoint)
+        if not gif_url:
+            return None
+        gif = await self._store(endpoint, gif_url, timeout=FAST_TIMEOUT)
+        if not gif:
+            return None
+        try:
+            data = await asyncio.to_thread(self._path(gif.digest).read_bytes)
+        except OSError:
+            return None
+        return io.BytesIO(data), "provider"
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        total = self.hits + self.misses
+        return {
+            "endpoints": len(self._pools),
+            "gifs": sum(len(pool) for pool in self._pools.values()),
+            "bytes": self.total_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "fetches": self.fetches,
+            "stores": self.stores,
+            "refilling": len(self._refilling),
+            "providers": {
+                name: {
+                    "score": round(h.score, 3),
+                    "successes": h.successes,
+                    "failures": h.failures,
+                    "benched": not h.available(now),
+                    "latency_ms": round(h.latency_ms, 1),
+                }
+                for name, h in self._health.items()
+            },
+        }
+
+    async def close(self) -> None:
+        """Stop scheduling refills; in-flight ones finish their current GIF."""
+        self._closed = True
+
+
+__all__ = [
+    "ActionGifPool",
+    "GifProvider",
+    "PooledGif",
+    "ProviderHealth",
+    "default_providers",
+]
@@ -3,20 +3,20 @@ SyriaBot - Action Service
 =========================
 
 Handles action commands like slap, hug, kiss, etc.
-Uses nekos.best API (primary) with waifu.pics fallback for SFW anime GIFs.
+Uses nekos.best API (primary) with waifu.pics fallback for SFW anime GIFs,
+served from a prefetched on-disk pool (see pool.py).
 
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
-import asyncio
 import io
-import aiohttp
 import random
 from typing import Optional, Tuple, Dict, List
 
 from src.core.logger import logger
-from src.utils.http import http_session, FAST_TIMEOUT
+
+from .pool import ActionGifPool, default_providers
 
 
 # API endpoints
@@ -624,9 +624,11 @@ class ActionService:
     Service for handling action commands with GIF responses.
 
     DESIGN:
-        Uses dual API system for reliability:
-        - Primary: nekos.best (better curated anime content)
-        - Fallback: waifu.pics (wider selection)
+        GIFs come from the ActionGifPool: a few per endpoint kept on disk
+        and refilled in the background, so an action is served without
+        waiting on the provider chain. The chain itself (nekos.best first
+        for better curated content, waifu.pics as the widest fallback)
+        is only walked inline when an endpoint's pool is still empty.
         Actions split into target actions (hug @user) and self actions (cry).
     """
 
@@ -634,9 +636,18 @@ class ActionService:
         """
         Initialize the action service.
 
-        Sets up HTTP session for API requests.
+        Builds the GIF pool over the provider chain.
         Pre-loads action dictionaries for quick lookup.
         """
+        self.pool = ActionGifPool(default_providers(
+            NEKOS_BEST_API,
+            PURRBOT_API,
+            OTAKUGIFS_API,
+            WAIFU_PICS_API,
+            frozenset(NEKOS_BEST_ACTIONS),
+            frozenset(PURRBOT_ACTIONS),
+            frozenset(OTAKUGIFS_ACTIONS),
+        ))
         logger.tree("Action Service Initialized", [
             ("Actions", str(len(ACTIONS))),
             ("Self-Actions", str(len(SELF_ACTIONS))),
@@ -644,91 +655,30 @@ class ActionService:
             ("Fallback API", "waifu.pics"),
         ], emoji="🎬")
 
-    async def _fetch_from_nekos_best(self, endpoint: str) -> Optional[str]:
-        """Fetch GIF from nekos.best API."""
-        url = f"{NEKOS_BEST_API}/{endpoint}"
-        try:
-            async with http_session.get(url, timeout=FAST_TIMEOUT) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # nekos.best returns {"results": [{"url": "..."}]}
-                    results = data.get("results", [])
-                    if results and results[0].get("url"):
-                        return results[0]["url"]
-        except asyncio.TimeoutError:
-            logger.tree("Nekos.best API Timeout", [
-                ("Endpoint", endpoint),
-                ("URL", url),
-            ], emoji="⏳")
-        except Exception as e:
-            logger.error_tree("Nekos.best API Error", e, [
-                ("Endpoint", endpoint),
-            ])
-        return None
+    async def start(self) -> None:
+        """Load the stored GIF pool and start prefetching."""
+        await self.pool.start()
 
-    async def _fetch_from_waifu_pics(self, endpoint: str) -> Optional[str]:
-        """Fetch GIF from waifu.pics API."""
-        url = f"{WAIFU_PICS_API}/{endpoint}"
-        try:
-            async with http_session.get(url, timeout=FAST_TIMEOUT) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # waifu.pics returns {"url": "..."}
-                    return data.get("url")
-        except asyncio.TimeoutError:
-            logger.tree("Waifu.pics API Timeout", [
-                ("Endpoint", endpoint),
-                ("URL", url),
-            ], emoji="⏳")
-        except Exception as e:
-            logger.error_tree("Waifu.pics API Error", e, [
-                ("Endpoint", endpoint),
-            ])
-        return None
+    async def close(self) -> None:
+        """Stop background GIF refills."""
+        await self.pool.close()
 
-    async def _fetch_from_otakugifs(self, endpoint: str) -> Optional[str]:
-        """Fetch GIF from otakugifs.xyz API."""
-        url = f"{OTAKUGIFS_API}?reaction={endpoint}"
-        try:
-            async with http_session.get(url, timeout=FAST_TIMEOUT) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("url")
-        except asyncio.TimeoutError:
-            logger.tree("OtakuGifs API Timeout", [
-                ("Endpoint", endpoint),
-                ("URL", url),
-            ], emoji="⏳")
-        except Exception as e:
-            logger.error_tree("OtakuGifs API Error", e, [
-                ("Endpoint", endpoint),
-            ])
-        return None
-
-    async def _fetch_from_purrbot(self, endpoint: str) -> Optional[str]:
-        """Fetch GIF from purrbot.site API."""
-        url = f"{PURRBOT_API}/{endpoint}/gif"
-        try:
-            async with http_session.get(url, timeout=FAST_TIMEOUT) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if not data.get("error") and data.get("link"):
-                        return data["link"]
-        except asyncio.TimeoutError:
-            logger.tree("Purrbot API Timeout", [
-                ("Endpoint", endpoint),
-                ("URL", url),
-            ], emoji="⏳")
-        except Exception as e:
-            logger.error_tree("Purrbot API Error", e, [
-                ("Endpoint", endpoint),
-            ])
-        return None
+    def _endpoint(self, action: str) -> Optional[str]:
+        action_data = ACTIONS.get(action) or SELF_ACTIONS.get(action)
+        if not action_data:
+            logger.tree("Action Unknown", [
+                ("Action", action),
+                ("Reason", "Not in ACTIONS or SELF_ACTIONS"),
+            ], emoji="⚠️")
+            return None
+        return action_data["endpoint"]
 
     async def get_action_gif(self, action: str) -> Optional[str]:
         """
-        Fetch a random GIF URL for the given action.
-        Uses nekos.best as primary (better curated), waifu.pics as fallback.
+        Get a random GIF URL for the given action.
+
+        The URL points at the provider's CDN even when it comes from the
+        pool; get_action_gif_bytes is the path that survives an outage.
 
         Args:
             action: The action name (slap, hug, etc.)
@@ -736,44 +686,13 @@ class ActionService:
         Returns:
             GIF URL or None if failed
         """
-        # Get endpoint for action
-        action_data = ACTIONS.get(action) or SELF_ACTIONS.get(action)
-        if not action_data:
-            logger.tree("Action Unknown", [
-                ("Action", action),
-                ("Reason", "Not in ACTIONS or SELF_ACTIONS"),
-            ], emoji="⚠️")
+        endpoint = self._endpoint(action)
+        if not endpoint:
             return None
 
-        endpoint = action_data["endpoint"]
-        gif_url = None
-        source = None
-
-        # Try nekos.best first (better curated anime content)
-        if endpoint in NEKOS_BEST_ACTIONS:
-            gif_url = await self._fetch_from_nekos_best(endpoint)
-            if gif_url:
-                source = "nekos.best"
-
-        # Try purrbot.site as second option
-        if not gif_url and endpoint in PURRBOT_ACTIONS:
-            gif_url = await self._fetch_from_purrbot(endpoint)
-            if gif_url:
-                source = "purrbot.site"
-
-        # Try otakugifs.xyz as third option
-        if not gif_url and endpoint in OTAKUGIFS_ACTIONS:
-            gif_url = await self._fetch_from_otakugifs(endpoint)
-            if gif_url:
-                source = "otakugifs.xyz"
-
-        # Fallback to waifu.pics
-        if not gif_url:
-            gif_url = await self._fetch_from_waifu_pics(endpoint)
-            if gif_url:
-                source = "waifu.pics"
-
-        if gif_url:
+        result = await self.pool.get_url(endpoint)
+        if result:
+            gif_url, source = result
             logger.tree("Action GIF Fetched", [
                 ("Action", action),
                 ("Endpoint", endpoint),
@@ -784,38 +703,37 @@ class ActionService:
         logger.tree("Action GIF Failed", [
             ("Action", action),
             ("Endpoint", endpoint),
-            ("Reason", "All APIs failed"),
+            ("Reason", "Pool empty and all APIs failed"),
         ], emoji="⚠️")
         return None
 
     async def get_action_gif_bytes(self, action: str) -> Optional[Tuple[io.BytesIO, str]]:
         """
-        Fetch a GIF for the action and download the bytes.
+        Get GIF bytes for the action.
 
         Returns:
             Tuple of (BytesIO buffer, filename) or None if failed.
         """
-        gif_url = await self.get_action_gif(action)
-        if not gif_url:
+        endpoint = self._endpoint(action)
+        if not endpoint:
             return None
 
-        try:
-            async with http_session.get(gif_url, timeout=FAST_TIMEOUT) as resp:
-                if resp.status == 200:
-                    data = await resp.read()
-                    buf = io.BytesIO(data)
-                    buf.seek(0)
-                    return buf, f"{action}.gif"
-        except asyncio.TimeoutError:
-            logger.tree("Action GIF Download Timeout", [
-                ("Action", action),
-                ("URL", gif_url[:80]),
-            ], emoji="⏳")
-        except Exception as e:
-            logger.error_tree("Action GIF Download Failed", e, [
+        result = await self.pool.get_bytes(endpoint)
+        if result:
+            buf, source = result
+            logger.tree("Action GIF Fetched", [
                 ("Action", action),
-                ("URL", gif_url[:80]),
-            ])
+                ("Endpoint", endpoint),
+                ("Source", source),
+                ("Size", f"{buf.getbuffer().nbytes / 1024:.0f} KB"),
+            ], emoji="🎬")
+            return buf, f"{action}.gif"
+
+        logger.tree("Action GIF Failed", [
+            ("Action", action),
+            ("Endpoint", endpoint),
+            ("Reason", "Pool empty and all APIs failed"),
+        ], emoji="⚠️")
         return None
 
     def get_action_message(self, action: str, user: str, target: Optional[str] = None) -> str:
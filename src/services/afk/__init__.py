@@ -9,5 +9,6 @@ Server: discord.gg/syria
 """
 
 from .service import AFKService
+from .registry import AFKRegistry, AFKEntry
 
-__all__ = ["AFKService"]
+__all__ = ["AFKService", "AFKRegistry", "AFKEntry"]
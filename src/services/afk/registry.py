@@ -0,0 +1,135 @@
+"""
+SyriaBot - AFK Registry
+=======================
+
+In-memory index of who is AFK, plus write-behind mention counters.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.core.logger import logger
+from src.services.database import db
+
+
+@dataclass
+class AFKEntry:
+    """One user's AFK status in one guild."""
+    user_id: int
+    guild_id: int
+    reason: str
+    timestamp: int
+
+
+@dataclass
+class _PendingMentions:
+    """Mentions received since the last flush."""
+    count: int = 0
+    pingers: Dict[int, Tuple[str, int]] = field(default_factory=dict)  # pinger_id -> (name, timestamp)
+
+
+class AFKRegistry:
+    """
+    Mirror of afk_users kept in memory.
+
+    DESIGN:
+        Only a handful of users are AFK at any time, yet every guild
+        message used to hit SQLite to find out. The registry answers "is
+        this author / any mentioned user AFK?" from a dict. AFK status is
+        still written through to afk_users immediately, so the registry
+        can always be rebuilt from the DB with load() (at startup, or
+        after a crash). Mention counters are write-behind: they pile up
+        here and flush() writes them in one transaction; at worst a crash
+        loses the counts since the last flush, never an AFK status.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[int, int], AFKEntry] = {}
+        self._pending: Dict[Tuple[int, int], _PendingMentions] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> int:
+        """Rebuild from the database. Returns the number of AFK users loaded."""
+        self._entries = {
+            (row["user_id"], row["guild_id"]): AFKEntry(
+                user_id=row["user_id"],
+                guild_id=row["guild_id"],
+                reason=row["reason"] or "",
+                timestamp=row["timestamp"],
+            )
+            for row in db.get_all_afk_users()
+        }
+        return len(self._entries)
+
+    # =========================================================================
+    # Status
+    # =========================================================================
+
+    def get(self, user_id: int, guild_id: int) -> Optional[AFKEntry]:
+        return self._entries.get((user_id, guild_id))
+
+    def get_many(self, user_ids: List[int], guild_id: int) -> List[AFKEntry]:
+        """AFK entries for the given users, in the order given."""
+        entries = self._entries
+        return [entry for uid in user_ids if (entry := entries.get((uid, guild_id))) is not None]
+
+    def set(self, user_id: int, guild_id: int, reason: str, timestamp: Optional[int] = None) -> AFKEntry:
+        entry = AFKEntry(user_id, guild_id, reason, timestamp if timestamp is not None else int(time.time()))
+        self._entries[(user_id, guild_id)] = entry
+        return entry
+
+    def pop(self, user_id: int, guild_id: int) -> Optional[AFKEntry]:
+        return self._entries.pop((user_id, guild_id), None)
+
+    def expired(self, max_age_seconds: int) -> List[AFKEntry]:
+        cutoff = int(time.time()) - max_age_seconds
+        return [entry for entry in self._entries.values() if entry.timestamp < cutoff]
+
+    # =========================================================================
+    # Mention Counters
+    # =========================================================================
+
+    def add_mention(self, user_id: int, guild_id: int, pinger_id: int, pinger_name: str) -> None:
+        pending = self._pending.setdefault((user_id, guild_id), _PendingMentions())
+        pending.count += 1
+        if pinger_id and pinger_name:
+            pending.pingers[pinger_id] = (pinger_name, int(time.time()))
+
+    def discard_mentions(self, user_id: int, guild_id: int) -> None:
+        """Drop unflushed mentions for a user whose AFK ended without a return."""
+        self._pending.pop((user_id, guild_id), None)
+
+    def flush(self) -> int:
+        """Write pending mention counters to the database. Returns entries written."""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        batch = [
+            (user_id, guild_id, mentions.count, [
+                (pinger_id, name, timestamp) for pinger_id, (name, timestamp) in mentions.pingers.items()
+            ])
+            for (user_id, guild_id), mentions in pending.items()
+        ]
+        if not db.add_afk_mentions_batch(batch):
+            # Keep them for the next flush (merging with anything added since)
+            for key, mentions in pending.items():
+                current = self._pending.setdefault(key, _PendingMentions())
+                current.count += mentions.count
+                current.pingers = {**mentions.pingers, **current.pingers}
+            return 0
+
+        logger.tree("AFK Mentions Flushed", [
+            ("Users", str(len(batch))),
+            ("Mentions", str(sum(count for _, _, count, _ in batch))),
+        ], emoji="📬")
+        return len(batch)
+
+
+__all__ = ["AFKRegistry", "AFKEntry"]
@@ -20,10 +20,12 @@ from src.core.colors import COLOR_GOLD, COLOR_NEUTRAL
 from src.core.logger import logger
 from src.services.actions import action_service
 from src.services.database import db
+from .registry import AFKRegistry
 
 # Constants
 EMOJI_ZZZ = "💤"
 AFK_EXPIRY_SECONDS = 7 * 24 * 60 * 60  # 7 days
+AFK_MENTION_FLUSH_SECONDS = 30  # Write-behind interval for mention counters
 
 
 class AFKService:
@@ -35,6 +37,8 @@ class AFKService:
         Tracks mentions while away with pinger attribution.
         Auto-removes AFK on first message with welcome back notification.
         Supports emoji shortcodes in AFK reasons.
+        Who is AFK lives in an AFKRegistry loaded at startup, so a message
+        from a non-AFK author with no AFK mentions does no database I/O.
     """
 
     def __init__(self, bot: commands.Bot) -> None:
@@ -45,31 +49,46 @@ class AFKService:
             bot: Main bot instance for Discord API access.
         """
         self.bot = bot
+        self.registry = AFKRegistry()
 
     async def setup(self) -> None:
         """Initialize the AFK service."""
+        loaded = self.registry.load()
         self._expiry_task.start()
+        self._flush_task.start()
         logger.tree("AFK Service Ready", [
             ("Expiry", "7 days"),
+            ("AFK Users", str(loaded)),
+            ("Mention Flush", f"{AFK_MENTION_FLUSH_SECONDS}s"),
         ], emoji="💤")
 
     def stop(self) -> None:
-        """Stop background tasks."""
+        """Stop background tasks and flush pending mention counters."""
         if self._expiry_task.is_running():
             self._expiry_task.cancel()
+        if self._flush_task.is_running():
+            self._flush_task.cancel()
+        self.registry.flush()
+
+    @tasks.loop(seconds=AFK_MENTION_FLUSH_SECONDS)
+    async def _flush_task(self) -> None:
+        """Persist mention counters accumulated since the last run."""
+        self.registry.flush()
 
     @tasks.loop(hours=1)
     async def _expiry_task(self) -> None:
         """Clear AFK entries older than 7 days and restore nicknames."""
-        expired = db.get_expired_afk_users(AFK_EXPIRY_SECONDS)
+        expired = self.registry.expired(AFK_EXPIRY_SECONDS)
         if not expired:
             return
 
         for entry in expired:
-            user_id = entry["user_id"]
-            guild_id = entry["guild_id"]
+            user_id = entry.user_id
+            guild_id = entry.guild_id
 
-            # Remove from database
+            # Remove from registry and database
+            self.registry.pop(user_id, guild_id)
+            self.registry.discard_mentions(user_id, guild_id)
             db.remove_afk(user_id, guild_id)
             db.get_and_clear_afk_mentions(user_id, guild_id)
 
@@ -105,7 +124,7 @@ class AFKService:
                     ("User", f"{member.name} ({member.display_name})"),
                     ("ID", str(user_id)),
                     ("Guild", guild.name),
-                    ("AFK Since", f"<t:{entry['timestamp']}:R>"),
+                    ("AFK Since", f"<t:{entry.timestamp}:R>"),
                 ], emoji="⏰")
             except discord.Forbidden:
                 logger.tree("AFK Expiry Nickname Failed", [
@@ -211,12 +230,13 @@ class AFKService:
         if len(converted_reason) > 200:
             converted_reason = converted_reason[:197] + "..."
 
-        # Set in database
+        # Set in database and registry
         db.set_afk(
             user_id=member.id,
             guild_id=member.guild.id,
             reason=converted_reason
         )
+        self.registry.set(member.id, member.guild.id, converted_reason)
         logger.tree("AFK Status Set", [
             ("User", f"{member.name} ({member.display_name})"),
             ("ID", str(member.id)),
@@ -261,10 +281,11 @@ class AFKService:
 
         guild_id = message.guild.id
 
-        # Check if author is AFK and remove it (returns timestamp if was AFK)
-        afk_data = db.remove_afk(message.author.id, guild_id)
-        if afk_data:
-            await self._handle_return(message, guild_id, afk_data.get("timestamp", 0))
+        # Check if author is AFK and remove it (in-memory check, DB only on return)
+        entry = self.registry.pop(message.author.id, guild_id)
+        if entry:
+            db.remove_afk(message.author.id, guild_id)
+            await self._handle_return(message, guild_id, entry.timestamp)
 
         # Check if any mentioned users are AFK
         await self._handle_mentions(message, guild_id)
@@ -272,6 +293,7 @@ class AFKService:
     async def _handle_return(self, message: discord.Message, guild_id: int, afk_timestamp: int) -> None:
         """Handle user returning from AFK."""
         # Get mention count and pinger names while they were AFK
+        self.registry.flush()
         mention_count, pinger_names = db.get_and_clear_afk_mentions(message.author.id, guild_id)
 
         # Calculate AFK duration
@@ -383,18 +405,18 @@ class AFKService:
         if not mentioned_ids:
             return
 
-        # Query AFK status for all mentioned users at once
-        afk_users = db.get_afk_users(mentioned_ids, guild_id)
+        # Look up AFK status for all mentioned users at once
+        afk_users = self.registry.get_many(mentioned_ids, guild_id)
         if not afk_users:
             return
 
         # Build notification lines and track mentions
         afk_lines = []
         afk_members = []
-        for afk_data in afk_users:
-            user_id = afk_data["user_id"]
-            reason = afk_data["reason"]
-            timestamp = afk_data["timestamp"]
+        for entry in afk_users:
+            user_id = entry.user_id
+            reason = entry.reason
+            timestamp = entry.timestamp
 
             member = message.guild.get_member(user_id)
             if not member:
@@ -412,7 +434,7 @@ class AFKService:
             else:
                 afk_lines.append(f"{EMOJI_ZZZ} **{member.display_name}** is AFK (<t:{timestamp}:R>)")
 
-            db.increment_afk_mentions(
+            self.registry.add_mention(
                 user_id,
                 guild_id,
                 pinger_id=message.author.id,
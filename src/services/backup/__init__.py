@@ -21,6 +21,14 @@ from .base import (
     send_backup_notification,
 )
 
+from .engine import (
+    BackupEngine,
+    BackupError,
+    LocalRemote,
+    RcloneRemote,
+    make_remote,
+)
+
 from .integrity import (
     check_integrity,
     auto_repair,
@@ -31,6 +39,11 @@ __all__ = [
     "BackupScheduler",
     "R2BackupScheduler",
     "send_backup_notification",
+    "BackupEngine",
+    "BackupError",
+    "LocalRemote",
+    "RcloneRemote",
+    "make_remote",
     "check_integrity",
     "auto_repair",
     "check_and_repair",
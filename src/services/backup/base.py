@@ -10,8 +10,6 @@ Server: discord.gg/syria
 """
 
 import asyncio
-import shutil
-import sqlite3
 import subprocess
 import tempfile
 from datetime import datetime, timedelta
@@ -22,7 +20,17 @@ from src.core.logger import logger
 from src.core.constants import TIMEZONE_EST
 from src.utils.async_utils import create_safe_task
 from src.utils.http import http_session, FAST_TIMEOUT
+from src.services.backup.engine import (
+    BackupEngine,
+    BackupError,
+    RcloneRemote,
+    SNAPSHOTS_DIR,
+    SNAPSHOT_NAME_FORMAT,
+    make_remote,
+    snapshot_database,
+)
 from src.services.backup.integrity import check_and_repair
+
 DEFAULT_RETENTION_HOURS = 48  # Keep 48 hourly backups (2 days)
 SECONDS_PER_HOUR = 3600
 
@@ -116,6 +124,7 @@ async def send_backup_notification(result: Optional[Dict[str, Any]]) -> None:
             [
                 ("Bot", result["bot_name"]),
                 ("Size", result["size"]),
+                ("Uploaded", f"{result['uploaded']} ({result['chunks']} chunks)"),
                 ("Retention", f"{result['retention_hours']} hours"),
                 ("Integrity", "Verified \u2713"),
             ],
@@ -152,7 +161,10 @@ class R2BackupScheduler:
     """
     Hourly backup scheduler with direct R2 upload.
 
-    No local storage - creates temp file, uploads to R2, deletes temp file.
+    No local storage - snapshots into a temp file, uploads the chunks the
+    remote doesn't have yet (see BackupEngine), deletes the temp file.
+    `remote` overrides the R2 target with another rclone remote or a
+    plain directory.
     """
 
     def __init__(
@@ -162,6 +174,7 @@ class R2BackupScheduler:
         r2_bucket: str = "bot-backups",
         retention_hours: int = DEFAULT_RETENTION_HOURS,
         webhook_url: Optional[str] = None,
+        remote: Optional[str] = None,
     ) -> None:
         self._db_path = Path(database_path)
         self._bot_name = bot_name.lower()
@@ -169,6 +182,7 @@ class R2BackupScheduler:
         self._r2_bucket = r2_bucket
         self._retention_hours = retention_hours
         self._webhook_url = webhook_url
+        self._engine = BackupEngine(make_remote(remote or f"r2:{r2_bucket}/{self._bot_display}"))
         self._tz = TIMEZONE_EST
         self._task: Optional[asyncio.Task] = None
         self._running = False
@@ -198,58 +212,53 @@ class R2BackupScheduler:
             ])
             return {**base_result, "success": False, "error": "corruption", "integrity_msg": integrity_msg[:100]}
 
-        # Create temp backup file with clean path structure
-        # Format: Syria/2026-02-25/8PM.db
-        now = datetime.now(self._tz)
-        date_folder = now.strftime("%Y-%m-%d")
-        hour = now.strftime("%-I%p")  # e.g., "8PM", "12AM"
-        backup_filename = f"{hour}.db"
-        r2_folder = f"{self._bot_display}/{date_folder}"
+        # Snapshot name sorts chronologically: Syria/snapshots/2026-02-25T20.json
+        name = datetime.now(self._tz).strftime(SNAPSHOT_NAME_FORMAT)
+        snapshot_path = f"{SNAPSHOTS_DIR}/{name}.json"
 
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir) / backup_filename
+            temp_path = Path(temp_dir) / "snapshot.db"
 
             try:
-                # Copy database to temp
-                # Use SQLite backup API for consistent snapshot (safe with WAL + concurrent writes)
-                src_conn = sqlite3.connect(str(self._db_path), timeout=30)
-                dst_conn = sqlite3.connect(str(temp_path))
-                src_conn.backup(dst_conn)
-                dst_conn.close()
-                src_conn.close()
-                backup_size = temp_path.stat().st_size
-                size_str = _format_size(backup_size)
-
-                # Upload to R2 using rclone
-                r2_path = f"r2:{self._r2_bucket}/{r2_folder}/{backup_filename}"
-                result = subprocess.run(
-                    ["rclone", "copyto", str(temp_path), r2_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                )
+                # Stepped SQLite backup API: consistent snapshot without blocking writers
+                steps = snapshot_database(self._db_path, temp_path)
 
-                if result.returncode != 0:
-                    error_msg = result.stderr.strip() or "Upload failed"
-                    logger.tree("R2 Upload Failed", [
-                        ("Bot", self._bot_display),
-                        ("Path", r2_path),
-                        ("Error", error_msg[:100]),
-                    ], emoji="❌")
-                    return {**base_result, "success": False, "error": "upload_failed", "error_msg": error_msg}
+                # Chunk, compress and upload what the remote doesn't have yet
+                stats = self._engine.backup(temp_path, name)
+                size_str = _format_size(stats.size)
+                uploaded_str = _format_size(stats.uploaded)
+                chunks_str = f"{stats.new_chunks}/{stats.chunks} new"
 
                 logger.tree("R2 Backup Uploaded", [
                     ("Bot", self._bot_display),
-                    ("Path", f"{r2_folder}/{backup_filename}"),
+                    ("Path", snapshot_path),
                     ("Size", size_str),
+                    ("Chunks", chunks_str),
+                    ("Uploaded", uploaded_str),
+                    ("Copy Steps", str(steps)),
                 ], emoji="\u2601\ufe0f")
 
-                return {**base_result, "success": True, "size": size_str, "filename": backup_filename, "r2_path": f"{r2_folder}/{backup_filename}"}
-
+                return {
+                    **base_result,
+                    "success": True,
+                    "size": size_str,
+                    "uploaded": uploaded_str,
+                    "chunks": chunks_str,
+                    "filename": name,
+                    "r2_path": snapshot_path,
+                }
+
+            except BackupError as e:
+                logger.tree("R2 Upload Failed", [
+                    ("Bot", self._bot_display),
+                    ("Remote", str(self._engine.remote)),
+                    ("Error", str(e)[:100]),
+                ], emoji="❌")
+                return {**base_result, "success": False, "error": "upload_failed", "error_msg": str(e)}
             except subprocess.TimeoutExpired as e:
                 logger.error_tree("R2 Upload Timeout", e, [
                     ("Bot", self._bot_display),
-                    ("Path", r2_path),
+                    ("Path", snapshot_path),
                 ])
                 return {**base_result, "success": False, "error": "upload_failed", "error_msg": "Timeout"}
             except Exception as e:
@@ -259,22 +268,28 @@ class R2BackupScheduler:
                 return {**base_result, "success": False, "error": "upload_failed", "error_msg": str(e)}
 
     def _cleanup_old_backups(self) -> int:
-        """Remove R2 backups older than retention period."""
+        """Remove snapshots older than retention period and chunks nothing references."""
+        keep_from = (datetime.now(self._tz) - timedelta(hours=self._retention_hours)).strftime(SNAPSHOT_NAME_FORMAT)
         try:
-            r2_path = f"r2:{self._r2_bucket}/{self._bot_display}/"
-            result = subprocess.run(
-                ["rclone", "delete", r2_path, f"--min-age={self._retention_hours}h", "--rmdirs"],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-
-            if result.returncode == 0:
-                logger.tree("R2 Cleanup Complete", [
-                    ("Bot", self._bot_display),
-                    ("Retention", f"{self._retention_hours} hours"),
-                ], emoji="\U0001f9f9")
-            return 0
+            snapshots, chunks = self._engine.prune(keep_from)
+
+            if isinstance(self._engine.remote, RcloneRemote):
+                # Whole-file copies from before incremental backups (Syria/2026-02-25/8PM.db)
+                subprocess.run(
+                    ["rclone", "delete", self._engine.remote.base, f"--min-age={self._retention_hours}h",
+                     "--include", "/*/*.db"],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+
+            logger.tree("R2 Cleanup Complete", [
+                ("Bot", self._bot_display),
+                ("Retention", f"{self._retention_hours} hours"),
+                ("Snapshots Removed", str(snapshots)),
+                ("Chunks Removed", str(chunks)),
+            ], emoji="\U0001f9f9")
+            return snapshots
         except Exception as e:
             logger.error_tree("R2 Cleanup Failed", e, [
                 ("Bot", self._bot_display),
@@ -311,7 +326,7 @@ class R2BackupScheduler:
             ("Bot", self._bot_display),
             ("Schedule", "Every hour"),
             ("Retention", f"{self._retention_hours} hours"),
-            ("Bucket", f"{self._r2_bucket}/{self._bot_name}"),
+            ("Remote", str(self._engine.remote)),
         ], emoji="\u2601\ufe0f")
 
     async def stop(self) -> None:
@@ -0,0 +1,487 @@
+"""
+SyriaBot - Incremental Backup Engine
+====================================
+
+Content-addressed, compressed SQLite snapshots.
+
+Each hourly snapshot is split into content-defined chunks. Every chunk is
+stored once, compressed, under its SHA-256; a small manifest per snapshot
+lists the chunks that rebuild it. An hour in which a few rows changed
+uploads a few chunks instead of the whole database.
+
+Remote layout (under the bot's folder):
+    chunks/ab/ab12...ef.zst           one chunk, named by its content hash
+    snapshots/2026-02-25T20.json      manifest for one hourly snapshot
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+from src.core.logger import logger
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+SNAPSHOT_NAME_FORMAT = "%Y-%m-%dT%H"  # Sorts chronologically as a string
+SNAPSHOT_STEP_PAGES = 256             # Pages copied per backup() step (1 MB at 4 KB pages)
+SNAPSHOT_STEP_SLEEP = 0.005           # Pause between steps so writers can take the lock
+SNAPSHOT_MAX_RESTARTS = 3             # Source changed mid-copy this often -> copy in one step
+
+CHUNK_MIN_BYTES = 64 * 1024
+CHUNK_AVG_BYTES = 256 * 1024
+CHUNK_MAX_BYTES = 1024 * 1024
+
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+RCLONE_TIMEOUT = 300
+
+CHUNKS_DIR = "chunks"
+SNAPSHOTS_DIR = "snapshots"
+MANIFEST_VERSION = 1
+
+
+class BackupError(Exception):
+    """A backup, prune or restore step failed."""
+
+
+class _SnapshotContended(Exception):
+    """The source kept changing under a stepped backup."""
+
+
+# =============================================================================
+# Snapshot
+# =============================================================================
+
+def snapshot_database(source: Path, dest: Path) -> int:
+    """
+    Consistent copy of a live database, taken in small steps.
+
+    Copies SNAPSHOT_STEP_PAGES pages per step and sleeps in between, so
+    the bot's writers are never blocked for the whole copy. A write from
+    another connection restarts the copy; after SNAPSHOT_MAX_RESTARTS it
+    falls back to a single-step copy.
+
+    Returns:
+        Number of steps taken (1 for the fallback).
+    """
+    state: Dict[str, Any] = {"steps": 0, "restarts": 0, "remaining": None}
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        state["steps"] += 1
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > SNAPSHOT_MAX_RESTARTS:
+                raise _SnapshotContended()
+        state["remaining"] = remaining
+        if remaining:
+            time.sleep(SNAPSHOT_STEP_SLEEP)
+
+    src_conn = sqlite3.connect(str(source), timeout=30)
+    try:
+        dst_conn = sqlite3.connect(str(dest))
+        try:
+            src_conn.backup(dst_conn, pages=SNAPSHOT_STEP_PAGES, progress=progress)
+            return state["steps"]
+        except _SnapshotContended:
+            logger.tree("Stepped Backup Contended", [
+                ("Database", source.name),
+                ("Restarts", str(state["restarts"])),
+                ("Fallback", "Single-step copy"),
+            ], emoji="⚠️")
+            src_conn.backup(dst_conn)
+            return 1
+        finally:
+            dst_conn.close()
+    finally:
+        src_conn.close()
+
+
+# =============================================================================
+# Chunking & Compression
+# =============================================================================
+
+def _page_size(path: Path) -> int:
+    """Page size from the SQLite header (1 encodes 65536)."""
+    with open(path, "rb") as f:
+        header = f.read(100)
+    size = int.from_bytes(header[16:18], "big")
+    return 65536 if size == 1 else size or 4096
+
+
+def iter_chunks(path: Path) -> Iterator[bytes]:
+    """
+    Split a database file into content-defined chunks on page boundaries.
+
+    A chunk ends after a page whose CRC-32 hits the boundary mask, within
+    the min/max bounds. Boundaries follow page contents rather than file
+    offsets, so rewriting pages only changes the chunks around them.
+    SQLite never shifts bytes within a file, which makes whole pages the
+    natural unit and keeps chunking at CRC speed instead of a byte-wise
+    rolling hash in Python.
+    """
+    page_size = _page_size(path)
+    min_pages = max(1, CHUNK_MIN_BYTES // page_size)
+    max_pages = max(min_pages, CHUNK_MAX_BYTES // page_size)
+    mask = max(1, CHUNK_AVG_BYTES // page_size) - 1
+
+    pages: List[bytes] = []
+    with open(path, "rb") as f:
+        while page := f.read(page_size):
+            pages.append(page)
+            count = len(pages)
+            if count >= max_pages or (count >= min_pages and zlib.crc32(page) & mask == 0):
+                yield b"".join(pages)
+                pages = []
+    if pages:
+        yield b"".join(pages)
+
+
+def _compressor() -> Tuple[Callable[[bytes], bytes], str]:
+    """Chunk compressor and its file extension (zstd when installed)."""
+    if ZSTD_AVAILABLE:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress, ".zst"
+    return lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0), ".gz"
+
+
+def _decompress(data: bytes, path: str) -> bytes:
+    if path.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise BackupError("zstandard is required to restore .zst chunks")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _chunk_path(digest: str, ext: str) -> str:
+    return f"{CHUNKS_DIR}/{digest[:2]}/{digest}{ext}"
+
+
+def _snapshot_name(path: str) -> str:
+    return Path(path).name.removesuffix(".json")
+
+
+# =============================================================================
+# Remotes
+# =============================================================================
+
+class BackupRemote(ABC):
+    """Storage for chunks and manifests. Paths are relative and '/'-separated."""
+
+    @abstractmethod
+    def list(self, prefix: str) -> List[str]:
+        """All file paths under prefix (including the prefix)."""
+        pass
+
+    @abstractmethod
+    def upload(self, staging: Path) -> None:
+        """Copy a local tree onto the remote, merging with what's there."""
+        pass
+
+    @abstractmethod
+    def download(self, paths: List[str], dest: Path) -> None:
+        """Copy the given files into dest, keeping their relative paths."""
+        pass
+
+    @abstractmethod
+    def delete(self, paths: List[str]) -> None:
+        """Remove the given files; missing ones are ignored."""
+        pass
+
+
+class LocalRemote(BackupRemote):
+    """A plain directory (local testing, or a mounted volume)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def __str__(self) -> str:
+        return str(self.root)
+
+    def list(self, prefix: str) -> List[str]:
+        base = self.root / prefix
+        if not base.exists():
+            return []
+        return sorted(p.relative_to(self.root).as_posix() for p in base.rglob("*") if p.is_file())
+
+    def upload(self, staging: Path) -> None:
+        for source in staging.rglob("*"):
+            if not source.is_file():
+                continue
+            target = self.root / source.relative_to(staging)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(target.name + ".partial")
+            shutil.copyfile(source, partial)
+            os.replace(partial, target)
+
+    def download(self, paths: List[str], dest: Path) -> None:
+        for path in paths:
+            target = dest / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.root / path, target)
+
+    def delete(self, paths: List[str]) -> None:
+        for path in paths:
+            (self.root / path).unlink(missing_ok=True)
+
+
+class RcloneRemote(BackupRemote):
+    """An rclone remote such as r2:bot-backups/Syria."""
+
+    def __init__(self, base: str) -> None:
+        self.base = base.rstrip("/")
+
+    def __str__(self) -> str:
+        return self.base
+
+    def _run(self, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ["rclone", *args],
+            capture_output=True,
+            text=True,
+            timeout=RCLONE_TIMEOUT,
+        )
+
+    def _check(self, result: subprocess.CompletedProcess, action: str) -> str:
+        if result.returncode != 0:
+            raise BackupError(result.stderr.strip()[:200] or f"rclone {action} failed")
+        return result.stdout
+
+    def _with_file_list(self, paths: List[str], *args: str) -> str:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as listing:
+            listing.write("\n".join(paths) + "\n")
+            listing.flush()
+            return self._check(self._run(*args, "--files-from-raw", listing.name), args[0])
+
+    def list(self, prefix: str) -> List[str]:
+        result = self._run("lsf", "-R", "--files-only", f"{self.base}/{prefix}")
+        if result.returncode != 0 and "directory not found" in result.stderr:
+            return []
+        return [f"{prefix}/{line}" for line in self._check(result, "lsf").splitlines() if line]
+
+    def upload(self, staging: Path) -> None:
+        self._check(self._run("copy", str(staging), self.base), "copy")
+
+    def download(self, paths: List[str], dest: Path) -> None:
+        self._with_file_list(paths, "copy", self.base, str(dest), "--no-traverse")
+
+    def delete(self, paths: List[str]) -> None:
+        if paths:
+            self._with_file_list(paths, "delete", self.base)
+
+
+def make_remote(spec: str) -> BackupRemote:
+    """rclone remote for "name:path" specs, a plain directory otherwise."""
+    if spec.startswith(("/", ".", "~")) or ":" not in spec:
+        return LocalRemote(Path(spec).expanduser())
+    return RcloneRemote(spec)
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+@dataclass
+class BackupStats:
+    """Result of one incremental backup."""
+    name: str
+    size: int           # Snapshot bytes
+    sha256: str
+    chunks: int
+    new_chunks: int
+    uploaded: int       # Compressed bytes sent
+
+
+class BackupEngine:
+    """
+    Incremental snapshot store on a BackupRemote.
+
+    DESIGN:
+        Chunks are uploaded first and the manifest last, so a manifest
+        only ever references chunks that exist; a run that dies halfway
+        leaves unreferenced chunks that the next prune collects. Only
+        chunks missing from the remote listing are compressed at all.
+        Pruning never drops the newest snapshot.
+    """
+
+    def __init__(self, remote: BackupRemote) -> None:
+        self.remote = remote
+
+    def _known_chunks(self) -> Dict[str, str]:
+        """Content hash -> remote path for every stored chunk."""
+        return {Path(path).name.split(".")[0]: path for path in self.remote.list(CHUNKS_DIR)}
+
+    def list_snapshots(self) -> List[str]:
+        """Snapshot names, oldest first."""
+        return sorted(
+            _snapshot_name(path) for path in self.remote.list(SNAPSHOTS_DIR) if path.endswith(".json")
+        )
+
+    def backup(self, snapshot: Path, name: str) -> BackupStats:
+        """Store a snapshot file under name, uploading only new chunks."""
+        known = self._known_chunks()
+        compress, ext = _compressor()
+        file_hash = hashlib.sha256()
+        chunk_paths: List[str] = []
+        size = new_chunks = uploaded = 0
+
+        with tempfile.TemporaryDirectory(prefix="backup-") as temp_dir:
+            chunk_staging = Path(temp_dir) / "chunks"
+            manifest_staging = Path(temp_dir) / "manifest"
+
+            for chunk in iter_chunks(snapshot):
+                file_hash.update(chunk)
+                size += len(chunk)
+                digest = hashlib.sha256(chunk).hexdigest()
+                path = known.get(digest)
+                if path is None:
+                    path = _chunk_path(digest, ext)
+                    data = compress(chunk)
+                    target = chunk_staging / path
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(data)
+                    known[digest] = path
+                    new_chunks += 1
+                    uploaded += len(data)
+                chunk_paths.append(path)
+
+            if new_chunks:
+                self.remote.upload(chunk_staging)
+
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "name": name,
+                "created": int(time.time()),
+                "size": size,
+                "sha256": file_hash.hexdigest(),
+                "chunks": chunk_paths,
+            }
+            manifest_file = manifest_staging / SNAPSHOTS_DIR / f"{name}.json"
+            manifest_file.parent.mkdir(parents=True)
+            manifest_file.write_text(json.dumps(manifest, separators=(",", ":")))
+            self.remote.upload(manifest_staging)
+
+        return BackupStats(
+            name=name,
+            size=size,
+            sha256=manifest["sha256"],
+            chunks=len(chunk_paths),
+            new_chunks=new_chunks,
+            uploaded=uploaded,
+        )
+
+    def _read_manifests(self, paths: List[str]) -> List[Dict[str, Any]]:
+        with tempfile.TemporaryDirectory(prefix="backup-") as temp_dir:
+            self.remote.download(paths, Path(temp_dir))
+            return [json.loads((Path(temp_dir) / path).read_text()) for path in paths]
+
+    def prune(self, keep_from: str) -> Tuple[int, int]:
+        """
+        Drop snapshots named before keep_from, then chunks nothing references.
+
+        Returns:
+            (snapshots deleted, chunks deleted)
+        """
+        manifests = sorted(path for path in self.remote.list(SNAPSHOTS_DIR) if path.endswith(".json"))
+        if not manifests:
+            return 0, 0
+
+        # The newest snapshot always survives, however old it is
+        expired = [path for path in manifests[:-1] if _snapshot_name(path) < keep_from]
+        kept = [path for path in manifests if path not in expired]
+
+        if expired:
+            self.remote.delete(expired)
+
+        referenced = {chunk for manifest in self._read_manifests(kept) for chunk in manifest["chunks"]}
+        orphans = [path for path in self.remote.list(CHUNKS_DIR) if path not in referenced]
+        self.remote.delete(orphans)
+
+        return len(expired), len(orphans)
+
+    def restore(self, name: str, output: Path) -> Tuple[bool, str]:
+        """
+        Rebuild a snapshot into output and verify it.
+
+        The file is assembled next to output, checked against the manifest's
+        size and SHA-256, then opened for PRAGMA quick_check; it replaces
+        output only if everything passes.
+
+        Returns:
+            (ok, message) where message is quick_check's result or the failure.
+        """
+        manifest_path = f"{SNAPSHOTS_DIR}/{name}.json"
+        if manifest_path not in self.remote.list(SNAPSHOTS_DIR):
+            raise BackupError(f"Snapshot not found: {name}")
+        manifest = self._read_manifests([manifest_path])[0]
+
+        partial = output.with_name(output.name + ".partial")
+        try:
+            with tempfile.TemporaryDirectory(prefix="restore-") as temp_dir:
+                chunk_dir = Path(temp_dir)
+                self.remote.download(sorted(set(manifest["chunks"])), chunk_dir)
+
+                file_hash = hashlib.sha256()
+                size = 0
+                with open(partial, "wb") as f:
+                    for path in manifest["chunks"]:
+                        chunk = _decompress((chunk_dir / path).read_bytes(), path)
+                        file_hash.update(chunk)
+                        size += len(chunk)
+                        f.write(chunk)
+
+            if size != manifest["size"] or file_hash.hexdigest() != manifest["sha256"]:
+                return False, "Checksum mismatch"
+
+            conn = sqlite3.connect(str(partial))
+            try:
+                result = conn.execute("PRAGMA quick_check;").fetchone()[0]
+            finally:
+                conn.close()
+            if result != "ok":
+                return False, str(result)
+
+            os.replace(partial, output)
+            return True, result
+        finally:
+            partial.unlink(missing_ok=True)
+
+
+# =============================================================================
+# Module Export
+# =============================================================================
+
+__all__ = [
+    "BackupEngine",
+    "BackupError",
+    "BackupRemote",
+    "BackupStats",
+    "LocalRemote",
+    "RcloneRemote",
+    "make_remote",
+    "snapshot_database",
+    "iter_chunks",
+    "SNAPSHOT_NAME_FORMAT",
+    "ZSTD_AVAILABLE",
+]
@@ -37,6 +37,7 @@ class BackupScheduler:
             r2_bucket=R2_BUCKET,
             retention_hours=RETENTION_HOURS,
             webhook_url=os.getenv("BACKUP_WEBHOOK_URL"),
+            remote=os.getenv("BACKUP_REMOTE"),  # e.g. /mnt/backups/Syria for local testing
         )
 
     async def start(self) -> None:
@@ -0,0 +1,172 @@
+"""
+SyriaBot - Birthday Index
+=========================
+
+In-memory birthday calendar and birthday role expiry heap.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import calendar
+import heapq
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from src.core.constants import TIMEZONE_EST
+
+
+# Birthday role duration (24 hours in seconds)
+BIRTHDAY_ROLE_DURATION = 24 * 60 * 60
+
+LEAP_DAY = (2, 29)
+
+
+class Birthday(NamedTuple):
+    month: int
+    day: int
+    year: Optional[int]
+
+
+def local_date(moment: Optional[datetime] = None) -> date:
+    """
+    Calendar date in the server's timezone (America/New_York).
+
+    Birthdays are calendar dates, not instants: whether it is someone's
+    birthday depends on the EST/EDT date, never the UTC one.
+    """
+    moment = moment or datetime.now(TIMEZONE_EST)
+    if moment.tzinfo is None:
+        raise ValueError("local_date needs an aware datetime")
+    return moment.astimezone(TIMEZONE_EST).date()
+
+
+def celebrated_keys(day: date) -> List[Tuple[int, int]]:
+    """
+    (month, day) keys whose birthday is celebrated on this date.
+
+    Feb 29 birthdays are celebrated on Feb 28 in common years, so they
+    still get one celebration every year.
+    """
+    keys = [(day.month, day.day)]
+    if (day.month, day.day) == (2, 28) and not calendar.isleap(day.year):
+        keys.append(LEAP_DAY)
+    return keys
+
+
+class BirthdayIndex:
+    """
+    (month, day) -> users, plus a min-heap of role expiries.
+
+    DESIGN:
+        Loaded once from the birthdays table and kept in step by the
+        service's set/remove/grant/clear paths, so the daily check is a
+        dict lookup instead of a query plus a get_birthday per user.
+        Active grants live in _granted (user -> granted_at) and in a heap
+        of (expires_at, user_id). Entries are never removed from the heap
+        in place: clearing or regranting just changes _granted, and a
+        popped entry whose timestamp no longer matches is skipped. The
+        earliest live expiry is therefore always heap[0] after pruning,
+        which is what the expiry timer sleeps until.
+    """
+
+    def __init__(self) -> None:
+        self._birthdays: Dict[int, Birthday] = {}
+        self._by_date: Dict[Tuple[int, int], Set[int]] = {}
+        self._granted: Dict[int, int] = {}
+        self._expiries: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._birthdays)
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Replace the index with birthdays table rows."""
+        self._birthdays.clear()
+        self._by_date.clear()
+        self._granted.clear()
+        self._expiries.clear()
+        for row in rows:
+            self.add(row["user_id"], row["birth_month"], row["birth_day"], row.get("birth_year"))
+            if row.get("role_granted_at"):
+                self.grant(row["user_id"], row["role_granted_at"])
+
+    # =========================================================================
+    # Calendar
+    # =========================================================================
+
+    def add(self, user_id: int, month: int, day: int, year: Optional[int] = None) -> None:
+        self.remove(user_id)
+        self._birthdays[user_id] = Birthday(month, day, year)
+        self._by_date.setdefault((month, day), set()).add(user_id)
+
+    def remove(self, user_id: int) -> None:
+        """Forget a birthday. An active grant stays so its role still expires."""
+        birthday = self._birthdays.pop(user_id, None)
+        if birthday is None:
+            return
+        users = self._by_date.get((birthday.month, birthday.day))
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self._by_date[(birthday.month, birthday.day)]
+
+    def get(self, user_id: int) -> Optional[Birthday]:
+        return self._birthdays.get(user_id)
+
+    def birthdays_on(self, day: date) -> List[int]:
+        """Users whose birthday is celebrated on this (local) date, in ID order."""
+        users: Set[int] = set()
+        for key in celebrated_keys(day):
+            users |= self._by_date.get(key, set())
+        return sorted(users)
+
+    def age_on(self, user_id: int, day: date) -> Optional[int]:
+        birthday = self._birthdays.get(user_id)
+        if birthday is None or not birthday.year:
+            return None
+        return day.year - birthday.year
+
+    # =========================================================================
+    # Role Expiry
+    # =========================================================================
+
+    def grant(self, user_id: int, granted_at: int) -> None:
+        self._granted[user_id] = granted_at
+        heapq.heappush(self._expiries, (granted_at + BIRTHDAY_ROLE_DURATION, user_id))
+
+    def clear(self, user_id: int) -> None:
+        self._granted.pop(user_id, None)
+
+    def is_granted(self, user_id: int) -> bool:
+        return user_id in self._granted
+
+    def active(self) -> List[int]:
+        return list(self._granted)
+
+    def _prune(self) -> None:
+        heap = self._expiries
+        while heap:
+            expires_at, user_id = heap[0]
+            granted_at = self._granted.get(user_id)
+            if granted_at is not None and granted_at + BIRTHDAY_ROLE_DURATION == expires_at:
+                return
+            heapq.heappop(heap)
+
+    def next_expiry(self) -> Optional[int]:
+        """Unix time of the earliest active grant's expiry."""
+        self._prune()
+        return self._expiries[0][0] if self._expiries else None
+
+    def pop_expired(self, now: float) -> List[int]:
+        """Clear and return every grant that has expired by now."""
+        expired = []
+        while True:
+            self._prune()
+            if not self._expiries or self._expiries[0][0] > now:
+                return expired
+            _, user_id = heapq.heappop(self._expiries)
+            del self._granted[user_id]
+            expired.append(user_id)
+
+
+__all__ = ["BIRTHDAY_ROLE_DURATION", "Birthday", "BirthdayIndex", "celebrated_keys", "local_date"]
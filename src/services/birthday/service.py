@@ -18,8 +18,8 @@ Server: discord.gg/syria
 import asyncio
 import calendar
 import time
-from datetime import datetime, time as dt_time
-from typing import TYPE_CHECKING, Optional, Tuple, Set
+from datetime import date, datetime, time as dt_time
+from typing import TYPE_CHECKING, List, Optional, Tuple, Set
 
 import discord
 from discord.ext import tasks
@@ -29,12 +29,15 @@ from src.core.colors import COLOR_SYRIA_GREEN
 from src.core.constants import TIMEZONE_EST
 from src.core.logger import logger
 from src.services.database import db
+from src.utils.async_utils import create_safe_task
+
+from .index import BirthdayIndex, local_date
 
 if TYPE_CHECKING:
     from src.bot import SyriaBot
 
-# Birthday role duration (24 hours in seconds)
-BIRTHDAY_ROLE_DURATION = 24 * 60 * 60
+# Daily check at 5:00 AM server time (follows EST/EDT)
+BIRTHDAY_CHECK_TIME = dt_time(hour=5, minute=0, tzinfo=TIMEZONE_EST)
 
 # Birthday rewards
 BIRTHDAY_COINS = 100_000
@@ -57,8 +60,12 @@ class BirthdayService:
 
     DESIGN:
         Users set their birthday once via /birthday set.
-        Daily check at 5:00 AM EST grants birthday role for 24 hours.
+        Daily check at 5:00 AM server time grants birthday role for 24 hours.
         Birthday users get 3x XP and coin rewards via DM.
+        Birthdays and active grants are served from a BirthdayIndex loaded
+        at startup: the daily check is one calendar lookup plus one
+        batched DB write, and each role is removed by a timer sleeping
+        until the earliest expiry instead of an hourly table scan.
     """
 
     def __init__(self, bot: "SyriaBot") -> None:
@@ -72,13 +79,16 @@ class BirthdayService:
         self._birthday_role_id: Optional[int] = None
         self._announcement_channel_id: Optional[int] = None
         self._enabled = False
+        self.index = BirthdayIndex()
+        self._expiry_task: Optional[asyncio.Task] = None
+        self._expiry_changed = asyncio.Event()
 
     async def setup(self) -> None:
         """
         Initialize and start the birthday service.
 
-        Validates configuration, starts the daily birthday check task,
-        starts the hourly role expiry check, and restores any active
+        Validates configuration, loads the birthday index, starts the daily
+        birthday check and the role expiry timer, and restores any active
         birthday bonuses from a previous session.
         """
         # Get config - role ID is required, channel is optional
@@ -94,63 +104,77 @@ class BirthdayService:
 
         self._enabled = True
 
-        # Start the daily birthday check
-        self.birthday_check.start()
-
-        # Start role expiry check (runs every hour)
-        self.role_expiry_check.start()
-
-        # Get birthday count for log
-        count = await asyncio.to_thread(db.get_birthday_count, config.GUILD_ID)
+        rows = await asyncio.to_thread(db.get_all_birthdays, config.GUILD_ID)
+        self.index.load(rows)
 
         # Restore active birthday bonus users (in case of restart during birthday)
-        active_birthday_users = await asyncio.to_thread(
-            db.get_active_birthday_roles, config.GUILD_ID
-        )
         async with _birthday_bonus_lock:
-            for user_id in active_birthday_users:
+            for user_id in self.index.active():
                 _birthday_bonus_users.add(user_id)
 
+        # Start the daily birthday check
+        self.birthday_check.start()
+
+        # Start the role expiry timer
+        self._expiry_task = create_safe_task(self._expiry_loop(), "Birthday Role Expiry")
+
+        # Bot was down at check time: today's birthdays still get their day
+        now = datetime.now(TIMEZONE_EST)
+        caught_up = now.time() >= BIRTHDAY_CHECK_TIME.replace(tzinfo=None)
+        if caught_up:
+            create_safe_task(self._catch_up(local_date(now)), "Birthday Catch-up")
+
         logger.tree("Birthday Service Ready", [
             ("Role ID", str(self._birthday_role_id)),
             ("Announce Channel", str(self._announcement_channel_id) if self._announcement_channel_id else "None"),
-            ("Registered Birthdays", str(count)),
+            ("Registered Birthdays", str(len(self.index))),
             ("Active Birthday Bonuses", str(len(_birthday_bonus_users))),
             ("Daily Check", "5:00 AM EST"),
+            ("Catch-up", "Today" if caught_up else "No"),
         ], emoji="🎂")
 
     def stop(self) -> None:
         """Stop the birthday service."""
         if self.birthday_check.is_running():
             self.birthday_check.cancel()
-        if self.role_expiry_check.is_running():
-            self.role_expiry_check.cancel()
+        if self._expiry_task:
+            self._expiry_task.cancel()
         logger.tree("Birthday Service Stopped", [], emoji="🛑")
 
     # =========================================================================
     # Scheduled Tasks
     # =========================================================================
 
-    @tasks.loop(time=dt_time(hour=10, minute=0))  # 10:00 UTC = 5:00 AM EST
+    @tasks.loop(time=BIRTHDAY_CHECK_TIME)
     async def birthday_check(self) -> None:
         """Daily birthday check - grant birthday roles."""
         if not self._enabled:
             return
+        await self._celebrate(local_date())
 
-        now = datetime.now(TIMEZONE_EST)
-        month = now.month
-        day = now.day
+    @birthday_check.before_loop
+    async def before_birthday_check(self) -> None:
+        """Wait for bot to be ready before starting birthday check."""
+        await self.bot.wait_until_ready()
+
+    async def _catch_up(self, day: date) -> None:
+        await self.bot.wait_until_ready()
+        await self._celebrate(day)
+
+    async def _celebrate(self, day: date) -> None:
+        """
+        Grant the birthday role to everyone celebrating on this local date.
 
+        Safe to run more than once for the same day: anyone who already has
+        the role, the bonus or an active grant is skipped.
+        """
+        now = datetime.now(TIMEZONE_EST)
         logger.tree("Birthday Check Starting", [
-            ("Date", f"{MONTH_NAMES[month]} {day}"),
-            ("Time", now.strftime("%I:%M %p EST")),
+            ("Date", f"{MONTH_NAMES[day.month]} {day.day}"),
+            ("Time", now.strftime("%I:%M %p %Z")),
         ], emoji="🎂")
 
-        # Get today's birthdays
-        birthday_user_ids = await asyncio.to_thread(
-            db.get_todays_birthdays, config.GUILD_ID, month, day
-        )
-
+        birthday_user_ids = self.index.birthdays_on(day)
         if not birthday_user_ids:
             logger.tree("Birthday Check Complete", [
                 ("Birthdays Today", "0"),
@@ -172,16 +196,15 @@ class BirthdayService:
             ], emoji="⚠️")
             return
 
-        granted_count = 0
-        current_year = now.year
-
+        # 1. Grant roles
+        granted: List[discord.Member] = []
         for user_id in birthday_user_ids:
             member = guild.get_member(user_id)
             if not member:
                 continue
 
             # Skip if already has the role (prevents double rewards)
-            if role in member.roles:
+            if role in member.roles or self.index.is_granted(user_id):
                 logger.tree("Birthday Role Skipped", [
                     ("User", f"{member.name} ({member.display_name})"),
                     ("Reason", "Already has role"),
@@ -198,39 +221,9 @@ class BirthdayService:
                 ], emoji="⚠️")
                 continue
 
-            # Get birthday data for age calculation
-            birthday_data = await asyncio.to_thread(
-                db.get_birthday, user_id, config.GUILD_ID
-            )
-            age = None
-            if birthday_data and birthday_data.get("birth_year"):
-                age = current_year - birthday_data["birth_year"]
-
             try:
                 await member.add_roles(role, reason="Birthday!")
-                await asyncio.to_thread(
-                    db.set_birthday_role_granted, user_id, config.GUILD_ID, int(time.time())
-                )
-                granted_count += 1
-
-                # Add to birthday bonus users (for 3x XP)
-                async with _birthday_bonus_lock:
-                    _birthday_bonus_users.add(user_id)
-
-                logger.tree("Birthday Role Granted", [
-                    ("User", f"{member.name} ({member.display_name})"),
-                    ("ID", str(user_id)),
-                    ("Birthday", f"{MONTH_NAMES[month]} {day}"),
-                    ("Age", str(age) if age else "Unknown"),
-                    ("Rewards", "3x XP + 100k coins"),
-                ], emoji="🎂")
-
-                # Send announcement
-                await self._announce_birthday(member, age)
-
-                # DM user with rewards and grant coins
-                await self._send_birthday_rewards(member, age)
-
+                granted.append(member)
             except discord.Forbidden as e:
                 logger.error_tree("Birthday Role Grant Failed", e, [
                     ("User", f"{member.name} ({member.display_name})"),
@@ -240,58 +233,91 @@ class BirthdayService:
                     ("User", f"{member.name} ({member.display_name})"),
                 ])
 
+        # 2. Record every grant in one transaction and arm the expiry timer
+        granted_at = int(time.time())
+        if granted:
+            await asyncio.to_thread(
+                db.set_birthday_roles_granted, config.GUILD_ID, [m.id for m in granted], granted_at
+            )
+            async with _birthday_bonus_lock:
+                for member in granted:
+                    self.index.grant(member.id, granted_at)
+                    # Add to birthday bonus users (for 3x XP)
+                    _birthday_bonus_users.add(member.id)
+            self._expiry_changed.set()
+
+        # 3. Announce and reward
+        for member in granted:
+            birthday = self.index.get(member.id)
+            age = self.index.age_on(member.id, day)
+
+            logger.tree("Birthday Role Granted", [
+                ("User", f"{member.name} ({member.display_name})"),
+                ("ID", str(member.id)),
+                ("Birthday", f"{MONTH_NAMES[birthday.month]} {birthday.day}" if birthday else "Unknown"),
+                ("Age", str(age) if age else "Unknown"),
+                ("Rewards", "3x XP + 100k coins"),
+            ], emoji="🎂")
+
+            # Send announcement
+            await self._announce_birthday(member, age)
+
+            # DM user with rewards and grant coins
+            await self._send_birthday_rewards(member, age)
+
         logger.tree("Birthday Check Complete", [
             ("Birthdays Today", str(len(birthday_user_ids))),
-            ("Roles Granted", str(granted_count)),
+            ("Roles Granted", str(len(granted))),
         ], emoji="🎂")
 
-    @tasks.loop(hours=1)
-    async def role_expiry_check(self) -> None:
-        """Hourly check to remove expired birthday roles (24h duration)."""
-        if not self._enabled:
-            return
-
-        cutoff_time = int(time.time()) - BIRTHDAY_ROLE_DURATION
-
-        expired_user_ids = await asyncio.to_thread(
-            db.get_expired_birthday_roles, config.GUILD_ID, cutoff_time
+    async def _expiry_loop(self) -> None:
+        """Sleep until the earliest birthday role expiry (or a new grant), then expire."""
+        await self.bot.wait_until_ready()
+        while self._enabled:
+            self._expiry_changed.clear()
+            next_expiry = self.index.next_expiry()
+            timeout = None if next_expiry is None else max(0.0, next_expiry - time.time())
+            try:
+                await asyncio.wait_for(self._expiry_changed.wait(), timeout)
+                continue  # New grant: recompute the earliest expiry
+            except asyncio.TimeoutError:
+                pass
+
+            expired_user_ids = self.index.pop_expired(time.time())
+            if expired_user_ids:
+                try:
+                    await self._expire(expired_user_ids)
+                except Exception as e:
+                    logger.error_tree("Birthday Role Expiry Failed", e, [
+                        ("Expired", str(len(expired_user_ids))),
+                    ])
+
+    async def _expire(self, expired_user_ids: List[int]) -> None:
+        """Remove birthday roles and bonuses whose 24h are up."""
+        # Clear the granted timestamps regardless of member presence
+        await asyncio.to_thread(
+            db.clear_birthday_roles_granted, config.GUILD_ID, expired_user_ids
         )
 
-        if not expired_user_ids:
-            return
+        # Remove from birthday bonus users (3x XP ends)
+        async with _birthday_bonus_lock:
+            for user_id in expired_user_ids:
+                if user_id in _birthday_bonus_users:
+                    _birthday_bonus_users.discard(user_id)
+                    logger.tree("Birthday XP Bonus Expired", [
+                        ("ID", str(user_id)),
+                        ("Bonus", "3x XP ended"),
+                    ], emoji="⏰")
 
         guild = self.bot.get_guild(config.GUILD_ID)
-        if not guild:
-            return
-
-        role = guild.get_role(self._birthday_role_id)
+        role = guild.get_role(self._birthday_role_id) if guild else None
         if not role:
             return
 
         removed_count = 0
         for user_id in expired_user_ids:
             member = guild.get_member(user_id)
-
-            # Clear the granted timestamp regardless of member presence
-            await asyncio.to_thread(
-                db.clear_birthday_role_granted, user_id, config.GUILD_ID
-            )
-
-            # Remove from birthday bonus users (3x XP ends)
-            async with _birthday_bonus_lock:
-                had_bonus = user_id in _birthday_bonus_users
-                _birthday_bonus_users.discard(user_id)
-
-            if had_bonus:
-                logger.tree("Birthday XP Bonus Expired", [
-                    ("ID", str(user_id)),
-                    ("Bonus", "3x XP ended"),
-                ], emoji="⏰")
-
-            if not member:
-                continue
-
-            if role not in member.roles:
+            if not member or role not in member.roles:
                 continue
 
             try:
@@ -313,21 +339,10 @@ class BirthdayService:
                     ("User", f"{member.name} ({member.display_name})"),
                 ])
 
-        if removed_count > 0:
-            logger.tree("Birthday Role Expiry Check", [
-                ("Expired", str(len(expired_user_ids))),
-                ("Removed", str(removed_count)),
-            ], emoji="🎂")
-
-    @birthday_check.before_loop
-    async def before_birthday_check(self) -> None:
-        """Wait for bot to be ready before starting birthday check."""
-        await self.bot.wait_until_ready()
-
-    @role_expiry_check.before_loop
-    async def before_role_expiry_check(self) -> None:
-        """Wait for bot to be ready before starting role expiry check."""
-        await self.bot.wait_until_ready()
+        logger.tree("Birthday Role Expiry", [
+            ("Expired", str(len(expired_user_ids))),
+            ("Removed", str(removed_count)),
+        ], emoji="🎂")
 
     # =========================================================================
     # Public Methods (for commands)
@@ -378,6 +393,8 @@ class BirthdayService:
         )
 
         if success:
+            if user.guild.id == config.GUILD_ID:
+                self.index.add(user.id, month, day, year)
             logger.tree("Birthday Set", [
                 ("User", f"{user.name} ({user.display_name})"),
                 ("ID", str(user.id)),
@@ -402,6 +419,8 @@ class BirthdayService:
         )
 
         if removed:
+            if user.guild.id == config.GUILD_ID:
+                self.index.remove(user.id)
             # Also remove any active birthday bonus
             async with _birthday_bonus_lock:
                 had_bonus = user.id in _birthday_bonus_users
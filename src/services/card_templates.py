@@ -0,0 +1,284 @@
+"""
+SyriaBot - Card Template Runtime
+================================
+
+Hot Playwright pages for the HTML cards (ship, meters, family, roulette).
+
+Each card type is a static template document: the CSS reads its
+per-render values from custom properties and the markup carries
+data-* hooks. The document is loaded once into its own page, fonts
+decoded, and every render after that only pushes a JSON payload into
+the page's binding script and screenshots the card's clip.
+
+Payload keys understood by the binder:
+    vars: {name: value}   -> CSS custom property --name on :root
+    text: {key: value}    -> textContent of every [data-text=key]
+    show: {key: bool}     -> hidden attribute of every [data-show=key]
+    src:  {key: url}      -> src of every img[data-src=key]; a failed
+                             image falls back to its [data-fallback] sibling
+Anything else is left for the template's own window.renderCard(data).
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from src.core.constants import (
+    CARD_IMAGE_DECODE_TIMEOUT,
+    CARD_TEMPLATE_MAX_PAGES,
+    CARD_TEMPLATE_MAX_RENDERS,
+)
+from src.core.logger import logger
+from src.services.xp.card import (
+    count_render,
+    get_render_context,
+    get_render_semaphore,
+    reset_browser,
+)
+
+
+# =============================================================================
+# Template
+# =============================================================================
+
+@dataclass(frozen=True)
+class CardTemplate:
+    """
+    One card type.
+
+    Attributes:
+        name: Template key (one hot page per name)
+        html: Complete static document
+        viewport: Page size; large enough for the tallest card
+        selector: Element the screenshot is clipped to
+        clip_padding: Extra pixels kept around the element (shadows/glow)
+        decode_timeout: ms to wait for images before screenshotting anyway
+    """
+    name: str
+    html: str
+    viewport: Tuple[int, int]
+    selector: str
+    clip_padding: int = 0
+    decode_timeout: int = CARD_IMAGE_DECODE_TIMEOUT
+
+
+_BINDER = '''
+<style>[hidden] { display: none !important; }</style>
+<script>
+(() => {
+    const root = document.documentElement;
+
+    function showFallback(img) {
+        img.style.display = 'none';
+        const fb = img.nextElementSibling;
+        if (fb && fb.hasAttribute('data-fallback')) fb.style.display = 'flex';
+    }
+
+    function bindImage(img, url) {
+        const fb = img.nextElementSibling;
+        if (fb && fb.hasAttribute('data-fallback')) fb.style.display = 'none';
+        img.style.display = '';
+        if (!url) {
+            img.removeAttribute('src');
+            showFallback(img);
+        } else if (img.getAttribute('src') !== url) {
+            img.src = url;
+        }
+    }
+
+    function settle(img) {
+        return img.decode().catch(() => showFallback(img));
+    }
+
+    window.__bindCard = async (data) => {
+        for (const [k, v] of Object.entries(data.vars || {})) root.style.setProperty('--' + k, v);
+        for (const [k, v] of Object.entries(data.text || {}))
+            for (const el of document.querySelectorAll(`[data-text="${k}"]`)) el.textContent = v;
+        for (const [k, v] of Object.entries(data.show || {}))
+            for (const el of document.querySelectorAll(`[data-show="${k}"]`)) el.hidden = !v;
+        for (const [k, v] of Object.entries(data.src || {}))
+            for (const el of document.querySelectorAll(`img[data-src="${k}"]`)) bindImage(el, v);
+        if (window.renderCard) window.renderCard(data);
+
+        const pending = [...document.images].filter(
+            img => img.getAttribute('src') && img.style.display !== 'none' && img.offsetParent !== null);
+        await Promise.race([
+            Promise.all(pending.map(settle)),
+            new Promise(resolve => setTimeout(resolve, data.decodeTimeout)),
+        ]);
+
+        const rect = document.querySelector(data.selector).getBoundingClientRect();
+        return {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+    };
+})();
+</script>
+'''
+
+
+def build_document(template: CardTemplate) -> str:
+    """Template document with the binding script appended to <body>."""
+    head, sep, tail = template.html.rpartition("</body>")
+    if not sep:
+        return template.html + _BINDER
+    return head + _BINDER + sep + tail
+
+
+def clip_rect(template: CardTemplate, rect: Dict[str, float]) -> Dict[str, float]:
+    """Element rect grown by clip_padding, kept inside the viewport."""
+    width, height = template.viewport
+    pad = template.clip_padding
+    x = max(0.0, rect["x"] - pad)
+    y = max(0.0, rect["y"] - pad)
+    return {
+        "x": x,
+        "y": y,
+        "width": min(width - x, rect["width"] + 2 * pad),
+        "height": min(height - y, rect["height"] + 2 * pad),
+    }
+
+
+# =============================================================================
+# Runtime
+# =============================================================================
+
+class _HotPage:
+    __slots__ = ("page", "renders")
+
+    def __init__(self, page: Any) -> None:
+        self.page = page
+        self.renders = 0
+
+
+class CardTemplateRuntime:
+    """
+    One preloaded page per card template.
+
+    DESIGN:
+        Pages come from the rank card's browser context (get_render_context),
+        so they share its lifecycle: when that context is closed (idle
+        timeout, periodic restart, crash reset) the pages close with it and
+        are reloaded on next use. Every screenshot is counted towards the
+        shared browser's periodic restart (count_render). Pages are loaded lazily and at most
+        CARD_TEMPLATE_MAX_PAGES are kept (least recently used closed
+        first), each reloaded after CARD_TEMPLATE_MAX_RENDERS renders to
+        shed whatever the DOM churn accumulated. Renders hold the shared
+        render semaphore, like every other Playwright card. Because the
+        DOM is reused, a template's binding must overwrite everything a
+        previous render could have set.
+    """
+
+    def __init__(self) -> None:
+        self._pages: "OrderedDict[str, _HotPage]" = OrderedDict()
+        self.loads = 0
+        self.renders = 0
+
+    async def _load(self, template: CardTemplate) -> _HotPage:
+        context = await get_render_context()
+        page = await context.new_page()
+        try:
+            width, height = template.viewport
+            await page.set_viewport_size({"width": width, "height": height})
+            await page.set_content(build_document(template), wait_until="load")
+            # Decode every declared font face now rather than on first use
+            await page.evaluate("Promise.all([...document.fonts].map(f => f.load().catch(() => null)))")
+        except Exception:
+            await page.close()
+            raise
+        self.loads += 1
+        return _HotPage(page)
+
+    async def _hot_page(self, template: CardTemplate) -> _HotPage:
+        await get_render_context()  # Idle/restart checks; keeps the idle timer fresh
+
+        hot = self._pages.get(template.name)
+        if hot is not None and (hot.page.is_closed() or hot.renders >= CARD_TEMPLATE_MAX_RENDERS):
+            await self._discard(template.name)
+            hot = None
+
+        if hot is None:
+            hot = await self._load(template)
+            self._pages[template.name] = hot
+            while len(self._pages) > CARD_TEMPLATE_MAX_PAGES:
+                await self._discard(next(iter(self._pages)))
+        self._pages.move_to_end(template.name)
+        return hot
+
+    async def _discard(self, name: str) -> None:
+        hot = self._pages.pop(name, None)
+        if hot is not None:
+            try:
+                if not hot.page.is_closed():
+                    await hot.page.close()
+            except Exception:
+                pass
+
+    async def _render_once(self, template: CardTemplate, payload: Dict[str, Any]) -> bytes:
+        hot = await self._hot_page(template)
+        try:
+            rect = await hot.page.evaluate("data => window.__bindCard(data)", {
+                **payload,
+                "selector": template.selector,
+                "decodeTimeout": template.decode_timeout,
+            })
+            screenshot = await hot.page.screenshot(
+                type="png", omit_background=True, clip=clip_rect(template, rect),
+            )
+        except Exception:
+            # Never reuse a page whose DOM may be half-bound
+            await self._discard(template.name)
+            raise
+        hot.renders += 1
+        self.renders += 1
+        count_render()
+        return screenshot
+
+    async def render(self, template: CardTemplate, payload: Dict[str, Any]) -> bytes:
+        """Bind payload into the template's hot page and screenshot the card."""
+        from playwright.async_api import Error as PlaywrightError
+
+        async with get_render_semaphore():
+            try:
+                return await self._render_once(template, payload)
+            except PlaywrightError as e:
+                error_msg = str(e).lower()
+                if "closed" not in error_msg and "target" not in error_msg:
+                    raise
+                # Browser went away under us: same recovery as the page pool
+                await reset_browser()
+                self._pages.clear()
+                return await self._render_once(template, payload)
+
+    async def prewarm(self, *templates: CardTemplate) -> None:
+        """Load template pages ahead of their first render."""
+        start = time.perf_counter()
+        async with get_render_semaphore():
+            for template in templates:
+                await self._hot_page(template)
+        logger.tree("Card Templates Loaded", [
+            ("Templates", ", ".join(t.name for t in templates)),
+            ("Time", f"{(time.perf_counter() - start) * 1000:.0f}ms"),
+        ], emoji="🔥")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pages": {name: hot.renders for name, hot in self._pages.items()},
+            "loads": self.loads,
+            "renders": self.renders,
+        }
+
+    async def close(self) -> None:
+        for name in list(self._pages):
+            await self._discard(name)
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+card_templates = CardTemplateRuntime()
+
+__all__ = ["CardTemplate", "CardTemplateRuntime", "build_document", "card_templates", "clip_rect"]
@@ -17,6 +17,9 @@ from .service import (
     TEXT_COLOR,
     WAND_AVAILABLE,
 )
+from .cache import ConvertCache, convert_cache
+from .engine import MediaEngine, media_engine
+from .preview import PreviewSession
 from .views import ConvertView, VideoConvertView, start_convert_editor
 
 __all__ = [
@@ -24,6 +27,11 @@ __all__ = [
     "ConvertResult",
     "VideoInfo",
     "convert_service",
+    "ConvertCache",
+    "convert_cache",
+    "MediaEngine",
+    "media_engine",
+    "PreviewSession",
     "ConvertView",
     "VideoConvertView",
     "start_convert_editor",
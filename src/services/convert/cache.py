@@ -0,0 +1,251 @@
+"""
+SyriaBot - Convert Output Cache
+===============================
+
+Content-addressed disk LRU cache for /convert results.
+
+The same popular clip or image gets captioned with the same text over and
+over. Outputs are keyed on the source media hash plus a canonical hash of
+the render settings, so a repeat conversion skips the media engine.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from src.core.config import DATA_DIR
+from src.core.constants import CONVERT_CACHE_MAX_BYTES
+from src.core.logger import logger
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+CACHE_DIR = DATA_DIR / "convert_cache"
+CACHE_SUFFIX = ".out"
+
+# Bump when rendering changes so stale outputs stop matching
+CACHE_VERSION = 1
+
+
+def media_hash(data: bytes) -> str:
+    """Hash source media bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def settings_hash(kind: str, settings: dict[str, Any]) -> str:
+    """Hash render settings in a canonical form (sorted keys, tuples as lists)."""
+    canonical = json.dumps(
+        {"kind": kind, "version": CACHE_VERSION, **settings},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ConvertCache:
+    """
+    Byte-bounded LRU of convert outputs stored as files.
+
+    DESIGN:
+        Each output is one file named after its key, written to a temp name
+        and os.replace()d into place so readers never see a partial file.
+        The in-memory index maps key -> size in least-recently-used order;
+        a hit bumps the file's mtime, so rebuilding the index from mtimes
+        at startup restores the same LRU order after a restart. Eviction
+        drops the oldest files until the total fits CONVERT_CACHE_MAX_BYTES.
+        Apart from the first load, the lock is never held during file I/O;
+        a file evicted between the index check and the read is a miss.
+        The index is loaded on first use rather than at import, since the
+        media worker processes import this module too but never use it.
+        Thread-safe: callers use it from asyncio.to_thread workers.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = CONVERT_CACHE_MAX_BYTES) -> None:
+        self._dir = cache_dir
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._enabled: Optional[bool] = None
+
+    # =========================================================================
+    # Index
+    # =========================================================================
+
+    def _load_index(self) -> bool:
+        """Rebuild the LRU index from files on disk, oldest first."""
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            files = []
+            for entry in os.scandir(self._dir):
+                if not entry.is_file():
+                    continue
+                if not entry.name.endswith(CACHE_SUFFIX):
+                    # Leftover temp file from an interrupted write
+                    os.unlink(entry.path)
+                    continue
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(CACHE_SUFFIX)], stat.st_size))
+        except OSError as e:
+            logger.error_tree("Convert Cache Init Failed", e, [
+                ("Path", str(self._dir)),
+                ("Impact", "Cache disabled"),
+            ])
+            return False
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        # Still under the first-use lock, so no other thread can re-store these
+        for key in self._evict():
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+        logger.tree("Convert Cache Loaded", [
+            ("Entries", str(len(self._entries))),
+            ("Size", f"{self._total_bytes / 1024 / 1024:.1f} MB"),
+            ("Limit", f"{self._max_bytes / 1024 / 1024:.0f} MB"),
+        ], emoji="🗃️")
+        return True
+
+    def _ready(self) -> bool:
+        """Load the index on first use; False if the cache is disabled."""
+        if self._enabled is None:
+            with self._lock:
+                if self._enabled is None:
+                    self._enabled = self._load_index()
+        return self._enabled
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}{CACHE_SUFFIX}"
+
+    def _evict(self) -> list[str]:
+        """Drop oldest entries until under budget. Caller must hold the lock."""
+        evicted = []
+        while self._total_bytes > self._max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(key)
+        self.evictions += len(evicted)
+        return evicted
+
+    def _unlink(self, keys: list[str]) -> None:
+        for key in keys:
+            with self._lock:
+                if key in self._entries:
+                    # Stored again since it was evicted
+                    continue
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.tree("Convert Cache Evict Failed", [
+                    ("Key", key[:16]),
+                    ("Error", str(e)[:50]),
+                ], emoji="⚠️")
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    @staticmethod
+    def make_key(data: bytes, kind: str, settings: dict[str, Any]) -> str:
+        """Build a key from source bytes and render settings."""
+        return f"{media_hash(data)[:40]}-{settings_hash(kind, settings)[:24]}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached output bytes, or None on miss."""
+        if not self._ready():
+            return None
+
+        with self._lock:
+            known = key in self._entries
+            if known:
+                self._entries.move_to_end(key)
+
+        if known:
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self.hits += 1
+                return data
+            with self._lock:
+                size = self._entries.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store output bytes, evicting least recently used entries."""
+        if not self._ready() or len(data) > self._max_bytes:
+            return
+
+        path = self._path(key)
+        tmp_path = self._dir / f"{key}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.tree("Convert Cache Write Failed", [
+                ("Key", key[:16]),
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+            return
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.get(key, 0)
+            self._entries[key] = len(data)
+            self._entries.move_to_end(key)
+            self.stores += 1
+            evicted = self._evict()
+        self._unlink(evicted)
+
+    def get_stats(self) -> dict:
+        """Get cache counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "enabled": bool(self._enabled),
+            }
+
+
+convert_cache = ConvertCache()
+
+__all__ = ["ConvertCache", "convert_cache", "media_hash", "settings_hash"]
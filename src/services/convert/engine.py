@@ -0,0 +1,502 @@
+"""
+SyriaBot - Media Engine
+=======================
+
+Process pool for CPU-heavy /convert work (Pillow quantization, Wand, ffmpeg
+orchestration) so it never competes with the event loop for the GIL.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from src.core.logger import logger
+from src.core.constants import (
+    MEDIA_MAX_WORKERS,
+    MEDIA_MAX_PENDING_PER_USER,
+    MEDIA_TIMING_WINDOW,
+    MEDIA_SHM_HEADROOM,
+)
+from src.services.convert.timing import StageTimer, JobCancelled, STAGES
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Job kind -> ConvertService method run inside the worker
+JOB_HANDLERS: Dict[str, str] = {
+    "image": "_process_image",
+    "video": "_process_video",
+}
+
+# Kinds with stage timings on the dashboard ("preview" runs in-process)
+TIMED_KINDS = (*JOB_HANDLERS, "preview")
+
+# Workers fork from a server that already imported the entry point and the
+# convert stack, so a new (or replacement) worker starts in milliseconds
+WORKER_PRELOAD = ["__main__", "src.services.convert.service"]
+
+SHM_DIR = "/dev/shm"
+
+
+class MediaQueueFull(Exception):
+    """User already has the maximum number of jobs pending."""
+
+
+class MediaJobExpired(Exception):
+    """The interaction expired before the job finished."""
+
+
+class MediaJobCancelled(Exception):
+    """The job was cancelled by the caller or by shutdown."""
+
+
+# =============================================================================
+# Worker Side
+# =============================================================================
+
+def _warm_worker() -> int:
+    """No-op job used to start workers ahead of the first real job."""
+    from src.services.convert.service import convert_service  # noqa: F401
+    return os.getpid()
+
+
+def _run_job(
+    kind: str,
+    shm_name: Optional[str],
+    size: int,
+    payload: Optional[bytes],
+    args: tuple,
+) -> Tuple[Any, Dict[str, float], bool]:
+    """
+    Run one convert job inside a worker process.
+
+    Input arrives either as a shared memory block (byte 0 is the cancel
+    flag, the media follows) or, when shared memory isn't available, as
+    pickled bytes.
+
+    Returns:
+        (handler result, stage timings in ms, cancelled)
+    """
+    from src.services.convert.service import convert_service
+
+    handler = getattr(convert_service, JOB_HANDLERS[kind])
+
+    if shm_name is None:
+        timer = StageTimer()
+        return handler(payload, *args, timer=timer), timer.stages, False
+
+    shm = SharedMemory(name=shm_name)
+    flag = shm.buf[0:1]
+    data = shm.buf[1:1 + size]
+    try:
+        timer = StageTimer(cancel_flag=flag)
+        try:
+            return handler(data, *args, timer=timer), timer.stages, False
+        except JobCancelled:
+            return None, timer.stages, True
+    finally:
+        data.release()
+        flag.release()
+        shm.close()
+
+
+# =============================================================================
+# Job
+# =============================================================================
+
+@dataclass(eq=False)
+class _MediaJob:
+    """A queued or running convert job."""
+
+    kind: str
+    user_id: int
+    data: Optional[bytes]
+    args: tuple
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.perf_counter)
+    started_at: float = 0.0
+    shm: Optional[SharedMemory] = None
+    expiry: Optional[asyncio.TimerHandle] = None
+    running: bool = False
+
+
+# =============================================================================
+# Media Engine
+# =============================================================================
+
+class MediaEngine:
+    """
+    Bounded process pool with a per-user fair queue.
+
+    DESIGN:
+        Jobs wait in one deque per user; users take turns in a rotation, so
+        a user who queues three videos can't starve someone converting one
+        image. At most `workers` jobs are in the pool at a time - the rest
+        stay in the queue where they can still be dropped for free.
+        Input bytes are copied once into a shared memory block that the
+        worker reads in place, instead of being pickled through the pool's
+        pipe. Byte 0 of the block is a cancel flag the worker polls between
+        stages and frames. If an interaction expires (or the awaiting task
+        is cancelled) a queued job is dropped and a running one is flagged.
+        A crashed worker (e.g. ImageMagick segfault) breaks only the pool,
+        which is rebuilt on the next job instead of taking the bot down.
+    """
+
+    def __init__(self) -> None:
+        self.workers = max(1, min(MEDIA_MAX_WORKERS, (os.cpu_count() or 2) - 1))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._queues: Dict[int, Deque[_MediaJob]] = {}
+        self._rotation: Deque[int] = deque()
+        self._active: Dict[int, int] = {}
+        self._inflight: Set[_MediaJob] = set()
+        self._running = 0
+
+        # Stats
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.rejected = 0
+        self.pool_restarts = 0
+        self.shm_fallbacks = 0
+        self._timings: Dict[str, Deque[Dict[str, float]]] = {
+            kind: deque(maxlen=MEDIA_TIMING_WINDOW) for kind in TIMED_KINDS
+        }
+
+    # =========================================================================
+    # Pool Lifecycle
+    # =========================================================================
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the pool, creating it on first use or after a crash."""
+        if self._pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            if ctx.get_start_method() == "forkserver":
+                ctx.set_forkserver_preload(WORKER_PRELOAD)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx)
+        return self._pool
+
+    async def start(self) -> None:
+        """Start the workers so the first /convert doesn't pay for it."""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        start = time.perf_counter()
+        pids = await asyncio.gather(*[
+            loop.run_in_executor(pool, _warm_worker) for _ in range(self.workers)
+        ])
+        logger.tree("Media Engine Started", [
+            ("Workers", str(len(set(pids)))),
+            ("Max Workers", str(self.workers)),
+            ("Warm-up", f"{(time.perf_counter() - start) * 1000:.0f}ms"),
+        ], emoji="🎞️")
+
+    async def close(self) -> None:
+        """Fail queued jobs, stop running ones and shut the pool down."""
+        for queue in self._queues.values():
+            for job in queue:
+                if not job.future.done():
+                    job.future.set_exception(MediaJobCancelled("Bot is shutting down"))
+        self._queues.clear()
+        self._rotation.clear()
+
+        # Running jobs stop at their next stage/frame boundary
+        for job in self._inflight:
+            self._cancel(job)
+
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def run(
+        self,
+        kind: str,
+        user_id: int,
+        data: bytes,
+        *args: Any,
+        expires_at: Optional[datetime] = None,
+    ) -> Any:
+        """
+        Queue a job and wait for its result.
+
+        Args:
+            kind: Job kind (key of JOB_HANDLERS).
+            user_id: Requesting user, for fair scheduling.
+            data: Input media bytes.
+            *args: Extra positional args for the handler.
+            expires_at: When the interaction token expires; the job is
+                dropped (or stopped) at that point.
+
+        Raises:
+            MediaQueueFull: User already has too many pending jobs.
+            MediaJobExpired: The interaction expired first.
+            MediaJobCancelled: Cancelled by shutdown or inside the worker.
+        """
+        queue = self._queues.get(user_id)
+        pending = (len(queue) if queue else 0) + self._active.get(user_id, 0)
+        if pending >= MEDIA_MAX_PENDING_PER_USER:
+            self.rejected += 1
+            raise MediaQueueFull()
+
+        loop = asyncio.get_running_loop()
+        job = _MediaJob(
+            kind=kind,
+            user_id=user_id,
+            data=data,
+            args=args,
+            future=loop.create_future(),
+        )
+
+        if expires_at is not None:
+            delay = max(0.0, expires_at.timestamp() - time.time())
+            job.expiry = loop.call_later(delay, self._expire, job)
+
+        if queue is None:
+            queue = self._queues[user_id] = deque()
+            self._rotation.append(user_id)
+        queue.append(job)
+        self._pump()
+
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            self._cancel(job)
+            self.cancelled += 1
+            raise
+        finally:
+            if job.expiry:
+                job.expiry.cancel()
+
+    # =========================================================================
+    # Scheduling
+    # =========================================================================
+
+    def _pump(self) -> None:
+        """Move jobs from the fair queue into free worker slots."""
+        while self._running < self.workers and self._rotation:
+            user_id = self._rotation.popleft()
+            queue = self._queues[user_id]
+            job = queue.popleft()
+            if queue:
+                self._rotation.append(user_id)
+            else:
+                del self._queues[user_id]
+            self._dispatch(job)
+
+    def _dispatch(self, job: _MediaJob) -> None:
+        """Hand a job to the pool."""
+        loop = asyncio.get_running_loop()
+        size = len(job.data)
+        shm_name: Optional[str] = None
+        payload: Optional[bytes] = job.data
+
+        job.shm = self._alloc_shm(job.data)
+        if job.shm is not None:
+            shm_name, payload = job.shm.name, None
+        job.data = None
+
+        try:
+            cf = self._get_pool().submit(_run_job, job.kind, shm_name, size, payload, job.args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._reset_pool(e)
+            self._release_shm(job)
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+
+        job.running = True
+        job.started_at = time.perf_counter()
+        self._running += 1
+        self._active[job.user_id] = self._active.get(job.user_id, 0) + 1
+        self._inflight.add(job)
+        cf.add_done_callback(lambda f: loop.call_soon_threadsafe(self._on_done, job, f))
+
+    def _on_done(self, job: _MediaJob, cf: Future) -> None:
+        """Collect a finished job (runs on the event loop)."""
+        self._running -= 1
+        self._inflight.discard(job)
+        remaining = self._active.get(job.user_id, 1) - 1
+        if remaining > 0:
+            self._active[job.user_id] = remaining
+        else:
+            self._active.pop(job.user_id, None)
+        self._release_shm(job)
+
+        try:
+            result, stages, was_cancelled = cf.result()
+        except BrokenProcessPool as e:
+            self._reset_pool(e)
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+            self._pump()
+            return
+        except Exception as e:
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+            self._pump()
+            return
+
+        if was_cancelled:
+            if not job.future.done():
+                job.future.set_exception(MediaJobCancelled("Cancelled while running"))
+        else:
+            self.completed += 1
+            timings = dict(stages)
+            timings["queue"] = (job.started_at - job.queued_at) * 1000
+            timings["total"] = (time.perf_counter() - job.queued_at) * 1000
+            self._timings[job.kind].append(timings)
+            if hasattr(result, "timings"):
+                result.timings = timings
+            if not job.future.done():
+                job.future.set_result(result)
+
+        self._pump()
+
+    def _cancel(self, job: _MediaJob) -> None:
+        """Drop a queued job or flag a running one."""
+        if job.running:
+            if job.shm is not None:
+                job.shm.buf[0] = 1
+            return
+
+        queue = self._queues.get(job.user_id)
+        if queue and job in queue:
+            queue.remove(job)
+            if not queue:
+                del self._queues[job.user_id]
+                try:
+                    self._rotation.remove(job.user_id)
+                except ValueError:
+                    pass
+
+    def _expire(self, job: _MediaJob) -> None:
+        """Interaction expired - nobody can receive the result any more."""
+        if job.future.done():
+            return
+        self._cancel(job)
+        self.expired += 1
+        job.future.set_exception(MediaJobExpired())
+        logger.tree("Media Job Expired", [
+            ("Kind", job.kind),
+            ("User ID", str(job.user_id)),
+            ("State", "Running" if job.running else "Queued"),
+        ], emoji="⏳")
+
+    def _reset_pool(self, error: Exception) -> None:
+        """Drop a broken pool so the next job builds a fresh one."""
+        if self._pool is None:
+            return
+        pool, self._pool = self._pool, None
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.pool_restarts += 1
+        logger.error_tree("Media Engine Pool Broken", error, [
+            ("Restarts", str(self.pool_restarts)),
+            ("Action", "Rebuilding on next job"),
+        ])
+
+    # =========================================================================
+    # Shared Memory
+    # =========================================================================
+
+    def _alloc_shm(self, data: bytes) -> Optional[SharedMemory]:
+        """
+        Copy job input into a new shared memory block.
+
+        /dev/shm is a small tmpfs in containers and writing past its end
+        raises SIGBUS rather than an exception, so the free space is checked
+        first; without enough headroom the input is pickled instead.
+        """
+        try:
+            if shutil.disk_usage(SHM_DIR).free < len(data) + MEDIA_SHM_HEADROOM:
+                self.shm_fallbacks += 1
+                return None
+            shm = SharedMemory(create=True, size=len(data) + 1)
+        except (OSError, ValueError):
+            self.shm_fallbacks += 1
+            return None
+        shm.buf[0] = 0
+        shm.buf[1:len(data) + 1] = data
+        return shm
+
+    @staticmethod
+    def _release_shm(job: _MediaJob) -> None:
+        """Close and unlink a job's shared memory block."""
+        if job.shm is None:
+            return
+        try:
+            job.shm.close()
+            job.shm.unlink()
+        except (OSError, BufferError):
+            pass
+        job.shm = None
+
+    # =========================================================================
+    # Stats
+    # =========================================================================
+
+    def record(self, kind: str, timings: Dict[str, float]) -> None:
+        """Record stage timings of work done outside the pool (thread-safe)."""
+        self._timings[kind].append(dict(timings))
+
+    def get_stats(self) -> dict:
+        """Get queue state and average per-stage timings for the dashboard."""
+        stages: Dict[str, Dict[str, float]] = {}
+        for kind, recent in self._timings.items():
+            # Snapshot: preview timings are appended from worker threads
+            samples = list(recent)
+            if not samples:
+                continue
+            keys = [k for k in (*STAGES, "queue", "total") if any(k in t for t in samples)]
+            stages[kind] = {
+                key: round(sum(s.get(key, 0.0) for s in samples) / len(samples), 1)
+                for key in keys
+            }
+            stages[kind]["samples"] = len(samples)
+
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": sum(len(q) for q in self._queues.values()),
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "rejected": self.rejected,
+            "pool_restarts": self.pool_restarts,
+            "shm_fallbacks": self.shm_fallbacks,
+            "stages_ms": stages,
+        }
+
+
+# Global instance
+media_engine = MediaEngine()
+
+
+__all__ = [
+    "MediaEngine",
+    "MediaQueueFull",
+    "MediaJobExpired",
+    "MediaJobCancelled",
+    "media_engine",
+]
@@ -0,0 +1,207 @@
+"""
+SyriaBot - Streaming GIF Encoder
+================================
+
+Frame-at-a-time GIF writer with one global palette, used by the
+animated /convert path.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import io
+import struct
+from typing import BinaryIO, Iterable, Optional
+
+from PIL import Image, ImageChops
+
+
+# Colors kept exact in the global palette (bar, text, watermark ramps)
+RESERVED_RAMP_STEPS = 8
+
+# Longest side of each sampled frame in the palette mosaic
+PALETTE_SAMPLE_SIZE = 256
+
+
+# =============================================================================
+# Global Palette
+# =============================================================================
+
+def color_ramp(start: tuple, end: tuple, steps: int) -> list[tuple]:
+    """Evenly spaced colors from start to end (inclusive)."""
+    if steps < 2:
+        return [tuple(start)]
+    return [
+        tuple(round(a + (b - a) * i / (steps - 1)) for a, b in zip(start, end))
+        for i in range(steps)
+    ]
+
+
+def build_global_palette(samples: Iterable[Image.Image], reserved: Iterable[tuple] = ()) -> Image.Image:
+    """
+    Build one 256-color palette image for a whole animation.
+
+    DESIGN:
+        Sampled frames are downscaled and tiled into a single mosaic, which
+        is quantized once. Reserved colors (the bar, the text and the
+        anti-aliased ramp between them, the watermark) are appended
+        verbatim so the overlay never shifts color when frames are mapped
+        onto the palette. Quantizing a mosaic of ~16 frames costs about as
+        much as one ADAPTIVE convert of a single full-size frame.
+    """
+    reserved = list(dict.fromkeys(tuple(c) for c in reserved))[:255]
+    thumbs = []
+    for frame in samples:
+        thumb = frame.convert("RGB")
+        thumb.thumbnail((PALETTE_SAMPLE_SIZE, PALETTE_SAMPLE_SIZE), Image.Resampling.BILINEAR)
+        thumbs.append(thumb)
+
+    palette: list[int] = []
+    if thumbs:
+        mosaic = Image.new("RGB", (sum(t.width for t in thumbs), max(t.height for t in thumbs)))
+        x = 0
+        for thumb in thumbs:
+            mosaic.paste(thumb, (x, 0))
+            x += thumb.width
+        quantized = mosaic.quantize(colors=256 - len(reserved), method=Image.Quantize.MEDIANCUT)
+        used = len(quantized.getcolors(256) or [])
+        palette = (quantized.getpalette() or [])[:used * 3]
+
+    for color in reserved:
+        palette.extend(color)
+    palette.extend([0] * (768 - len(palette)))
+
+    palette_img = Image.new("P", (1, 1))
+    palette_img.putpalette(palette[:768])
+    return palette_img
+
+
+# =============================================================================
+# GIF Blocks
+# =============================================================================
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+    """Position just past a chain of data sub-blocks and its terminator."""
+    while data[pos]:
+        pos += data[pos] + 1
+    return pos + 1
+
+
+def _image_block(frame: Image.Image, offset: tuple[int, int], palette: bytes) -> bytes:
+    """
+    Image descriptor + LZW data for one P-mode frame, placed at `offset`.
+
+    The LZW data comes from a single-frame Image.save(format="GIF"), the
+    only public way to reach Pillow's GIF encoder. The rest of that file
+    (header, extensions, trailer) is dropped. If Pillow wrote the frame
+    against a color table other than `palette`, that table is carried
+    over as the frame's local color table, so indices always decode to
+    the colors they were encoded with.
+    """
+    buf = io.BytesIO()
+    frame.save(buf, format="GIF", optimize=False)
+    data = buf.getvalue()
+
+    screen_flags = data[10]
+    pos = 13
+    table = b""
+    table_bits = 0
+    if screen_flags & 0x80:
+        table_bits = screen_flags & 0x07
+        end = pos + (3 << (table_bits + 1))
+        table = data[pos:end]
+        pos = end
+
+    while data[pos] == 0x21:  # Extensions written by Pillow (GCE, comments)
+        pos = _skip_sub_blocks(data, pos + 2)
+    if data[pos] != 0x2C:
+        raise ValueError("Pillow GIF output has no image descriptor")
+
+    descriptor = bytearray(data[pos:pos + 10])
+    struct.pack_into("<HH", descriptor, 1, *offset)
+    pos += 10
+
+    packed = descriptor[9]
+    if packed & 0x80:
+        end = pos + (3 << ((packed & 0x07) + 1))
+        table = data[pos:end]
+        pos = end
+    elif table and not palette.startswith(table):
+        descriptor[9] = (packed & 0x40) | 0x80 | table_bits
+    else:
+        table = b""
+
+    end = _skip_sub_blocks(data, pos + 1)  # Skip the LZW minimum code size byte
+    return bytes(descriptor) + table + data[pos:end]
+
+
+# =============================================================================
+# Streaming Writer
+# =============================================================================
+
+class StreamingGifWriter:
+    """
+    Write a GIF frame by frame instead of collecting every frame first.
+
+    DESIGN:
+        Pillow's save_all keeps every frame in memory until the end. This
+        writer emits the header (global palette + loop extension) up front
+        and each frame as it arrives. The container blocks are written
+        here from the GIF89a spec; only the LZW image data comes from
+        Pillow, through its public single-frame save (see _image_block),
+        so no private GifImagePlugin helpers are involved. Only the
+        previous full canvas and one pending frame are held: each frame
+        is cropped to the region that changed since the previous one
+        (disposal "do not dispose"), and a frame identical to the previous
+        one extends the pending frame's duration instead of being written.
+        Frames must be P-mode canvases mapped onto the palette passed to
+        the constructor. loop=None writes no loop extension, so the
+        animation plays once and stays on its last frame.
+    """
+
+    def __init__(self, fp: BinaryIO, size: tuple[int, int], palette_img: Image.Image, loop: Optional[int] = 0) -> None:
+        self._fp = fp
+        self._previous: Optional[Image.Image] = None
+        self._pending: Optional[tuple[Image.Image, tuple[int, int], int]] = None
+        self.frames_written = 0
+
+        palette = bytes((palette_img.getpalette() or [])[:768])
+        self._palette = palette + bytes(768 - len(palette))
+
+        # Logical screen: 256-entry global color table, 8 bits per channel
+        fp.write(b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0xF7, 0, 0))
+        fp.write(self._palette)
+        if loop is not None:
+            fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def add(self, frame: Image.Image, duration: int) -> None:
+        """Queue one full P-mode canvas for output."""
+        if self._previous is None:
+            self._pending = (frame, (0, 0), duration)
+        else:
+            bbox = ImageChops.difference(self._previous, frame).getbbox()
+            if bbox is None:
+                crop, offset, pending_duration = self._pending
+                self._pending = (crop, offset, pending_duration + duration)
+                return
+            self._flush()
+            self._pending = (frame.crop(bbox), bbox[:2], duration)
+        self._previous = frame
+
+    def close(self) -> None:
+        """Write the last frame and the trailer."""
+        self._flush()
+        self._fp.write(b";")
+
+    def _flush(self) -> None:
+        if self._pending is None:
+            return
+        crop, offset, duration = self._pending
+        # Graphic control extension: disposal 1 (do not dispose), delay in centiseconds
+        self._fp.write(b"!\xf9\x04" + struct.pack("<BHB", 1 << 2, int(duration / 10), 0) + b"\x00")
+        self._fp.write(_image_block(crop, offset, self._palette))
+        self._pending = None
+        self.frames_written += 1
+
+
+__all__ = ["StreamingGifWriter", "build_global_palette", "color_ramp"]
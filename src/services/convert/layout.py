@@ -0,0 +1,83 @@
+"""
+SyriaBot - Convert Text Bar Layout
+==================================
+
+Text bar sizing shared by the /convert render and the editor preview.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+from typing import Callable
+
+from PIL import ImageFont
+
+from src.core.constants import (
+    BAR_HEIGHT_RATIO,
+    BAR_PADDING_RATIO,
+    FONT_SIZE_RATIO,
+    LINE_SPACING_RATIO,
+    MIN_BAR_HEIGHT,
+    TEXT_PADDING_RATIO,
+)
+from src.utils.text import wrap_text
+
+
+# Smallest font the shrink-to-fit loop goes down to
+MIN_SHRINK_FONT_SIZE = 16
+
+
+def calculate_dynamic_layout(
+    text: str,
+    img_width: int,
+    img_height: int,
+    get_font: Callable[[int], ImageFont.FreeTypeFont],
+    min_bar_height: int = MIN_BAR_HEIGHT,
+    min_font_size: int = 24,
+    min_text_padding: int = 20,
+    min_vertical_padding: int = 10,
+) -> tuple[int, list[str], int, int]:
+    """
+    Calculate layout with DYNAMIC sizing based on image dimensions (NotSoBot style).
+
+    Bar height = 20% of image height
+    Font size = 70% of bar height, BUT constrained to fit text width
+
+    Returns:
+        (font_size, wrapped_lines, bar_height, text_padding)
+    """
+    # Calculate bar height based on image (20% of height, minimum 80px)
+    bar_height = max(min_bar_height, int(img_height * BAR_HEIGHT_RATIO))
+
+    # Calculate horizontal padding (5% of image width, minimum 20px)
+    text_padding = max(min_text_padding, int(img_width * TEXT_PADDING_RATIO))
+    max_text_width = img_width - (text_padding * 2)
+
+    # Find optimal font size that fits both height AND width constraints
+    # Start from bar-based size (70% of bar) and shrink until text fits width
+    font_size = max(min_font_size, int(bar_height * FONT_SIZE_RATIO))
+    font = get_font(font_size)
+    lines = wrap_text(text, font, max_text_width)
+
+    # Shrink font until all lines fit within max_text_width
+    # This handles single long words that can't wrap (like "Adnan:")
+    while font_size > MIN_SHRINK_FONT_SIZE:
+        if all(font.getbbox(line)[2] - font.getbbox(line)[0] <= max_text_width for line in lines):
+            break
+        font_size -= 2
+        font = get_font(font_size)
+        lines = wrap_text(text, font, max_text_width)
+
+    # If text wraps to multiple lines, we may need to expand bar height
+    line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
+    line_spacing = int(line_height * LINE_SPACING_RATIO)
+    total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
+
+    # Expand bar if text needs more space (padding = 10% of bar height)
+    vertical_padding = max(min_vertical_padding, int(bar_height * BAR_PADDING_RATIO))
+    bar_height = max(bar_height, total_text_height + (vertical_padding * 2))
+
+    return font_size, lines, bar_height, text_padding
+
+
+__all__ = ["calculate_dynamic_layout"]
@@ -0,0 +1,189 @@
+"""
+SyriaBot - Convert Editor Preview
+=================================
+
+Incremental preview renderer for the /convert editors.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import io
+from typing import Optional
+
+from PIL import Image, ImageDraw, ImageFont, features
+
+from src.core.constants import (
+    LINE_SPACING_RATIO,
+    EDITOR_PREVIEW_MAX_SIZE,
+    EDITOR_PREVIEW_QUALITY,
+)
+from src.services.convert.layout import calculate_dynamic_layout
+from src.utils.text import find_font, get_font
+
+
+# WebP when Pillow was built with it, JPEG otherwise
+PREVIEW_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+PREVIEW_FILENAME = "preview.webp" if PREVIEW_FORMAT == "WEBP" else "preview.jpg"
+
+
+# =============================================================================
+# Layout
+# =============================================================================
+
+class _Layout:
+    """Text bar layout measured at full resolution."""
+
+    __slots__ = ("font_size", "lines", "bar_height", "line_height", "line_spacing", "text_height")
+
+    def __init__(self, font_size: int, lines: list[str], bar_height: int, line_height: int, line_spacing: int) -> None:
+        self.font_size = font_size
+        self.lines = lines
+        self.bar_height = bar_height
+        self.line_height = line_height
+        self.line_spacing = line_spacing
+        self.text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
+
+
+# =============================================================================
+# Preview Session
+# =============================================================================
+
+class PreviewSession:
+    """
+    Renders editor previews without redoing work that didn't change.
+
+    DESIGN:
+        The source is decoded and downscaled to preview size once, when the
+        editor opens. The text layout is measured at the size the final
+        render uses and cached per (text, width), so wrapping matches the
+        download while drawing happens at preview scale. The drawn bar is
+        cached per (text, colors) and only redrawn when either changes;
+        the source body is only recomposited for transparent images, whose
+        background is the bar color. Previews are encoded as lossy
+        WebP/JPEG, a fraction of the PNG the editors used to upload on
+        every edit. The full-resolution render only happens on Save.
+    """
+
+    def __init__(
+        self,
+        image_data: bytes,
+        min_bar_height: int = 80,
+        min_font_size: int = 24,
+        min_text_padding: int = 20,
+        min_vertical_padding: int = 10,
+        max_dimension: int = 2000,
+        handle_rgba: bool = True,
+        preview_size: int = EDITOR_PREVIEW_MAX_SIZE,
+    ) -> None:
+        self._min_bar_height = min_bar_height
+        self._min_font_size = min_font_size
+        self._min_text_padding = min_text_padding
+        self._min_vertical_padding = min_vertical_padding
+        self._font_path = find_font()
+        self._fonts: dict[int, ImageFont.FreeTypeFont] = {}
+        self._layouts: dict[tuple[str, int], _Layout] = {}
+
+        img = Image.open(io.BytesIO(image_data))
+
+        # Size the final render works at (before any decode-time reduction)
+        self.full_size = img.size
+        if max_dimension and max(img.size) > max_dimension:
+            factor = max_dimension / max(img.size)
+            self.full_size = (max(1, int(img.width * factor)), max(1, int(img.height * factor)))
+
+        # JPEGs can decode straight at a reduced scale
+        img.draft("RGB", (preview_size, preview_size))
+        self._has_alpha = handle_rgba and img.mode == "RGBA"
+        if not self._has_alpha and img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail((preview_size, preview_size), Image.Resampling.LANCZOS)
+        self._source = img
+        self._scale = img.width / self.full_size[0]
+
+        self._body: Optional[Image.Image] = None if self._has_alpha else img
+        self._body_color: Optional[tuple] = None
+        self._bar: Optional[Image.Image] = None
+        self._bar_key: Optional[tuple] = None
+
+    def _font(self, size: int) -> ImageFont.FreeTypeFont:
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = get_font(self._font_path, size)
+        return font
+
+    def _layout(self, text: str) -> _Layout:
+        """Measure the bar at full resolution (cached per text and width)."""
+        width, height = self.full_size
+        key = (text, width)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            return layout
+
+        # Same sizing as the final render, including the shrink-to-fit loop
+        font_size, lines, bar_height, _ = calculate_dynamic_layout(
+            text, width, height, self._font,
+            min_bar_height=self._min_bar_height,
+            min_font_size=self._min_font_size,
+            min_text_padding=self._min_text_padding,
+            min_vertical_padding=self._min_vertical_padding,
+        )
+        font = self._font(font_size)
+        line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
+        line_spacing = int(line_height * LINE_SPACING_RATIO)
+        layout = _Layout(font_size, lines, bar_height, line_height, line_spacing)
+
+        self._layouts[key] = layout
+        return layout
+
+    def _render_bar(self, text: str, bar_color: tuple, text_color: tuple) -> Image.Image:
+        """Draw the bar at preview scale (cached per text and colors)."""
+        key = (text, bar_color, text_color)
+        if self._bar_key == key:
+            return self._bar
+
+        layout = self._layout(text)
+        scale = self._scale
+        width = self._source.width
+        bar = Image.new("RGB", (width, max(1, round(layout.bar_height * scale))), bar_color)
+        draw = ImageDraw.Draw(bar)
+        font = self._font(max(1, round(layout.font_size * scale)))
+
+        current_y = ((layout.bar_height - layout.text_height) // 2) * scale
+        for line in layout.lines:
+            bbox = font.getbbox(line)
+            text_x = (width - (bbox[2] - bbox[0])) // 2 - bbox[0]
+            draw.text((text_x, round(current_y) - bbox[1]), line, font=font, fill=text_color)
+            current_y += (layout.line_height + layout.line_spacing) * scale
+
+        self._bar, self._bar_key = bar, key
+        return bar
+
+    def _render_body(self, bar_color: tuple) -> Image.Image:
+        """Source at preview size; transparent sources sit on the bar color."""
+        if self._has_alpha and self._body_color != bar_color:
+            body = Image.new("RGB", self._source.size, bar_color)
+            body.paste(self._source, mask=self._source.split()[3])
+            self._body, self._body_color = body, bar_color
+        return self._body
+
+    def render(self, text: str, bar_color: tuple, text_color: tuple) -> bytes:
+        """Return encoded preview bytes for the current settings."""
+        body = self._render_body(bar_color)
+        if text:
+            bar = self._render_bar(text, bar_color, text_color)
+            canvas = Image.new("RGB", (body.width, bar.height + body.height))
+            canvas.paste(bar, (0, 0))
+            canvas.paste(body, (0, bar.height))
+        else:
+            canvas = body
+
+        output = io.BytesIO()
+        if PREVIEW_FORMAT == "WEBP":
+            canvas.save(output, format="WEBP", quality=EDITOR_PREVIEW_QUALITY, method=0)
+        else:
+            canvas.save(output, format="JPEG", quality=EDITOR_PREVIEW_QUALITY)
+        return output.getvalue()
+
+
+__all__ = ["PreviewSession", "PREVIEW_FILENAME"]
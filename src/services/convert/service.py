@@ -12,12 +12,16 @@ Server: discord.gg/syria
 
 import asyncio
 import io
+import os
+import re
 import subprocess
 import tempfile
+import time
 import uuid
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Dict, Optional, Literal
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -39,12 +43,17 @@ from src.core.constants import (
     MAX_VIDEO_DURATION,
     GIF_FPS,
     GIF_MAX_WIDTH,
+    GIF_PALETTE_SAMPLES,
+    PREVIEW_SAMPLE_FPS,
+    PREVIEW_THUMB_WIDTH,
+    PREVIEW_STRIP_FRAMES,
+    PREVIEW_STRIP_FRAME_WIDTH,
+    PREVIEW_SHORT_CLIP,
     BAR_HEIGHT_RATIO,
     MIN_BAR_HEIGHT,
     FONT_SIZE_RATIO,
     LINE_SPACING_RATIO,
     BAR_PADDING_RATIO,
-    TEXT_PADDING_RATIO,
     DEFAULT_BAR_COLOR,
     DEFAULT_TEXT_COLOR,
     IMAGE_EXTENSIONS,
@@ -56,12 +65,35 @@ from src.core.constants import (
     WATERMARK_MIN_FONT,
     WATERMARK_MAX_FONT,
 )
+from src.services.convert.cache import convert_cache
+from src.services.convert.engine import (
+    media_engine,
+    MediaQueueFull,
+    MediaJobExpired,
+    MediaJobCancelled,
+)
+from src.services.convert.layout import calculate_dynamic_layout
+from src.services.convert.gif import (
+    StreamingGifWriter,
+    build_global_palette,
+    color_ramp,
+    RESERVED_RAMP_STEPS,
+)
+from src.services.convert.timing import StageTimer, JobCancelled
 from src.utils.http import http_session, DOWNLOAD_TIMEOUT
 from src.utils.text import wrap_text
 
 # Temp directory for processing
 TEMP_DIR = Path(tempfile.gettempdir()) / "syria_convert"
 
+# ffmpeg banner lines parsed by the preview extractor
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_RAW_SIZE_RE = re.compile(r"Video: rawvideo.*?, (\d+)x(\d+)")
+
+# Temp files younger than this may belong to a running job (media workers
+# import this module too), so startup cleanup leaves them alone
+ORPHAN_MIN_AGE = 10 * 60
+
 # Aliases for backwards compatibility
 BAR_COLOR = DEFAULT_BAR_COLOR
 TEXT_COLOR = DEFAULT_TEXT_COLOR
@@ -77,6 +109,7 @@ class ConvertResult:
     success: bool
     gif_bytes: Optional[bytes] = None
     error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
 
 
 @dataclass
@@ -101,6 +134,8 @@ class ConvertService:
         Supports static images, animated GIFs, and short videos.
         Uses Wand/ImageMagick for high-quality GIF processing with Pillow fallback.
         FFmpeg handles video-to-GIF conversion with palette generation.
+        Final renders run in the media engine's worker processes; the
+        _process_* methods are the worker-side entry points.
     """
 
     def __init__(self) -> None:
@@ -151,8 +186,9 @@ class ConvertService:
         """Clean up any leftover temp files from previous runs/crashes."""
         try:
             cleaned = 0
+            cutoff = time.time() - ORPHAN_MIN_AGE
             for item in TEMP_DIR.iterdir():
-                if item.is_file():
+                if item.is_file() and item.stat().st_mtime < cutoff:
                     item.unlink(missing_ok=True)
                     cleaned += 1
             if cleaned > 0:
@@ -243,63 +279,15 @@ class ConvertService:
 
     def _calculate_dynamic_layout(self, text: str, img_width: int, img_height: int) -> tuple[ImageFont.FreeTypeFont, list[str], int, int]:
         """
-        Calculate layout with DYNAMIC sizing based on image dimensions (NotSoBot style).
-
-        Bar height = 20% of image height
-        Font size = 70% of bar height, BUT constrained to fit text width
+        Calculate the text bar layout for an image (see layout.calculate_dynamic_layout).
 
         Returns:
             (font, wrapped_lines, bar_height, text_padding)
         """
-        # Calculate bar height based on image (20% of height, minimum 80px)
-        bar_height = max(MIN_BAR_HEIGHT, int(img_height * BAR_HEIGHT_RATIO))
-
-        # Calculate horizontal padding (5% of image width, minimum 20px)
-        text_padding = max(20, int(img_width * TEXT_PADDING_RATIO))
-        max_text_width = img_width - (text_padding * 2)
-
-        # Calculate initial font size based on bar height (70% of bar)
-        initial_font_size = max(24, int(bar_height * FONT_SIZE_RATIO))
-
-        # Find optimal font size that fits both height AND width constraints
-        # Start from bar-based size and shrink until text fits width
-        font_size = initial_font_size
-        font = self._get_font(font_size)
-        lines = wrap_text(text, font, max_text_width)
-
-        # Shrink font until all lines fit within max_text_width
-        # This handles single long words that can't wrap (like "Adnan:")
-        while font_size > 16:
-            all_lines_fit = True
-            for line in lines:
-                bbox = font.getbbox(line)
-                line_width = bbox[2] - bbox[0]
-                if line_width > max_text_width:
-                    all_lines_fit = False
-                    break
-
-            if all_lines_fit:
-                break
-
-            # Shrink font and re-wrap
-            font_size -= 2
-            font = self._get_font(font_size)
-            lines = wrap_text(text, font, max_text_width)
-
-        # If text wraps to multiple lines, we may need to expand bar height
-        line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
-        line_spacing = int(line_height * LINE_SPACING_RATIO)
-        total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
-
-        # Calculate padding (10% of bar height)
-        vertical_padding = max(10, int(bar_height * BAR_PADDING_RATIO))
-
-        # Expand bar if text needs more space
-        min_bar_for_text = total_text_height + (vertical_padding * 2)
-        if min_bar_for_text > bar_height:
-            bar_height = min_bar_for_text
-
-        return font, lines, bar_height, text_padding
+        font_size, lines, bar_height, text_padding = calculate_dynamic_layout(
+            text, img_width, img_height, self._get_font
+        )
+        return self._get_font(font_size), lines, bar_height, text_padding
 
     def _add_watermark(self, img: Image.Image) -> Image.Image:
         """Add small gold watermark to bottom right corner, scaled to image size."""
@@ -353,7 +341,11 @@ class ConvertService:
         self,
         image_data: bytes,
         text: str,
-        position: Literal["top", "bottom"] = "top"
+        position: Literal["top", "bottom"] = "top",
+        bar_color: tuple = BAR_COLOR,
+        text_color: tuple = TEXT_COLOR,
+        user_id: int = 0,
+        expires_at: Optional[datetime] = None,
     ) -> ConvertResult:
         """
         Convert an image to GIF with text bar.
@@ -362,6 +354,10 @@ class ConvertService:
             image_data: Raw image bytes
             text: Text to add to the bar
             position: Position of text bar ("top" or "bottom")
+            bar_color: RGB tuple for bar color
+            text_color: RGB tuple for text color
+            user_id: Requesting user (for fair queueing)
+            expires_at: Interaction expiry; the job is dropped after it
 
         Returns:
             ConvertResult with GIF bytes or error
@@ -372,14 +368,27 @@ class ConvertService:
         ], emoji="🔄")
 
         try:
-            # Process in thread to avoid blocking
-            result = await asyncio.to_thread(
-                self._process_image,
-                image_data,
-                text,
-                position
+            key, cached = await self._cache_lookup("image", image_data, {
+                "text": text,
+                "position": position,
+                "bar_color": bar_color,
+                "text_color": text_color,
+                "max_dimension": MAX_DIMENSION,
+            })
+            if cached is not None:
+                return ConvertResult(success=True, gif_bytes=cached)
+
+            # Process in a media worker so quantization doesn't hold the GIL
+            result = await media_engine.run(
+                "image", user_id, image_data,
+                text, position, bar_color, text_color,
+                expires_at=expires_at,
             )
+            self._log_timings("Image", result)
+            await self._cache_store(key, result)
             return result
+        except (MediaQueueFull, MediaJobExpired, MediaJobCancelled) as e:
+            return self._engine_error(e)
         except Exception as e:
             logger.error_tree("Image Conversion Failed", e, [
                 ("Text", text[:30] if text else "None"),
@@ -390,6 +399,48 @@ class ConvertService:
                 error=f"Failed to convert image: {type(e).__name__}"
             )
 
+    @staticmethod
+    async def _cache_lookup(kind: str, data: bytes, settings: dict) -> tuple[str, Optional[bytes]]:
+        """Hash the source + settings and check the output cache (off the event loop)."""
+        def lookup() -> tuple[str, Optional[bytes]]:
+            key = convert_cache.make_key(data, kind, settings)
+            return key, convert_cache.get(key)
+
+        key, cached = await asyncio.to_thread(lookup)
+        if cached is not None:
+            logger.tree("Convert Cache Hit", [
+                ("Kind", kind),
+                ("Key", key[:16]),
+                ("Size", f"{len(cached) / 1024:.1f} KB"),
+            ], emoji="⚡")
+        return key, cached
+
+    @staticmethod
+    async def _cache_store(key: str, result: ConvertResult) -> None:
+        """Keep a successful output for repeat conversions."""
+        if result.success and result.gif_bytes:
+            await asyncio.to_thread(convert_cache.put, key, result.gif_bytes)
+
+    @staticmethod
+    def _engine_error(error: Exception) -> ConvertResult:
+        """Map a media engine scheduling error to a user-facing result."""
+        if isinstance(error, MediaQueueFull):
+            message = "You already have conversions in progress. Please wait for them to finish."
+        elif isinstance(error, MediaJobExpired):
+            message = "This editor expired before the conversion finished."
+        else:
+            message = "Conversion was cancelled."
+        return ConvertResult(success=False, error=message)
+
+    @staticmethod
+    def _log_timings(kind: str, result: ConvertResult) -> None:
+        """Log per-stage timings of a finished media job."""
+        if not result.timings:
+            return
+        logger.tree(f"{kind} Convert Timings", [
+            (stage.title(), f"{ms:.0f}ms") for stage, ms in result.timings.items()
+        ], emoji="⏱️")
+
     def _process_image(
         self,
         image_data: bytes,
@@ -397,89 +448,98 @@ class ConvertService:
         position: Literal["top", "bottom"],
         bar_color: tuple = BAR_COLOR,
         text_color: tuple = TEXT_COLOR,
+        timer: Optional[StageTimer] = None,
     ) -> ConvertResult:
-        """Process image synchronously (runs in thread)."""
+        """Process image synchronously (runs in a media worker)."""
+        timer = timer or StageTimer()
         try:
             # Open image
-            img = Image.open(io.BytesIO(image_data))
+            with timer.stage("decode"):
+                img = Image.open(io.BytesIO(image_data))
 
             # Check if it's an animated GIF
             is_animated = getattr(img, 'is_animated', False)
             if is_animated:
                 return self._process_animated_gif(
-                    img, text, position, bar_color, text_color
-                )
-
-            # Convert to RGB for consistent processing
-            if img.mode == "RGBA":
-                # Preserve transparency by compositing on bar color
-                background = Image.new("RGB", img.size, bar_color)
-                background.paste(img, mask=img.split()[3])
-                img = background
-            elif img.mode == "P":
-                # Palette mode - convert properly
-                img = img.convert("RGB")
-            elif img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Resize if too large
-            if img.width > MAX_DIMENSION or img.height > MAX_DIMENSION:
-                img.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.Resampling.LANCZOS)
-
-            # Only add bar if text is provided
-            if text and text.strip():
-                # Calculate DYNAMIC layout based on image size (NotSoBot style)
-                font, lines, bar_height, text_padding = self._calculate_dynamic_layout(
-                    text, img.width, img.height
+                    img, text, position, bar_color, text_color, timer
                 )
 
-                # Create new image with bar
-                new_height = img.height + bar_height
-                new_img = Image.new("RGB", (img.width, new_height), bar_color)
+            with timer.stage("decode"):
+                img.load()
 
-                # Paste original image in correct position
-                if position == "top":
-                    # Bar at top, image below
-                    new_img.paste(img, (0, bar_height))
-                else:  # bottom
-                    # Image at top, bar below
-                    new_img.paste(img, (0, 0))
+                # Convert to RGB for consistent processing
+                if img.mode == "RGBA":
+                    # Preserve transparency by compositing on bar color
+                    background = Image.new("RGB", img.size, bar_color)
+                    background.paste(img, mask=img.split()[3])
+                    img = background
+                elif img.mode == "P":
+                    # Palette mode - convert properly
+                    img = img.convert("RGB")
+                elif img.mode != "RGB":
+                    img = img.convert("RGB")
 
-                # Draw text on the bar
-                draw = ImageDraw.Draw(new_img)
+                # Resize if too large
+                if img.width > MAX_DIMENSION or img.height > MAX_DIMENSION:
+                    img.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.Resampling.LANCZOS)
 
-                # Calculate line height and spacing
-                line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
-                line_spacing = int(line_height * LINE_SPACING_RATIO)
-                total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
+            timer.check()
 
-                # Calculate starting Y position (centered vertically in bar)
-                if position == "top":
-                    start_y = (bar_height - total_text_height) // 2
-                else:  # bottom
-                    start_y = img.height + (bar_height - total_text_height) // 2
-
-                # Draw each line centered horizontally
-                current_y = start_y
-                for line in lines:
-                    bbox = font.getbbox(line)
-                    line_width = bbox[2] - bbox[0]
-                    text_x = (img.width - line_width) // 2 - bbox[0]
-                    text_y = current_y - bbox[1]
-                    draw.text((text_x, text_y), line, font=font, fill=text_color)
-                    current_y += line_height + line_spacing
-
-                # Ensure RGB mode for watermark
-                if new_img.mode == "RGBA":
-                    # Composite RGBA on white background for consistent watermark
-                    background = Image.new("RGB", new_img.size, (255, 255, 255))
-                    background.paste(new_img, mask=new_img.split()[3])
-                    new_img = background
-                elif new_img.mode != "RGB":
-                    new_img = new_img.convert("RGB")
+            # Only add bar if text is provided
+            if text and text.strip():
+                with timer.stage("layout"):
+                    # Calculate DYNAMIC layout based on image size (NotSoBot style)
+                    font, lines, bar_height, text_padding = self._calculate_dynamic_layout(
+                        text, img.width, img.height
+                    )
 
-                # Add watermark only when text is added (quotes already have watermark)
-                new_img = self._add_watermark(new_img)
+                    # Create new image with bar
+                    new_height = img.height + bar_height
+                    new_img = Image.new("RGB", (img.width, new_height), bar_color)
+
+                    # Paste original image in correct position
+                    if position == "top":
+                        # Bar at top, image below
+                        new_img.paste(img, (0, bar_height))
+                    else:  # bottom
+                        # Image at top, bar below
+                        new_img.paste(img, (0, 0))
+
+                    # Draw text on the bar
+                    draw = ImageDraw.Draw(new_img)
+
+                    # Calculate line height and spacing
+                    line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
+                    line_spacing = int(line_height * LINE_SPACING_RATIO)
+                    total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
+
+                    # Calculate starting Y position (centered vertically in bar)
+                    if position == "top":
+                        start_y = (bar_height - total_text_height) // 2
+                    else:  # bottom
+                        start_y = img.height + (bar_height - total_text_height) // 2
+
+                    # Draw each line centered horizontally
+                    current_y = start_y
+                    for line in lines:
+                        bbox = font.getbbox(line)
+                        line_width = bbox[2] - bbox[0]
+                        text_x = (img.width - line_width) // 2 - bbox[0]
+                        text_y = current_y - bbox[1]
+                        draw.text((text_x, text_y), line, font=font, fill=text_color)
+                        current_y += line_height + line_spacing
+
+                    # Ensure RGB mode for watermark
+                    if new_img.mode == "RGBA":
+                        # Composite RGBA on white background for consistent watermark
+                        background = Image.new("RGB", new_img.size, (255, 255, 255))
+                        background.paste(new_img, mask=new_img.split()[3])
+                        new_img = background
+                    elif new_img.mode != "RGB":
+                        new_img = new_img.convert("RGB")
+
+                    # Add watermark only when text is added (quotes already have watermark)
+                    new_img = self._add_watermark(new_img)
             else:
                 # No text - just convert to GIF without adding bar or watermark
                 # (preserves existing watermarks like quote images have)
@@ -488,9 +548,10 @@ class ConvertService:
                     new_img = new_img.convert("RGB")
 
             # Save as PNG (full quality) - filename will be .gif for Discord starring
-            output = io.BytesIO()
-            new_img.save(output, format="PNG", optimize=True)
-            result_bytes = output.getvalue()
+            with timer.stage("encode"):
+                output = io.BytesIO()
+                new_img.save(output, format="PNG", optimize=True)
+                result_bytes = output.getvalue()
 
             logger.tree("Convert Complete", [
                 ("Size", f"{len(result_bytes) / 1024:.1f} KB"),
@@ -503,6 +564,8 @@ class ConvertService:
                 gif_bytes=result_bytes
             )
 
+        except JobCancelled:
+            raise
         except Exception as e:
             return ConvertResult(
                 success=False,
@@ -516,21 +579,172 @@ class ConvertService:
         position: Literal["top", "bottom"],
         bar_color: tuple = BAR_COLOR,
         text_color: tuple = TEXT_COLOR,
+        timer: Optional[StageTimer] = None,
     ) -> ConvertResult:
-        """Process animated GIF, preserving colors and quality using Wand/ImageMagick."""
+        """Process animated GIF with the streamed encoder, falling back to Wand/Pillow."""
+        timer = timer or StageTimer()
+
+        try:
+            return self._process_animated_gif_streamed(img, text, position, bar_color, text_color, timer)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.tree("Streamed GIF Encode Failed", [
+                ("Error", str(e)),
+                ("Fallback", "Using Wand" if WAND_AVAILABLE else "Using Pillow"),
+            ], emoji="⚠️")
+            img.seek(0)
+            timer.stages.clear()
 
         # Try Wand first (much better quality), fall back to Pillow
         if WAND_AVAILABLE:
             try:
-                return self._process_animated_gif_wand(img, text, position, bar_color, text_color)
+                return self._process_animated_gif_wand(img, text, position, bar_color, text_color, timer)
+            except JobCancelled:
+                raise
             except Exception as e:
                 logger.tree("Wand GIF Processing Failed", [
                     ("Error", str(e)),
                     ("Fallback", "Using Pillow"),
                 ], emoji="⚠️")
+                # Rewind for the Pillow pass and don't count Wand's time twice
+                img.seek(0)
+                timer.stages.clear()
 
         # Fallback to Pillow-based processing
-        return self._process_animated_gif_pillow(img, text, position, bar_color, text_color)
+        return self._process_animated_gif_pillow(img, text, position, bar_color, text_color, timer)
+
+    def _process_animated_gif_streamed(
+        self,
+        img: Image.Image,
+        text: str,
+        position: Literal["top", "bottom"],
+        bar_color: tuple = BAR_COLOR,
+        text_color: tuple = TEXT_COLOR,
+        timer: Optional[StageTimer] = None,
+    ) -> ConvertResult:
+        """
+        Process animated GIF with one shared palette and a pre-rendered overlay.
+
+        DESIGN:
+            The bar, text and watermark are drawn once, and the bar is
+            quantized once onto a global palette built from evenly spaced
+            sample frames. Each frame is then decoded, mapped onto that
+            palette below the bar and handed to StreamingGifWriter, so only
+            a couple of canvases are alive at any time however long the
+            animation is. The watermark is pasted into its own box per
+            frame only when it sits over the animation instead of the bar.
+        """
+        timer = timer or StageTimer()
+        orig_width, orig_height = img.size
+        frame_count = getattr(img, "n_frames", 1)
+        has_text = bool(text and text.strip())
+
+        bar_height = 0
+        bar_layer = None
+        watermark = None
+        watermark_xy = (0, 0)
+        reserved: list[tuple] = []
+
+        with timer.stage("layout"):
+            if has_text:
+                font, lines, bar_height, _ = self._calculate_dynamic_layout(
+                    text, orig_width, orig_height
+                )
+                line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
+                line_spacing = int(line_height * LINE_SPACING_RATIO)
+                total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
+
+                # Bar + text, drawn once
+                bar_layer = Image.new("RGB", (orig_width, bar_height), bar_color)
+                draw = ImageDraw.Draw(bar_layer)
+                current_y = (bar_height - total_text_height) // 2
+                for line in lines:
+                    bbox = font.getbbox(line)
+                    line_width = bbox[2] - bbox[0]
+                    text_x = (orig_width - line_width) // 2 - bbox[0]
+                    draw.text((text_x, current_y - bbox[1]), line, font=font, fill=text_color)
+                    current_y += line_height + line_spacing
+
+                # Watermark, drawn once on a transparent layer and cropped to its box
+                layer = self._add_watermark(
+                    Image.new("RGBA", (orig_width, orig_height + bar_height), (0, 0, 0, 0))
+                )
+                watermark_box = layer.getbbox()
+                if watermark_box:
+                    watermark = layer.crop(watermark_box)
+                    watermark_xy = watermark_box[:2]
+
+                reserved = (
+                    color_ramp(bar_color, text_color, RESERVED_RAMP_STEPS)
+                    + color_ramp((0, 0, 0), WATERMARK_COLOR, RESERVED_RAMP_STEPS // 2)
+                )
+
+        new_height = orig_height + bar_height
+        bar_top = 0 if position == "top" else orig_height
+        frame_top = bar_height if position == "top" else 0
+
+        watermark_on_frame = False
+        if watermark is not None:
+            # The part over the bar is baked into the bar; paste clips the rest
+            bar_layer.paste(watermark, (watermark_xy[0], watermark_xy[1] - bar_top), watermark)
+            watermark_on_frame = (
+                watermark_xy[1] < frame_top + orig_height
+                and watermark_xy[1] + watermark.height > frame_top
+            )
+
+        with timer.stage("quantize"):
+            palette = build_global_palette(self._sample_gif_frames(img, frame_count, timer), reserved)
+            base = Image.new("P", (orig_width, new_height))
+            base.putpalette(palette.getpalette())
+            if bar_layer is not None:
+                base.paste(bar_layer.quantize(palette=palette, dither=Image.Dither.NONE), (0, bar_top))
+
+        output = io.BytesIO()
+        writer = StreamingGifWriter(output, (orig_width, new_height), palette)
+
+        for index in range(frame_count):
+            timer.check()
+
+            with timer.stage("decode"):
+                img.seek(index)
+                duration = img.info.get("duration", 100)
+                frame = img.convert("RGB")
+
+            with timer.stage("layout"):
+                if watermark_on_frame:
+                    frame.paste(watermark, (watermark_xy[0], watermark_xy[1] - frame_top), watermark)
+
+            with timer.stage("quantize"):
+                canvas = base.copy()
+                canvas.paste(frame.quantize(palette=palette, dither=Image.Dither.NONE), (0, frame_top))
+
+            with timer.stage("encode"):
+                writer.add(canvas, duration)
+
+        with timer.stage("encode"):
+            writer.close()
+            result_bytes = output.getvalue()
+
+        logger.tree("Animated GIF Convert Complete (Streamed)", [
+            ("Frames", frame_count),
+            ("Written", writer.frames_written),
+            ("Size", f"{len(result_bytes) / 1024:.1f} KB"),
+            ("Dimensions", f"{orig_width}x{new_height}"),
+            ("Has Text", "Yes" if has_text else "No"),
+            ("Engine", "Pillow (shared palette)"),
+        ], emoji="✅")
+
+        return ConvertResult(success=True, gif_bytes=result_bytes)
+
+    @staticmethod
+    def _sample_gif_frames(img: Image.Image, frame_count: int, timer: StageTimer):
+        """Yield up to GIF_PALETTE_SAMPLES evenly spaced frames (RGB) for palette building."""
+        samples = min(frame_count, GIF_PALETTE_SAMPLES)
+        for index in sorted({i * frame_count // samples for i in range(samples)}):
+            timer.check()
+            img.seek(index)
+            yield img.convert("RGB")
 
     def _process_animated_gif_wand(
         self,
@@ -539,16 +753,23 @@ class ConvertService:
         position: Literal["top", "bottom"],
         bar_color: tuple = BAR_COLOR,
         text_color: tuple = TEXT_COLOR,
+        timer: Optional[StageTimer] = None,
     ) -> ConvertResult:
         """Process animated GIF using Wand/ImageMagick (NotSoBot method)."""
+        timer = timer or StageTimer()
+
         # Save PIL image to bytes for Wand to read
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='GIF', save_all=True)
-        img_bytes.seek(0)
+        with timer.stage("decode"):
+            img_bytes = io.BytesIO()
+            img.save(img_bytes, format='GIF', save_all=True)
+            img_bytes.seek(0)
 
         has_text = text and text.strip()
 
-        with WandImage(blob=img_bytes.getvalue()) as wand_img:
+        with timer.stage("decode"):
+            wand_img = WandImage(blob=img_bytes.getvalue())
+
+        with wand_img:
             orig_width = wand_img.width
             orig_height = wand_img.height
             frame_count = len(wand_img.sequence)
@@ -564,94 +785,100 @@ class ConvertService:
             font_size = max(24, int(bar_height * FONT_SIZE_RATIO)) if has_text else 0
 
             # SHRINK font until text fits (NotSoBot style)
-            if has_text:
-                with Drawing() as measure_draw:
-                    measure_draw.font = self._font_path or 'DejaVu-Sans-Bold'
-                    while font_size > 16:
-                        measure_draw.font_size = font_size
-                        with WandImage(width=orig_width, height=bar_height) as temp_img:
-                            metrics = measure_draw.get_font_metrics(temp_img, text)
-                            if metrics.text_width <= max_text_width:
-                                break
-                        font_size -= 2
-
-                logger.tree("GIF Text Layout", [
-                    ("Text", text[:30] + "..." if len(text) > 30 else text),
-                    ("GIF Width", str(orig_width)),
-                    ("Font Size", str(font_size)),
-                ], emoji="📏")
+            with timer.stage("layout"):
+                if has_text:
+                    with Drawing() as measure_draw:
+                        measure_draw.font = self._font_path or 'DejaVu-Sans-Bold'
+                        while font_size > 16:
+                            measure_draw.font_size = font_size
+                            with WandImage(width=orig_width, height=bar_height) as temp_img:
+                                metrics = measure_draw.get_font_metrics(temp_img, text)
+                                if metrics.text_width <= max_text_width:
+                                    break
+                            font_size -= 2
+
+                    logger.tree("GIF Text Layout", [
+                        ("Text", text[:30] + "..." if len(text) > 30 else text),
+                        ("GIF Width", str(orig_width)),
+                        ("Font Size", str(font_size)),
+                    ], emoji="📏")
 
             # Create output image
             with WandImage() as output_img:
-                for frame in wand_img.sequence:
-                    # Clone the frame
-                    with frame.clone() as f:
-                        # Coalesce to handle frame disposal properly
-                        f.coalesce()
-
-                        if has_text:
-                            # Create new canvas with bar
-                            bar_color_hex = f'rgb({bar_color[0]},{bar_color[1]},{bar_color[2]})'
+                with timer.stage("layout"):
+                    for frame in wand_img.sequence:
+                        timer.check()
 
-                            with WandImage(width=orig_width, height=new_height, background=Color(bar_color_hex)) as new_frame:
-                                # Paste original frame
-                                if position == "top":
-                                    new_frame.composite(f, left=0, top=bar_height)
-                                else:
-                                    new_frame.composite(f, left=0, top=0)
+                        # Clone the frame
+                        with frame.clone() as f:
+                            # Coalesce to handle frame disposal properly
+                            f.coalesce()
 
-                                # Draw text centered on bar
-                                text_color_hex = f'rgb({text_color[0]},{text_color[1]},{text_color[2]})'
+                            if has_text:
+                                # Create new canvas with bar
+                                bar_color_hex = f'rgb({bar_color[0]},{bar_color[1]},{bar_color[2]})'
 
-                                with Drawing() as draw:
-                                    draw.font = self._font_path or 'DejaVu-Sans-Bold'
-                                    draw.font_size = font_size
-                                    draw.fill_color = Color(text_color_hex)
-                                    draw.text_alignment = 'center'
-
-                                    # Get metrics for vertical positioning
-                                    metrics = draw.get_font_metrics(new_frame, text)
-
-                                    # X = center of image
-                                    text_x = orig_width // 2
-
-                                    # Y = center of bar
+                                with WandImage(width=orig_width, height=new_height, background=Color(bar_color_hex)) as new_frame:
+                                    # Paste original frame
                                     if position == "top":
-                                        text_y = int(bar_height / 2 + metrics.text_height / 3)
+                                        new_frame.composite(f, left=0, top=bar_height)
                                     else:
-                                        text_y = int(orig_height + bar_height / 2 + metrics.text_height / 3)
-
-                                    draw.text(text_x, text_y, text)
-                                    draw(new_frame)
-
-                                # Add watermark
-                                watermark_size = max(WATERMARK_MIN_FONT, min(WATERMARK_MAX_FONT, int(orig_width * WATERMARK_FONT_SIZE_RATIO)))
-                                watermark_padding = max(8, int(orig_width * WATERMARK_PADDING_RATIO))
-                                watermark_color = f'rgb({WATERMARK_COLOR[0]},{WATERMARK_COLOR[1]},{WATERMARK_COLOR[2]})'
-                                with Drawing() as wm_draw:
-                                    wm_draw.font = self._font_path or 'DejaVu-Sans-Bold'
-                                    wm_draw.font_size = watermark_size
-                                    wm_draw.fill_color = Color(watermark_color)
-                                    wm_draw.stroke_color = Color('black')
-                                    wm_draw.stroke_width = 1
-                                    wm_draw.text_alignment = 'right'
-                                    wm_draw.gravity = 'south_east'
-                                    wm_draw.text(watermark_padding, watermark_padding, WATERMARK_TEXT)
-                                    wm_draw(new_frame)
-
-                                # Copy frame delay
-                                new_frame.delay = f.delay or 10
-                                output_img.sequence.append(new_frame.clone())
-                        else:
-                            # No text - just pass through without adding watermark
-                            # (preserves existing watermarks like quote images have)
-                            f.delay = f.delay or 10
-                            output_img.sequence.append(f.clone())
-
-                # Optimize and save
-                output_img.type = 'optimize'
-                output_img.format = 'gif'
-                result_bytes = output_img.make_blob()
+                                        new_frame.composite(f, left=0, top=0)
+
+                                    # Draw text centered on bar
+                                    text_color_hex = f'rgb({text_color[0]},{text_color[1]},{text_color[2]})'
+
+                                    with Drawing() as draw:
+                                        draw.font = self._font_path or 'DejaVu-Sans-Bold'
+                                        draw.font_size = font_size
+                                        draw.fill_color = Color(text_color_hex)
+                                        draw.text_alignment = 'center'
+
+                                        # Get metrics for vertical positioning
+                                        metrics = draw.get_font_metrics(new_frame, text)
+
+                                        # X = center of image
+                                        text_x = orig_width // 2
+
+                                        # Y = center of bar
+                                        if position == "top":
+                                            text_y = int(bar_height / 2 + metrics.text_height / 3)
+                                        else:
+                                            text_y = int(orig_height + bar_height / 2 + metrics.text_height / 3)
+
+                                        draw.text(text_x, text_y, text)
+                                        draw(new_frame)
+
+                                    # Add watermark
+                                    watermark_size = max(WATERMARK_MIN_FONT, min(WATERMARK_MAX_FONT, int(orig_width * WATERMARK_FONT_SIZE_RATIO)))
+                                    watermark_padding = max(8, int(orig_width * WATERMARK_PADDING_RATIO))
+                                    watermark_color = f'rgb({WATERMARK_COLOR[0]},{WATERMARK_COLOR[1]},{WATERMARK_COLOR[2]})'
+                                    with Drawing() as wm_draw:
+                                        wm_draw.font = self._font_path or 'DejaVu-Sans-Bold'
+                                        wm_draw.font_size = watermark_size
+                                        wm_draw.fill_color = Color(watermark_color)
+                                        wm_draw.stroke_color = Color('black')
+                                        wm_draw.stroke_width = 1
+                                        wm_draw.text_alignment = 'right'
+                                        wm_draw.gravity = 'south_east'
+                                        wm_draw.text(watermark_padding, watermark_padding, WATERMARK_TEXT)
+                                        wm_draw(new_frame)
+
+                                    # Copy frame delay
+                                    new_frame.delay = f.delay or 10
+                                    output_img.sequence.append(new_frame.clone())
+                            else:
+                                # No text - just pass through without adding watermark
+                                # (preserves existing watermarks like quote images have)
+                                f.delay = f.delay or 10
+                                output_img.sequence.append(f.clone())
+
+                # Optimize and save (ImageMagick quantizes inside make_blob,
+                # so its palette work is reported under "encode")
+                with timer.stage("encode"):
+                    output_img.type = 'optimize'
+                    output_img.format = 'gif'
+                    result_bytes = output_img.make_blob()
 
         logger.tree("Animated GIF Convert Complete (Wand)", [
             ("Frames", frame_count),
@@ -670,8 +897,10 @@ class ConvertService:
         position: Literal["top", "bottom"],
         bar_color: tuple = BAR_COLOR,
         text_color: tuple = TEXT_COLOR,
+        timer: Optional[StageTimer] = None,
     ) -> ConvertResult:
         """Fallback: Process animated GIF using Pillow."""
+        timer = timer or StageTimer()
         try:
             frames = []
             durations = []
@@ -688,67 +917,71 @@ class ConvertService:
             bar_height = 0
 
             if has_text:
-                font, lines, bar_height, text_padding = self._calculate_dynamic_layout(
-                    text, orig_width, orig_height
-                )
-                line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
-                line_spacing = int(line_height * LINE_SPACING_RATIO)
-                total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
+                with timer.stage("layout"):
+                    font, lines, bar_height, text_padding = self._calculate_dynamic_layout(
+                        text, orig_width, orig_height
+                    )
+                    line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
+                    line_spacing = int(line_height * LINE_SPACING_RATIO)
+                    total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
 
-                if position == "top":
-                    start_y = (bar_height - total_text_height) // 2
-                else:
-                    start_y = orig_height + (bar_height - total_text_height) // 2
+                    if position == "top":
+                        start_y = (bar_height - total_text_height) // 2
+                    else:
+                        start_y = orig_height + (bar_height - total_text_height) // 2
 
             new_height = orig_height + bar_height if has_text else orig_height
 
             frame_count = 0
             try:
                 while True:
-                    duration = img.info.get('duration', 100)
-                    durations.append(duration)
-                    frame = img.convert("RGBA")
-
-                    if has_text:
-                        bar_color_rgba = bar_color + (255,)
-                        new_frame = Image.new("RGBA", (orig_width, new_height), bar_color_rgba)
+                    with timer.stage("decode"):
+                        duration = img.info.get('duration', 100)
+                        durations.append(duration)
+                        frame = img.convert("RGBA")
 
-                        if position == "top":
-                            new_frame.paste(frame, (0, bar_height))
+                    with timer.stage("layout"):
+                        if has_text:
+                            bar_color_rgba = bar_color + (255,)
+                            new_frame = Image.new("RGBA", (orig_width, new_height), bar_color_rgba)
+
+                            if position == "top":
+                                new_frame.paste(frame, (0, bar_height))
+                            else:
+                                new_frame.paste(frame, (0, 0))
+
+                            draw = ImageDraw.Draw(new_frame)
+                            current_y = start_y
+                            for line in lines:
+                                bbox = font.getbbox(line)
+                                line_width = bbox[2] - bbox[0]
+                                text_x = (orig_width - line_width) // 2 - bbox[0]
+                                text_y = current_y - bbox[1]
+                                draw.text((text_x, text_y), line, font=font, fill=text_color)
+                                current_y += line_height + line_spacing
                         else:
-                            new_frame.paste(frame, (0, 0))
-
-                        draw = ImageDraw.Draw(new_frame)
-                        current_y = start_y
-                        for line in lines:
-                            bbox = font.getbbox(line)
-                            line_width = bbox[2] - bbox[0]
-                            text_x = (orig_width - line_width) // 2 - bbox[0]
-                            text_y = current_y - bbox[1]
-                            draw.text((text_x, text_y), line, font=font, fill=text_color)
-                            current_y += line_height + line_spacing
-                    else:
-                        new_frame = frame
-
-                    # Add watermark to frame only when text is added
-                    # (preserves existing watermarks like quote images have)
-                    if has_text:
-                        wm_font_size = max(WATERMARK_MIN_FONT, min(WATERMARK_MAX_FONT, int(orig_width * WATERMARK_FONT_SIZE_RATIO)))
-                        wm_padding = max(8, int(orig_width * WATERMARK_PADDING_RATIO))
-                        wm_font = self._get_font(wm_font_size)
-                        wm_draw = ImageDraw.Draw(new_frame)
-                        wm_bbox = wm_font.getbbox(WATERMARK_TEXT)
-                        wm_width = wm_bbox[2] - wm_bbox[0]
-                        wm_height = wm_bbox[3] - wm_bbox[1]
-                        wm_x = new_frame.width - wm_width - wm_padding - wm_bbox[0]
-                        wm_y = new_frame.height - wm_height - wm_padding - wm_bbox[1]
-                        # Draw outline
-                        for ox, oy in [(-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)]:
-                            wm_draw.text((wm_x + ox, wm_y + oy), WATERMARK_TEXT, font=wm_font, fill=(0, 0, 0))
-                        wm_draw.text((wm_x, wm_y), WATERMARK_TEXT, font=wm_font, fill=WATERMARK_COLOR)
+                            new_frame = frame
+
+                        # Add watermark to frame only when text is added
+                        # (preserves existing watermarks like quote images have)
+                        if has_text:
+                            wm_font_size = max(WATERMARK_MIN_FONT, min(WATERMARK_MAX_FONT, int(orig_width * WATERMARK_FONT_SIZE_RATIO)))
+                            wm_padding = max(8, int(orig_width * WATERMARK_PADDING_RATIO))
+                            wm_font = self._get_font(wm_font_size)
+                            wm_draw = ImageDraw.Draw(new_frame)
+                            wm_bbox = wm_font.getbbox(WATERMARK_TEXT)
+                            wm_width = wm_bbox[2] - wm_bbox[0]
+                            wm_height = wm_bbox[3] - wm_bbox[1]
+                            wm_x = new_frame.width - wm_width - wm_padding - wm_bbox[0]
+                            wm_y = new_frame.height - wm_height - wm_padding - wm_bbox[1]
+                            # Draw outline
+                            for ox, oy in [(-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)]:
+                                wm_draw.text((wm_x + ox, wm_y + oy), WATERMARK_TEXT, font=wm_font, fill=(0, 0, 0))
+                            wm_draw.text((wm_x, wm_y), WATERMARK_TEXT, font=wm_font, fill=WATERMARK_COLOR)
 
                     frames.append(new_frame)
                     frame_count += 1
+                    timer.check()
                     img.seek(img.tell() + 1)
 
             except EOFError:
@@ -758,21 +991,24 @@ class ConvertService:
                 return ConvertResult(success=False, error="No frames found in GIF")
 
             palette_frames = []
-            for frame in frames:
-                p_frame = frame.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
-                palette_frames.append(p_frame)
-
-            output = io.BytesIO()
-            palette_frames[0].save(
-                output,
-                format="GIF",
-                save_all=True,
-                append_images=palette_frames[1:],
-                duration=durations,
-                loop=0,
-                disposal=2,
-            )
-            result_bytes = output.getvalue()
+            with timer.stage("quantize"):
+                for frame in frames:
+                    timer.check()
+                    p_frame = frame.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
+                    palette_frames.append(p_frame)
+
+            with timer.stage("encode"):
+                output = io.BytesIO()
+                palette_frames[0].save(
+                    output,
+                    format="GIF",
+                    save_all=True,
+                    append_images=palette_frames[1:],
+                    duration=durations,
+                    loop=0,
+                    disposal=2,
+                )
+                result_bytes = output.getvalue()
 
             logger.tree("Animated GIF Convert Complete (Pillow)", [
                 ("Frames", frame_count),
@@ -784,6 +1020,8 @@ class ConvertService:
 
             return ConvertResult(success=True, gif_bytes=result_bytes)
 
+        except JobCancelled:
+            raise
         except Exception as e:
             return ConvertResult(success=False, error=str(e))
 
@@ -858,6 +1096,8 @@ class ConvertService:
         bar_color: tuple = BAR_COLOR,
         text_color: tuple = TEXT_COLOR,
         effect: str = "none",
+        user_id: int = 0,
+        expires_at: Optional[datetime] = None,
     ) -> ConvertResult:
         """
         Convert a video to animated GIF with optional text bar.
@@ -868,6 +1108,9 @@ class ConvertService:
             position: Position of text bar ("top" or "bottom")
             bar_color: RGB tuple for bar color
             text_color: RGB tuple for text color
+            effect: Key of VIDEO_EFFECT_FILTERS
+            user_id: Requesting user (for fair queueing)
+            expires_at: Interaction expiry; the job is dropped after it
 
         Returns:
             ConvertResult with GIF bytes or error
@@ -879,16 +1122,29 @@ class ConvertService:
         ], emoji="🎬")
 
         try:
-            result = await asyncio.to_thread(
-                self._process_video,
-                video_data,
-                text,
-                position,
-                bar_color,
-                text_color,
-                effect
+            key, cached = await self._cache_lookup("video", video_data, {
+                "text": text,
+                "position": position,
+                "bar_color": bar_color,
+                "text_color": text_color,
+                "effect": effect,
+                "trim": [0, MAX_VIDEO_DURATION],
+                "fps": GIF_FPS,
+                "width": GIF_MAX_WIDTH,
+            })
+            if cached is not None:
+                return ConvertResult(success=True, gif_bytes=cached)
+
+            result = await media_engine.run(
+                "video", user_id, video_data,
+                text, position, bar_color, text_color, effect,
+                expires_at=expires_at,
             )
+            self._log_timings("Video", result)
+            await self._cache_store(key, result)
             return result
+        except (MediaQueueFull, MediaJobExpired, MediaJobCancelled) as e:
+            return self._engine_error(e)
         except Exception as e:
             logger.error_tree("Video Conversion Failed", e, [
                 ("Text", text[:30] if text else "None"),
@@ -907,9 +1163,11 @@ class ConvertService:
         position: Literal["top", "bottom"],
         bar_color: tuple,
         text_color: tuple,
-        effect: str = "none"
+        effect: str = "none",
+        timer: Optional[StageTimer] = None,
     ) -> ConvertResult:
-        """Process video synchronously (runs in thread)."""
+        """Process video synchronously (runs in a media worker)."""
+        timer = timer or StageTimer()
         # Create unique temp files
         temp_id = uuid.uuid4().hex[:8]
         input_path = TEMP_DIR / f"input_{temp_id}.mp4"
@@ -917,11 +1175,12 @@ class ConvertService:
         palette_path = TEMP_DIR / f"palette_{temp_id}.png"
 
         try:
-            # Write video data to temp file
-            input_path.write_bytes(video_data)
+            with timer.stage("decode"):
+                # Write video data to temp file
+                input_path.write_bytes(video_data)
 
-            # Get video info
-            info = self._get_video_info(str(input_path))
+                # Get video info
+                info = self._get_video_info(str(input_path))
             if not info:
                 return ConvertResult(success=False, error="Could not read video file")
 
@@ -932,144 +1191,147 @@ class ConvertService:
                     error=f"Video too long ({info.duration:.1f}s). Max is {MAX_VIDEO_DURATION}s."
                 )
 
-            # Calculate output dimensions
-            scale_width = min(info.width, GIF_MAX_WIDTH)
-            # Make width divisible by 2 for ffmpeg
-            scale_width = scale_width - (scale_width % 2)
-
-            # Calculate scaled height (maintaining aspect ratio)
-            scale_factor = scale_width / info.width
-            scale_height = int(info.height * scale_factor)
-            # Make height divisible by 2 for ffmpeg
-            scale_height = scale_height - (scale_height % 2)
-
-            # Build ffmpeg filter chain
-            bar_color_hex = "#{:02x}{:02x}{:02x}".format(*bar_color)
-            text_color_hex = "#{:02x}{:02x}{:02x}".format(*text_color)
-
-            # Base scale filter
-            filters = [f"scale={scale_width}:{scale_height}:flags=lanczos"]
-
-            # Add effect filter if specified
-            effect_filter = self.VIDEO_EFFECT_FILTERS.get(effect, "")
-            if effect_filter:
-                filters.append(effect_filter)
-
-            # Font option for drawtext filters
-            font_file = self._font_path or ""
-            font_option = f":fontfile={font_file}" if font_file else ""
-
-            # Add text bar if text is provided
-            if text:
-
-                # Bar height = 20% of scaled video height, minimum 60px
-                bar_height = max(60, int(scale_height * BAR_HEIGHT_RATIO))
-
-                # Max text width = 90% of video width (leave padding)
-                max_text_width = int(scale_width * 0.90)
-
-                # Start with large font (70% of bar height)
-                font_size = max(24, int(bar_height * FONT_SIZE_RATIO))
-
-                # SHRINK font until text fits (NotSoBot style)
-                # Use conservative estimate: char_width ≈ 0.65 * font_size
-                while font_size > 16:
-                    estimated_width = len(text) * font_size * 0.65
-                    if estimated_width <= max_text_width:
-                        break
-                    font_size -= 2
-
-                # Vertical padding
-                vertical_padding = max(8, int(bar_height * BAR_PADDING_RATIO))
-                total_text_height = font_size
-                min_bar_for_text = total_text_height + (vertical_padding * 2)
-                if min_bar_for_text > bar_height:
-                    bar_height = min_bar_for_text
-                bar_height = bar_height + (bar_height % 2)  # Make divisible by 2
-
-                # Y position for text (centered in bar)
-                text_y = (bar_height - font_size) // 2
-
-                if position == "top":
-                    filters.append(f"pad=iw:ih+{bar_height}:0:{bar_height}:color={bar_color_hex}")
-                    escaped_text = self._escape_drawtext(text)
-                    filters.append(
-                        f"drawtext=text='{escaped_text}'{font_option}"
-                        f":fontsize={font_size}:fontcolor={text_color_hex}"
-                        f":x=(w-text_w)/2:y={text_y}"
-                    )
-                else:
-                    filters.append(f"pad=iw:ih+{bar_height}:0:0:color={bar_color_hex}")
-                    escaped_text = self._escape_drawtext(text)
-                    filters.append(
-                        f"drawtext=text='{escaped_text}'{font_option}"
-                        f":fontsize={font_size}:fontcolor={text_color_hex}"
-                        f":x=(w-text_w)/2:y=h-{bar_height}+{text_y}"
-                    )
+            with timer.stage("layout"):
+                # Calculate output dimensions
+                scale_width = min(info.width, GIF_MAX_WIDTH)
+                # Make width divisible by 2 for ffmpeg
+                scale_width = scale_width - (scale_width % 2)
 
-                logger.tree("Video Text Layout", [
-                    ("Text", text[:30] + "..." if len(text) > 30 else text),
-                    ("Video Width", str(scale_width)),
-                    ("Font Size", str(font_size)),
-                ], emoji="📏")
-
-            # Add watermark at bottom right only when text is added
-            if text:
-                watermark_size = max(WATERMARK_MIN_FONT, min(WATERMARK_MAX_FONT, int(scale_width * WATERMARK_FONT_SIZE_RATIO)))
-                watermark_padding = max(8, int(scale_width * WATERMARK_PADDING_RATIO))
-                watermark_hex = "#{:02x}{:02x}{:02x}".format(*WATERMARK_COLOR)
-                escaped_watermark = self._escape_drawtext(WATERMARK_TEXT)
-                filters.append(
-                    f"drawtext=text='{escaped_watermark}'{font_option}"
-                    f":fontsize={watermark_size}:fontcolor={watermark_hex}"
-                    f":borderw=1:bordercolor=black"
-                    f":x=w-text_w-{watermark_padding}:y=h-text_h-{watermark_padding}"
-                )
+                # Calculate scaled height (maintaining aspect ratio)
+                scale_factor = scale_width / info.width
+                scale_height = int(info.height * scale_factor)
+                # Make height divisible by 2 for ffmpeg
+                scale_height = scale_height - (scale_height % 2)
 
-            # Add fps filter
-            filters.append(f"fps={GIF_FPS}")
+                # Build ffmpeg filter chain
+                bar_color_hex = "#{:02x}{:02x}{:02x}".format(*bar_color)
+                text_color_hex = "#{:02x}{:02x}{:02x}".format(*text_color)
 
-            filter_chain = ",".join(filters)
+                # Base scale filter
+                filters = [f"scale={scale_width}:{scale_height}:flags=lanczos"]
 
-            # Step 1: Generate palette for better colors
-            palette_cmd = [
-                "ffmpeg", "-y",
-                "-i", str(input_path),
-                "-vf", f"{filter_chain},palettegen=stats_mode=diff",
-                "-t", str(min(info.duration, MAX_VIDEO_DURATION)),
-                str(palette_path)
-            ]
+                # Add effect filter if specified
+                effect_filter = self.VIDEO_EFFECT_FILTERS.get(effect, "")
+                if effect_filter:
+                    filters.append(effect_filter)
 
-            result = subprocess.run(palette_cmd, capture_output=True, timeout=120)
-            if result.returncode != 0:
-                logger.tree("Palette Generation Failed", [
-                    ("Error", result.stderr.decode()[:100]),
-                ], emoji="⚠️")
-                # Fall back to no palette
-                palette_path.unlink(missing_ok=True)
+                # Font option for drawtext filters
+                font_file = self._font_path or ""
+                font_option = f":fontfile={font_file}" if font_file else ""
 
-            # Step 2: Create GIF
-            if palette_path.exists():
-                # Use palette for better quality
-                gif_cmd = [
-                    "ffmpeg", "-y",
-                    "-i", str(input_path),
-                    "-i", str(palette_path),
-                    "-lavfi", f"{filter_chain} [x]; [x][1:v] paletteuse=dither=bayer:bayer_scale=5",
-                    "-t", str(min(info.duration, MAX_VIDEO_DURATION)),
-                    str(output_path)
-                ]
-            else:
-                # No palette fallback
-                gif_cmd = [
+                # Add text bar if text is provided
+                if text:
+
+                    # Bar height = 20% of scaled video height, minimum 60px
+                    bar_height = max(60, int(scale_height * BAR_HEIGHT_RATIO))
+
+                    # Max text width = 90% of video width (leave padding)
+                    max_text_width = int(scale_width * 0.90)
+
+                    # Start with large font (70% of bar height)
+                    font_size = max(24, int(bar_height * FONT_SIZE_RATIO))
+
+                    # SHRINK font until text fits (NotSoBot style)
+                    # Use conservative estimate: char_width ≈ 0.65 * font_size
+                    while font_size > 16:
+                        estimated_width = len(text) * font_size * 0.65
+                        if estimated_width <= max_text_width:
+                            break
+                        font_size -= 2
+
+                    # Vertical padding
+                    vertical_padding = max(8, int(bar_height * BAR_PADDING_RATIO))
+                    total_text_height = font_size
+                    min_bar_for_text = total_text_height + (vertical_padding * 2)
+                    if min_bar_for_text > bar_height:
+                        bar_height = min_bar_for_text
+                    bar_height = bar_height + (bar_height % 2)  # Make divisible by 2
+
+                    # Y position for text (centered in bar)
+                    text_y = (bar_height - font_size) // 2
+
+                    if position == "top":
+                        filters.append(f"pad=iw:ih+{bar_height}:0:{bar_height}:color={bar_color_hex}")
+                        escaped_text = self._escape_drawtext(text)
+                        filters.append(
+                            f"drawtext=text='{escaped_text}'{font_option}"
+                            f":fontsize={font_size}:fontcolor={text_color_hex}"
+                            f":x=(w-text_w)/2:y={text_y}"
+                        )
+                    else:
+                        filters.append(f"pad=iw:ih+{bar_height}:0:0:color={bar_color_hex}")
+                        escaped_text = self._escape_drawtext(text)
+                        filters.append(
+                            f"drawtext=text='{escaped_text}'{font_option}"
+                            f":fontsize={font_size}:fontcolor={text_color_hex}"
+                            f":x=(w-text_w)/2:y=h-{bar_height}+{text_y}"
+                        )
+
+                    logger.tree("Video Text Layout", [
+                        ("Text", text[:30] + "..." if len(text) > 30 else text),
+                        ("Video Width", str(scale_width)),
+                        ("Font Size", str(font_size)),
+                    ], emoji="📏")
+
+                # Add watermark at bottom right only when text is added
+                if text:
+                    watermark_size = max(WATERMARK_MIN_FONT, min(WATERMARK_MAX_FONT, int(scale_width * WATERMARK_FONT_SIZE_RATIO)))
+                    watermark_padding = max(8, int(scale_width * WATERMARK_PADDING_RATIO))
+                    watermark_hex = "#{:02x}{:02x}{:02x}".format(*WATERMARK_COLOR)
+                    escaped_watermark = self._escape_drawtext(WATERMARK_TEXT)
+                    filters.append(
+                        f"drawtext=text='{escaped_watermark}'{font_option}"
+                        f":fontsize={watermark_size}:fontcolor={watermark_hex}"
+                        f":borderw=1:bordercolor=black"
+                        f":x=w-text_w-{watermark_padding}:y=h-text_h-{watermark_padding}"
+                    )
+
+                # Add fps filter
+                filters.append(f"fps={GIF_FPS}")
+
+                filter_chain = ",".join(filters)
+
+            with timer.stage("quantize"):
+                # Step 1: Generate palette for better colors
+                palette_cmd = [
                     "ffmpeg", "-y",
                     "-i", str(input_path),
-                    "-vf", filter_chain,
+                    "-vf", f"{filter_chain},palettegen=stats_mode=diff",
                     "-t", str(min(info.duration, MAX_VIDEO_DURATION)),
-                    str(output_path)
+                    str(palette_path)
                 ]
 
-            result = subprocess.run(gif_cmd, capture_output=True, timeout=180)
+                result = subprocess.run(palette_cmd, capture_output=True, timeout=120)
+                if result.returncode != 0:
+                    logger.tree("Palette Generation Failed", [
+                        ("Error", result.stderr.decode()[:100]),
+                    ], emoji="⚠️")
+                    # Fall back to no palette
+                    palette_path.unlink(missing_ok=True)
+
+            with timer.stage("encode"):
+                # Step 2: Create GIF
+                if palette_path.exists():
+                    # Use palette for better quality
+                    gif_cmd = [
+                        "ffmpeg", "-y",
+                        "-i", str(input_path),
+                        "-i", str(palette_path),
+                        "-lavfi", f"{filter_chain} [x]; [x][1:v] paletteuse=dither=bayer:bayer_scale=5",
+                        "-t", str(min(info.duration, MAX_VIDEO_DURATION)),
+                        str(output_path)
+                    ]
+                else:
+                    # No palette fallback
+                    gif_cmd = [
+                        "ffmpeg", "-y",
+                        "-i", str(input_path),
+                        "-vf", filter_chain,
+                        "-t", str(min(info.duration, MAX_VIDEO_DURATION)),
+                        str(output_path)
+                    ]
+
+                result = subprocess.run(gif_cmd, capture_output=True, timeout=180)
             if result.returncode != 0:
                 error_msg = result.stderr.decode()
                 logger.tree("FFmpeg GIF Error", [
@@ -1095,6 +1357,8 @@ class ConvertService:
 
         except subprocess.TimeoutExpired:
             return ConvertResult(success=False, error="Video processing timed out")
+        except JobCancelled:
+            raise
         except Exception as e:
             return ConvertResult(success=False, error=str(e))
         finally:
@@ -1152,87 +1416,192 @@ class ConvertService:
                         ("Error", str(e)[:50]),
                     ], emoji="⚠️")
 
-    def extract_preview_strip(self, video_data: bytes, num_frames: int = 5) -> Optional[bytes]:
+    # =========================================================================
+    # Video Preview (single ffmpeg run)
+    # =========================================================================
+
+    @staticmethod
+    def _is_streamable(video_data: bytes) -> bool:
         """
-        Extract multiple frames and stitch into horizontal preview strip.
+        Check whether ffmpeg can demux a video from a pipe.
 
-        Args:
-            video_data: Raw video bytes
-            num_frames: Number of frames to extract (default 5)
+        MP4/MOV files whose moov box (the sample index) comes after the
+        media data need a seekable input. Other containers stream fine.
+        """
+        if video_data[4:8] != b"ftyp":
+            return True
+
+        offset = 0
+        total = len(video_data)
+        while offset + 8 <= total:
+            size = int.from_bytes(video_data[offset:offset + 4], "big")
+            box = video_data[offset + 4:offset + 8]
+            if box == b"moov":
+                return True
+            if box == b"mdat":
+                return False
+            if size == 1 and offset + 16 <= total:
+                size = int.from_bytes(video_data[offset + 8:offset + 16], "big")
+            if size < 8:
+                break
+            offset += size
+        return False
+
+    def _sample_video_frames(
+        self,
+        video_data: bytes,
+        width: int,
+        timer: StageTimer,
+    ) -> tuple[Optional[float], list[Image.Image], str]:
+        """
+        Decode a video once and sample frames from it.
+
+        One ffmpeg process reads the input, samples PREVIEW_SAMPLE_FPS frames
+        per second of the first MAX_VIDEO_DURATION seconds, scales them and
+        writes raw RGB to stdout. Duration and output frame size are parsed
+        from ffmpeg's own stream banner, so there's no separate ffprobe.
+        Input goes over stdin; MP4s that can't be read from a pipe are
+        handed over as an in-memory file (memfd) instead, so nothing is
+        written to disk.
 
         Returns:
-            PNG bytes of the stitched preview strip, or None on failure
+            (duration, frames, input mode) - duration is None if unknown
         """
-        temp_id = uuid.uuid4().hex[:8]
-        input_path = TEMP_DIR / f"preview_input_{temp_id}.mp4"
-        frame_paths = [TEMP_DIR / f"preview_frame_{temp_id}_{i}.png" for i in range(num_frames)]
+        memfd: Optional[int] = None
+        temp_path: Optional[Path] = None
+        run_kwargs: dict = {"stdin": subprocess.DEVNULL}
 
         try:
-            # Write video to temp file
-            input_path.write_bytes(video_data)
+            with timer.stage("decode"):
+                if self._is_streamable(video_data):
+                    source, mode = "pipe:0", "stdin"
+                    run_kwargs = {"input": video_data}
+                elif hasattr(os, "memfd_create"):
+                    memfd = os.memfd_create("syria_preview")
+                    with open(memfd, "wb", closefd=False) as f:
+                        f.write(video_data)
+                    source, mode = f"/dev/fd/{memfd}", "memfd"
+                    run_kwargs["pass_fds"] = (memfd,)
+                else:
+                    # No memfd outside Linux - fall back to a temp file
+                    temp_path = TEMP_DIR / f"preview_{uuid.uuid4().hex[:8]}.mp4"
+                    temp_path.write_bytes(video_data)
+                    source, mode = str(temp_path), "file"
 
-            # Get video duration
-            info = self._get_video_info(str(input_path))
-            if not info or info.duration <= 0:
-                return None
+                cmd = [
+                    "ffmpeg", "-hide_banner",
+                    "-i", source,
+                    "-t", str(MAX_VIDEO_DURATION),
+                    "-an", "-sn",
+                    "-vf", f"fps={PREVIEW_SAMPLE_FPS},scale={width}:-2",
+                    "-f", "rawvideo", "-pix_fmt", "rgb24",
+                    "pipe:1",
+                ]
+                result = subprocess.run(cmd, capture_output=True, timeout=30, **run_kwargs)
+        finally:
+            if memfd is not None:
+                os.close(memfd)
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+        stderr = result.stderr.decode(errors="replace")
+
+        duration = None
+        match = _DURATION_RE.search(stderr)
+        if match:
+            hours, minutes, seconds = match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        frames: list[Image.Image] = []
+        output_info = stderr[stderr.find("Output #0"):]
+        match = _RAW_SIZE_RE.search(output_info)
+        if match and result.stdout:
+            frame_width, frame_height = int(match.group(1)), int(match.group(2))
+            frame_size = frame_width * frame_height * 3
+            raw = memoryview(result.stdout)
+            for offset in range(0, len(raw) - frame_size + 1, frame_size):
+                frames.append(Image.frombytes("RGB", (frame_width, frame_height), raw[offset:offset + frame_size]))
+
+        if result.returncode != 0 and not frames:
+            logger.tree("Video Preview Decode Failed", [
+                ("Input", mode),
+                ("Return Code", str(result.returncode)),
+                ("Error", stderr.strip().splitlines()[-1][:100] if stderr.strip() else "Unknown"),
+            ], emoji="⚠️")
 
-            duration = min(info.duration, MAX_VIDEO_DURATION)
+        # Streamed containers may not report a duration - estimate from samples
+        if duration is None and frames:
+            duration = len(frames) / PREVIEW_SAMPLE_FPS
 
-            # Calculate timestamps for each frame (0%, 25%, 50%, 75%, 100%)
-            timestamps = [duration * i / (num_frames - 1) for i in range(num_frames)]
+        return duration, frames, mode
 
-            # Extract frames at each timestamp
-            frames = []
-            for i, ts in enumerate(timestamps):
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-ss", str(ts),
-                    "-i", str(input_path),
-                    "-vf", "scale=160:-2",  # Small thumbnails for strip
-                    "-frames:v", "1",
-                    "-q:v", "2",
-                    str(frame_paths[i])
-                ]
+    @staticmethod
+    def _stitch_preview_strip(frames: list[Image.Image], num_frames: int) -> Image.Image:
+        """Pick evenly spaced frames (first to last) and lay them out horizontally."""
+        if len(frames) > num_frames:
+            last = len(frames) - 1
+            frames = [frames[round(i * last / (num_frames - 1))] for i in range(num_frames)]
+
+        thumbs = []
+        for frame in frames:
+            if frame.width != PREVIEW_STRIP_FRAME_WIDTH:
+                height = int(frame.height * PREVIEW_STRIP_FRAME_WIDTH / frame.width)
+                height = max(2, height - (height % 2))
+                frame = frame.resize((PREVIEW_STRIP_FRAME_WIDTH, height), Image.Resampling.BICUBIC)
+            thumbs.append(frame)
+
+        # Stitch frames horizontally
+        total_width = sum(f.width for f in thumbs) + (len(thumbs) - 1) * 4  # 4px gap
+        max_height = max(f.height for f in thumbs)
+        strip = Image.new("RGB", (total_width, max_height), (30, 30, 30))  # Dark background
+
+        x_offset = 0
+        for frame in thumbs:
+            # Center vertically if heights differ
+            y_offset = (max_height - frame.height) // 2
+            strip.paste(frame, (x_offset, y_offset))
+            x_offset += frame.width + 4  # 4px gap
+        return strip
 
-                result = subprocess.run(cmd, capture_output=True, timeout=15)
-                if result.returncode == 0 and frame_paths[i].exists():
-                    img = Image.open(frame_paths[i])
-                    frames.append(img)
+    @staticmethod
+    def _timing_rows(timer: StageTimer) -> list[tuple[str, str]]:
+        """Format stage timings as log rows."""
+        return [(stage.title(), f"{ms:.0f}ms") for stage, ms in timer.stages.items()]
 
-            if len(frames) < 2:
-                return None
+    def extract_preview_strip(self, video_data: bytes, num_frames: int = PREVIEW_STRIP_FRAMES) -> Optional[bytes]:
+        """
+        Extract multiple frames and stitch into horizontal preview strip.
 
-            # Stitch frames horizontally
-            total_width = sum(f.width for f in frames) + (len(frames) - 1) * 4  # 4px gap
-            max_height = max(f.height for f in frames)
+        Args:
+            video_data: Raw video bytes
+            num_frames: Number of frames in the strip (default 5)
 
-            strip = Image.new("RGB", (total_width, max_height), (30, 30, 30))  # Dark background
+        Returns:
+            PNG bytes of the stitched preview strip, or None on failure
+        """
+        timer = StageTimer()
+        try:
+            duration, frames, mode = self._sample_video_frames(video_data, PREVIEW_STRIP_FRAME_WIDTH, timer)
+            if not duration or duration <= 0 or len(frames) < 2:
+                return None
 
-            x_offset = 0
-            for frame in frames:
-                # Center vertically if heights differ
-                y_offset = (max_height - frame.height) // 2
-                strip.paste(frame, (x_offset, y_offset))
-                x_offset += frame.width + 4  # 4px gap
+            with timer.stage("layout"):
+                strip = self._stitch_preview_strip(frames, num_frames)
 
             # Save as PNG
-            output = io.BytesIO()
-            strip.save(output, format="PNG", optimize=True)
+            with timer.stage("encode"):
+                output = io.BytesIO()
+                strip.save(output, format="PNG", optimize=True)
 
+            media_engine.record("preview", timer.stages)
             logger.tree("Video Preview Strip Generated", [
-                ("Frames", len(frames)),
-                ("Duration", f"{duration:.1f}s"),
-                ("Size", f"{total_width}x{max_height}"),
+                ("Frames", str(min(len(frames), num_frames))),
+                ("Duration", f"{min(duration, MAX_VIDEO_DURATION):.1f}s"),
+                ("Size", f"{strip.width}x{strip.height}"),
+                ("Input", mode),
+                *self._timing_rows(timer),
             ], emoji="👁️")
 
-            # Close all frame images to free file handles
-            for frame in frames:
-                try:
-                    frame.close()
-                except Exception:
-                    pass
-            strip.close()
-
             return output.getvalue()
 
         except Exception as e:
@@ -1240,35 +1609,6 @@ class ConvertService:
                 ("Error", str(e)),
             ], emoji="❌")
             return None
-        finally:
-            # Cleanup PIL images (in case of exception before normal close)
-            if 'frames' in locals():
-                for frame in frames:
-                    try:
-                        frame.close()
-                    except Exception:
-                        pass
-            if 'strip' in locals():
-                try:
-                    strip.close()
-                except Exception:
-                    pass
-            # Cleanup temp files
-            try:
-                input_path.unlink(missing_ok=True)
-            except Exception as e:
-                logger.tree("Preview Input Cleanup Failed", [
-                    ("Path", str(input_path.name)),
-                    ("Error", str(e)[:50]),
-                ], emoji="⚠️")
-            for path in frame_paths:
-                try:
-                    path.unlink(missing_ok=True)
-                except Exception as e:
-                    logger.tree("Preview Frame Cleanup Failed", [
-                        ("Path", str(path.name)),
-                        ("Error", str(e)[:50]),
-                    ], emoji="⚠️")
 
     def get_video_duration(self, video_data: bytes) -> Optional[float]:
         """Get video duration in seconds from video data (sync)."""
@@ -1295,115 +1635,44 @@ class ConvertService:
 
     def get_video_preview_data(self, video_data: bytes) -> tuple[Optional[float], Optional[bytes]]:
         """
-        Get video duration and preview in a single operation.
+        Get video duration and preview in a single ffmpeg run.
 
-        Writes video to disk once and extracts both duration and preview.
         Uses single thumbnail for short clips (<10s), preview strip for longer.
 
         Returns:
             Tuple of (duration, preview_bytes) - either can be None on failure
         """
-        temp_id = uuid.uuid4().hex[:8]
-        input_path = TEMP_DIR / f"preview_data_{temp_id}.mp4"
-        output_path = TEMP_DIR / f"preview_out_{temp_id}.png"
-        frame_paths = [TEMP_DIR / f"preview_frame_{temp_id}_{i}.png" for i in range(5)]
-
+        timer = StageTimer()
         try:
-            # Write video once
-            input_path.write_bytes(video_data)
-
-            # Get video info (duration)
-            info = self._get_video_info(str(input_path))
-            if not info:
+            duration, frames, mode = self._sample_video_frames(video_data, PREVIEW_THUMB_WIDTH, timer)
+            if duration is None:
                 return None, None
 
-            duration = info.duration
-            is_short_clip = duration is not None and duration < 10
-
+            is_short_clip = duration < PREVIEW_SHORT_CLIP
             preview_bytes = None
+            preview_type = "None"
 
-            if is_short_clip:
-                # Short clip: extract single thumbnail
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-i", str(input_path),
-                    "-vf", "scale=400:-2",
-                    "-frames:v", "1",
-                    "-q:v", "2",
-                    str(output_path)
-                ]
-                result = subprocess.run(cmd, capture_output=True, timeout=30)
-                if result.returncode == 0 and output_path.exists():
-                    preview_bytes = output_path.read_bytes()
-            else:
-                # Long video: extract preview strip
-                num_frames = 5
-                clip_duration = min(duration, MAX_VIDEO_DURATION)
-                timestamps = [clip_duration * i / (num_frames - 1) for i in range(num_frames)]
-
-                frames = []
-                for i, ts in enumerate(timestamps):
-                    cmd = [
-                        "ffmpeg", "-y",
-                        "-ss", str(ts),
-                        "-i", str(input_path),
-                        "-vf", "scale=160:-2",
-                        "-frames:v", "1",
-                        "-q:v", "2",
-                        str(frame_paths[i])
-                    ]
-                    result = subprocess.run(cmd, capture_output=True, timeout=15)
-                    if result.returncode == 0 and frame_paths[i].exists():
-                        img = Image.open(frame_paths[i])
-                        frames.append(img)
-
-                if len(frames) >= 2:
-                    # Stitch frames horizontally
-                    total_width = sum(f.width for f in frames) + (len(frames) - 1) * 4
-                    max_height = max(f.height for f in frames)
-                    strip = Image.new("RGB", (total_width, max_height), (30, 30, 30))
-
-                    x_offset = 0
-                    for frame in frames:
-                        y_offset = (max_height - frame.height) // 2
-                        strip.paste(frame, (x_offset, y_offset))
-                        x_offset += frame.width + 4
+            if frames:
+                with timer.stage("layout"):
+                    if is_short_clip or len(frames) < 2:
+                        # Short clip (or too few samples): first frame as thumbnail
+                        preview, preview_type = frames[0], "Thumbnail"
+                    else:
+                        preview, preview_type = self._stitch_preview_strip(frames, PREVIEW_STRIP_FRAMES), "Strip"
 
+                with timer.stage("encode"):
                     output = io.BytesIO()
-                    strip.save(output, format="PNG", optimize=True)
+                    preview.save(output, format="PNG", optimize=preview_type == "Strip")
                     preview_bytes = output.getvalue()
 
-                    logger.tree("Video Preview Data Generated", [
-                        ("Duration", f"{duration:.1f}s"),
-                        ("Type", "Strip" if len(frames) >= 2 else "Thumbnail"),
-                        ("Frames", str(len(frames))),
-                    ], emoji="👁️")
-
-                    # Close PIL images to free file handles
-                    for frame in frames:
-                        try:
-                            frame.close()
-                        except Exception:
-                            pass
-                    strip.close()
-
-            # Fallback to single thumbnail if strip failed
-            if not preview_bytes and not is_short_clip:
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-i", str(input_path),
-                    "-vf", "scale=400:-2",
-                    "-frames:v", "1",
-                    "-q:v", "2",
-                    str(output_path)
-                ]
-                result = subprocess.run(cmd, capture_output=True, timeout=30)
-                if result.returncode == 0 and output_path.exists():
-                    preview_bytes = output_path.read_bytes()
-                    logger.tree("Video Preview Fallback", [
-                        ("Duration", f"{duration:.1f}s"),
-                        ("Type", "Single Thumbnail"),
-                    ], emoji="👁️")
+            media_engine.record("preview", timer.stages)
+            logger.tree("Video Preview Data Generated", [
+                ("Duration", f"{duration:.1f}s"),
+                ("Type", preview_type),
+                ("Frames Sampled", str(len(frames))),
+                ("Input", f"{mode} ({len(video_data) / 1024 / 1024:.1f} MB)"),
+                *self._timing_rows(timer),
+            ], emoji="👁️")
 
             return duration, preview_bytes
 
@@ -1412,28 +1681,6 @@ class ConvertService:
                 ("Error", str(e)[:50]),
             ], emoji="❌")
             return None, None
-        finally:
-            # Cleanup PIL images (in case of exception before normal close)
-            if 'frames' in locals():
-                for frame in frames:
-                    try:
-                        frame.close()
-                    except Exception:
-                        pass
-            if 'strip' in locals():
-                try:
-                    strip.close()
-                except Exception:
-                    pass
-            # Cleanup all temp files
-            for path in [input_path, output_path] + frame_paths:
-                try:
-                    path.unlink(missing_ok=True)
-                except Exception as e:
-                    logger.tree("Preview Data Cleanup Failed", [
-                        ("Path", str(path.name)),
-                        ("Error", str(e)[:50]),
-                    ], emoji="⚠️")
 
     @staticmethod
     def is_video(filename: str) -> bool:
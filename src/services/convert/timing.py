@@ -0,0 +1,57 @@
+"""
+SyriaBot - Convert Stage Timing
+===============================
+
+Per-stage timers for the convert pipeline and cooperative cancellation.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+# Stages reported to the dashboard, in pipeline order
+STAGES = ("decode", "layout", "quantize", "encode")
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when the caller cancelled the job."""
+
+
+class StageTimer:
+    """
+    Accumulates wall time per pipeline stage.
+
+    DESIGN:
+        Stages can be entered many times (once per GIF frame), so time is
+        summed rather than overwritten. When a cancel flag is attached (one
+        byte of the job's shared memory block), entering a stage or calling
+        check() raises JobCancelled once the parent has set it, so a job the
+        user abandoned stops at the next frame instead of running to the end.
+    """
+
+    def __init__(self, cancel_flag: Optional[memoryview] = None) -> None:
+        self._cancel_flag = cancel_flag
+        self.stages: Dict[str, float] = {}
+
+    def check(self) -> None:
+        """Raise JobCancelled if the parent process cancelled this job."""
+        if self._cancel_flag is not None and self._cancel_flag[0]:
+            raise JobCancelled()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of work under a stage name (milliseconds)."""
+        self.check()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+
+__all__ = ["StageTimer", "JobCancelled", "STAGES"]
@@ -15,7 +15,7 @@ import discord
 from discord import ui
 from typing import Optional
 from dataclasses import dataclass
-from PIL import Image, ImageDraw
+from PIL import Image
 
 from src.core.colors import (
     COLOR_ERROR, COLOR_WARNING, COLOR_GOLD,
@@ -24,12 +24,8 @@ from src.core.colors import (
     EMOJI_RENAME, EMOJI_SAVE, EMOJI_BLOCK,
 )
 from src.core.logger import logger
-from src.core.constants import (
-    BAR_HEIGHT_RATIO, FONT_SIZE_RATIO, LINE_SPACING_RATIO,
-    BAR_PADDING_RATIO, TEXT_PADDING_RATIO,
-)
+from src.services.convert.preview import PreviewSession, PREVIEW_FILENAME
 from src.services.convert.service import convert_service
-from src.utils.text import wrap_text, find_font, get_font
 from src.utils.storage import upload_to_storage
 
 
@@ -134,109 +130,6 @@ class ColorSelect(ui.Select):
         await callback(interaction)
 
 
-# =============================================================================
-# Shared Image Processing Helper
-# =============================================================================
-
-def add_text_bar_to_image(
-    image_data: bytes,
-    text: str,
-    bar_color: tuple[int, int, int],
-    text_color: tuple[int, int, int],
-    min_bar_height: int = 80,
-    min_font_size: int = 24,
-    min_text_padding: int = 20,
-    min_vertical_padding: int = 10,
-    max_dimension: int = 2000,
-    handle_rgba: bool = True,
-) -> bytes:
-    """
-    Add a text bar to an image. Shared by ConvertView and VideoConvertView.
-
-    Args:
-        image_data: Raw image bytes
-        text: Caption text to add
-        bar_color: RGB tuple for bar background
-        text_color: RGB tuple for text
-        min_bar_height: Minimum bar height in pixels
-        min_font_size: Minimum font size
-        min_text_padding: Minimum horizontal padding
-        min_vertical_padding: Minimum vertical padding
-        max_dimension: Max image dimension (resize if larger)
-        handle_rgba: Whether to handle RGBA -> RGB conversion with bar color background
-
-    Returns:
-        PNG bytes of processed image
-    """
-    img = Image.open(io.BytesIO(image_data))
-
-    # Convert to RGB
-    if handle_rgba and img.mode == "RGBA":
-        background = Image.new("RGB", img.size, bar_color)
-        background.paste(img, mask=img.split()[3])
-        img = background
-    elif img.mode != "RGB":
-        img = img.convert("RGB")
-
-    # Resize if too large
-    if max_dimension and (img.width > max_dimension or img.height > max_dimension):
-        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
-
-    # If no text, just return as PNG
-    if not text:
-        output = io.BytesIO()
-        img.save(output, format="PNG", optimize=True)
-        return output.getvalue()
-
-    # Calculate bar height
-    bar_height = max(min_bar_height, int(img.height * BAR_HEIGHT_RATIO))
-
-    # Calculate font size
-    font_size = max(min_font_size, int(bar_height * FONT_SIZE_RATIO))
-    font_path = find_font()
-    font = get_font(font_path, font_size)
-
-    # Calculate padding
-    text_padding = max(min_text_padding, int(img.width * TEXT_PADDING_RATIO))
-
-    # Wrap text
-    max_text_width = img.width - (text_padding * 2)
-    lines = wrap_text(text, font, max_text_width)
-
-    # Calculate text height
-    line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1]
-    line_spacing = int(line_height * LINE_SPACING_RATIO)
-    total_text_height = (line_height * len(lines)) + (line_spacing * (len(lines) - 1))
-
-    # Expand bar if needed
-    vertical_padding = max(min_vertical_padding, int(bar_height * BAR_PADDING_RATIO))
-    min_bar_for_text = total_text_height + (vertical_padding * 2)
-    if min_bar_for_text > bar_height:
-        bar_height = min_bar_for_text
-
-    # Create new image with bar
-    new_height = img.height + bar_height
-    new_img = Image.new("RGB", (img.width, new_height), bar_color)
-    new_img.paste(img, (0, bar_height))
-
-    # Draw text
-    draw = ImageDraw.Draw(new_img)
-    start_y = (bar_height - total_text_height) // 2
-    current_y = start_y
-
-    for line in lines:
-        bbox = font.getbbox(line)
-        line_width = bbox[2] - bbox[0]
-        text_x = (img.width - line_width) // 2 - bbox[0]
-        text_y = current_y - bbox[1]
-        draw.text((text_x, text_y), line, font=font, fill=text_color)
-        current_y += line_height + line_spacing
-
-    output = io.BytesIO()
-    new_img.save(output, format="PNG", optimize=True)
-    return output.getvalue()
-
-
 # =============================================================================
 # Convert View (Images)
 # =============================================================================
@@ -263,6 +156,7 @@ class ConvertView(ui.View):
         self.settings = ConvertSettings(text=initial_text)
         self.message: Optional[discord.Message] = None
         self._preview_bytes: Optional[bytes] = None
+        self._preview: Optional[PreviewSession] = None
 
         # Add color select dropdown
         self.add_item(ColorSelect(self))
@@ -283,18 +177,13 @@ class ConvertView(ui.View):
         }
 
     def _process_preview(self) -> bytes:
-        """Process image with current settings and return PNG bytes."""
-        return add_text_bar_to_image(
-            image_data=self.image_data,
-            text=self.settings.text,
-            bar_color=self.settings.bar_color,
-            text_color=self.settings.text_color,
-            min_bar_height=80,
-            min_font_size=24,
-            min_text_padding=20,
-            min_vertical_padding=10,
-            max_dimension=2000,
-            handle_rgba=True,
+        """Render the preview for the current settings (full resolution only on Save)."""
+        if self._preview is None:
+            self._preview = PreviewSession(self.image_data)
+        return self._preview.render(
+            self.settings.text,
+            self.settings.bar_color,
+            self.settings.text_color,
         )
 
     def create_embed(self) -> discord.Embed:
@@ -342,9 +231,9 @@ class ConvertView(ui.View):
         # Create preview file
         file = discord.File(
             fp=io.BytesIO(self._preview_bytes),
-            filename="preview.png"
+            filename=PREVIEW_FILENAME
         )
-        embed.set_image(url="attachment://preview.png")
+        embed.set_image(url=f"attachment://{PREVIEW_FILENAME}")
 
         await interaction.message.edit(embed=embed, attachments=[file], view=self)
 
@@ -397,14 +286,15 @@ class ConvertView(ui.View):
         info = self._get_image_info()
         is_animated = info.get("is_animated", False)
 
-        # Use convert_service - always outputs GIF
-        result = await asyncio.to_thread(
-            convert_service._process_image,
+        # Use convert_service - always outputs GIF (rendered in a media worker)
+        result = await convert_service.convert(
             self.image_data,
             self.settings.text,
             "top",
             self.settings.bar_color,
             self.settings.text_color,
+            user_id=interaction.user.id,
+            expires_at=interaction.expires_at,
         )
         if not result.success:
             # Re-enable buttons so user can retry
@@ -521,6 +411,7 @@ class VideoConvertView(ui.View):
         self.settings = ConvertSettings(text=initial_text)
         self.message: Optional[discord.Message] = None
         self._processing = False
+        self._preview: Optional[PreviewSession] = None
 
         # Add color select dropdown
         self.add_item(ColorSelect(self, "update_embed", "video_color_select"))
@@ -531,17 +422,20 @@ class VideoConvertView(ui.View):
             return None
 
         try:
-            return add_text_bar_to_image(
-                image_data=self.thumbnail_bytes,
-                text=self.settings.text,
-                bar_color=self.settings.bar_color,
-                text_color=self.settings.text_color,
-                min_bar_height=40,
-                min_font_size=16,
-                min_text_padding=10,
-                min_vertical_padding=5,
-                max_dimension=0,  # No resize for thumbnails
-                handle_rgba=False,
+            if self._preview is None:
+                self._preview = PreviewSession(
+                    self.thumbnail_bytes,
+                    min_bar_height=40,
+                    min_font_size=16,
+                    min_text_padding=10,
+                    min_vertical_padding=5,
+                    max_dimension=0,  # Layout at the thumbnail's own size
+                    handle_rgba=False,
+                )
+            return self._preview.render(
+                self.settings.text,
+                self.settings.bar_color,
+                self.settings.text_color,
             )
         except Exception as e:
             logger.tree("Video Preview Generation Failed", [
@@ -584,8 +478,8 @@ class VideoConvertView(ui.View):
         preview_bytes = await asyncio.to_thread(self._generate_preview_with_text)
 
         if preview_bytes:
-            file = discord.File(fp=io.BytesIO(preview_bytes), filename="preview.png")
-            embed.set_image(url="attachment://preview.png")
+            file = discord.File(fp=io.BytesIO(preview_bytes), filename=PREVIEW_FILENAME)
+            embed.set_image(url=f"attachment://{PREVIEW_FILENAME}")
             await interaction.message.edit(embed=embed, attachments=[file], view=self)
         else:
             await interaction.message.edit(embed=embed, view=self)
@@ -656,6 +550,8 @@ class VideoConvertView(ui.View):
             position="top",
             bar_color=self.settings.bar_color,
             text_color=self.settings.text_color,
+            user_id=interaction.user.id,
+            expires_at=interaction.expires_at,
         )
 
         if not result.success:
@@ -855,8 +751,8 @@ async def start_convert_editor(
 
         # Create embed and file
         embed = view.create_embed()
-        file = discord.File(fp=io.BytesIO(preview_bytes), filename="preview.png")
-        embed.set_image(url="attachment://preview.png")
+        file = discord.File(fp=io.BytesIO(preview_bytes), filename=PREVIEW_FILENAME)
+        embed.set_image(url=f"attachment://{PREVIEW_FILENAME}")
 
         # Send response
         if is_interaction:
@@ -9,7 +9,7 @@ Server: discord.gg/syria
 """
 
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from src.core.logger import logger
 
@@ -21,6 +21,8 @@ class AFKMixin:
     DESIGN:
         Stores AFK status with reason and timestamp. Tracks mentions received
         while AFK (with pinger details) for notification on return.
+        AFKService keeps an in-memory mirror (AFKRegistry) loaded through
+        get_all_afk_users and writes mention counters in batches.
     """
 
     def set_afk(self, user_id: int, guild_id: int, reason: str = "") -> None:
@@ -119,6 +121,17 @@ class AFKMixin:
             ])
             return []
 
+    def get_all_afk_users(self) -> List[Dict[str, Any]]:
+        """Get every AFK entry (for rebuilding the in-memory registry)."""
+        try:
+            with self._get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT * FROM afk_users")
+                return [dict(row) for row in cur.fetchall()]
+        except Exception as e:
+            logger.error_tree("DB: Get All AFK Error", e)
+            return []
+
     def get_expired_afk_users(self, max_age_seconds: int) -> List[Dict[str, Any]]:
         """Get all AFK users whose AFK has expired (older than max_age_seconds)."""
         cutoff = int(time.time()) - max_age_seconds
@@ -164,6 +177,47 @@ class AFKMixin:
                 ("Pinger", pinger_name or "Unknown"),
             ])
 
+    def add_afk_mentions_batch(
+        self,
+        mentions: List[Tuple[int, int, int, List[Tuple[int, str, int]]]],
+    ) -> bool:
+        """
+        Add accumulated mention counts in one transaction.
+
+        Args:
+            mentions: (user_id, guild_id, count, [(pinger_id, pinger_name, timestamp), ...])
+
+        Returns:
+            True if written, False on error.
+        """
+        if not mentions:
+            return True
+
+        try:
+            with self._get_conn() as conn:
+                cur = conn.cursor()
+                cur.executemany("""
+                    INSERT INTO afk_mentions (user_id, guild_id, mention_count)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(user_id, guild_id) DO UPDATE SET
+                        mention_count = mention_count + excluded.mention_count
+                """, [(user_id, guild_id, count) for user_id, guild_id, count, _ in mentions])
+
+                cur.executemany("""
+                    INSERT INTO afk_mention_pingers (afk_user_id, guild_id, pinger_id, pinger_name, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [
+                    (user_id, guild_id, pinger_id, pinger_name, timestamp)
+                    for user_id, guild_id, _, pingers in mentions
+                    for pinger_id, pinger_name, timestamp in pingers
+                ])
+            return True
+        except Exception as e:
+            logger.error_tree("DB: AFK Mention Batch Error", e, [
+                ("Users", str(len(mentions))),
+            ])
+            return False
+
     def get_and_clear_afk_mentions(self, user_id: int, guild_id: int) -> tuple[int, List[str]]:
         """
         Get mention count and pinger names, then clear.
@@ -163,49 +163,6 @@ class BirthdaysMixin:
             ])
             return None
 
-    def get_todays_birthdays(self, guild_id: int, month: int, day: int) -> List[int]:
-        """
-        Get all users with birthday today.
-
-        Args:
-            guild_id: Guild ID
-            month: Current month (1-12)
-            day: Current day (1-31)
-
-        Returns:
-            List of user IDs with birthday today, empty list on error
-        """
-        try:
-            with self._get_conn() as conn:
-                if conn is None:
-                    logger.tree("DB: Get Today's Birthdays Failed", [
-                        ("Guild ID", str(guild_id)),
-                        ("Reason", "No database connection"),
-                    ], emoji="⚠️")
-                    return []
-
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT user_id FROM birthdays
-                    WHERE guild_id = ? AND birth_month = ? AND birth_day = ?
-                """, (guild_id, month, day))
-                user_ids = [row["user_id"] for row in cur.fetchall()]
-
-                if user_ids:
-                    logger.tree("DB: Today's Birthdays Found", [
-                        ("Date", f"{month}/{day}"),
-                        ("Count", str(len(user_ids))),
-                    ], emoji="🎂")
-
-                return user_ids
-
-        except Exception as e:
-            logger.error_tree("DB: Get Today's Birthdays Error", e, [
-                ("Guild ID", str(guild_id)),
-                ("Date", f"{month}/{day}"),
-            ])
-            return []
-
     def get_upcoming_birthdays(
         self,
         guild_id: int,
@@ -258,205 +215,123 @@ class BirthdaysMixin:
             ])
             return []
 
-    def get_birthday_count(self, guild_id: int) -> int:
+    def get_all_birthdays(self, guild_id: int) -> List[Dict[str, Any]]:
         """
-        Get total number of registered birthdays in a guild.
+        Get every birthday in a guild (for the in-memory birthday index).
 
         Args:
             guild_id: Guild ID
 
         Returns:
-            Count of birthdays, 0 on error
+            List of rows with user_id, birth_month, birth_day, birth_year,
+            role_granted_at; empty list on error
         """
         try:
             with self._get_conn() as conn:
                 if conn is None:
-                    logger.tree("DB: Get Birthday Count Failed", [
+                    logger.tree("DB: Get All Birthdays Failed", [
                         ("Guild ID", str(guild_id)),
                         ("Reason", "No database connection"),
                     ], emoji="⚠️")
-                    return 0
+                    return []
 
                 cur = conn.cursor()
                 cur.execute("""
-                    SELECT COUNT(*) as count FROM birthdays WHERE guild_id = ?
+                    SELECT user_id, birth_month, birth_day, birth_year, role_granted_at
+                    FROM birthdays
+                    WHERE guild_id = ?
                 """, (guild_id,))
-                row = cur.fetchone()
-                return row["count"] if row else 0
+                return [dict(row) for row in cur.fetchall()]
 
         except Exception as e:
-            logger.error_tree("DB: Get Birthday Count Error", e, [
+            logger.error_tree("DB: Get All Birthdays Error", e, [
                 ("Guild ID", str(guild_id)),
             ])
-            return 0
+            return []
 
     # =========================================================================
     # Birthday Role Tracking
     # =========================================================================
 
-    def set_birthday_role_granted(
+    def set_birthday_roles_granted(
         self,
-        user_id: int,
         guild_id: int,
+        user_ids: List[int],
         granted_at: int
-    ) -> bool:
+    ) -> int:
         """
-        Track when birthday role was granted (for 24h removal).
+        Track a whole day's birthday role grants in one transaction.
 
         Args:
-            user_id: Discord user ID
             guild_id: Guild ID
-            granted_at: Unix timestamp when role was granted
+            user_ids: Users the role was granted to
+            granted_at: Unix timestamp when the roles were granted
 
         Returns:
-            True if successful, False otherwise
+            Number of rows updated, 0 on error
         """
+        if not user_ids:
+            return 0
         try:
             with self._get_conn() as conn:
                 if conn is None:
-                    logger.tree("DB: Set Role Granted Failed", [
-                        ("ID", str(user_id)),
+                    logger.tree("DB: Set Roles Granted Failed", [
+                        ("Count", str(len(user_ids))),
                         ("Reason", "No database connection"),
                     ], emoji="⚠️")
-                    return False
+                    return 0
 
                 cur = conn.cursor()
-                cur.execute("""
+                cur.executemany("""
                     UPDATE birthdays SET role_granted_at = ?
                     WHERE user_id = ? AND guild_id = ?
-                """, (granted_at, user_id, guild_id))
-
-                if cur.rowcount == 0:
-                    logger.tree("DB: Set Role Granted Failed", [
-                        ("ID", str(user_id)),
-                        ("Reason", "User not found in birthdays"),
-                    ], emoji="⚠️")
-                    return False
+                """, [(granted_at, user_id, guild_id) for user_id in user_ids])
 
-                logger.tree("DB: Role Granted Timestamp Set", [
-                    ("ID", str(user_id)),
+                logger.tree("DB: Role Granted Timestamps Set", [
+                    ("Count", str(cur.rowcount)),
                     ("Granted At", str(granted_at)),
                 ], emoji="🎂")
-                return True
+                return cur.rowcount
 
         except Exception as e:
-            logger.error_tree("DB: Set Role Granted Error", e, [
-                ("ID", str(user_id)),
+            logger.error_tree("DB: Set Roles Granted Error", e, [
                 ("Guild ID", str(guild_id)),
+                ("Count", str(len(user_ids))),
             ])
-            return False
+            return 0
 
-    def clear_birthday_role_granted(self, user_id: int, guild_id: int) -> bool:
+    def clear_birthday_roles_granted(self, guild_id: int, user_ids: List[int]) -> int:
         """
-        Clear birthday role granted timestamp.
+        Clear birthday role granted timestamps for several users at once.
 
         Args:
-            user_id: Discord user ID
             guild_id: Guild ID
+            user_ids: Users whose role expired
 
         Returns:
-            True if successful, False otherwise
+            Number of rows updated, 0 on error
         """
+        if not user_ids:
+            return 0
         try:
             with self._get_conn() as conn:
                 if conn is None:
-                    logger.tree("DB: Clear Role Granted Failed", [
-                        ("ID", str(user_id)),
+                    logger.tree("DB: Clear Roles Granted Failed", [
+                        ("Count", str(len(user_ids))),
                         ("Reason", "No database connection"),
                     ], emoji="⚠️")
-                    return False
+                    return 0
 
                 cur = conn.cursor()
-                cur.execute("""
+                cur.executemany("""
                     UPDATE birthdays SET role_granted_at = NULL
                     WHERE user_id = ? AND guild_id = ?
-                """, (user_id, guild_id))
-
-                if cur.rowcount == 0:
-                    logger.tree("DB: Clear Role Granted Skipped", [
-                        ("ID", str(user_id)),
-                        ("Reason", "User not found"),
-                    ], emoji="ℹ️")
-                    return False
-
-                logger.tree("DB: Role Granted Cleared", [
-                    ("ID", str(user_id)),
-                ], emoji="🗑️")
-                return True
+                """, [(user_id, guild_id) for user_id in user_ids])
+                return cur.rowcount
 
         except Exception as e:
-            logger.error_tree("DB: Clear Role Granted Error", e, [
-                ("ID", str(user_id)),
+            logger.error_tree("DB: Clear Roles Granted Error", e, [
                 ("Guild ID", str(guild_id)),
+                ("Count", str(len(user_ids))),
             ])
-            return False
-
-    def get_active_birthday_roles(self, guild_id: int) -> List[int]:
-        """
-        Get users with currently active birthday roles (for restoring on bot restart).
-
-        Args:
-            guild_id: Guild ID
-
-        Returns:
-            List of user IDs with active birthday roles
-        """
-        try:
-            with self._get_conn() as conn:
-                if conn is None:
-                    return []
-
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT user_id FROM birthdays
-                    WHERE guild_id = ? AND role_granted_at IS NOT NULL
-                """, (guild_id,))
-                return [row["user_id"] for row in cur.fetchall()]
-
-        except Exception as e:
-            logger.error_tree("DB: Get Active Birthday Roles Error", e, [
-                ("Guild ID", str(guild_id)),
-            ])
-            return []
-
-    def get_expired_birthday_roles(self, guild_id: int, cutoff_time: int) -> List[int]:
-        """
-        Get users whose birthday role should be removed (granted > 24h ago).
-
-        Args:
-            guild_id: Guild ID
-            cutoff_time: Timestamp 24 hours ago
-
-        Returns:
-            List of user IDs to remove role from, empty list on error
-        """
-        try:
-            with self._get_conn() as conn:
-                if conn is None:
-                    logger.tree("DB: Get Expired Roles Failed", [
-                        ("Guild ID", str(guild_id)),
-                        ("Reason", "No database connection"),
-                    ], emoji="⚠️")
-                    return []
-
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT user_id FROM birthdays
-                    WHERE guild_id = ? AND role_granted_at IS NOT NULL AND role_granted_at < ?
-                """, (guild_id, cutoff_time))
-                user_ids = [row["user_id"] for row in cur.fetchall()]
-
-                if user_ids:
-                    logger.tree("DB: Expired Birthday Roles Found", [
-                        ("Count", str(len(user_ids))),
-                        ("Cutoff", str(cutoff_time)),
-                    ], emoji="⏰")
-
-                return user_ids
-
-        except Exception as e:
-            logger.error_tree("DB: Get Expired Roles Error", e, [
-                ("Guild ID", str(guild_id)),
-                ("Cutoff", str(cutoff_time)),
-            ])
-            return []
+            return 0
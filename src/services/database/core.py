@@ -843,6 +843,14 @@ class DatabaseCore:
                 )
             """)
 
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS social_cursors (
+                    platform TEXT PRIMARY KEY,
+                    last_id TEXT NOT NULL,
+                    updated_at INTEGER NOT NULL
+                )
+            """)
+
             # =====================================================================
             # FAQ Analytics Table
             # =====================================================================
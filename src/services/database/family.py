@@ -9,7 +9,7 @@ Server: discord.gg/syria
 """
 
 import time
-from typing import Optional, List
+from typing import Any, Dict, List, Optional
 
 from src.core.logger import logger
 
@@ -22,14 +22,17 @@ class FamilyMixin:
         - Marriages stored as two rows (A→B and B→A) for fast lookups.
         - Adoptions stored as one row per parent-child pair (PK on child).
         - Divorce cooldowns tracked separately for 24h remarry restriction.
+        - FamilyGraphService mirrors marriages/adoptions in memory (loaded via
+          get_all_family_edges); these methods remain the write path and the
+          cold-start read path.
     """
 
     # =========================================================================
     # Marriages
     # =========================================================================
 
-    def marry(self, user1_id: int, user2_id: int, guild_id: int) -> None:
-        """Create a marriage between two users (inserts both directions, atomic)."""
+    def marry(self, user1_id: int, user2_id: int, guild_id: int) -> int:
+        """Create a marriage between two users (inserts both directions, atomic). Returns married_at."""
         now = int(time.time())
 
         with self._get_conn() as conn:
@@ -55,6 +58,8 @@ class FamilyMixin:
             ("Guild", str(guild_id)),
         ], emoji="💍")
 
+        return now
+
     def divorce(self, user_id: int, guild_id: int) -> Optional[int]:
         """Divorce a user. Returns the ex-spouse ID or None if not married."""
         with self._get_conn() as conn:
@@ -133,8 +138,8 @@ class FamilyMixin:
     # Adoptions
     # =========================================================================
 
-    def adopt(self, parent_id: int, child_id: int, guild_id: int) -> None:
-        """Create a parent-child relationship."""
+    def adopt(self, parent_id: int, child_id: int, guild_id: int) -> int:
+        """Create a parent-child relationship. Returns adopted_at."""
         now = int(time.time())
 
         with self._get_conn() as conn:
@@ -150,6 +155,8 @@ class FamilyMixin:
             ("Guild", str(guild_id)),
         ], emoji="👨‍👧")
 
+        return now
+
     def disown(self, parent_id: int, child_id: int, guild_id: int) -> bool:
         """Remove a child from a parent. Returns True if deleted."""
         with self._get_conn() as conn:
@@ -336,20 +343,42 @@ class FamilyMixin:
             """, (user_id, guild_id))
 
     # =========================================================================
-    # Siblings
+    # Ancestry
     # =========================================================================
 
     def is_ancestor(self, target_id: int, user_id: int, guild_id: int, max_depth: int = 20) -> bool:
-        """Check if target_id is an ancestor of user_id by walking the parent chain."""
-        current = user_id
-        for _ in range(max_depth):
-            parent: Optional[int] = self.get_parent(current, guild_id)
-            if parent is None:
-                break
-            if parent == target_id:
-                return True
-            current = parent
-        return False
+        """Check if target_id is within max_depth parent links above user_id (one recursive query)."""
+        with self._get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                WITH RECURSIVE chain(id, depth) AS (
+                    SELECT parent_id, 1 FROM family_adoptions
+                    WHERE child_id = ? AND guild_id = ?
+                    UNION ALL
+                    SELECT a.parent_id, chain.depth + 1 FROM family_adoptions a
+                    JOIN chain ON a.child_id = chain.id
+                    WHERE a.guild_id = ? AND chain.depth < ?
+                )
+                SELECT 1 FROM chain WHERE id = ? LIMIT 1
+            """, (user_id, guild_id, guild_id, max_depth, target_id))
+            return cur.fetchone() is not None
+
+    # =========================================================================
+    # Bulk load
+    # =========================================================================
+
+    def get_all_family_edges(self) -> Dict[str, List[Dict[str, Any]]]:
+        """All marriages and adoptions across guilds (adoptions in adoption order)."""
+        with self._get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT user_id, spouse_id, guild_id, married_at FROM family_marriages")
+            marriages = [dict(row) for row in cur.fetchall()]
+            cur.execute("""
+                SELECT parent_id, child_id, guild_id, adopted_at FROM family_adoptions
+                ORDER BY adopted_at ASC, rowid ASC
+            """)
+            adoptions = [dict(row) for row in cur.fetchall()]
+        return {"marriages": marriages, "adoptions": adoptions}
 
     # =========================================================================
     # Siblings
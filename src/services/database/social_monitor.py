@@ -2,14 +2,15 @@
 SyriaBot - Database Social Monitor Mixin
 ========================================
 
-Social media posted-ID tracking to avoid duplicate notifications.
+Social media posted-ID tracking to avoid duplicate notifications,
+plus each feed's last-seen cursor for incremental polling.
 
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
 import time
-from typing import Set
+from typing import Optional, Set
 
 from src.core.logger import logger
 
@@ -80,3 +81,37 @@ class SocialMonitorMixin:
                 ("Platform", platform),
             ])
             return 0
+
+    def social_get_cursor(self, platform: str) -> Optional[str]:
+        """Get the newest post ID seen on a feed's last successful poll."""
+        try:
+            with self._get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    "SELECT last_id FROM social_cursors WHERE platform = ?",
+                    (platform,),
+                )
+                row = cur.fetchone()
+                return row["last_id"] if row else None
+        except Exception as e:
+            logger.error_tree("DB: Social Get Cursor Error", e, [
+                ("Platform", platform),
+            ])
+            return None
+
+    def social_set_cursor(self, platform: str, last_id: str) -> None:
+        """Store the newest post ID seen on a feed."""
+        now = int(time.time())
+        try:
+            with self._get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    INSERT INTO social_cursors (platform, last_id, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(platform) DO UPDATE SET last_id = excluded.last_id, updated_at = excluded.updated_at
+                """, (platform, last_id, now))
+        except Exception as e:
+            logger.error_tree("DB: Social Set Cursor Error", e, [
+                ("Platform", platform),
+                ("Last ID", last_id),
+            ])
@@ -9,7 +9,7 @@ Server: discord.gg/syria
 """
 
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.core.logger import logger
 
@@ -564,6 +564,62 @@ class StatsMixin:
         except Exception as e:
             logger.error_tree("DB: Record Member Event Error", e, [("user_id", str(user_id)), ("event_type", event_type)])
 
+    def record_join_batch(
+        self,
+        guild_id: int,
+        date: str,
+        joins: List[Tuple[int, Optional[int]]],
+    ) -> int:
+        """
+        Record a burst of member joins in one transaction.
+
+        Writes the invited_by attribution, the daily new member counter and
+        one member_events row per join, so a raid costs one commit instead
+        of three per member.
+
+        Args:
+            guild_id: Guild the members joined.
+            date: Daily stats date key (YYYY-MM-DD).
+            joins: List of (user_id, inviter_id or None).
+
+        Returns:
+            Number of joins written.
+        """
+        if not joins:
+            return 0
+        now = int(time.time())
+        invited = [(inviter_id, user_id, guild_id) for user_id, inviter_id in joins if inviter_id]
+        try:
+            with self._get_conn() as conn:
+                cur = conn.cursor()
+                if invited:
+                    cur.executemany("""
+                        INSERT OR IGNORE INTO user_xp
+                            (user_id, guild_id, xp, level, total_messages, voice_minutes, created_at)
+                        VALUES (?, ?, 0, 0, 0, 0, ?)
+                    """, [(user_id, guild_id, now) for _, user_id, _ in invited])
+                    cur.executemany("""
+                        UPDATE user_xp SET invited_by = ?
+                        WHERE user_id = ? AND guild_id = ?
+                    """, invited)
+                cur.execute("""
+                    INSERT INTO server_daily_stats (date, guild_id, new_members)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(date) DO UPDATE SET
+                        new_members = new_members + excluded.new_members
+                """, (date, guild_id, len(joins)))
+                cur.executemany("""
+                    INSERT INTO member_events (guild_id, user_id, event_type, timestamp)
+                    VALUES (?, ?, 'join', ?)
+                """, [(guild_id, user_id, now) for user_id, _ in joins])
+            return len(joins)
+        except Exception as e:
+            logger.error_tree("DB: Record Join Batch Error", e, [
+                ("guild_id", str(guild_id)),
+                ("Joins", str(len(joins))),
+            ])
+            return 0
+
     def get_member_events(
         self,
         guild_id: int,
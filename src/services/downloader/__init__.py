@@ -19,9 +19,45 @@ Server: discord.gg/syria
 """
 
 from .config import DownloadResult
+from .scheduler import (
+    DownloadScheduler,
+    DownloadJob,
+    DownloadQueueFull,
+    DownloadCancelled,
+    download_scheduler,
+    JOB_QUEUED,
+    JOB_FETCHING,
+    JOB_TRANSCODING,
+    JOB_UPLOADING,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_CANCELLED,
+    PRIORITY_STAFF,
+    PRIORITY_BOOSTER,
+    PRIORITY_DEFAULT,
+)
 from .service import DownloaderService
 
 # Global instance
 downloader = DownloaderService()
 
-__all__ = ["downloader", "DownloaderService", "DownloadResult"]
+__all__ = [
+    "downloader",
+    "DownloaderService",
+    "DownloadResult",
+    "DownloadScheduler",
+    "DownloadJob",
+    "DownloadQueueFull",
+    "DownloadCancelled",
+    "download_scheduler",
+    "JOB_QUEUED",
+    "JOB_FETCHING",
+    "JOB_TRANSCODING",
+    "JOB_UPLOADING",
+    "JOB_DONE",
+    "JOB_FAILED",
+    "JOB_CANCELLED",
+    "PRIORITY_STAFF",
+    "PRIORITY_BOOSTER",
+    "PRIORITY_DEFAULT",
+]
@@ -70,7 +70,8 @@ async def _download_single_file(
     session: aiohttp.ClientSession,
     download_url: str,
     filename: str,
-    download_dir: Path
+    download_dir: Path,
+    max_size_mb: float = MAX_FILE_SIZE_MB,
 ) -> Optional[Path]:
     """
     Download a single file with streaming for memory efficiency.
@@ -106,13 +107,13 @@ async def _download_single_file(
         ], emoji="✅")
 
         # Check if file is too large for Discord
-        if file_size_mb > MAX_FILE_SIZE_MB:
+        if file_size_mb > max_size_mb:
             if file_path.suffix.lower() in VIDEO_EXTENSIONS:
                 logger.tree("File Too Large, Compressing", [
                     ("Filename", filename),
                     ("Size", f"{file_size_mb:.1f} MB"),
                 ], emoji="🗜️")
-                compressed = await compress_video(file_path)
+                compressed = await compress_video(file_path, max_size_mb)
                 if compressed:
                     file_path.unlink()
                     return compressed
@@ -142,7 +143,12 @@ async def _download_single_file(
         return None
 
 
-async def download(url: str, download_dir: Path, platform: str) -> DownloadResult:
+async def download(
+    url: str,
+    download_dir: Path,
+    platform: str,
+    max_size_mb: float = MAX_FILE_SIZE_MB,
+) -> DownloadResult:
     """Download using local Cobalt API - returns Discord-ready files."""
     try:
         logger.tree("Cobalt API Request", [
@@ -264,7 +270,7 @@ async def download(url: str, download_dir: Path, platform: str) -> DownloadResul
                 ], emoji="⚡")
                 # Download in parallel for carousels
                 tasks = [
-                    _download_single_file(session, url, filename, download_dir)
+                    _download_single_file(session, url, filename, download_dir, max_size_mb)
                     for url, filename in download_items
                 ]
                 results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -279,7 +285,7 @@ async def download(url: str, download_dir: Path, platform: str) -> DownloadResul
                 # Single file - download directly
                 downloaded_files = []
                 for download_url, filename in download_items:
-                    result = await _download_single_file(session, download_url, filename, download_dir)
+                    result = await _download_single_file(session, download_url, filename, download_dir, max_size_mb)
                     if isinstance(result, Path):
                         downloaded_files.append(result)
 
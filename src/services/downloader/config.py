@@ -8,10 +8,11 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
+import asyncio
 import re
 import sys
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -41,6 +42,54 @@ TEMP_DIR = Path(tempfile.gettempdir()) / "syria_dl"
 # =============================================================================
 
 MAX_FILE_SIZE_MB = 24  # Leave headroom under Discord's 25MB limit
+UPLOAD_HEADROOM_MB = 1  # Kept free under a guild's upload limit (message overhead)
+
+
+# =============================================================================
+# Size-Targeted Encoding
+# =============================================================================
+
+# x264 presets measured with scripts/bench_x264_presets.py:
+# preset -> (720p frames/s in pass 2, size at equal quality relative to medium)
+X264_PRESETS = {
+    "ultrafast": (260.0, 1.45),
+    "superfast": (185.0, 1.25),
+    "veryfast": (140.0, 1.12),
+    "faster": (95.0, 1.05),
+    "fast": (75.0, 1.02),
+    "medium": (55.0, 1.00),
+    "slow": (32.0, 0.96),
+}
+ENCODE_PASS1_COST = 0.45             # Pass 1 (fast first pass) time relative to pass 2
+ENCODE_TIME_BUDGET = 90              # Seconds both passes should take; picks the slowest preset that fits
+ENCODE_SIZE_SAFETY = 0.96            # Fraction of the limit targeted (container + rate control slack)
+ENCODE_MIN_BPP = 0.035               # Bits per pixel per frame before stepping resolution down
+ENCODE_HEIGHT_STEPS = (1080, 720, 540, 480, 360, 240)
+ENCODE_MAX_FPS_STEPPED = 30          # Frame rate cap once resolution has to be stepped down
+ENCODE_MIN_VIDEO_KBPS = 120          # Below this the video can't fit at any useful quality
+ENCODE_PASS_TIMEOUT = 300            # Seconds per ffmpeg pass
+
+
+# =============================================================================
+# Deduplication
+# =============================================================================
+
+DOWNLOAD_RECENT_MAX = 500            # Canonical URLs remembered with their upload links
+DOWNLOAD_RECENT_TTL = 6 * 60 * 60    # Seconds an attachment link is reused (links are signed)
+
+
+# =============================================================================
+# Scheduling
+# =============================================================================
+
+DOWNLOAD_MAX_CONCURRENT = 3          # Downloads running at once across the bot
+DOWNLOAD_MAX_PER_USER = 1            # Downloads running at once per user
+DOWNLOAD_MAX_PENDING_PER_USER = 3    # Queued + running per user
+DOWNLOAD_MAX_QUEUED = 25             # Waiting jobs before new ones are refused
+DOWNLOAD_PROGRESS_INTERVAL = 2.0     # Min seconds between progress message edits
+DOWNLOAD_REAP_INTERVAL = 5 * 60      # Seconds between temp dir sweeps
+DOWNLOAD_TEMP_GRACE = 60             # Untracked temp dirs younger than this are left alone
+DOWNLOAD_TEMP_MAX_AGE = 30 * 60      # Tracked temp dirs older than this are reclaimed anyway
 
 
 # =============================================================================
@@ -106,12 +155,45 @@ class DownloadResult:
     files: list[Path]
     platform: str
     error: Optional[str] = None
+    key: Optional[str] = None                             # Canonical URL key
+    hashes: list[str] = field(default_factory=list)       # sha256 per file
+    links: list[str] = field(default_factory=list)        # Reused attachment links (no files)
 
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+def upload_limit_mb(guild_limit_bytes: Optional[int]) -> float:
+    """Usable upload size for a guild's filesize limit (default when unknown)."""
+    if not guild_limit_bytes:
+        return MAX_FILE_SIZE_MB
+    return max(MAX_FILE_SIZE_MB, guild_limit_bytes / (1024 * 1024) - UPLOAD_HEADROOM_MB)
+
+
+async def communicate(
+    process: asyncio.subprocess.Process,
+    timeout: float,
+) -> tuple[bytes, bytes]:
+    """
+    Wait for a subprocess with a timeout, killing it if the wait is abandoned.
+
+    Raises asyncio.TimeoutError / CancelledError like wait_for, but only
+    after the process has been killed and reaped, so a cancelled download
+    job never leaves yt-dlp or ffmpeg running in the background.
+    """
+    try:
+        return await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await asyncio.shield(process.wait())
+        raise
+
+
 def get_platform(url: str) -> Optional[str]:
     """Detect which platform a URL belongs to."""
     for platform, patterns in PLATFORM_PATTERNS.items():
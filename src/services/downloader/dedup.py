@@ -0,0 +1,157 @@
+"""
+SyriaBot - Download Deduplication
+=================================
+
+Canonical URL keys and a bounded store of recently uploaded downloads.
+
+Popular links get posted (and downloaded) many times within minutes.
+Requests for the same media share one key regardless of tracking params,
+mobile/www hosts or link style, and repeats can be answered with the
+Discord attachment link from the last upload instead of a new download.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .config import DOWNLOAD_RECENT_MAX, DOWNLOAD_RECENT_TTL
+
+
+# =============================================================================
+# URL Normalization
+# =============================================================================
+
+# Media ID per platform, when it's in the URL itself (short links resolve offline)
+MEDIA_ID_PATTERNS = {
+    "instagram": re.compile(r"instagram\.com/(?:[\w.]+/)?(?:p|reels?|tv)/([\w-]+)", re.IGNORECASE),
+    "twitter": re.compile(r"(?:twitter|x)\.com/\w+/status/(\d+)", re.IGNORECASE),
+    "tiktok": re.compile(r"tiktok\.com/@[\w.]+/video/(\d+)", re.IGNORECASE),
+    "reddit": re.compile(r"reddit\.com/r/\w+/comments/(\w+)", re.IGNORECASE),
+    "facebook": re.compile(r"facebook\.com/(?:.+/videos/|reel/|watch/?\?(?:.*&)?v=)(\d+)", re.IGNORECASE),
+    "snapchat": re.compile(r"snapchat\.com/spotlight/([\w-]+)", re.IGNORECASE),
+    "twitch": re.compile(r"(?:twitch\.tv/\w+/clip/|clips\.twitch\.tv/)([\w-]+)", re.IGNORECASE),
+}
+
+# Host prefixes that serve the same content
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "old.", "new.")
+
+
+def normalize_url(url: str, platform: str) -> str:
+    """
+    Canonical key for a media URL.
+
+    Uses the platform's media ID when the URL contains one (so share links,
+    /reel/ vs /p/ and clips.twitch.tv vs twitch.tv/.../clip/ all match).
+    Otherwise falls back to host + path with the query string (tracking
+    params like igsh, utm_*, s, t) and fragment dropped.
+    """
+    pattern = MEDIA_ID_PATTERNS.get(platform)
+    if pattern:
+        match = pattern.search(url)
+        if match:
+            return f"{platform}:{match.group(1)}"
+
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return f"{platform}:{host}{parts.path.rstrip('/')}"
+
+
+# =============================================================================
+# Recent Downloads
+# =============================================================================
+
+@dataclass
+class RecentDownload:
+    """A download that was uploaded to Discord."""
+    platform: str
+    hashes: list[str]
+    links: list[str]
+    stored_at: float
+
+
+class RecentDownloads:
+    """
+    Bounded, expiring map of canonical URL -> uploaded attachment links.
+
+    DESIGN:
+        Two indexes: canonical URL key -> RecentDownload, and file sha256 ->
+        attachment link. The second catches different URLs that produce
+        the same file (reposts, mirrors) once it has been downloaded, so
+        only the upload is skipped. Entries expire after
+        DOWNLOAD_RECENT_TTL because Discord attachment links are signed
+        and stop working. Only touched from the event loop, so no lock.
+    """
+
+    def __init__(self, max_entries: int = DOWNLOAD_RECENT_MAX, ttl: float = DOWNLOAD_RECENT_TTL) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._by_key: "OrderedDict[str, RecentDownload]" = OrderedDict()
+        self._by_hash: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.hash_hits = 0
+        self.misses = 0
+
+    def get_links(self, key: str) -> Optional[list[str]]:
+        """Attachment links for a canonical URL, if uploaded recently."""
+        entry = self._by_key.get(key)
+        if entry is None or time.time() - entry.stored_at > self._ttl:
+            self._by_key.pop(key, None)
+            self.misses += 1
+            return None
+        self._by_key.move_to_end(key)
+        self.hits += 1
+        return entry.links
+
+    def links_for_hashes(self, hashes: list[str]) -> Optional[list[str]]:
+        """Attachment links for a set of files, if every one was uploaded recently."""
+        if not hashes:
+            return None
+        now = time.time()
+        links = []
+        for file_hash in hashes:
+            entry = self._by_hash.get(file_hash)
+            if entry is None or now - entry[1] > self._ttl:
+                return None
+            links.append(entry[0])
+        self.hash_hits += 1
+        return links
+
+    def remember(self, key: str, platform: str, hashes: list[str], links: list[str]) -> None:
+        """Record where a download's files were uploaded."""
+        if not links or len(links) != len(hashes):
+            return
+        now = time.time()
+        self._by_key[key] = RecentDownload(platform, hashes, links, now)
+        self._by_key.move_to_end(key)
+        for file_hash, link in zip(hashes, links):
+            self._by_hash[file_hash] = (link, now)
+            self._by_hash.move_to_end(file_hash)
+
+        while len(self._by_key) > self._max_entries:
+            self._by_key.popitem(last=False)
+        while len(self._by_hash) > self._max_entries * 4:
+            self._by_hash.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Get store counters."""
+        return {
+            "entries": len(self._by_key),
+            "files": len(self._by_hash),
+            "hits": self.hits,
+            "hash_hits": self.hash_hits,
+            "misses": self.misses,
+        }
+
+
+__all__ = ["normalize_url", "RecentDownloads", "RecentDownload"]
@@ -0,0 +1,370 @@
+"""
+SyriaBot - Size-Targeted Encoder
+================================
+
+Two-pass x264 encoding that lands a video just under an upload limit.
+
+The bitrate budget comes from the probed duration and the guild's upload
+limit; audio bitrate, resolution and frame rate are scaled down when the
+budget is tight, and the preset is picked from a measured speed table so
+the encode fits a time budget. Predicted and actual size/time are logged
+so the model constants in config.py can be tuned.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from src.core.logger import logger
+from .config import (
+    X264_PRESETS,
+    ENCODE_PASS1_COST,
+    ENCODE_TIME_BUDGET,
+    ENCODE_SIZE_SAFETY,
+    ENCODE_MIN_BPP,
+    ENCODE_HEIGHT_STEPS,
+    ENCODE_MAX_FPS_STEPPED,
+    ENCODE_MIN_VIDEO_KBPS,
+    ENCODE_PASS_TIMEOUT,
+    communicate,
+)
+
+
+# =============================================================================
+# Probe
+# =============================================================================
+
+@dataclass
+class VideoInfo:
+    """What the encoder needs to know about a source video."""
+    duration: float
+    width: int
+    height: int
+    fps: float
+    has_audio: bool
+
+
+def _parse_rate(rate: str) -> float:
+    """Parse an ffprobe frame rate like '30000/1001'."""
+    try:
+        num, _, den = rate.partition("/")
+        value = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return value if 0 < value <= 240 else 0.0
+
+
+async def probe(file: Path) -> Optional[VideoInfo]:
+    """Read duration, dimensions, frame rate and audio presence in one ffprobe run."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration:stream=codec_type,width,height,avg_frame_rate,r_frame_rate",
+        "-of", "json",
+        str(file)
+    ]
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await communicate(process, timeout=10)
+        data = json.loads(stdout.decode() or "{}")
+        streams = data.get("streams", [])
+        video = next((s for s in streams if s.get("codec_type") == "video"), None)
+        duration = float(data.get("format", {}).get("duration") or 0)
+        if video is None or duration <= 0:
+            logger.tree("Video Probe Incomplete", [
+                ("File", file.name),
+                ("Duration", f"{duration:.1f}s"),
+                ("Video Stream", "Yes" if video else "No"),
+            ], emoji="⚠️")
+            return None
+
+        fps = _parse_rate(video.get("avg_frame_rate", "")) or _parse_rate(video.get("r_frame_rate", "")) or 30.0
+        info = VideoInfo(
+            duration=duration,
+            width=int(video.get("width") or 0),
+            height=int(video.get("height") or 0),
+            fps=fps,
+            has_audio=any(s.get("codec_type") == "audio" for s in streams),
+        )
+        logger.tree("Video Probed", [
+            ("File", file.name),
+            ("Duration", f"{info.duration:.1f}s"),
+            ("Resolution", f"{info.width}x{info.height}"),
+            ("FPS", f"{info.fps:.2f}"),
+            ("Audio", "Yes" if info.has_audio else "No"),
+        ], emoji="🔍")
+        return info if info.width and info.height else None
+    except asyncio.TimeoutError:
+        logger.tree("ffprobe Timeout", [
+            ("File", file.name),
+        ], emoji="⏳")
+        return None
+    except Exception as e:
+        logger.tree("Video Probe Failed", [
+            ("File", file.name),
+            ("Error", str(e)[:50]),
+        ], emoji="⚠️")
+        return None
+
+
+# =============================================================================
+# Planning
+# =============================================================================
+
+@dataclass
+class EncodePlan:
+    """Settings for one size-targeted encode and what they should produce."""
+    preset: str
+    video_kbps: int
+    audio_kbps: int
+    width: int
+    height: int
+    fps: float
+    scaled: bool
+    predicted_bytes: int
+    predicted_seconds: float
+
+
+def audio_kbps_for(total_kbps: float) -> int:
+    """Scale audio with the overall budget (speech stays intelligible at 48k AAC)."""
+    if total_kbps >= 1500:
+        return 128
+    if total_kbps >= 800:
+        return 96
+    if total_kbps >= 400:
+        return 64
+    return 48
+
+
+def _encode_seconds(preset: str, duration: float, width: int, height: int, fps: float) -> float:
+    """Predicted wall time of both passes, from the measured 720p speed."""
+    frames_720p = duration * fps * (width * height) / (1280 * 720)
+    return frames_720p / X264_PRESETS[preset][0] * (1 + ENCODE_PASS1_COST)
+
+
+def _pick_preset(duration: float, width: int, height: int, fps: float) -> str:
+    """Slowest (most efficient) preset whose predicted time fits ENCODE_TIME_BUDGET."""
+    preset = next(iter(X264_PRESETS))
+    for name in X264_PRESETS:
+        if _encode_seconds(name, duration, width, height, fps) <= ENCODE_TIME_BUDGET:
+            preset = name
+    return preset
+
+
+def plan_encode(info: VideoInfo, max_bytes: int) -> Optional[EncodePlan]:
+    """
+    Work out bitrate, resolution, frame rate and preset for a size target.
+
+    Returns None when even the lowest step can't hold a usable video bitrate
+    (the clip is too long for the limit).
+    """
+    total_kbps = max_bytes * ENCODE_SIZE_SAFETY * 8 / info.duration / 1000
+    audio_kbps = audio_kbps_for(total_kbps) if info.has_audio else 0
+    video_kbps = int(total_kbps - audio_kbps)
+    if video_kbps < ENCODE_MIN_VIDEO_KBPS:
+        return None
+
+    def bpp(width: int, height: int, fps: float, preset: str) -> float:
+        return video_kbps * 1000 / (width * height * fps) / X264_PRESETS[preset][1]
+
+    # Candidate sizes: the source, then each step below its short side
+    short_side = min(info.width, info.height)
+    candidates = [(info.width, info.height, info.fps)]
+    stepped_fps = min(info.fps, ENCODE_MAX_FPS_STEPPED)
+    if stepped_fps < info.fps:
+        candidates.append((info.width, info.height, stepped_fps))
+    for step in ENCODE_HEIGHT_STEPS:
+        if step < short_side:
+            factor = step / short_side
+            candidates.append((
+                max(2, round(info.width * factor / 2) * 2),
+                max(2, round(info.height * factor / 2) * 2),
+                stepped_fps,
+            ))
+
+    # First size where the slowest preset that fits the time budget still
+    # gets enough bits per pixel (fewer pixels leave time for a slower one)
+    for width, height, fps in candidates:
+        preset = _pick_preset(info.duration, width, height, fps)
+        if bpp(width, height, fps, preset) >= ENCODE_MIN_BPP:
+            break
+    scaled = (width, height, fps) != candidates[0]
+
+    predicted_seconds = _encode_seconds(preset, info.duration, width, height, fps)
+    predicted_bytes = int((video_kbps + audio_kbps) * 1000 / 8 * info.duration)
+
+    return EncodePlan(
+        preset=preset,
+        video_kbps=video_kbps,
+        audio_kbps=audio_kbps,
+        width=width,
+        height=height,
+        fps=fps,
+        scaled=scaled,
+        predicted_bytes=predicted_bytes,
+        predicted_seconds=predicted_seconds,
+    )
+
+
+# =============================================================================
+# Encode
+# =============================================================================
+
+def _video_args(plan: EncodePlan, video_kbps: int) -> list[str]:
+    args = [
+        "-c:v", "libx264",
+        "-preset", plan.preset,
+        "-b:v", f"{video_kbps}k",
+        "-maxrate", f"{int(video_kbps * 1.5)}k",
+        "-bufsize", f"{video_kbps * 2}k",
+        "-pix_fmt", "yuv420p",
+    ]
+    if plan.scaled:
+        args += ["-vf", f"scale={plan.width}:{plan.height},fps={plan.fps:g}"]
+    return args
+
+
+async def _run_pass(cmd: list[str], file: Path, label: str) -> bool:
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await communicate(process, timeout=ENCODE_PASS_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.tree("Targeted Encode Timeout", [
+            ("File", file.name),
+            ("Pass", label),
+            ("Timeout", f"{ENCODE_PASS_TIMEOUT}s"),
+        ], emoji="⏳")
+        return False
+    if process.returncode != 0:
+        stderr_text = (stderr or b"").decode(errors="ignore")
+        logger.tree("Targeted Encode Pass Failed", [
+            ("File", file.name),
+            ("Pass", label),
+            ("Exit Code", str(process.returncode)),
+            ("Error", stderr_text[-100:] if stderr_text else "Unknown"),
+        ], emoji="❌")
+        return False
+    return True
+
+
+async def encode_to_size(file: Path, max_size_mb: float) -> Optional[Path]:
+    """
+    Two-pass encode `file` to fit under `max_size_mb`.
+
+    Pass 1 analyses the video once; if pass 2 still overshoots (rare, short
+    clips with little rate-control room) it is re-run once from the same
+    pass 1 stats at a bitrate scaled by the overshoot.
+    """
+    info = await probe(file)
+    if info is None:
+        return None
+
+    max_bytes = int(max_size_mb * 1024 * 1024)
+    plan = plan_encode(info, max_bytes)
+    if plan is None:
+        logger.tree("Video Too Long For Size Limit", [
+            ("File", file.name),
+            ("Duration", f"{info.duration:.1f}s"),
+            ("Limit", f"{max_size_mb:.0f} MB"),
+        ], emoji="❌")
+        return None
+
+    logger.tree("Targeted Encode Planned", [
+        ("File", file.name),
+        ("Preset", plan.preset),
+        ("Video", f"{plan.video_kbps} kbps"),
+        ("Audio", f"{plan.audio_kbps} kbps" if plan.audio_kbps else "None"),
+        ("Resolution", f"{plan.width}x{plan.height}@{plan.fps:g}" + (" (stepped)" if plan.scaled else "")),
+        ("Predicted Size", f"{plan.predicted_bytes / 1024 / 1024:.1f} MB"),
+        ("Predicted Time", f"{plan.predicted_seconds:.0f}s"),
+    ], emoji="📊")
+
+    output_file = file.parent / f"compressed_{file.stem}.mp4"
+    passlog = file.parent / f"x264_{file.stem}"
+    audio_args = ["-c:a", "aac", "-b:a", f"{plan.audio_kbps}k"] if plan.audio_kbps else ["-an"]
+    start = time.monotonic()
+
+    try:
+        pass1 = [
+            "ffmpeg", "-y", "-i", str(file),
+            *_video_args(plan, plan.video_kbps),
+            "-pass", "1", "-passlogfile", str(passlog),
+            "-an", "-f", "null", "-",
+        ]
+        if not await _run_pass(pass1, file, "1"):
+            return None
+
+        video_kbps = plan.video_kbps
+        for attempt in range(2):
+            pass2 = [
+                "ffmpeg", "-y", "-i", str(file),
+                *_video_args(plan, video_kbps),
+                "-pass", "2", "-passlogfile", str(passlog),
+                *audio_args,
+                "-movflags", "+faststart",
+                str(output_file)
+            ]
+            if not await _run_pass(pass2, file, "2") or not output_file.exists():
+                output_file.unlink(missing_ok=True)
+                return None
+
+            actual_bytes = output_file.stat().st_size
+            if actual_bytes <= max_bytes:
+                break
+            if attempt == 1:
+                logger.tree("Targeted Encode Still Too Large", [
+                    ("File", file.name),
+                    ("Size", f"{actual_bytes / 1024 / 1024:.1f} MB"),
+                    ("Limit", f"{max_size_mb:.0f} MB"),
+                ], emoji="❌")
+                output_file.unlink(missing_ok=True)
+                return None
+            # Scale video bits by the overshoot (audio size is fixed)
+            audio_bytes = plan.audio_kbps * 1000 / 8 * info.duration
+            ratio = (max_bytes * ENCODE_SIZE_SAFETY - audio_bytes) / max(1, actual_bytes - audio_bytes)
+            video_kbps = max(ENCODE_MIN_VIDEO_KBPS, int(video_kbps * ratio))
+            logger.tree("Targeted Encode Overshot, Retrying Pass 2", [
+                ("File", file.name),
+                ("Size", f"{actual_bytes / 1024 / 1024:.1f} MB"),
+                ("New Video Bitrate", f"{video_kbps} kbps"),
+            ], emoji="🔄")
+
+        elapsed = time.monotonic() - start
+        logger.tree("Targeted Encode Complete", [
+            ("File", file.name),
+            ("Preset", plan.preset),
+            ("Predicted Size", f"{plan.predicted_bytes / 1024 / 1024:.2f} MB"),
+            ("Actual Size", f"{actual_bytes / 1024 / 1024:.2f} MB"),
+            ("Size Error", f"{(actual_bytes / plan.predicted_bytes - 1) * 100:+.1f}%"),
+            ("Predicted Time", f"{plan.predicted_seconds:.1f}s"),
+            ("Actual Time", f"{elapsed:.1f}s"),
+            ("Limit", f"{max_size_mb:.0f} MB"),
+        ], emoji="✅")
+        return output_file
+
+    except Exception as e:
+        logger.error_tree("Targeted Encode Exception", e, [
+            ("File", file.name),
+        ])
+        output_file.unlink(missing_ok=True)
+        return None
+    finally:
+        for log_file in file.parent.glob(f"{passlog.name}*"):
+            log_file.unlink(missing_ok=True)
+
+
+__all__ = ["VideoInfo", "EncodePlan", "probe", "plan_encode", "audio_kbps_for", "encode_to_size"]
@@ -0,0 +1,325 @@
+"""
+SyriaBot - Download Scheduler
+=============================
+
+Bounded priority queue for /download jobs.
+
+Caps how many downloads (yt-dlp, gallery-dl, ffmpeg) run at once across
+the bot and per user, lets boosters and staff jump the queue, and tracks
+each job through queued -> fetching -> transcoding -> uploading.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.logger import logger
+from .config import (
+    DOWNLOAD_MAX_CONCURRENT,
+    DOWNLOAD_MAX_PER_USER,
+    DOWNLOAD_MAX_PENDING_PER_USER,
+    DOWNLOAD_MAX_QUEUED,
+)
+
+
+# =============================================================================
+# Job States
+# =============================================================================
+
+JOB_QUEUED = "queued"
+JOB_FETCHING = "fetching"
+JOB_TRANSCODING = "transcoding"
+JOB_UPLOADING = "uploading"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# Allowed transitions (cobalt interleaves fetch/transcode per file)
+_TRANSITIONS = {
+    JOB_QUEUED: {JOB_FETCHING, JOB_CANCELLED, JOB_FAILED},
+    JOB_FETCHING: {JOB_TRANSCODING, JOB_UPLOADING, JOB_DONE, JOB_FAILED, JOB_CANCELLED},
+    JOB_TRANSCODING: {JOB_FETCHING, JOB_UPLOADING, JOB_DONE, JOB_FAILED, JOB_CANCELLED},
+    JOB_UPLOADING: {JOB_DONE, JOB_FAILED, JOB_CANCELLED},
+}
+
+# Priorities (lower runs first)
+PRIORITY_STAFF = 0
+PRIORITY_BOOSTER = 1
+PRIORITY_DEFAULT = 2
+
+# Job whose work is running in the current task (set for the job's task and
+# anything it spawns, so the fetch/transcode code can report its stage)
+_current_job: contextvars.ContextVar[Optional["DownloadJob"]] = contextvars.ContextVar(
+    "download_job", default=None
+)
+
+
+def set_stage(state: str) -> None:
+    """Move the current download job (if any) to a new state."""
+    job = _current_job.get()
+    if job is not None:
+        job.set_state(state)
+
+
+class DownloadQueueFull(Exception):
+    """The global queue or the user's pending limit is full."""
+
+
+class DownloadCancelled(Exception):
+    """The job was cancelled through DownloadScheduler.cancel()."""
+
+
+# =============================================================================
+# Job
+# =============================================================================
+
+@dataclass(eq=False)
+class DownloadJob:
+    """One /download request."""
+    user_id: int
+    url: str
+    priority: int = PRIORITY_DEFAULT
+    on_change: Optional[Callable[["DownloadJob"], None]] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    state: str = JOB_QUEUED
+    position: int = 0                       # 1-based queue position while queued
+    created_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    cancel_requested: bool = False
+    task: Optional[asyncio.Task] = None
+    slot: Optional[asyncio.Future] = None
+
+    def set_state(self, state: str) -> bool:
+        """Apply a state transition; ignored if not allowed from the current state."""
+        if state == self.state or state not in _TRANSITIONS.get(self.state, ()):
+            return False
+        self.state = state
+        self._notify()
+        return True
+
+    def _notify(self) -> None:
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(self)
+        except Exception as e:
+            logger.tree("Download Progress Callback Failed", [
+                ("Job", self.id),
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+class DownloadScheduler:
+    """
+    Priority queue with global and per-user concurrency limits.
+
+    DESIGN:
+        Jobs wait in a heap ordered by (priority, arrival). When a slot
+        frees, the first queued job whose user is under the per-user
+        running limit is started; jobs of a busy user are skipped, not
+        dropped. Each job's work runs in its own task so cancel() can
+        stop it at any stage (subprocesses are killed by the awaiting
+        code); the caller sees DownloadCancelled. A task cancelled before
+        its first step never enters _execute, so a done-callback finishes
+        the job and releases its slot. Queue positions are
+        pushed to waiting jobs through on_change whenever the queue moves.
+        Only used from the event loop, so no locking.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DOWNLOAD_MAX_CONCURRENT,
+        max_per_user: int = DOWNLOAD_MAX_PER_USER,
+        max_queued: int = DOWNLOAD_MAX_QUEUED,
+        max_pending_per_user: int = DOWNLOAD_MAX_PENDING_PER_USER,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queued = max_queued
+        self.max_pending_per_user = max_pending_per_user
+
+        self._heap: list[tuple[int, int, DownloadJob]] = []
+        self._seq = itertools.count()
+        self._jobs: dict[str, DownloadJob] = {}
+        self._running: set[DownloadJob] = set()
+        self._user_running: dict[int, int] = {}
+
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def run(self, job: DownloadJob, work: Callable[[DownloadJob], Awaitable[Any]]) -> Any:
+        """
+        Queue a job and run `work(job)` once it gets a slot.
+
+        Raises:
+            DownloadQueueFull: Queue or per-user limit reached (nothing queued)
+            DownloadCancelled: cancel() was called for this job
+        """
+        self._admit(job)
+        job.task = asyncio.create_task(self._execute(job, work), name=f"download-{job.id}")
+        job.task.add_done_callback(lambda task: self._on_task_done(job))
+        try:
+            return await job.task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if job.cancel_requested and not (current and current.cancelling()):
+                raise DownloadCancelled(job.id) from None
+            raise
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it's unknown or finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.task is None or job.task.done():
+            return False
+        job.cancel_requested = True
+        job.task.cancel()
+        return True
+
+    def get_job(self, job_id: str) -> Optional[DownloadJob]:
+        return self._jobs.get(job_id)
+
+    def cancel_all(self) -> int:
+        """Cancel every job (shutdown)."""
+        return sum(self.cancel(job_id) for job_id in list(self._jobs))
+
+    def get_stats(self) -> dict:
+        """Get queue counters."""
+        return {
+            "running": len(self._running),
+            "queued": sum(1 for job in self._jobs.values() if job.state == JOB_QUEUED),
+            "max_concurrent": self.max_concurrent,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+        }
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _admit(self, job: DownloadJob) -> None:
+        queued = sum(1 for j in self._jobs.values() if j.state == JOB_QUEUED)
+        pending = sum(1 for j in self._jobs.values() if j.user_id == job.user_id)
+        if queued >= self.max_queued or pending >= self.max_pending_per_user:
+            self.rejected += 1
+            logger.tree("Download Job Rejected", [
+                ("User ID", str(job.user_id)),
+                ("Queued", str(queued)),
+                ("User Pending", str(pending)),
+            ], emoji="🚫")
+            raise DownloadQueueFull()
+
+        job.slot = asyncio.get_running_loop().create_future()
+        self._jobs[job.id] = job
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        self._pump()
+
+    async def _execute(self, job: DownloadJob, work: Callable[[DownloadJob], Awaitable[Any]]) -> Any:
+        _current_job.set(job)
+        try:
+            await job.slot
+            job.started_at = time.monotonic()
+            job.set_state(JOB_FETCHING)
+            result = await work(job)
+            job.set_state(JOB_DONE)
+            self.completed += 1
+            return result
+        except asyncio.CancelledError:
+            self._record_cancel(job)
+            raise
+        except Exception:
+            job.set_state(JOB_FAILED)
+            self.failed += 1
+            raise
+        finally:
+            self._finish(job)
+
+    def _on_task_done(self, job: DownloadJob) -> None:
+        """Clean up a job whose task was cancelled before _execute's first step."""
+        if self._jobs.get(job.id) is not job:
+            return  # _execute already finished it
+        self._record_cancel(job)
+        self._finish(job)
+
+    def _record_cancel(self, job: DownloadJob) -> None:
+        job.set_state(JOB_CANCELLED)
+        self.cancelled += 1
+        logger.tree("Download Job Cancelled", [
+            ("Job", job.id),
+            ("User ID", str(job.user_id)),
+        ], emoji="🛑")
+
+    def _finish(self, job: DownloadJob) -> None:
+        self._jobs.pop(job.id, None)
+        if job in self._running:
+            self._running.discard(job)
+            remaining = self._user_running.get(job.user_id, 1) - 1
+            if remaining > 0:
+                self._user_running[job.user_id] = remaining
+            else:
+                self._user_running.pop(job.user_id, None)
+        self._pump()
+
+    def _pump(self) -> None:
+        """Start queued jobs while slots are free, then refresh queue positions."""
+        skipped = []
+        while self._heap and len(self._running) < self.max_concurrent:
+            entry = heapq.heappop(self._heap)
+            job = entry[2]
+            if job.state != JOB_QUEUED or job.slot.done():
+                continue  # Cancelled while queued
+            if self._user_running.get(job.user_id, 0) >= self.max_per_user:
+                skipped.append(entry)
+                continue
+            self._running.add(job)
+            self._user_running[job.user_id] = self._user_running.get(job.user_id, 0) + 1
+            job.slot.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+        waiting = sorted(entry for entry in self._heap if entry[2].state == JOB_QUEUED and not entry[2].slot.done())
+        for position, (_, _, job) in enumerate(waiting, 1):
+            if job.position != position:
+                job.position = position
+                job._notify()
+
+
+download_scheduler = DownloadScheduler()
+
+__all__ = [
+    "DownloadScheduler",
+    "DownloadJob",
+    "DownloadQueueFull",
+    "DownloadCancelled",
+    "download_scheduler",
+    "set_stage",
+    "JOB_QUEUED",
+    "JOB_FETCHING",
+    "JOB_TRANSCODING",
+    "JOB_UPLOADING",
+    "JOB_DONE",
+    "JOB_FAILED",
+    "JOB_CANCELLED",
+    "PRIORITY_STAFF",
+    "PRIORITY_BOOSTER",
+    "PRIORITY_DEFAULT",
+]
@@ -9,24 +9,43 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
+import asyncio
+import hashlib
 import shutil
+import time
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from src.core.logger import logger
+from src.utils.async_utils import create_safe_task
 from .config import (
     TEMP_DIR,
     COBALT_API_URL,
     MAX_FILE_SIZE_MB,
+    DOWNLOAD_REAP_INTERVAL,
+    DOWNLOAD_TEMP_GRACE,
+    DOWNLOAD_TEMP_MAX_AGE,
     VIDEO_EXTENSIONS,
     IMAGE_EXTENSIONS,
     DownloadResult,
     get_platform,
 )
+from .dedup import normalize_url, RecentDownloads
+from .scheduler import download_scheduler
 from . import cobalt
 from . import ytdlp
 
 
+@dataclass(eq=False)
+class _Inflight:
+    """One running download and how many requests are sharing it."""
+    task: asyncio.Task
+    key: str
+    waiters: int = 0
+
+
 class DownloaderService:
     """
     Service for downloading media from social media platforms.
@@ -36,6 +55,13 @@ class DownloaderService:
         - Primary: Cobalt API (fast, Discord-ready files)
         - Fallback: yt-dlp (wider platform support)
         Files are renamed with branding (discord.gg/syria) before delivery.
+        Concurrent requests for the same canonical URL share one download;
+        its directory is refcounted and removed by the last release().
+        Recently uploaded media is answered with its attachment links.
+        Every download directory is tracked from creation until cleanup;
+        a failed or cancelled fetch removes its own directory, and a
+        periodic sweep reclaims anything untracked (a crash) or tracked
+        for longer than any job can run (a leak).
     """
 
     def __init__(self) -> None:
@@ -45,32 +71,92 @@ class DownloaderService:
         Sets up temp directory and cleans orphaned files from previous runs.
         """
         TEMP_DIR.mkdir(parents=True, exist_ok=True)
-        self._cleanup_orphaned_files()
+        self._inflight: dict[str, _Inflight] = {}
+        self._holders: dict[Path, _Inflight] = {}
+        self._recent = RecentDownloads()
+        self._live_dirs: dict[Path, float] = {}    # download dir -> created (monotonic)
+        self._reap_task: Optional[asyncio.Task] = None
+        self.reclaim_temp_dirs(grace=0)
         logger.tree("Downloader Service Initialized", [
             ("Cobalt API", COBALT_API_URL),
             ("Temp Dir", str(TEMP_DIR)),
             ("Max Size", f"{MAX_FILE_SIZE_MB} MB"),
         ], emoji="📥")
 
-    def _cleanup_orphaned_files(self) -> None:
-        """Clean up any leftover temp files from previous runs."""
+    # =========================================================================
+    # Temp Dir Reclaiming
+    # =========================================================================
+
+    def start(self) -> None:
+        """Start the periodic temp dir sweep."""
+        if self._reap_task is None or self._reap_task.done():
+            self._reap_task = create_safe_task(self._reap_loop(), "Download Temp Reaper")
+
+    async def stop(self) -> None:
+        """Cancel running downloads, stop the sweep and remove all temp files."""
+        cancelled = download_scheduler.cancel_all()
+        if self._reap_task:
+            self._reap_task.cancel()
+            try:
+                await self._reap_task
+            except asyncio.CancelledError:
+                pass
+            self._reap_task = None
+        if cancelled:
+            # Let cancelled jobs kill their subprocesses before removing dirs
+            await asyncio.sleep(0.5)
+        self._live_dirs.clear()
+        self.reclaim_temp_dirs(grace=0)
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(DOWNLOAD_REAP_INTERVAL)
+            self.reclaim_temp_dirs()
+
+    def reclaim_temp_dirs(self, grace: float = DOWNLOAD_TEMP_GRACE) -> int:
+        """
+        Remove temp entries no running download owns.
+
+        Untracked entries older than `grace` seconds are leftovers from a
+        crash or restart; tracked ones older than DOWNLOAD_TEMP_MAX_AGE
+        outlived every timeout a job can hit and were leaked.
+        """
+        now_wall = time.time()
+        now = time.monotonic()
+        live = dict(self._live_dirs)
+        cleaned = 0
         try:
-            cleaned = 0
             for item in TEMP_DIR.iterdir():
+                created = live.get(item)
+                if created is not None:
+                    if now - created < DOWNLOAD_TEMP_MAX_AGE:
+                        continue
+                    self._live_dirs.pop(item, None)
+                else:
+                    try:
+                        if now_wall - item.stat().st_mtime < grace:
+                            continue
+                    except FileNotFoundError:
+                        continue
                 if item.is_dir():
                     shutil.rmtree(item, ignore_errors=True)
-                    cleaned += 1
-                elif item.is_file():
+                else:
                     item.unlink(missing_ok=True)
-                    cleaned += 1
+                cleaned += 1
             if cleaned > 0:
                 logger.tree("Download Temp Cleanup", [
                     ("Files Cleaned", str(cleaned)),
+                    ("Live", str(len(self._live_dirs))),
                 ], emoji="🧹")
         except Exception as e:
             logger.tree("Download Temp Cleanup Failed", [
                 ("Error", str(e)[:50]),
             ], emoji="⚠️")
+        return cleaned
+
+    # =========================================================================
+    # Download
+    # =========================================================================
 
     def get_platform(self, url: str) -> str | None:
         """Detect which platform a URL belongs to."""
@@ -86,10 +172,17 @@ class DownloaderService:
         """Check if Cobalt API is healthy and responsive."""
         return await cobalt.check_health()
 
-    async def download(self, url: str) -> DownloadResult:
+    async def download(self, url: str, max_size_mb: float = MAX_FILE_SIZE_MB) -> DownloadResult:
         """
         Download media from a social media URL using Cobalt API.
         Falls back to yt-dlp if Cobalt fails.
+
+        Requests for the same media (by canonical URL) share one in-flight
+        download. A result with `links` instead of `files` means the media
+        was uploaded recently and those attachment links can be re-sent.
+        Callers must hand successful file results back via release().
+        Videos over `max_size_mb` (the destination's upload limit) are
+        re-encoded to fit it.
         """
         platform = self.get_platform(url)
         if not platform:
@@ -104,11 +197,79 @@ class DownloaderService:
                 error="Unsupported URL. Supported: Instagram, Twitter, TikTok, Reddit, Facebook, Snapchat, Twitch."
             )
 
+        key = normalize_url(url, platform)
+        links = self._recent.get_links(key)
+        if links:
+            logger.tree("Download Served From Recent Upload", [
+                ("Platform", platform.title()),
+                ("Key", key[:60]),
+                ("Links", str(len(links))),
+            ], emoji="♻️")
+            return DownloadResult(success=True, files=[], platform=platform, key=key, links=links)
+
+        # Different upload limits produce different files
+        inflight_key = f"{key}@{max_size_mb:g}"
+        entry = self._inflight.get(inflight_key)
+        if entry is None:
+            entry = _Inflight(asyncio.create_task(self._fetch(url, platform, key, max_size_mb)), inflight_key)
+            self._inflight[inflight_key] = entry
+            entry.task.add_done_callback(lambda _, e=entry: self._forget_inflight(e.key, e))
+        else:
+            logger.tree("Download Coalesced", [
+                ("Platform", platform.title()),
+                ("Key", key[:60]),
+                ("Waiters", str(entry.waiters + 1)),
+            ], emoji="🔗")
+
+        entry.waiters += 1
+        try:
+            result = await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            self._leave(entry)
+            raise
+
+        if not result.success:
+            entry.waiters -= 1
+            return result
+
+        self._holders[result.files[0].parent] = entry
+
+        # Same files as something uploaded recently under another URL
+        links = self._recent.links_for_hashes(result.hashes)
+        if links:
+            self.release(result)
+            logger.tree("Download Matched Recent Upload", [
+                ("Platform", platform.title()),
+                ("Files", str(len(links))),
+            ], emoji="♻️")
+            return DownloadResult(success=True, files=[], platform=platform, key=key, links=links)
+
+        return result
+
+    async def _fetch(self, url: str, platform: str, key: str, max_size_mb: float) -> DownloadResult:
+        """Run one download (shared by every request for the same key)."""
         # Create unique download directory
         download_id = str(uuid.uuid4())[:8]
         download_dir = TEMP_DIR / download_id
         download_dir.mkdir(parents=True, exist_ok=True)
+        self._live_dirs[download_dir] = time.monotonic()
+
+        try:
+            return await self._fetch_into(url, platform, key, download_dir, max_size_mb)
+        except BaseException:
+            # Cancelled (every requester gave up) or crashed mid-download
+            self.cleanup([download_dir])
+            raise
 
+    async def _fetch_into(
+        self,
+        url: str,
+        platform: str,
+        key: str,
+        download_dir: Path,
+        max_size_mb: float,
+    ) -> DownloadResult:
+        download_id = download_dir.name
         logger.tree("Download Started", [
             ("Platform", platform.title()),
             ("URL", url[:60] + "..." if len(url) > 60 else url),
@@ -116,7 +277,7 @@ class DownloaderService:
         ], emoji="📥")
 
         # Try Cobalt API first (fast, returns Discord-ready files)
-        cobalt_result = await cobalt.download(url, download_dir, platform)
+        cobalt_result = await cobalt.download(url, download_dir, platform, max_size_mb)
         if cobalt_result.success:
             # Rename files with platform + server ad
             renamed_files = self._rename_files_for_branding(cobalt_result.files, platform)
@@ -124,11 +285,7 @@ class DownloaderService:
                 ("Platform", platform.title()),
                 ("Files", str(len(renamed_files))),
             ], emoji="✅")
-            return DownloadResult(
-                success=True,
-                files=renamed_files,
-                platform=platform
-            )
+            return await self._finish(renamed_files, platform, key)
 
         logger.tree("Cobalt Failed, Trying yt-dlp Fallback", [
             ("Platform", platform.title()),
@@ -136,7 +293,7 @@ class DownloaderService:
         ], emoji="🔄")
 
         # Fallback to yt-dlp
-        ytdlp_result = await ytdlp.download(url, download_dir, platform)
+        ytdlp_result = await ytdlp.download(url, download_dir, platform, max_size_mb)
         if ytdlp_result.success:
             # Rename files with platform + server ad
             renamed_files = self._rename_files_for_branding(ytdlp_result.files, platform)
@@ -144,11 +301,7 @@ class DownloaderService:
                 ("Platform", platform.title()),
                 ("Files", str(len(renamed_files))),
             ], emoji="✅")
-            return DownloadResult(
-                success=True,
-                files=renamed_files,
-                platform=platform
-            )
+            return await self._finish(renamed_files, platform, key)
         else:
             logger.tree("Download Failed (Both Methods)", [
                 ("Platform", platform.title()),
@@ -158,6 +311,74 @@ class DownloaderService:
 
         return ytdlp_result
 
+    async def _finish(self, files: list[Path], platform: str, key: str) -> DownloadResult:
+        """Hash the delivered files so identical media can reuse an upload."""
+        hashes = await asyncio.to_thread(self._hash_files, files)
+        return DownloadResult(success=True, files=files, platform=platform, key=key, hashes=hashes)
+
+    @staticmethod
+    def _hash_files(files: list[Path]) -> list[str]:
+        hashes = []
+        for file in files:
+            digest = hashlib.sha256()
+            with open(file, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            hashes.append(digest.hexdigest())
+        return hashes
+
+    # =========================================================================
+    # Shared Results
+    # =========================================================================
+
+    def _forget_inflight(self, key: str, entry: "_Inflight") -> None:
+        """Stop coalescing onto a finished download (later requests start fresh)."""
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    def _leave(self, entry: "_Inflight") -> None:
+        """A waiter was cancelled before the download finished."""
+        entry.waiters -= 1
+        if entry.waiters > 0:
+            return
+
+        if not entry.task.done():
+            # Nobody wants it any more; stop yt-dlp/ffmpeg (the fetch cleans up)
+            self._forget_inflight(entry.key, entry)
+            entry.task.cancel()
+            return
+
+        def cleanup_orphan(task: asyncio.Task) -> None:
+            if entry.waiters == 0 and not task.cancelled() and task.exception() is None:
+                result = task.result()
+                if result.success and result.files:
+                    self.cleanup([result.files[0].parent])
+
+        entry.task.add_done_callback(cleanup_orphan)
+
+    def release(self, result: DownloadResult) -> None:
+        """
+        Hand back a successful download once its files have been sent.
+
+        The download directory is removed when the last request sharing
+        it releases it.
+        """
+        if not result.files:
+            return
+        download_dir = result.files[0].parent
+        entry = self._holders.get(download_dir)
+        if entry is not None:
+            entry.waiters -= 1
+            if entry.waiters > 0:
+                return
+            del self._holders[download_dir]
+        self.cleanup([download_dir])
+
+    def remember_upload(self, result: DownloadResult, links: list[str]) -> None:
+        """Record the attachment links a download was uploaded to."""
+        if result.key and result.files:
+            self._recent.remember(result.key, result.platform, result.hashes, links)
+
     def _rename_files_for_branding(self, files: list[Path], platform: str) -> list[Path]:
         """
         Rename files with platform name and server advertisement.
@@ -203,6 +424,7 @@ class DownloaderService:
         """Clean up downloaded files and directories."""
         cleaned = 0
         for path in paths:
+            self._live_dirs.pop(path, None)
             try:
                 if path.is_dir():
                     shutil.rmtree(path)
@@ -3,6 +3,7 @@ SyriaBot - Video Processing
 ===========================
 
 FFmpeg-based video processing: format checking, compatibility, compression.
+Compression targets the destination's upload limit (see encoder.py).
 
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
@@ -13,7 +14,9 @@ from pathlib import Path
 from typing import Optional
 
 from src.core.logger import logger
-from .config import MAX_FILE_SIZE_MB, VIDEO_EXTENSIONS
+from .config import MAX_FILE_SIZE_MB, VIDEO_EXTENSIONS, communicate
+from .encoder import encode_to_size
+from .scheduler import set_stage, JOB_TRANSCODING
 
 
 async def check_video_format(file: Path) -> tuple[str, str]:
@@ -32,7 +35,7 @@ async def check_video_format(file: Path) -> tuple[str, str]:
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=10)
+        stdout, stderr = await communicate(process, timeout=10)
         output = stdout.decode().strip()
         parts = output.split(",")
         if len(parts) >= 2:
@@ -54,36 +57,7 @@ async def check_video_format(file: Path) -> tuple[str, str]:
         return "unknown", "unknown"
 
 
-async def get_video_duration(file: Path) -> float:
-    """Get video duration in seconds using ffprobe."""
-    probe_cmd = [
-        "ffprobe", "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(file)
-    ]
-
-    try:
-        probe_process = await asyncio.create_subprocess_exec(
-            *probe_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        probe_stdout, _ = await probe_process.communicate()
-        duration = float(probe_stdout.decode().strip())
-        logger.tree("Video Duration Detected", [
-            ("Duration", f"{duration:.1f}s"),
-        ], emoji="⏱️")
-        return duration
-    except Exception as e:
-        logger.tree("Duration Probe Failed", [
-            ("Error", str(e)[:50]),
-            ("Using Default", "60s"),
-        ], emoji="⚠️")
-        return 60.0
-
-
-async def ensure_discord_compatible(file: Path) -> Optional[Path]:
+async def ensure_discord_compatible(file: Path, max_size_mb: float = MAX_FILE_SIZE_MB) -> Optional[Path]:
     """Ensure video is Discord-compatible. Only re-encodes if necessary."""
     codec, pix_fmt = await check_video_format(file)
 
@@ -140,7 +114,7 @@ async def ensure_discord_compatible(file: Path) -> Optional[Path]:
             stderr=asyncio.subprocess.PIPE,
         )
 
-        _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        _, stderr = await communicate(process, timeout=timeout)
 
         if process.returncode != 0 or not output_file.exists():
             stderr_text = stderr.decode(errors="ignore")
@@ -160,14 +134,14 @@ async def ensure_discord_compatible(file: Path) -> Optional[Path]:
             ("Method", "Remux" if (is_h264 and is_yuv420p) else "Re-encode"),
         ], emoji="✅")
 
-        if new_size_mb > MAX_FILE_SIZE_MB:
+        if new_size_mb > max_size_mb:
             logger.tree("Processed File Too Large", [
                 ("Size", f"{new_size_mb:.1f} MB"),
-                ("Max", f"{MAX_FILE_SIZE_MB} MB"),
+                ("Max", f"{max_size_mb:.0f} MB"),
             ], emoji="⚠️")
-            compressed = await compress_video(output_file)
+            # Encode from the source, not the CRF output (one generation of loss)
             output_file.unlink()
-            return compressed
+            return await compress_video(file, max_size_mb)
 
         return output_file
 
@@ -188,106 +162,18 @@ async def ensure_discord_compatible(file: Path) -> Optional[Path]:
         return None
 
 
-async def compress_video(file: Path) -> Optional[Path]:
-    """Compress a video to fit under the size limit."""
+async def compress_video(file: Path, max_size_mb: float = MAX_FILE_SIZE_MB) -> Optional[Path]:
+    """Compress a video to fit under the size limit (two-pass, size-targeted)."""
+    set_stage(JOB_TRANSCODING)
     logger.tree("Video Compression Started", [
         ("File", file.name),
         ("Current Size", f"{file.stat().st_size / (1024*1024):.1f} MB"),
-        ("Target", f"< {MAX_FILE_SIZE_MB} MB"),
+        ("Target", f"< {max_size_mb:.0f} MB"),
     ], emoji="🗜️")
-
-    output_file = file.parent / f"compressed_{file.stem}.mp4"
-    duration = await get_video_duration(file)
-
-    # Validate duration to prevent ZeroDivisionError
-    if not duration or duration <= 0:
-        logger.tree("Compression Failed", [
-            ("File", file.name),
-            ("Reason", "Invalid or zero duration"),
-            ("Duration", str(duration)),
-        ], emoji="❌")
-        return None
-
-    # Calculate target bitrate
-    target_size_bits = MAX_FILE_SIZE_MB * 8 * 1024 * 1024
-    audio_bitrate = 128 * 1024
-    video_bitrate = int((target_size_bits / duration) - audio_bitrate)
-    video_bitrate = max(video_bitrate, 500000)
-
-    logger.tree("Compression Bitrate Calculated", [
-        ("Video Bitrate", f"{video_bitrate // 1000} kbps"),
-        ("Audio Bitrate", "128 kbps"),
-    ], emoji="📊")
-
-    cmd = [
-        "ffmpeg", "-y",
-        "-i", str(file),
-        "-c:v", "libx264",
-        "-preset", "ultrafast",
-        "-b:v", str(video_bitrate),
-        "-maxrate", str(int(video_bitrate * 1.5)),
-        "-bufsize", str(video_bitrate * 2),
-        "-pix_fmt", "yuv420p",
-        "-c:a", "aac",
-        "-b:a", "128k",
-        "-movflags", "+faststart",
-        str(output_file)
-    ]
-
-    try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        await asyncio.wait_for(process.communicate(), timeout=300)
-
-        if process.returncode != 0 or not output_file.exists():
-            logger.tree("Compression Failed", [
-                ("File", file.name),
-                ("Exit Code", str(process.returncode)),
-            ], emoji="❌")
-            if output_file.exists():
-                output_file.unlink()
-            return None
-
-        compressed_size_mb = output_file.stat().st_size / (1024 * 1024)
-
-        logger.tree("Compression Complete", [
-            ("Original", f"{file.stat().st_size / (1024*1024):.1f} MB"),
-            ("Compressed", f"{compressed_size_mb:.1f} MB"),
-            ("Reduction", f"{(1 - compressed_size_mb / (file.stat().st_size / (1024*1024))) * 100:.0f}%"),
-        ], emoji="✅")
-
-        if compressed_size_mb > 25:
-            logger.tree("Compressed Still Too Large", [
-                ("Size", f"{compressed_size_mb:.1f} MB"),
-                ("Max", "25 MB"),
-            ], emoji="❌")
-            output_file.unlink()
-            return None
-
-        return output_file
-
-    except asyncio.TimeoutError:
-        logger.tree("Compression Timeout", [
-            ("File", file.name),
-            ("Timeout", "300s"),
-        ], emoji="⏳")
-        if output_file.exists():
-            output_file.unlink()
-        return None
-    except Exception as e:
-        logger.error_tree("Compression Exception", e, [
-            ("File", file.name),
-        ])
-        if output_file.exists():
-            output_file.unlink()
-        return None
+    return await encode_to_size(file, max_size_mb)
 
 
-async def process_file(file: Path) -> Optional[Path]:
+async def process_file(file: Path, max_size_mb: float = MAX_FILE_SIZE_MB) -> Optional[Path]:
     """Process a downloaded file - re-encode videos for Discord compatibility."""
     file_size_mb = file.stat().st_size / (1024 * 1024)
 
@@ -299,7 +185,7 @@ async def process_file(file: Path) -> Optional[Path]:
 
     # Non-video files: just check size
     if file.suffix.lower() not in VIDEO_EXTENSIONS:
-        if file_size_mb <= MAX_FILE_SIZE_MB:
+        if file_size_mb <= max_size_mb:
             logger.tree("File Ready (Non-Video)", [
                 ("File", file.name),
                 ("Size", f"{file_size_mb:.1f} MB"),
@@ -308,22 +194,23 @@ async def process_file(file: Path) -> Optional[Path]:
         logger.tree("File Too Large (Non-Video)", [
             ("File", file.name),
             ("Size", f"{file_size_mb:.1f} MB"),
-            ("Max", f"{MAX_FILE_SIZE_MB} MB"),
+            ("Max", f"{max_size_mb:.0f} MB"),
         ], emoji="❌")
         return None
 
     # Video files need processing for Discord compatibility
-    needs_compression = file_size_mb > MAX_FILE_SIZE_MB
+    set_stage(JOB_TRANSCODING)
+    needs_compression = file_size_mb > max_size_mb
 
     if needs_compression:
         logger.tree("Video Needs Compression", [
             ("File", file.name),
             ("Size", f"{file_size_mb:.1f} MB"),
-            ("Target", f"< {MAX_FILE_SIZE_MB} MB"),
+            ("Target", f"< {max_size_mb:.0f} MB"),
         ], emoji="🗜️")
-        result = await compress_video(file)
+        result = await compress_video(file, max_size_mb)
     else:
-        result = await ensure_discord_compatible(file)
+        result = await ensure_discord_compatible(file, max_size_mb)
 
     if result:
         result_size = result.stat().st_size / (1024 * 1024)
@@ -19,7 +19,9 @@ from .config import (
     GALLERY_DL_PATH,
     COOKIES_FILE,
     IMAGE_EXTENSIONS,
+    MAX_FILE_SIZE_MB,
     DownloadResult,
+    communicate,
 )
 from .video import process_file
 
@@ -77,12 +79,8 @@ async def download_images(url: str, download_dir: Path, platform: str) -> Downlo
         )
 
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=60
-            )
+            stdout, stderr = await communicate(process, timeout=60)
         except asyncio.TimeoutError:
-            process.kill()
             logger.tree("Image Download Timeout", [
                 ("Platform", platform.title()),
                 ("Timeout", "60s"),
@@ -201,7 +199,12 @@ async def download_images(url: str, download_dir: Path, platform: str) -> Downlo
         )
 
 
-async def download(url: str, download_dir: Path, platform: str) -> DownloadResult:
+async def download(
+    url: str,
+    download_dir: Path,
+    platform: str,
+    max_size_mb: float = MAX_FILE_SIZE_MB,
+) -> DownloadResult:
     """Download using yt-dlp as fallback."""
     try:
         output_template = str(download_dir / "%(title).50s_%(id)s.%(ext)s")
@@ -242,13 +245,8 @@ async def download(url: str, download_dir: Path, platform: str) -> DownloadResul
         )
 
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=120
-            )
+            stdout, stderr = await communicate(process, timeout=120)
         except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()  # Ensure process is fully cleaned up
             logger.tree("yt-dlp Timeout", [
                 ("Platform", platform.title()),
                 ("Timeout", "120s"),
@@ -309,7 +307,7 @@ async def download(url: str, download_dir: Path, platform: str) -> DownloadResul
         processed_files = []
         for file in files:
             try:
-                result = await process_file(file)
+                result = await process_file(file, max_size_mb)
                 if result:
                     processed_files.append(result)
             except Exception as e:
@@ -3,23 +3,21 @@ SyriaBot - Family Card Generator
 =================================
 
 HTML/CSS based family tree card rendered with Playwright.
-Reuses the browser pool from the rank card system.
+Rendered from a hot template page (see card_templates); the sections
+are built in the page from the JSON payload.
 
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
-import io
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 from dataclasses import dataclass, field
 
 import discord
 
 from src.core.logger import logger
-from src.services.xp.card import (
-    _get_page, _return_page, get_render_semaphore,
-)
+from src.services.card_templates import CardTemplate, card_templates
 
 
 # Cache: {user_id: (bytes, timestamp)}
@@ -61,166 +59,78 @@ def _fmt_date(timestamp: Optional[int]) -> str:
     return dt.strftime("%b %d, %Y")
 
 
-def _escape(text: str) -> str:
-    """Escape HTML special characters."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
-
-
-def _member_circle(member: FamilyMember, size: int = 48) -> str:
-    """Generate HTML for a small member avatar circle with name."""
-    name = _escape(member.display_name[:14])
-    return f'''<div class="member-item">
-            <img class="member-avatar" src="{member.avatar_url}" width="{size}" height="{size}"
-                 onerror="this.style.display='none';this.nextElementSibling.style.display='flex'">
-            <div class="member-avatar-fallback" style="display:none;width:{size}px;height:{size}px">
-                {_escape(member.display_name[0].upper())}
-            </div>
-            <span class="member-name">{name}</span>
-        </div>'''
-
-
-def _generate_family_html(data: FamilyData) -> str:
-    """Generate HTML for the family tree card."""
-
-    sections: list[str] = []
-
-    # --- Parents section ---
-    if data.parents:
-        parent_items = ""
-        for i, p in enumerate(data.parents):
-            parent_items += _member_circle(p, 48)
-            if i == 0 and len(data.parents) > 1:
-                parent_items += '<div class="connector-amp">&</div>'
-
-        date_str = _fmt_date(data.adopted_at)
-        date_html = f'<span class="label-date">· adopted {date_str}</span>' if date_str else ""
-
-        sections.append(f'''
-        <div class="section">
-            <div class="section-header"><span class="section-label">Parents</span>{date_html}</div>
-            <div class="members-row">{parent_items}</div>
-        </div>''')
-
-    # --- Spouse section ---
-    if data.spouse:
-        date_str = _fmt_date(data.married_at)
-        date_html = f'<span class="label-date">· married {date_str}</span>' if date_str else ""
-        sections.append(f'''
-        <div class="section">
-            <div class="section-header"><span class="section-label">Spouse</span>{date_html}</div>
-            <div class="spouse-row">
-                <img class="spouse-avatar" src="{data.spouse.avatar_url}" width="50" height="50"
-                     onerror="this.style.display='none';this.nextElementSibling.style.display='flex'">
-                <div class="member-avatar-fallback spouse-fb" style="display:none;width:50px;height:50px">
-                    {_escape(data.spouse.display_name[0].upper())}
-                </div>
-                <div class="spouse-name">{_escape(data.spouse.display_name[:20])}</div>
-            </div>
-        </div>''')
-
-    # --- Children section ---
-    if data.children:
-        child_items = "".join(_member_circle(c, 46) for c in data.children[:5])
-        sections.append(f'''
-        <div class="section">
-            <div class="section-header"><span class="section-label">Children ({len(data.children)}/{data.max_children})</span></div>
-            <div class="members-grid">{child_items}</div>
-        </div>''')
-
-    # --- Siblings section ---
-    if data.siblings:
-        sib_items = "".join(_member_circle(s, 42) for s in data.siblings[:8])
-        sections.append(f'''
-        <div class="section">
-            <div class="section-header"><span class="section-label">Siblings ({len(data.siblings)})</span></div>
-            <div class="members-grid">{sib_items}</div>
-        </div>''')
-
-    # --- Empty state ---
-    if not sections:
-        sections.append('''
-        <div class="empty-state">
-            <div class="empty-icon">👪</div>
-            <div class="empty-text">No family yet</div>
-            <div class="empty-hint">Use marry, adopt, or get adopted to start your family!</div>
-        </div>''')
-
-    sections_html = "\n".join(sections)
-    display_name_escaped = _escape(data.display_name[:20])
-    username_escaped = _escape(data.username)
-
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-<style>
-* {{ margin: 0; padding: 0; box-sizing: border-box; }}
-
-body {{
+def _initial(name: str) -> str:
+    return name[0].upper() if name else "?"
+
+
+_FAMILY_CSS = '''* { margin: 0; padding: 0; box-sizing: border-box; }
+
+body {
     font-family: 'Segoe UI', -apple-system, BlinkMacSystemFont, Roboto, 'Noto Sans', Ubuntu, sans-serif;
     background: transparent;
     display: flex;
     justify-content: center;
     padding: 10px;
-}}
+}
 
 /* === Card border gradient === */
-.card-outer {{
+.card-outer {
     padding: 2px;
     background: linear-gradient(140deg, #1F5E2E 0%, #2d8a42 35%, #E6B84A 70%, #c49a30 100%);
     border-radius: 18px;
     box-shadow: 0 6px 28px rgba(0,0,0,0.55), 0 0 30px rgba(31,94,46,0.2);
-}}
+}
 
 /* === Main card === */
-.card {{
+.card {
     width: 480px;
     background: #111118;
     border-radius: 16px;
     overflow: hidden;
-}}
+}
 
 /* === Header === */
-.header {{
+.header {
     display: flex;
     align-items: center;
     gap: 16px;
     padding: 22px 22px 18px;
     background: linear-gradient(165deg, rgba(31,94,46,0.12) 0%, transparent 60%);
-}}
+}
 
-.avatar-wrap {{
+.avatar-wrap {
     position: relative;
     flex-shrink: 0;
     width: 72px;
     height: 72px;
-}}
+}
 
-.avatar-ring {{
+.avatar-ring {
     position: absolute;
     inset: -3px;
     border-radius: 50%;
     background: linear-gradient(135deg, #1F5E2E, #E6B84A);
     z-index: 0;
-}}
+}
 
-.avatar-ring-inner {{
+.avatar-ring-inner {
     position: absolute;
     inset: 0;
     border-radius: 50%;
     border: 3px solid #111118;
     z-index: 1;
-}}
+}
 
-.avatar-img {{
+.avatar-img {
     width: 72px;
     height: 72px;
     border-radius: 50%;
     object-fit: cover;
     position: relative;
     z-index: 2;
-}}
+}
 
-.avatar-fb {{
+.avatar-fb {
     width: 72px;
     height: 72px;
     border-radius: 50%;
@@ -233,14 +143,14 @@ body {{
     font-weight: 700;
     position: relative;
     z-index: 2;
-}}
+}
 
-.user-info {{
+.user-info {
     flex: 1;
     min-width: 0;
-}}
+}
 
-.display-name {{
+.display-name {
     font-size: 22px;
     font-weight: 700;
     color: #fff;
@@ -248,16 +158,16 @@ body {{
     white-space: nowrap;
     overflow: hidden;
     text-overflow: ellipsis;
-}}
+}
 
-.username {{
+.username {
     font-size: 13px;
     font-weight: 500;
     color: #555564;
     margin-top: 2px;
-}}
+}
 
-.badge {{
+.badge {
     display: inline-block;
     margin-top: 6px;
     padding: 2px 8px;
@@ -269,62 +179,62 @@ body {{
     color: #E6B84A;
     background: rgba(230,184,74,0.1);
     border: 1px solid rgba(230,184,74,0.2);
-}}
+}
 
 /* === Section divider === */
-.divider {{
+.divider {
     height: 1px;
     margin: 0 22px;
     background: linear-gradient(90deg, rgba(31,94,46,0.35), rgba(230,184,74,0.15), transparent);
-}}
+}
 
 /* === Sections === */
-.section {{
+.section {
     padding: 14px 22px;
-}}
+}
 
-.section + .section {{
+.section + .section {
     padding-top: 0;
-}}
+}
 
-.section-header {{
+.section-header {
     display: flex;
     align-items: baseline;
     gap: 6px;
     margin-bottom: 10px;
-}}
+}
 
-.section-label {{
+.section-label {
     font-size: 10px;
     font-weight: 700;
     color: #E6B84A;
     text-transform: uppercase;
     letter-spacing: 1.2px;
-}}
+}
 
-.label-date {{
+.label-date {
     font-size: 10px;
     font-weight: 500;
     color: #444454;
-}}
+}
 
 /* === Spouse row === */
-.spouse-row {{
+.spouse-row {
     display: flex;
     align-items: center;
     gap: 12px;
-}}
+}
 
-.spouse-avatar {{
+.spouse-avatar {
     width: 50px;
     height: 50px;
     border-radius: 50%;
     object-fit: cover;
     border: 2px solid rgba(230,184,74,0.4);
     flex-shrink: 0;
-}}
+}
 
-.spouse-fb {{
+.spouse-fb {
     border-radius: 50%;
     background: #1a1a24;
     display: flex;
@@ -335,46 +245,46 @@ body {{
     font-weight: 700;
     border: 2px solid rgba(230,184,74,0.4);
     flex-shrink: 0;
-}}
+}
 
-.spouse-name {{
+.spouse-name {
     font-size: 15px;
     font-weight: 600;
     color: #ddd;
     white-space: nowrap;
     overflow: hidden;
     text-overflow: ellipsis;
-}}
+}
 
 /* === Members grid (children/siblings) === */
-.members-grid {{
+.members-grid {
     display: grid;
     grid-template-columns: repeat(auto-fit, minmax(60px, 1fr));
     gap: 10px 12px;
-}}
+}
 
-.members-row {{
+.members-row {
     display: flex;
     gap: 10px;
     align-items: flex-start;
-}}
+}
 
-.member-item {{
+.member-item {
     display: flex;
     flex-direction: column;
     align-items: center;
     gap: 4px;
     width: 60px;
-}}
+}
 
-.member-avatar {{
+.member-avatar {
     border-radius: 50%;
     object-fit: cover;
     border: 2px solid rgba(31,94,46,0.3);
     flex-shrink: 0;
-}}
+}
 
-.member-avatar-fallback {{
+.member-avatar-fallback {
     border-radius: 50%;
     background: #1a1a24;
     display: flex;
@@ -384,9 +294,9 @@ body {{
     color: #fff;
     font-weight: 700;
     border: 2px solid rgba(31,94,46,0.3);
-}}
+}
 
-.member-name {{
+.member-name {
     font-size: 10px;
     font-weight: 500;
     color: #666678;
@@ -396,73 +306,195 @@ body {{
     text-overflow: ellipsis;
     text-align: center;
     line-height: 1.2;
-}}
+}
 
-.connector-amp {{
+.connector-amp {
     display: flex;
     align-items: center;
     color: #444454;
     font-size: 14px;
     font-weight: 600;
     padding: 0 2px;
-}}
+}
 
 /* === Empty state === */
-.empty-state {{
+.empty-state {
     text-align: center;
     padding: 28px 22px;
-}}
+}
 
-.empty-icon {{
+.empty-icon {
     font-size: 28px;
     margin-bottom: 6px;
-}}
+}
 
-.empty-text {{
+.empty-text {
     font-size: 14px;
     font-weight: 600;
     color: #666678;
-}}
+}
 
-.empty-hint {{
+.empty-hint {
     font-size: 11px;
     color: #444454;
     margin-top: 3px;
-}}
+}
 
 /* === Bottom spacer === */
-.bottom-pad {{
+.bottom-pad {
     height: 8px;
-}}
-</style>
-</head>
-<body>
+}
+'''
+
+_FAMILY_BODY = '''
 <div class="card-outer">
 <div class="card">
     <div class="header">
         <div class="avatar-wrap">
             <div class="avatar-ring"></div>
             <div class="avatar-ring-inner"></div>
-            <img class="avatar-img" src="{data.avatar_url}" width="72" height="72"
-                 onerror="this.style.display='none';this.nextElementSibling.style.display='flex'">
-            <div class="avatar-fb" style="display:none">
-                {_escape(data.display_name[0].upper())}
-            </div>
+            <img class="avatar-img" data-src="avatar" width="72" height="72">
+            <div class="avatar-fb" data-fallback data-text="initial" style="display:none"></div>
         </div>
         <div class="user-info">
-            <div class="display-name">{display_name_escaped}</div>
-            <div class="username">@{username_escaped}</div>
+            <div class="display-name" data-text="display_name"></div>
+            <div class="username" data-text="username"></div>
             <div class="badge">Family Tree</div>
         </div>
     </div>
     <div class="divider"></div>
-    {sections_html}
+    <div id="sections"></div>
     <div class="bottom-pad"></div>
 </div>
 </div>
-</body>
-</html>'''
-    return html
+<script>
+(() => {
+    function el(tag, cls, text) {
+        const node = document.createElement(tag);
+        if (cls) node.className = cls;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function avatar(member, imgClass, fallbackClass, size) {
+        const img = el('img', imgClass);
+        img.width = size;
+        img.height = size;
+        const fb = el('div', fallbackClass, member.initial);
+        fb.setAttribute('data-fallback', '');
+        fb.style.display = 'none';
+        fb.style.width = size + 'px';
+        fb.style.height = size + 'px';
+        img.onerror = () => { img.style.display = 'none'; fb.style.display = 'flex'; };
+        img.src = member.avatar;
+        return [img, fb];
+    }
+
+    function memberItem(member, size) {
+        const item = el('div', 'member-item');
+        item.append(...avatar(member, 'member-avatar', 'member-avatar-fallback', size),
+                    el('span', 'member-name', member.name));
+        return item;
+    }
+
+    function section(label, date, body) {
+        const node = el('div', 'section');
+        const header = el('div', 'section-header');
+        header.append(el('span', 'section-label', label));
+        if (date) header.append(el('span', 'label-date', '· ' + date));
+        node.append(header, body);
+        return node;
+    }
+
+    function grid(members, size) {
+        const node = el('div', 'members-grid');
+        node.append(...members.map(m => memberItem(m, size)));
+        return node;
+    }
+
+    window.renderCard = (data) => {
+        const f = data.family;
+        const sections = [];
+
+        if (f.parents.length) {
+            const row = el('div', 'members-row');
+            f.parents.forEach((parent, i) => {
+                row.append(memberItem(parent, 48));
+                if (i === 0 && f.parents.length > 1) row.append(el('div', 'connector-amp', '&'));
+            });
+            sections.push(section('Parents', f.adopted && 'adopted ' + f.adopted, row));
+        }
+
+        if (f.spouse) {
+            const row = el('div', 'spouse-row');
+            row.append(...avatar(f.spouse, 'spouse-avatar', 'member-avatar-fallback spouse-fb', 50),
+                       el('div', 'spouse-name', f.spouse.name));
+            sections.push(section('Spouse', f.married && 'married ' + f.married, row));
+        }
+
+        if (f.children.length) {
+            sections.push(section(`Children (${f.childCount}/${f.maxChildren})`, '', grid(f.children, 46)));
+        }
+
+        if (f.siblings.length) {
+            sections.push(section(`Siblings (${f.siblingCount})`, '', grid(f.siblings, 42)));
+        }
+
+        if (!sections.length) {
+            const empty = el('div', 'empty-state');
+            empty.append(
+                el('div', 'empty-icon', '👪'),
+                el('div', 'empty-text', 'No family yet'),
+                el('div', 'empty-hint', 'Use marry, adopt, or get adopted to start your family!'),
+            );
+            sections.push(empty);
+        }
+
+        document.getElementById('sections').replaceChildren(...sections);
+    };
+})();
+</script>
+'''
+
+FAMILY_TEMPLATE = CardTemplate(
+    name="family",
+    html=f"<!DOCTYPE html>\n<html>\n<head>\n<style>\n{_FAMILY_CSS}</style>\n</head>\n<body>{_FAMILY_BODY}</body>\n</html>",
+    # Tall enough for every section filled (5 children, 8 siblings)
+    viewport=(520, 1000),
+    selector=".card-outer",
+    clip_padding=18,
+)
+
+
+def _member_payload(member: FamilyMember, max_name: int = 14) -> Dict[str, str]:
+    return {
+        "name": member.display_name[:max_name],
+        "initial": _initial(member.display_name),
+        "avatar": member.avatar_url,
+    }
+
+
+def _family_payload(data: FamilyData) -> Dict[str, Any]:
+    """Template payload for the family card."""
+    return {
+        "text": {
+            "display_name": data.display_name[:20],
+            "username": f"@{data.username}",
+            "initial": _initial(data.display_name),
+        },
+        "src": {"avatar": data.avatar_url},
+        "family": {
+            "parents": [_member_payload(p) for p in data.parents],
+            "adopted": _fmt_date(data.adopted_at),
+            "spouse": _member_payload(data.spouse, 20) if data.spouse else None,
+            "married": _fmt_date(data.married_at),
+            "children": [_member_payload(c) for c in data.children[:5]],
+            "childCount": len(data.children),
+            "maxChildren": data.max_children,
+            "siblings": [_member_payload(s) for s in data.siblings[:8]],
+            "siblingCount": len(data.siblings),
+        },
+    }
 
 
 async def generate_family_card(data: FamilyData) -> bytes:
@@ -482,72 +514,24 @@ async def generate_family_card(data: FamilyData) -> bytes:
     for k in expired:
         del _family_cache[k]
 
-    # Calculate needed height based on content
-    height = 140  # header + divider + bottom pad
-    if data.parents:
-        height += 85
-    if data.spouse:
-        height += 80
-    if data.children:
-        cols = 480 // 72  # ~6 per row with grid
-        rows = (len(data.children) + cols - 1) // cols
-        height += 40 + rows * 68
-    if data.siblings:
-        cols = 480 // 72
-        rows = (len(data.siblings) + cols - 1) // cols
-        height += 40 + rows * 64
-    if not data.spouse and not data.parents and not data.children and not data.siblings:
-        height += 100
-
-    async with get_render_semaphore():
-        page = None
-        try:
-            page = await _get_page()
-            await page.goto('about:blank')
-            await page.set_viewport_size({'width': 520, 'height': max(height, 280)})
-
-            html = _generate_family_html(data)
-            await page.set_content(html, wait_until='networkidle')
-
-            # Wait briefly for avatars to load
-            try:
-                await page.wait_for_timeout(800)
-            except Exception:
-                pass
-
-            # Get actual card height from DOM
-            actual_height = await page.evaluate('''() => {
-                const wrapper = document.querySelector('.card-outer');
-                return wrapper ? wrapper.getBoundingClientRect().height + 20 : 350;
-            }''')
-
-            # Resize viewport to actual content height
-            await page.set_viewport_size({'width': 520, 'height': int(actual_height) + 20})
-
-            screenshot = await page.screenshot(type='png', omit_background=True)
-
-            await _return_page(page)
-            page = None
-
-            _family_cache[cache_key] = (screenshot, now)
-
-            logger.tree("Family Card Generated", [
-                ("User", data.display_name),
-                ("Height", str(int(actual_height))),
-            ], emoji="🎨")
-
-            return screenshot
-
-        except Exception as e:
-            logger.error_tree("Family Card Failed", e, [
-                ("User", data.display_name),
-            ])
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-            raise
+    try:
+        # Clipped to the card, so the image height follows its content
+        screenshot = await card_templates.render(FAMILY_TEMPLATE, _family_payload(data))
+    except Exception as e:
+        logger.error_tree("Family Card Failed", e, [
+            ("User", data.display_name),
+        ])
+        raise
+
+    _family_cache[cache_key] = (screenshot, now)
+
+    members = len(data.parents) + len(data.children) + len(data.siblings) + (1 if data.spouse else 0)
+    logger.tree("Family Card Generated", [
+        ("User", data.display_name),
+        ("Members", str(members)),
+    ], emoji="🎨")
+
+    return screenshot
 
 
 async def resolve_family_member(guild: discord.Guild, user_id: int) -> FamilyMember:
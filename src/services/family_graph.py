@@ -0,0 +1,294 @@
+"""
+SyriaBot - Family Graph Service
+===============================
+
+In-memory family graph (marriages and adoptions) per guild.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.constants import ANCESTOR_MAX_DEPTH
+from src.core.logger import logger
+from src.services.database import db
+
+
+# =============================================================================
+# Graph
+# =============================================================================
+
+@dataclass
+class FamilyGraph:
+    """
+    Adjacency maps for one guild.
+
+    Mirrors family_marriages / family_adoptions exactly: one spouse per
+    user, one parent per child, children in adoption order. Mutators are
+    idempotent so replaying one over a snapshot that already contains it
+    is harmless.
+    """
+    spouse: Dict[int, int] = field(default_factory=dict)
+    married_at: Dict[int, int] = field(default_factory=dict)
+    parent: Dict[int, int] = field(default_factory=dict)
+    adopted_at: Dict[int, int] = field(default_factory=dict)
+    children: Dict[int, List[int]] = field(default_factory=dict)
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def get_children(self, user_id: int) -> List[int]:
+        return list(self.children.get(user_id, ()))
+
+    def get_household_children(self, user_id: int) -> List[int]:
+        """Children of user + spouse, deduplicated, user's first."""
+        children = self.get_children(user_id)
+        spouse_id = self.spouse.get(user_id)
+        if spouse_id:
+            children = list(dict.fromkeys(children + self.get_children(spouse_id)))
+        return children
+
+    def get_siblings(self, user_id: int) -> List[int]:
+        """Other children of the parent's household."""
+        parent_id = self.parent.get(user_id)
+        if not parent_id:
+            return []
+        return [c for c in self.get_household_children(parent_id) if c != user_id]
+
+    def is_ancestor(self, target_id: int, user_id: int, max_depth: int = ANCESTOR_MAX_DEPTH) -> bool:
+        """True if target_id is within max_depth parent links above user_id."""
+        parent = self.parent
+        current = user_id
+        for _ in range(max_depth):
+            current = parent.get(current)
+            if current is None:
+                return False
+            if current == target_id:
+                return True
+        return False
+
+    # =========================================================================
+    # Mutations
+    # =========================================================================
+
+    def marry(self, user1_id: int, user2_id: int, married_at: int) -> None:
+        self.spouse[user1_id] = user2_id
+        self.spouse[user2_id] = user1_id
+        self.married_at[user1_id] = married_at
+        self.married_at[user2_id] = married_at
+
+    def divorce(self, user_id: int) -> None:
+        spouse_id = self.spouse.pop(user_id, None)
+        self.married_at.pop(user_id, None)
+        if spouse_id is not None and self.spouse.get(spouse_id) == user_id:
+            del self.spouse[spouse_id]
+            self.married_at.pop(spouse_id, None)
+
+    def adopt(self, parent_id: int, child_id: int, adopted_at: int) -> None:
+        # INSERT OR IGNORE on (child_id, guild_id): an existing parent wins
+        if child_id in self.parent:
+            return
+        self.parent[child_id] = parent_id
+        self.adopted_at[child_id] = adopted_at
+        self.children.setdefault(parent_id, []).append(child_id)
+
+    def remove_child(self, child_id: int, parent_id: Optional[int] = None) -> Optional[int]:
+        """Unlink a child (from parent_id only, if given). Returns the removed parent."""
+        current = self.parent.get(child_id)
+        if current is None or (parent_id is not None and current != parent_id):
+            return None
+        del self.parent[child_id]
+        self.adopted_at.pop(child_id, None)
+        siblings = self.children.get(current)
+        if siblings is not None:
+            if child_id in siblings:
+                siblings.remove(child_id)
+            if not siblings:
+                del self.children[current]
+        return current
+
+    def remove_member(self, user_id: int) -> None:
+        """Member left: divorce, free their children, leave their parent."""
+        self.divorce(user_id)
+        for child_id in self.children.pop(user_id, []):
+            self.parent.pop(child_id, None)
+            self.adopted_at.pop(child_id, None)
+        self.remove_child(user_id)
+
+
+# =============================================================================
+# Service
+# =============================================================================
+
+class FamilyGraphService:
+    """
+    Family reads from memory, writes through to SQLite.
+
+    DESIGN:
+        setup() loads every guild's marriages and adoptions in one pass
+        (two SELECTs, off the event loop). After that, spouse, parent,
+        household, sibling and ancestry lookups are dict reads: /family
+        and the adopt cycle checks do no I/O. Every mutation runs the
+        existing DB transaction first and touches the graph only if it
+        committed, so the graph can never hold a relationship the DB
+        rejected. Until the load finishes (cold start) reads fall through
+        to the DB, ancestry via a single recursive CTE; mutations made
+        while the load is in flight are replayed onto the fresh graph.
+    """
+
+    def __init__(self) -> None:
+        self._graphs: Dict[int, FamilyGraph] = {}
+        self._loaded = False
+        self._replay: Optional[List[Callable[[], None]]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def setup(self) -> None:
+        """Load all guild graphs from the database."""
+        self._replay = []
+        try:
+            edges = await asyncio.to_thread(db.get_all_family_edges)
+        except Exception:
+            self._replay = None
+            raise
+
+        graphs: Dict[int, FamilyGraph] = {}
+        for row in edges["marriages"]:
+            graph = graphs.setdefault(row["guild_id"], FamilyGraph())
+            graph.spouse[row["user_id"]] = row["spouse_id"]
+            graph.married_at[row["user_id"]] = row["married_at"]
+        for row in edges["adoptions"]:  # Ordered by adopted_at
+            graphs.setdefault(row["guild_id"], FamilyGraph()).adopt(
+                row["parent_id"], row["child_id"], row["adopted_at"],
+            )
+
+        self._graphs = graphs
+        replay, self._replay = self._replay, None
+        for op in replay:
+            op()
+        self._loaded = True
+
+        logger.tree("Family Graph Loaded", [
+            ("Guilds", str(len(graphs))),
+            ("Marriages", str(len(edges["marriages"]) // 2)),
+            ("Adoptions", str(len(edges["adoptions"]))),
+            ("Replayed", str(len(replay))),
+        ], emoji="👪")
+
+    def _graph(self, guild_id: int) -> FamilyGraph:
+        graph = self._graphs.get(guild_id)
+        if graph is None:
+            graph = self._graphs[guild_id] = FamilyGraph()
+        return graph
+
+    def _apply(self, guild_id: int, op: Callable[[FamilyGraph], Any]) -> None:
+        """Apply a committed mutation to the graph (or queue it while loading)."""
+        if self._replay is not None:
+            self._replay.append(lambda: op(self._graph(guild_id)))
+        if self._loaded:
+            op(self._graph(guild_id))
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def get_spouse(self, user_id: int, guild_id: int) -> Optional[int]:
+        if not self._loaded:
+            return db.get_spouse(user_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.spouse.get(user_id) if graph else None
+
+    def get_parent(self, user_id: int, guild_id: int) -> Optional[int]:
+        if not self._loaded:
+            return db.get_parent(user_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.parent.get(user_id) if graph else None
+
+    def get_children(self, user_id: int, guild_id: int) -> List[int]:
+        if not self._loaded:
+            return db.get_children(user_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.get_children(user_id) if graph else []
+
+    def get_household_children(self, user_id: int, guild_id: int) -> List[int]:
+        if not self._loaded:
+            return db.get_household_children(user_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.get_household_children(user_id) if graph else []
+
+    def get_household_children_count(self, user_id: int, guild_id: int) -> int:
+        return len(self.get_household_children(user_id, guild_id))
+
+    def get_siblings(self, user_id: int, guild_id: int) -> List[int]:
+        if not self._loaded:
+            return db.get_siblings(user_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.get_siblings(user_id) if graph else []
+
+    def is_ancestor(self, target_id: int, user_id: int, guild_id: int, max_depth: int = ANCESTOR_MAX_DEPTH) -> bool:
+        if not self._loaded:
+            return db.is_ancestor(target_id, user_id, guild_id, max_depth)
+        graph = self._graphs.get(guild_id)
+        return graph.is_ancestor(target_id, user_id, max_depth) if graph else False
+
+    def get_marriage_timestamp(self, user_id: int, guild_id: int) -> Optional[int]:
+        if not self._loaded:
+            return db.get_marriage_timestamp(user_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.married_at.get(user_id) if graph else None
+
+    def get_adoption_timestamp(self, child_id: int, guild_id: int) -> Optional[int]:
+        if not self._loaded:
+            return db.get_adoption_timestamp(child_id, guild_id)
+        graph = self._graphs.get(guild_id)
+        return graph.adopted_at.get(child_id) if graph else None
+
+    # =========================================================================
+    # Mutations (DB transaction first, graph only after commit)
+    # =========================================================================
+
+    def marry(self, user1_id: int, user2_id: int, guild_id: int) -> None:
+        married_at = db.marry(user1_id, user2_id, guild_id)
+        self._apply(guild_id, lambda g: g.marry(user1_id, user2_id, married_at))
+
+    def divorce(self, user_id: int, guild_id: int) -> Optional[int]:
+        spouse_id = db.divorce(user_id, guild_id)
+        if spouse_id is not None:
+            self._apply(guild_id, lambda g: g.divorce(user_id))
+        return spouse_id
+
+    def adopt(self, parent_id: int, child_id: int, guild_id: int) -> None:
+        adopted_at = db.adopt(parent_id, child_id, guild_id)
+        self._apply(guild_id, lambda g: g.adopt(parent_id, child_id, adopted_at))
+
+    def disown(self, parent_id: int, child_id: int, guild_id: int) -> bool:
+        deleted = db.disown(parent_id, child_id, guild_id)
+        if deleted:
+            self._apply(guild_id, lambda g: g.remove_child(child_id, parent_id))
+        return deleted
+
+    def runaway(self, child_id: int, guild_id: int) -> Optional[int]:
+        parent_id = db.runaway(child_id, guild_id)
+        if parent_id is not None:
+            self._apply(guild_id, lambda g: g.remove_child(child_id))
+        return parent_id
+
+    def cleanup_on_leave(self, user_id: int, guild_id: int) -> dict:
+        result = db.cleanup_family_on_leave(user_id, guild_id)
+        self._apply(guild_id, lambda g: g.remove_member(user_id))
+        return result
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+family_graph = FamilyGraphService()
+
+__all__ = ["FamilyGraph", "FamilyGraphService", "family_graph"]
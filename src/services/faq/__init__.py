@@ -8,7 +8,8 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
+from .matcher import FAQMatcher
 from .service import FAQ_DATA, faq_analytics
 from .views import FAQView, PersistentFAQView, setup_persistent_views
 
-__all__ = ["FAQ_DATA", "faq_analytics", "FAQView", "PersistentFAQView", "setup_persistent_views"]
+__all__ = ["FAQMatcher", "FAQ_DATA", "faq_analytics", "FAQView", "PersistentFAQView", "setup_persistent_views"]
@@ -0,0 +1,208 @@
+"""
+SyriaBot - FAQ Matcher
+======================
+
+Compiled topic matcher for the FAQ auto-responder.
+
+Built once from the topic patterns and fuzzy keywords: every topic is
+tested in a single regex call, and typo correction looks words up in a
+symmetric-delete index instead of measuring edit distance to every
+keyword variant.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import re
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Largest per-variant typo threshold (see KeywordCorrector._threshold)
+MAX_EDIT_DISTANCE = 2
+
+# Words shorter than this are never corrected
+MIN_CORRECT_LENGTH = 4
+
+# Distinct words remembered by the correction cache
+CORRECTION_CACHE_SIZE = 4096
+
+
+# =============================================================================
+# Edit Distance
+# =============================================================================
+
+def bounded_levenshtein(s1: str, s2: str, limit: int) -> int:
+    """
+    Levenshtein distance, or limit + 1 once it is known to exceed limit.
+
+    Only the diagonal band of width 2 * limit + 1 is filled.
+    """
+    if abs(len(s1) - len(s2)) > limit:
+        return limit + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if not s2:
+        return len(s1)
+
+    over = limit + 1
+    prev = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        lo = max(1, i - limit)
+        hi = min(len(s2), i + limit)
+        curr = [over] * (len(s2) + 1)
+        if lo == 1:
+            curr[0] = i
+        row_min = curr[0]
+        for j in range(lo, hi + 1):
+            cost = prev[j - 1] + (c1 != s2[j - 1])
+            cost = min(cost, prev[j] + 1, curr[j - 1] + 1)
+            curr[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return over
+        prev = curr
+    return min(prev[-1], over)
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    """The word plus every string reachable by deleting up to depth characters."""
+    out = {word}
+    for n in range(1, min(depth, len(word)) + 1):
+        for drop in combinations(range(len(word)), n):
+            out.add("".join(c for i, c in enumerate(word) if i not in drop))
+    return out
+
+
+# =============================================================================
+# Keyword Corrector
+# =============================================================================
+
+class KeywordCorrector:
+    """
+    Maps misspelled words onto their canonical keyword.
+
+    DESIGN:
+        Symmetric-delete (SymSpell) index: each variant is stored under
+        every string reachable by deleting up to its threshold of
+        characters. Two strings within edit distance k always share such
+        a delete, so a word only needs its own deletes looked up to find
+        every variant it could be a typo of. The few candidates are then
+        verified with a banded Levenshtein. The rules are the old scan's:
+        1 edit for variants of up to 5 characters, 2 for longer ones, the
+        closest variant wins and ties go to the first in keyword order.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]]) -> None:
+        # Variants in keyword order: (rank, variant, canonical, threshold)
+        self._variants: List[Tuple[int, str, str, int]] = []
+        self._index: Dict[str, List[int]] = {}
+        for correct, variants in keywords.items():
+            for variant in variants:
+                vid = len(self._variants)
+                threshold = self._threshold(variant)
+                self._variants.append((vid, variant, correct, threshold))
+                for key in _deletes(variant, threshold):
+                    self._index.setdefault(key, []).append(vid)
+
+        self._max_len = max((len(v) for _, v, _, _ in self._variants), default=0) + MAX_EDIT_DISTANCE
+        self.correct_word = lru_cache(maxsize=CORRECTION_CACHE_SIZE)(self._correct_word)
+
+    @staticmethod
+    def _threshold(variant: str) -> int:
+        return 1 if len(variant) <= 5 else 2
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _correct_word(self, word: str) -> str:
+        if len(word) < MIN_CORRECT_LENGTH or len(word) > self._max_len:
+            return word
+
+        index = self._index
+        candidates: Set[int] = set()
+        for key in _deletes(word, MAX_EDIT_DISTANCE):
+            ids = index.get(key)
+            if ids:
+                candidates.update(ids)
+        if not candidates:
+            return word
+
+        best_match = word
+        best_distance = MAX_EDIT_DISTANCE + 1
+        for vid in sorted(candidates):
+            _, variant, correct, threshold = self._variants[vid]
+            distance = bounded_levenshtein(word, variant, threshold)
+            if distance <= threshold and distance < best_distance:
+                best_distance = distance
+                best_match = correct
+        return best_match
+
+    def correct(self, text: str) -> str:
+        """Lowercase, split on whitespace and replace every recognised keyword typo."""
+        correct_word = self.correct_word
+        return " ".join(correct_word(word) for word in text.lower().split())
+
+
+# =============================================================================
+# Topic Matcher
+# =============================================================================
+
+class FAQMatcher:
+    """
+    Assigns a message to at most one FAQ topic.
+
+    DESIGN:
+        All topics' patterns are compiled into one regex of optional
+        lookaheads, one named group per topic, so a single search()
+        reports every topic that matches anywhere in the message.
+        Priority stays what it was with the per-pattern loop: the first
+        topic in FAQ_PATTERNS order wins. When nothing matches, the
+        message is typo-corrected and matched once more.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]], keywords: Dict[str, List[str]]) -> None:
+        self.topics: List[str] = list(patterns)
+        self._groups = {f"t{i}": topic for i, topic in enumerate(self.topics)}
+        branches = "".join(
+            f"(?:(?=.*?(?P<t{i}>{'|'.join(f'(?:{p})' for p in patterns[topic])})))?"
+            for i, topic in enumerate(self.topics)
+        )
+        self._regex = re.compile(r"\A" + branches, re.IGNORECASE | re.DOTALL)
+        self.corrector = KeywordCorrector(keywords)
+
+    def topics_in(self, text: str) -> List[str]:
+        """Every topic with a pattern matching text, in priority order."""
+        # Every branch is optional, so match() always succeeds
+        groups = self._regex.match(text).groupdict()
+        return [self._groups[name] for name, value in groups.items() if value is not None]
+
+    def _first(self, text: str) -> Optional[str]:
+        for name, value in self._regex.match(text).groupdict().items():
+            if value is not None:
+                return self._groups[name]
+        return None
+
+    def match(self, content: str) -> Tuple[Optional[str], bool]:
+        """
+        Match content to a topic.
+
+        Returns:
+            (topic, was_fuzzy): topic is None if nothing matched; was_fuzzy
+            is True if the match needed typo correction
+        """
+        topic = self._first(content)
+        if topic:
+            return topic, False
+
+        corrected = self.corrector.correct(content)
+        if corrected != content.lower():
+            topic = self._first(corrected)
+            if topic:
+                return topic, True
+        return None, False
+
+
+__all__ = ["FAQMatcher", "KeywordCorrector", "bounded_levenshtein"]
@@ -3,22 +3,17 @@ SyriaBot - Card Generator
 =========================
 
 HTML/CSS based cards rendered with Playwright for ship, howsimp, howgay commands.
-Shares browser instance and semaphore with rank card for efficiency.
+Shares the browser with the rank card; each card type is a hot template
+page that only receives a JSON payload per render (see card_templates).
 
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from src.core.logger import logger
-
-# Import shared browser infrastructure from rank card
-from src.services.xp.card import (
-    _get_page,
-    _return_page,
-    get_render_semaphore,
-)
+from src.services.card_templates import CardTemplate, card_templates
 
 # No caching for fun cards - results are random each time
 
@@ -40,6 +35,9 @@ HEART_EMOJI_HIGH = 70    # 💖 for >= 70%
 HEART_EMOJI_MED = 40     # 💕 for >= 40%
 METER_EMOJI_THRESHOLD = 50  # Different emoji above/below 50%
 
+# Background when the user has no banner
+DEFAULT_CARD_BG = "linear-gradient(135deg, #1a1a2e 0%, #16213e 100%)"
+
 # Shared CSS base for all cards
 _BASE_CSS = '''
     * {
@@ -66,24 +64,24 @@ _GOOGLE_FONTS_LINK = '''<style>
 </style>'''
 
 
-def _generate_ship_html(
-    user1_name: str,
-    user1_avatar: str,
-    user2_name: str,
-    user2_avatar: str,
-    ship_name: str,
-    percentage: int,
-    message: str,
-    banner_url: Optional[str],
-) -> str:
-    """Generate HTML for ship card."""
-    bg_style = f'url({banner_url})' if banner_url else 'linear-gradient(135deg, #1a1a2e 0%, #16213e 100%)'
+def _css_url(url: Optional[str]) -> str:
+    """Card background: the banner image, or the default gradient."""
+    if not url:
+        return DEFAULT_CARD_BG
+    return 'url("' + url.replace('"', "%22") + '")'
+
 
-    # Heart fill based on percentage
-    heart_color = "#ff6b6b" if percentage >= 50 else "#ff9999"
-    glow_intensity = min(percentage / 100, 1)
+# =============================================================================
+# Ship Card
+# =============================================================================
 
-    html = f'''
+SHIP_TEMPLATE = CardTemplate(
+    name="ship",
+    viewport=(SHIP_CARD_WIDTH + VIEWPORT_PADDING, SHIP_CARD_HEIGHT + VIEWPORT_PADDING),
+    selector=".card-wrapper",
+    clip_padding=VIEWPORT_PADDING // 2,
+    decode_timeout=AVATAR_LOAD_TIMEOUT_SHIP,
+    html=f'''
 <!DOCTYPE html>
 <html>
 <head>
@@ -91,18 +89,25 @@ def _generate_ship_html(
     <style>
         {_BASE_CSS}
 
+        :root {{
+            --bg: {DEFAULT_CARD_BG};
+            --glow: 0;
+            --heart-color: #ff9999;
+            --fill: 0%;
+        }}
+
         .card-wrapper {{
             padding: 3px;
             background: linear-gradient(135deg, #ff6b6b, #ff8e8e, #ffb3b3, #ff6b9d);
             border-radius: 24px;
             position: relative;
-            box-shadow: 0 8px 32px rgba(0,0,0,0.4), 0 0 60px rgba(255, 107, 107, {glow_intensity * 0.3});
+            box-shadow: 0 8px 32px rgba(0,0,0,0.4), 0 0 60px rgba(255, 107, 107, calc(var(--glow) * 0.3));
         }}
 
         .card {{
             width: {SHIP_CARD_WIDTH}px;
             height: {SHIP_CARD_HEIGHT}px;
-            background: {bg_style};
+            background: var(--bg);
             background-size: cover;
             background-position: center;
             border-radius: 21px;
@@ -183,13 +188,13 @@ def _generate_ship_html(
 
         .heart {{
             font-size: 44px;
-            filter: drop-shadow(0 0 12px rgba(255, 107, 107, {glow_intensity}));
+            filter: drop-shadow(0 0 12px rgba(255, 107, 107, var(--glow)));
         }}
 
         .percentage {{
             font-size: 36px;
             font-weight: 900;
-            color: {heart_color};
+            color: var(--heart-color);
             text-shadow: 0 2px 8px rgba(255, 107, 107, 0.5);
         }}
 
@@ -210,7 +215,7 @@ def _generate_ship_html(
 
         .meter-fill {{
             height: 100%;
-            width: {percentage}%;
+            width: var(--fill);
             background: linear-gradient(90deg, #ff6b6b, #ff8e8e, #ffb3b3);
             border-radius: 9px;
             position: relative;
@@ -244,18 +249,18 @@ def _generate_ship_html(
 
                 <div class="avatars-section">
                     <div class="user-column">
-                        <img class="avatar" src="{user1_avatar}" alt="avatar1">
-                        <div class="name-label">{user1_name[:16]}</div>
+                        <img class="avatar" data-src="avatar1" alt="avatar1">
+                        <div class="name-label" data-text="name1"></div>
                     </div>
 
                     <div class="heart-section">
-                        <div class="heart">{"💖" if percentage >= HEART_EMOJI_HIGH else "💕" if percentage >= HEART_EMOJI_MED else "💔"}</div>
-                        <div class="percentage">{percentage}%</div>
+                        <div class="heart" data-text="heart"></div>
+                        <div class="percentage" data-text="percentage"></div>
                     </div>
 
                     <div class="user-column">
-                        <img class="avatar" src="{user2_avatar}" alt="avatar2">
-                        <div class="name-label">{user2_name[:16]}</div>
+                        <img class="avatar" data-src="avatar2" alt="avatar2">
+                        <div class="name-label" data-text="name2"></div>
                     </div>
                 </div>
 
@@ -265,53 +270,95 @@ def _generate_ship_html(
                     </div>
                 </div>
 
-                <div class="message">{message}</div>
+                <div class="message" data-text="message"></div>
             </div>
         </div>
     </div>
 </body>
 </html>
-'''
-    return html
+''',
+)
 
 
-def _generate_meter_html(
-    user_name: str,
-    user_avatar: str,
+def _ship_payload(
+    user1_name: str,
+    user1_avatar: str,
+    user2_name: str,
+    user2_avatar: str,
     percentage: int,
     message: str,
-    meter_type: str,  # "howsimp" or "gay"
     banner_url: Optional[str],
-) -> str:
-    """Generate HTML for howsimp/gay meter card."""
-    bg_style = f'url({banner_url})' if banner_url else 'linear-gradient(135deg, #1a1a2e 0%, #16213e 100%)'
+) -> Dict[str, Any]:
+    """Template payload for the ship card."""
+    heart = "💖" if percentage >= HEART_EMOJI_HIGH else "💕" if percentage >= HEART_EMOJI_MED else "💔"
+    return {
+        "vars": {
+            "bg": _css_url(banner_url),
+            "glow": f"{min(percentage / 100, 1):.3f}",
+            "heart-color": "#ff6b6b" if percentage >= 50 else "#ff9999",
+            "fill": f"{percentage}%",
+        },
+        "text": {
+            "name1": user1_name[:16],
+            "name2": user2_name[:16],
+            "heart": heart,
+            "percentage": f"{percentage}%",
+            "message": message,
+        },
+        "src": {"avatar1": user1_avatar, "avatar2": user2_avatar},
+    }
+
 
+# =============================================================================
+# Meter Card
+# =============================================================================
+
+# meter_type -> (frame gradient, bar gradient, title, glow rgb)
+_METER_STYLES = {
+    "howsimp": (
+        "linear-gradient(135deg, #ff6b9d, #c850c0, #ff6b9d)",
+        "linear-gradient(90deg, #ff6b9d, #c850c0, #ff8ec4)",
+        "SIMP METER",
+        "199, 80, 192",
+    ),
+    "gay": (
+        "linear-gradient(135deg, #ff6b6b, #feca57, #48dbfb, #ff9ff3, #a55eea)",
+        "linear-gradient(90deg, #ff6b6b, #ff9f43, #feca57, #2ed573, #48dbfb, #a55eea, #ff6b9d)",
+        "GAY METER",
+        "168, 94, 234",
+    ),
+    "smart": (
+        "linear-gradient(135deg, #4facfe, #00f2fe, #4facfe)",
+        "linear-gradient(90deg, #4facfe, #00f2fe, #43e97b)",
+        "SMART METER",
+        "79, 172, 254",
+    ),
+    "howfat": (
+        "linear-gradient(135deg, #f093fb, #f5576c, #f093fb)",
+        "linear-gradient(90deg, #43e97b, #f9d423, #f5576c)",
+        "BODY FAT",
+        "245, 87, 108",
+    ),
+}
+
+
+def _meter_emoji(meter_type: str, percentage: int) -> str:
     if meter_type == "howsimp":
-        gradient = "linear-gradient(135deg, #ff6b9d, #c850c0, #ff6b9d)"
-        bar_gradient = "linear-gradient(90deg, #ff6b9d, #c850c0, #ff8ec4)"
-        title = "SIMP METER"
-        emoji = "🥺" if percentage >= METER_EMOJI_THRESHOLD else "😐"
-        glow_color = "199, 80, 192"
-    elif meter_type == "gay":
-        gradient = "linear-gradient(135deg, #ff6b6b, #feca57, #48dbfb, #ff9ff3, #a55eea)"
-        bar_gradient = "linear-gradient(90deg, #ff6b6b, #ff9f43, #feca57, #2ed573, #48dbfb, #a55eea, #ff6b9d)"
-        title = "GAY METER"
-        emoji = "🏳️‍🌈" if percentage >= METER_EMOJI_THRESHOLD else "🌈"
-        glow_color = "168, 94, 234"
-    elif meter_type == "smart":
-        gradient = "linear-gradient(135deg, #4facfe, #00f2fe, #4facfe)"
-        bar_gradient = "linear-gradient(90deg, #4facfe, #00f2fe, #43e97b)"
-        title = "SMART METER"
-        emoji = "🎓" if percentage >= METER_EMOJI_THRESHOLD else "🧠"
-        glow_color = "79, 172, 254"
-    else:  # howfat
-        gradient = "linear-gradient(135deg, #f093fb, #f5576c, #f093fb)"
-        bar_gradient = "linear-gradient(90deg, #43e97b, #f9d423, #f5576c)"
-        title = "BODY FAT"
-        emoji = "🍔" if percentage >= 25 else "💪"
-        glow_color = "245, 87, 108"
-
-    html = f'''
+        return "🥺" if percentage >= METER_EMOJI_THRESHOLD else "😐"
+    if meter_type == "gay":
+        return "🏳️‍🌈" if percentage >= METER_EMOJI_THRESHOLD else "🌈"
+    if meter_type == "smart":
+        return "🎓" if percentage >= METER_EMOJI_THRESHOLD else "🧠"
+    return "🍔" if percentage >= 25 else "💪"
+
+
+METER_TEMPLATE = CardTemplate(
+    name="meter",
+    viewport=(METER_CARD_WIDTH + VIEWPORT_PADDING, METER_CARD_HEIGHT + VIEWPORT_PADDING),
+    selector=".card-wrapper",
+    clip_padding=VIEWPORT_PADDING // 2,
+    decode_timeout=AVATAR_LOAD_TIMEOUT_METER,
+    html=f'''
 <!DOCTYPE html>
 <html>
 <head>
@@ -319,18 +366,26 @@ def _generate_meter_html(
     <style>
         {_BASE_CSS}
 
+        :root {{
+            --bg: {DEFAULT_CARD_BG};
+            --frame: {_METER_STYLES["howfat"][0]};
+            --bar: {_METER_STYLES["howfat"][1]};
+            --glow: {_METER_STYLES["howfat"][3]};
+            --fill: 0%;
+        }}
+
         .card-wrapper {{
             padding: 3px;
-            background: {gradient};
+            background: var(--frame);
             border-radius: 24px;
             position: relative;
-            box-shadow: 0 8px 32px rgba(0,0,0,0.4), 0 0 60px rgba({glow_color}, 0.25);
+            box-shadow: 0 8px 32px rgba(0,0,0,0.4), 0 0 60px rgba(var(--glow), 0.25);
         }}
 
         .card {{
             width: {METER_CARD_WIDTH}px;
             height: {METER_CARD_HEIGHT}px;
-            background: {bg_style};
+            background: var(--bg);
             background-size: cover;
             background-position: center;
             border-radius: 21px;
@@ -361,7 +416,7 @@ def _generate_meter_html(
             font-size: 20px;
             font-weight: 700;
             letter-spacing: 4px;
-            background: {bar_gradient};
+            background: var(--bar);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
@@ -379,8 +434,8 @@ def _generate_meter_html(
             height: 100px;
             border-radius: 50%;
             object-fit: cover;
-            border: 4px solid rgba({glow_color}, 0.6);
-            box-shadow: 0 0 20px rgba({glow_color}, 0.3);
+            border: 4px solid rgba(var(--glow), 0.6);
+            box-shadow: 0 0 20px rgba(var(--glow), 0.3);
         }}
 
         .user-name {{
@@ -404,7 +459,7 @@ def _generate_meter_html(
         .percentage {{
             font-size: 48px;
             font-weight: 900;
-            background: {bar_gradient};
+            background: var(--bar);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
@@ -427,12 +482,12 @@ def _generate_meter_html(
 
         .meter-fill {{
             height: 100%;
-            width: {percentage}%;
-            background: {bar_gradient};
+            width: var(--fill);
+            background: var(--bar);
             background-size: 200% 100%;
             border-radius: 12px;
             position: relative;
-            box-shadow: 0 0 20px rgba({glow_color}, 0.5);
+            box-shadow: 0 0 20px rgba(var(--glow), 0.5);
         }}
 
         .meter-fill::after {{
@@ -458,16 +513,16 @@ def _generate_meter_html(
     <div class="card-wrapper">
         <div class="card">
             <div class="card-content">
-                <div class="title">{title}</div>
+                <div class="title" data-text="title"></div>
 
                 <div class="avatar-section">
-                    <img class="avatar" src="{user_avatar}" alt="avatar">
-                    <div class="user-name">{user_name[:16]}</div>
+                    <img class="avatar" data-src="avatar" alt="avatar">
+                    <div class="user-name" data-text="name"></div>
                 </div>
 
                 <div class="result-section">
-                    <div class="emoji">{emoji}</div>
-                    <div class="percentage">{percentage}%</div>
+                    <div class="emoji" data-text="emoji"></div>
+                    <div class="percentage" data-text="percentage"></div>
                 </div>
 
                 <div class="meter-section">
@@ -476,15 +531,48 @@ def _generate_meter_html(
                     </div>
                 </div>
 
-                <div class="message">{message}</div>
+                <div class="message" data-text="message"></div>
             </div>
         </div>
     </div>
 </body>
 </html>
-'''
-    return html
+''',
+)
+
+
+def _meter_payload(
+    user_name: str,
+    user_avatar: str,
+    percentage: int,
+    message: str,
+    meter_type: str,  # "howsimp", "gay", "smart" or "howfat"
+    banner_url: Optional[str],
+) -> Dict[str, Any]:
+    """Template payload for the howsimp/gay/smart/howfat meter card."""
+    frame, bar, title, glow = _METER_STYLES.get(meter_type, _METER_STYLES["howfat"])
+    return {
+        "vars": {
+            "bg": _css_url(banner_url),
+            "frame": frame,
+            "bar": bar,
+            "glow": glow,
+            "fill": f"{percentage}%",
+        },
+        "text": {
+            "title": title,
+            "name": user_name[:16],
+            "emoji": _meter_emoji(meter_type, percentage),
+            "percentage": f"{percentage}%",
+            "message": message,
+        },
+        "src": {"avatar": user_avatar},
+    }
+
 
+# =============================================================================
+# Rendering
+# =============================================================================
 
 async def generate_ship_card(
     user1_id: int,
@@ -499,61 +587,29 @@ async def generate_ship_card(
     banner_url: Optional[str] = None,
 ) -> bytes:
     """Generate ship card image (no caching - results are random)."""
-    # Use shared semaphore from rank card module
-    async with get_render_semaphore():
-        page = None
-        try:
-            page = await _get_page()
-            await page.goto('about:blank')
-
-            html = _generate_ship_html(
-                user1_name=user1_name,
-                user1_avatar=user1_avatar,
-                user2_name=user2_name,
-                user2_avatar=user2_avatar,
-                ship_name=ship_name,
-                percentage=percentage,
-                message=message,
-                banner_url=banner_url,
-            )
-
-            await page.set_viewport_size({'width': SHIP_CARD_WIDTH + VIEWPORT_PADDING, 'height': SHIP_CARD_HEIGHT + VIEWPORT_PADDING})
-            await page.set_content(html, wait_until='networkidle')
-
-            # Wait for avatars
-            try:
-                await page.wait_for_function(
-                    '''() => {
-                        const imgs = document.querySelectorAll('img.avatar');
-                        return Array.from(imgs).every(img => img.complete && img.naturalWidth > 0);
-                    }''',
-                    timeout=AVATAR_LOAD_TIMEOUT_SHIP
-                )
-            except Exception:
-                pass
-
-            screenshot = await page.screenshot(type='png', omit_background=True)
-            await _return_page(page)
-            page = None
-
-            logger.tree("Ship Card Generated", [
-                ("Users", f"{user1_name} + {user2_name}"),
-                ("Result", f"{percentage}%"),
-            ], emoji="💕")
-
-            return screenshot
-
-        except Exception as e:
-            logger.error_tree("Ship Card Failed", e, [
-                ("Users", f"{user1_name} + {user2_name}"),
-                ("Result", f"{percentage}%"),
-            ])
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-            raise
+    try:
+        screenshot = await card_templates.render(SHIP_TEMPLATE, _ship_payload(
+            user1_name=user1_name,
+            user1_avatar=user1_avatar,
+            user2_name=user2_name,
+            user2_avatar=user2_avatar,
+            percentage=percentage,
+            message=message,
+            banner_url=banner_url,
+        ))
+    except Exception as e:
+        logger.error_tree("Ship Card Failed", e, [
+            ("Users", f"{user1_name} + {user2_name}"),
+            ("Result", f"{percentage}%"),
+        ])
+        raise
+
+    logger.tree("Ship Card Generated", [
+        ("Users", f"{user1_name} + {user2_name}"),
+        ("Result", f"{percentage}%"),
+    ], emoji="💕")
+
+    return screenshot
 
 
 async def generate_meter_card(
@@ -567,60 +623,29 @@ async def generate_meter_card(
     banner_url: Optional[str] = None,
 ) -> bytes:
     """Generate howsimp/gay meter card image (no caching - results are random)."""
-    # Use shared semaphore from rank card module
-    async with get_render_semaphore():
-        page = None
-        try:
-            page = await _get_page()
-            await page.goto('about:blank')
-
-            html = _generate_meter_html(
-                user_name=user_name,
-                user_avatar=user_avatar,
-                percentage=percentage,
-                message=message,
-                meter_type=meter_type,
-                banner_url=banner_url,
-            )
-
-            await page.set_viewport_size({'width': METER_CARD_WIDTH + VIEWPORT_PADDING, 'height': METER_CARD_HEIGHT + VIEWPORT_PADDING})
-            await page.set_content(html, wait_until='networkidle')
-
-            # Wait for avatar
-            try:
-                await page.wait_for_function(
-                    '''() => {
-                        const img = document.querySelector('img.avatar');
-                        return img && img.complete && img.naturalWidth > 0;
-                    }''',
-                    timeout=AVATAR_LOAD_TIMEOUT_METER
-                )
-            except Exception:
-                pass
-
-            screenshot = await page.screenshot(type='png', omit_background=True)
-            await _return_page(page)
-            page = None
-
-            logger.tree(f"{meter_type.title()} Card Generated", [
-                ("User", user_name),
-                ("Result", f"{percentage}%"),
-            ], emoji="🎨")
-
-            return screenshot
-
-        except Exception as e:
-            logger.error_tree(f"{meter_type.title()} Card Failed", e, [
-                ("User", user_name),
-                ("Type", meter_type),
-                ("Result", f"{percentage}%"),
-            ])
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-            raise
+    try:
+        screenshot = await card_templates.render(METER_TEMPLATE, _meter_payload(
+            user_name=user_name,
+            user_avatar=user_avatar,
+            percentage=percentage,
+            message=message,
+            meter_type=meter_type,
+            banner_url=banner_url,
+        ))
+    except Exception as e:
+        logger.error_tree(f"{meter_type.title()} Card Failed", e, [
+            ("User", user_name),
+            ("Type", meter_type),
+            ("Result", f"{percentage}%"),
+        ])
+        raise
+
+    logger.tree(f"{meter_type.title()} Card Generated", [
+        ("User", user_name),
+        ("Result", f"{percentage}%"),
+    ], emoji="🎨")
+
+    return screenshot
 
 
 async def cleanup() -> None:
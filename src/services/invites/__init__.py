@@ -0,0 +1,13 @@
+"""
+SyriaBot - Invites Package
+==========================
+
+Burst-aware invite attribution for member joins.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+from .service import InviteAttributionService
+
+__all__ = ["InviteAttributionService"]
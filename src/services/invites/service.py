@@ -0,0 +1,301 @@
+"""
+SyriaBot - Invite Attribution Service
+=====================================
+
+Debounced invite attribution for member joins. Joins are queued for a short
+burst window, one invite snapshot serves the whole burst, and the usage
+deltas are handed out to the queued joins in arrival order.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+from src.core.constants import (
+    INVITE_BURST_MAX,
+    INVITE_BURST_WINDOW,
+    INVITE_FETCH_TIMEOUT,
+    TIMEZONE_EST,
+)
+from src.core.logger import logger
+from src.services.database import db
+
+
+@dataclass
+class _PendingJoin:
+    """A member join waiting for the next invite snapshot."""
+
+    member: discord.Member
+    future: asyncio.Future
+
+
+class InviteAttributionService:
+    """
+    Attributes member joins to invites in bursts.
+
+    DESIGN:
+        The first join of a burst starts a short timer. Every join that
+        arrives before it fires shares the same guild.invites() fetch,
+        so a raid of N joins costs one REST call instead of N.
+        Usage deltas against the cached snapshot are expanded into slots
+        and handed out to the queued joins in arrival order. When only one
+        invite moved the attribution is exact; when several moved it is
+        best-effort and counted as ambiguous.
+        Attribution, the daily new member counter and the join events are
+        written in one DB transaction per burst.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """
+        Initialize the attribution service.
+
+        Args:
+            bot: Main bot instance for Discord API access.
+        """
+        self.bot = bot
+        # Cache invites for tracking: {guild_id: {invite_code: uses}}
+        self._invite_cache: Dict[int, Dict[str, int]] = {}
+        self._invite_lock = asyncio.Lock()
+        self._pending: List[_PendingJoin] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._burst_full = asyncio.Event()
+        self.cached: bool = False
+
+        # Metrics
+        self._bursts: int = 0
+        self._joins: int = 0
+        self._max_burst: int = 0
+        self._exact: int = 0
+        self._ambiguous: int = 0
+        self._unattributed: int = 0
+        self._fetch_failures: int = 0
+
+    # =========================================================================
+    # Cache
+    # =========================================================================
+
+    async def cache_invites(self, guild: discord.Guild) -> None:
+        """Load the baseline invite snapshot for a guild."""
+        try:
+            invites = await asyncio.wait_for(guild.invites(), timeout=30.0)
+            async with self._invite_lock:
+                self._invite_cache[guild.id] = {inv.code: inv.uses or 0 for inv in invites}
+            self.cached = True
+            logger.tree("Invite Cache Loaded", [
+                ("Guild", guild.name),
+                ("Invites Cached", str(len(invites))),
+            ], emoji="🔗")
+        except asyncio.TimeoutError:
+            logger.tree("Invite Cache Timeout", [
+                ("Guild", guild.name),
+                ("Timeout", "30s"),
+                ("Impact", "Join tracking unavailable until next cache"),
+            ], emoji="⏳")
+        except discord.HTTPException as e:
+            logger.error_tree("Invite Cache Failed", e, [
+                ("Guild", guild.name),
+            ])
+
+    def on_invite_create(self, invite: discord.Invite) -> None:
+        """Track a newly created invite."""
+        if invite.guild is None:
+            return
+        self._invite_cache.setdefault(invite.guild.id, {})[invite.code] = invite.uses or 0
+
+    def on_invite_delete(self, invite: discord.Invite) -> None:
+        """Forget a deleted invite."""
+        if invite.guild is None:
+            return
+        self._invite_cache.get(invite.guild.id, {}).pop(invite.code, None)
+
+    # =========================================================================
+    # Attribution
+    # =========================================================================
+
+    def queue(self, member: discord.Member) -> "asyncio.Future[Optional[discord.Invite]]":
+        """
+        Queue a join for the current burst without waiting for it.
+
+        The join takes its place in arrival order immediately, so the caller
+        can run the rest of onboarding and await the result afterwards.
+
+        Args:
+            member: The member that just joined.
+
+        Returns:
+            A future for the invite the member most likely used (None if
+            unknown). Cancelling it does not drop the join from the burst.
+        """
+        loop = asyncio.get_running_loop()
+        pending = _PendingJoin(member=member, future=loop.create_future())
+        self._pending.append(pending)
+
+        if len(self._pending) >= INVITE_BURST_MAX:
+            # Burst is large enough - flush now instead of waiting the window
+            self._burst_full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._run_bursts())
+
+        return asyncio.shield(pending.future)
+
+    async def _run_bursts(self) -> None:
+        """Drain the join queue one burst window at a time."""
+        while self._pending:
+            self._burst_full.clear()
+            if len(self._pending) < INVITE_BURST_MAX:
+                try:
+                    await asyncio.wait_for(self._burst_full.wait(), timeout=INVITE_BURST_WINDOW)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch, self._pending = self._pending, []
+
+            # Invite snapshots are per guild - attribute each guild's joins separately
+            by_guild: Dict[int, List[_PendingJoin]] = {}
+            for pending in batch:
+                by_guild.setdefault(pending.member.guild.id, []).append(pending)
+
+            for joins in by_guild.values():
+                await self._process_burst(joins)
+
+    async def _process_burst(self, batch: List[_PendingJoin]) -> None:
+        """Attribute, resolve and persist one guild's joins."""
+        try:
+            results = await self._attribute_batch(batch)
+        except Exception as e:
+            logger.error_tree("Invite Attribution Failed", e, [
+                ("Burst", str(len(batch))),
+            ])
+            results = [None] * len(batch)
+
+        for pending, invite in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(invite)
+
+        await self._persist_batch(batch, results)
+
+    async def _attribute_batch(
+        self,
+        batch: List[_PendingJoin],
+    ) -> List[Optional[discord.Invite]]:
+        """Fetch one invite snapshot and assign usage deltas to a single guild's burst."""
+        guild = batch[0].member.guild
+        cache = self._invite_cache.get(guild.id, {})
+        async with self._invite_lock:
+            try:
+                new_invites = await asyncio.wait_for(guild.invites(), timeout=INVITE_FETCH_TIMEOUT)
+            except asyncio.TimeoutError as e:
+                self._fetch_failures += 1
+                logger.error_tree("Invite Fetch Timeout", e, [
+                    ("Guild", guild.name),
+                    ("Timeout", f"{INVITE_FETCH_TIMEOUT:.0f}s"),
+                    ("Burst", str(len(batch))),
+                ])
+                return [None] * len(batch)
+            except discord.HTTPException as e:
+                self._fetch_failures += 1
+                logger.error_tree("Invite Fetch Failed", e, [
+                    ("Guild", guild.name),
+                    ("Burst", str(len(batch))),
+                ])
+                return [None] * len(batch)
+
+            # Expand usage deltas into one slot per counted use
+            slots: List[discord.Invite] = []
+            moved: Dict[str, int] = {}
+            for invite in new_invites:
+                delta = (invite.uses or 0) - cache.get(invite.code, 0)
+                if delta > 0:
+                    moved[invite.code] = delta
+                    slots.extend([invite] * delta)
+
+            self._invite_cache[guild.id] = {inv.code: inv.uses or 0 for inv in new_invites}
+
+        results: List[Optional[discord.Invite]] = [
+            slots[i] if i < len(slots) else None for i in range(len(batch))
+        ]
+
+        # Accuracy: a single moving invite is unambiguous for every join it covers
+        attributed = min(len(slots), len(batch))
+        if len(moved) <= 1:
+            self._exact += attributed
+        else:
+            self._ambiguous += attributed
+        self._unattributed += len(batch) - attributed
+
+        self._bursts += 1
+        self._joins += len(batch)
+        self._max_burst = max(self._max_burst, len(batch))
+
+        if len(batch) > 1 or len(moved) > 1:
+            logger.tree("Invite Burst Attributed", [
+                ("Guild", guild.name),
+                ("Joins", str(len(batch))),
+                ("Invites Used", ", ".join(f"{code}×{n}" for code, n in moved.items()) or "None"),
+                ("Attributed", f"{attributed}/{len(batch)}"),
+                ("Mode", "Exact" if len(moved) <= 1 else "Ambiguous"),
+            ], emoji="🔗")
+
+        return results
+
+    async def _persist_batch(
+        self,
+        batch: List[_PendingJoin],
+        results: List[Optional[discord.Invite]],
+    ) -> None:
+        """Write one guild's attribution, daily counter and join events in one transaction."""
+        guild_id = batch[0].member.guild.id
+        today = datetime.now(TIMEZONE_EST).strftime("%Y-%m-%d")
+        joins = [
+            (p.member.id, invite.inviter.id if invite and invite.inviter else None)
+            for p, invite in zip(batch, results)
+        ]
+        try:
+            await asyncio.to_thread(db.record_join_batch, guild_id, today, joins)
+        except Exception as e:
+            logger.error_tree("Join Batch Persist Failed", e, [
+                ("Joins", str(len(joins))),
+            ])
+            return
+
+        # Bursts are already summarized - only log single joins individually
+        if len(batch) > 1:
+            return
+        for pending, invite in zip(batch, results):
+            if invite and invite.inviter:
+                logger.tree("Invite Tracked", [
+                    ("New Member", f"{pending.member.name} ({pending.member.id})"),
+                    ("Invited By", f"{invite.inviter.name} ({invite.inviter.id})"),
+                    ("Invite Code", invite.code),
+                ], emoji="🔗")
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def get_stats(self) -> dict:
+        """Get burst size and attribution accuracy counters."""
+        attributed = self._exact + self._ambiguous
+        return {
+            "bursts": self._bursts,
+            "joins": self._joins,
+            "max_burst": self._max_burst,
+            "avg_burst": round(self._joins / self._bursts, 2) if self._bursts else 0.0,
+            "fetches_saved": self._joins - self._bursts,
+            "exact": self._exact,
+            "ambiguous": self._ambiguous,
+            "unattributed": self._unattributed,
+            "fetch_failures": self._fetch_failures,
+            "accuracy": round(self._exact / self._joins, 3) if self._joins else 0.0,
+            "coverage": round(attributed / self._joins, 3) if self._joins else 0.0,
+        }
+
+
+__all__ = ["InviteAttributionService"]
@@ -0,0 +1,190 @@
+"""
+SyriaBot - Quote Layer Cache
+============================
+
+Precomputed layers for the quote renderer.
+
+The vignette, fade mask, dark overlay, ghost/tint wash and film grain
+depend only on the image size, so they are built once per size instead of
+on every quote. Processed avatar sections are kept per avatar URL (which
+carries Discord's avatar hash), so a returning author skips both the
+avatar download and the resize/ghost/tint/fade work.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from src.core.constants import (
+    QUOTE_AVATAR_CACHE_SIZE,
+    QUOTE_BG_COLOR,
+    QUOTE_GRAIN_VARIANTS,
+    QUOTE_THEME_COLOR,
+)
+
+
+# =============================================================================
+# Static Layers
+# =============================================================================
+
+@dataclass(frozen=True)
+class StaticLayers:
+    """Size-dependent layers, shared read-only between renders."""
+    size: Tuple[int, int]
+    section_width: int
+    shade: Image.Image          # Dark overlay composited with the vignette (banner backgrounds)
+    plain: Image.Image          # Solid background with the vignette already applied
+    wash: Image.Image           # Ghost + theme tint for the avatar section
+    fade_mask: Image.Image      # Horizontal alpha fade for the avatar section
+    grain: Tuple[Image.Image, ...]
+
+
+def _build_vignette(width: int, height: int) -> Image.Image:
+    """Darker edges: radial alpha ramp, softened."""
+    x = np.linspace(-1, 1, width)
+    y = np.linspace(-1, 1, height)
+    xx, yy = np.meshgrid(x, y)
+    dist = np.sqrt(xx**2 * 0.6 + yy**2)
+    alpha = np.clip(dist ** 1.8 * 180, 0, 255).astype(np.uint8)
+    zeros = np.zeros((height, width), dtype=np.uint8)
+    vignette = Image.fromarray(np.dstack([zeros, zeros, zeros, alpha]), "RGBA")
+    return vignette.filter(ImageFilter.GaussianBlur(30))
+
+
+def _build_fade_mask(section_width: int, height: int) -> Image.Image:
+    """Ultra-smooth left-to-right fade for the avatar section."""
+    x = np.linspace(0, 1, section_width)
+    alpha_row = (255 * (1 - x ** 0.35)).astype(np.uint8)  # Even more gradual
+    fade_mask = Image.fromarray(np.tile(alpha_row, (height, 1)), "L")
+    return fade_mask.filter(ImageFilter.GaussianBlur(50))  # More blur
+
+
+def _build_grain(width: int, height: int, rng: np.random.Generator) -> Image.Image:
+    """Subtle film grain - sparse, only 30% coverage."""
+    noise = rng.integers(108, 148, (height, width), dtype=np.uint8)
+    alpha = rng.integers(0, 12, (height, width), dtype=np.uint8)
+    mask = rng.random((height, width)) < 0.3
+    alpha = (alpha * mask).astype(np.uint8)
+    return Image.fromarray(np.dstack([noise, noise, noise, alpha]), "RGBA")
+
+
+def _build_static(width: int, height: int, section_width: int) -> StaticLayers:
+    vignette = _build_vignette(width, height)
+    dark_overlay = Image.new("RGBA", (width, height), (0, 0, 0, 140))
+    plain = Image.new("RGBA", (width, height), (*QUOTE_BG_COLOR, 255))
+
+    # "Over" is associative, so stacking the constant layers once up front
+    # gives the same result as compositing them one by one per quote
+    ghost = Image.new("RGBA", (section_width, height), (255, 255, 255, 40))
+    tint = Image.new("RGBA", (section_width, height), (*QUOTE_THEME_COLOR, 60))
+
+    rng = np.random.default_rng()
+    return StaticLayers(
+        size=(width, height),
+        section_width=section_width,
+        shade=Image.alpha_composite(dark_overlay, vignette),
+        plain=Image.alpha_composite(plain, vignette),
+        wash=Image.alpha_composite(ghost, tint),
+        fade_mask=_build_fade_mask(section_width, height),
+        grain=tuple(_build_grain(width, height, rng) for _ in range(QUOTE_GRAIN_VARIANTS)),
+    )
+
+
+# =============================================================================
+# Layer Cache
+# =============================================================================
+
+class QuoteLayerCache:
+    """
+    Static layers keyed by size plus an LRU of processed avatar sections.
+
+    DESIGN:
+        Renders run on executor threads, so both maps are guarded by a
+        lock. Building happens outside it: a race only builds the same
+        layers twice. Cached images are never mutated: callers composite
+        onto copies or paste them onto their own canvas.
+    """
+
+    def __init__(self, avatar_cache_size: int = QUOTE_AVATAR_CACHE_SIZE) -> None:
+        self._static: Dict[Tuple[int, int, int], StaticLayers] = {}
+        self._avatars: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._avatar_cache_size = avatar_cache_size
+        self._lock = threading.Lock()
+
+    def static(self, width: int, height: int, section_width: int) -> StaticLayers:
+        """Static layers for a canvas size, built on first use."""
+        key = (width, height, section_width)
+        with self._lock:
+            layers = self._static.get(key)
+        if layers is None:
+            layers = _build_static(width, height, section_width)
+            with self._lock:
+                layers = self._static.setdefault(key, layers)
+        return layers
+
+    def get_avatar(self, key: str) -> Optional[Image.Image]:
+        with self._lock:
+            section = self._avatars.get(key)
+            if section is not None:
+                self._avatars.move_to_end(key)
+            return section
+
+    def put_avatar(self, key: str, section: Image.Image) -> None:
+        with self._lock:
+            self._avatars[key] = section
+            self._avatars.move_to_end(key)
+            while len(self._avatars) > self._avatar_cache_size:
+                self._avatars.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sizes": len(self._static), "avatars": len(self._avatars)}
+
+
+def build_avatar_section(avatar_img: Image.Image, layers: StaticLayers, section_left_width: int) -> Image.Image:
+    """
+    Resize, ghost, tint and fade an avatar into its left-hand section.
+
+    Args:
+        avatar_img: The source avatar
+        layers: Static layers for the target size
+        section_left_width: Width the avatar is centered in (AVATAR_SECTION_WIDTH)
+    """
+    if avatar_img.mode != "RGBA":
+        avatar_img = avatar_img.convert("RGBA")
+
+    # Resize avatar to fill left section height
+    _, avatar_height = layers.size
+    avatar_width = int(avatar_img.width * (avatar_height / avatar_img.height))
+    avatar = avatar_img.resize((avatar_width, avatar_height), Image.Resampling.LANCZOS)
+
+    # Section much wider than the avatar for an ultra-smooth fade
+    section_width = layers.section_width
+    left_section = Image.new("RGBA", (section_width, avatar_height), (0, 0, 0, 0))
+
+    # Center avatar in section
+    avatar_x = (section_left_width - avatar_width) // 2
+    if avatar_x < 0:
+        # Crop if too wide
+        crop_x = -avatar_x
+        avatar = avatar.crop((crop_x, 0, crop_x + section_width, avatar_height))
+        avatar_x = 0
+
+    left_section.paste(avatar, (avatar_x, 0))
+
+    # Ghosted overlay + theme color tint
+    left_section = Image.alpha_composite(left_section, layers.wash)
+
+    # Apply fade mask
+    left_section.putalpha(layers.fade_mask)
+    return left_section
+
+
+__all__ = ["QuoteLayerCache", "StaticLayers", "build_avatar_section"]
@@ -11,9 +11,9 @@ Server: discord.gg/syria
 
 import asyncio
 import io
+import random
 import re
-import aiohttp
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Tuple
 from dataclasses import dataclass
@@ -36,8 +36,10 @@ from src.core.constants import (
     QUOTE_SUBTEXT_COLOR,
     QUOTE_AVATAR_SECTION_WIDTH_RATIO,
     QUOTE_MAX_BANNER_CACHE_SIZE,
+    QUOTE_RENDER_WORKERS,
 )
 from src.utils.text import wrap_text
+from .layers import QuoteLayerCache, build_avatar_section
 
 # Aliases for backwards compatibility
 EASTERN_TZ = TIMEZONE_EST
@@ -50,6 +52,7 @@ BG_COLOR = QUOTE_BG_COLOR
 TEXT_COLOR = QUOTE_TEXT_COLOR
 SUBTEXT_COLOR = QUOTE_SUBTEXT_COLOR
 AVATAR_SECTION_WIDTH = int(IMAGE_WIDTH * QUOTE_AVATAR_SECTION_WIDTH_RATIO)
+SECTION_WIDTH = AVATAR_SECTION_WIDTH + 400  # Much wider than the avatar for an ultra-smooth fade
 FONT_PATHS = QUOTE_FONT_PATHS
 
 
@@ -80,6 +83,11 @@ class QuoteService:
         - Syria green & gold theme colors
         - Arabic font support and emoji rendering
         - Film grain effect for aesthetic polish
+
+        Everything that depends only on the canvas size (vignette, fade
+        mask, overlays, grain) comes from a QuoteLayerCache built once, and
+        processed avatar sections are cached per avatar URL. Rendering runs
+        on a small executor so PIL work never blocks the event loop.
     """
 
     def __init__(self) -> None:
@@ -87,14 +95,39 @@ class QuoteService:
         Initialize the quote service.
 
         Sets up HTTP session, finds system fonts with Arabic support,
-        and initializes banner cache for performance.
+        and initializes banner and layer caches for performance.
         """
         self._font_path: Optional[str] = None
         self._font_italic_path: Optional[str] = None
         self._banner_cache: Dict[int, Tuple[Image.Image, str]] = {}
         self._banner_lock = asyncio.Lock()
+        self._layers = QuoteLayerCache()
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._find_fonts()
 
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=QUOTE_RENDER_WORKERS, thread_name_prefix="quote-render")
+        return self._executor
+
+    async def prewarm(self) -> None:
+        """Build the static layers off-loop so the first quote doesn't pay for them."""
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self._layers.static, IMAGE_WIDTH, IMAGE_HEIGHT, SECTION_WIDTH)
+            logger.tree("Quote Layers Pre-built", [
+                ("Size", f"{IMAGE_WIDTH}x{IMAGE_HEIGHT}"),
+            ], emoji="🔥")
+        except Exception as e:
+            logger.error_tree("Quote Layer Pre-build Failed", e)
+
+    async def close(self) -> None:
+        """Shut down the render executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
     def _find_fonts(self) -> None:
         """Find available fonts on the system."""
         for path in FONT_PATHS:
@@ -205,80 +238,26 @@ class QuoteService:
     def _create_image(
         self,
         avatar_img: Optional[Image.Image] = None,
-        banner_img: Optional[Image.Image] = None
+        banner_img: Optional[Image.Image] = None,
+        avatar_key: Optional[str] = None,
     ) -> Image.Image:
         """Create the quote image background with avatar overlay."""
+        layers = self._layers.static(IMAGE_WIDTH, IMAGE_HEIGHT, SECTION_WIDTH)
 
-        # Start with banner or black background
+        # Banner under the dark overlay + vignette, or the pre-vignetted black background
         if banner_img:
-            img = banner_img.convert("RGBA")
-            # Add dark overlay to make text readable
-            dark_overlay = Image.new("RGBA", img.size, (0, 0, 0, 140))
-            img = Image.alpha_composite(img, dark_overlay)
+            img = Image.alpha_composite(banner_img.convert("RGBA"), layers.shade)
         else:
-            img = Image.new("RGBA", (IMAGE_WIDTH, IMAGE_HEIGHT), (*BG_COLOR, 255))
-
-        # Add vignette effect (darker edges) - optimized with NumPy
-        x = np.linspace(-1, 1, IMAGE_WIDTH)
-        y = np.linspace(-1, 1, IMAGE_HEIGHT)
-        xx, yy = np.meshgrid(x, y)
-        dist = np.sqrt(xx**2 * 0.6 + yy**2)
-        alpha = np.clip(dist ** 1.8 * 180, 0, 255).astype(np.uint8)
-        vignette = Image.fromarray(np.dstack([
-            np.zeros((IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8),
-            np.zeros((IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8),
-            np.zeros((IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8),
-            alpha
-        ]), 'RGBA')
-        vignette = vignette.filter(ImageFilter.GaussianBlur(30))
-        img = Image.alpha_composite(img, vignette)
+            img = layers.plain.copy()
 
         # Add avatar on left side with fade effect
-        if avatar_img:
-            # Convert avatar
-            if avatar_img.mode == "P":
-                avatar_img = avatar_img.convert("RGBA")
-            elif avatar_img.mode != "RGBA":
-                avatar_img = avatar_img.convert("RGBA")
-
-            # Resize avatar to fill left section height
-            avatar_height = IMAGE_HEIGHT
-            avatar_width = int(avatar_img.width * (avatar_height / avatar_img.height))
-            avatar = avatar_img.resize((avatar_width, avatar_height), Image.Resampling.LANCZOS)
-
-            # Create left section - much wider for ultra-smooth fade
-            section_width = AVATAR_SECTION_WIDTH + 400
-            left_section = Image.new("RGBA", (section_width, IMAGE_HEIGHT), (0, 0, 0, 0))
-
-            # Center avatar in section
-            avatar_x = (AVATAR_SECTION_WIDTH - avatar_width) // 2
-            if avatar_x < 0:
-                # Crop if too wide
-                crop_x = -avatar_x
-                avatar = avatar.crop((crop_x, 0, crop_x + section_width, avatar_height))
-                avatar_x = 0
-
-            left_section.paste(avatar, (avatar_x, 0))
-
-            # Add ghosted overlay
-            ghost = Image.new("RGBA", left_section.size, (255, 255, 255, 40))
-            left_section = Image.alpha_composite(left_section, ghost)
-
-            # Add theme color tint
-            tint = Image.new("RGBA", left_section.size, (*THEME_COLOR, 60))
-            left_section = Image.alpha_composite(left_section, tint)
-
-            # Create horizontal fade mask - optimized with NumPy, ultra-smooth
-            x = np.linspace(0, 1, section_width)
-            alpha_row = (255 * (1 - x ** 0.35)).astype(np.uint8)  # Even more gradual
-            fade_array = np.tile(alpha_row, (IMAGE_HEIGHT, 1))
-            fade_mask = Image.fromarray(fade_array, 'L')
-            fade_mask = fade_mask.filter(ImageFilter.GaussianBlur(50))  # More blur
-
-            # Apply fade mask
-            r, g, b, a = left_section.split()
-            left_section = Image.merge("RGBA", (r, g, b, fade_mask))
+        left_section = self._layers.get_avatar(avatar_key) if avatar_key else None
+        if left_section is None and avatar_img:
+            left_section = build_avatar_section(avatar_img, layers, AVATAR_SECTION_WIDTH)
+            if avatar_key:
+                self._layers.put_avatar(avatar_key, left_section)
 
+        if left_section is not None:
             # Composite onto main image - shift left to hide edge
             img.paste(left_section, (-30, 0), left_section)
 
@@ -384,103 +363,22 @@ class QuoteService:
             if len(text) > 500:
                 text = text[:497] + "..."
 
-            # Fetch images
-            avatar_img = await self._fetch_image(avatar_url)
+            # Fetch images (a cached avatar section needs no download)
+            avatar_img = None
+            if self._layers.get_avatar(avatar_url) is None:
+                avatar_img = await self._fetch_image(avatar_url)
 
             banner_img = None
             if banner_url and guild_id:
                 banner_img = await self._get_banner(guild_id, banner_url)
 
-            # Create the image
-            img = self._create_image(avatar_img, banner_img)
-            draw = ImageDraw.Draw(img)
-
-            # === TEXT SECTION (right side - moved more right) ===
-            text_x = AVATAR_SECTION_WIDTH + 120  # More to the right
-            text_max_width = IMAGE_WIDTH - text_x - 50
-            text_max_height = IMAGE_HEIGHT - 180
-
-            # Calculate font size and get wrapped lines
-            font_size, lines = self._calculate_font_size(text, text_max_width, text_max_height)
-            quote_font = self._get_font(font_size)
-
-            line_height = int(font_size * 1.4)
-            total_text_height = len(lines) * line_height
-
-            # Center vertically
-            text_y = (IMAGE_HEIGHT - total_text_height - 70) // 2
-
-            # === GOLD DECORATIVE QUOTE MARK ===
-            quote_mark_font = self._get_font(120)
-            draw.text(
-                (text_x - 15, text_y - 60),
-                "\u201C",  # Left double quotation mark "
-                font=quote_mark_font,
-                fill=(*ACCENT_GOLD, 100)  # Semi-transparent gold
+            loop = asyncio.get_running_loop()
+            image_bytes, font_size = await loop.run_in_executor(
+                self.executor,
+                self._render,
+                text, author_name, username, timestamp, avatar_img, avatar_url, banner_img,
             )
 
-            # Draw quote text with shadow and emoji support
-            for line in lines:
-                self._draw_text_shadow(img, (text_x, text_y), line, quote_font, TEXT_COLOR)
-                text_y += line_height
-
-            # === GOLD SEPARATOR LINE ===
-            line_y = text_y + 15
-            draw.line(
-                [(text_x, line_y), (text_x + 80, line_y)],
-                fill=(*ACCENT_GOLD, 150),
-                width=2
-            )
-
-            # === AUTHOR SECTION ===
-            author_y = line_y + 20
-
-            # "- AuthorName" in italic with shadow
-            author_font = self._get_font(28, italic=True)
-            author_text = f"- {author_name}"
-            self._draw_text_shadow(img, (text_x, author_y), author_text, author_font, TEXT_COLOR)
-
-            # "@username" and timestamp smaller and gray
-            if username:
-                username_font = self._get_font(18)
-                username_text = f"@{username}"
-                if timestamp:
-                    username_text += f"  •  {timestamp}"
-                username_y = author_y + 38
-                draw.text((text_x, username_y), username_text, font=username_font, fill=SUBTEXT_COLOR)
-
-            # === BRANDING WATERMARK ===
-            brand_font = self._get_font(14)
-            brand_text = "discord.gg/syria"
-            brand_bbox = brand_font.getbbox(brand_text)
-            brand_width = brand_bbox[2] - brand_bbox[0]
-            draw.text(
-                (IMAGE_WIDTH - brand_width - 25, IMAGE_HEIGHT - 30),
-                brand_text,
-                font=brand_font,
-                fill=(*ACCENT_GOLD, 150)  # Semi-transparent gold
-            )
-
-            # === SUBTLE FILM GRAIN - optimized with NumPy ===
-            noise = np.random.randint(108, 148, (IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
-            alpha = np.random.randint(0, 12, (IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
-            # Sparse grain - only 30% coverage
-            mask = np.random.random((IMAGE_HEIGHT, IMAGE_WIDTH)) < 0.3
-            alpha = (alpha * mask).astype(np.uint8)
-            grain = Image.fromarray(np.dstack([noise, noise, noise, alpha]), 'RGBA')
-            img = Image.alpha_composite(img, grain)
-
-            # Save (convert to RGB for final output)
-            output = io.BytesIO()
-            if img.mode == "RGBA":
-                # Flatten onto black background
-                rgb_img = Image.new("RGB", img.size, BG_COLOR)
-                rgb_img.paste(img, (0, 0), img.split()[3])
-                rgb_img.save(output, format="PNG")
-            else:
-                img.save(output, format="PNG")
-            output.seek(0)
-
             logger.tree("Quote Generated", [
                 ("Author", author_name),
                 ("Length", f"{len(text)} chars"),
@@ -488,12 +386,110 @@ class QuoteService:
                 ("Banner", "Yes" if banner_img else "No"),
             ], emoji="💬")
 
-            return QuoteResult(success=True, image_bytes=output.getvalue())
+            return QuoteResult(success=True, image_bytes=image_bytes)
 
         except Exception as e:
             logger.error_tree("Quote Generation Failed", e)
             return QuoteResult(success=False, error=str(e))
 
+    def _render(
+        self,
+        text: str,
+        author_name: str,
+        username: Optional[str],
+        timestamp: Optional[str],
+        avatar_img: Optional[Image.Image],
+        avatar_key: str,
+        banner_img: Optional[Image.Image],
+    ) -> Tuple[bytes, int]:
+        """Draw the full quote image. Runs on the render executor; returns (PNG bytes, font size)."""
+        # Create the image
+        img = self._create_image(avatar_img, banner_img, avatar_key)
+        draw = ImageDraw.Draw(img)
+
+        # === TEXT SECTION (right side - moved more right) ===
+        text_x = AVATAR_SECTION_WIDTH + 120  # More to the right
+        text_max_width = IMAGE_WIDTH - text_x - 50
+        text_max_height = IMAGE_HEIGHT - 180
+
+        # Calculate font size and get wrapped lines
+        font_size, lines = self._calculate_font_size(text, text_max_width, text_max_height)
+        quote_font = self._get_font(font_size)
+
+        line_height = int(font_size * 1.4)
+        total_text_height = len(lines) * line_height
+
+        # Center vertically
+        text_y = (IMAGE_HEIGHT - total_text_height - 70) // 2
+
+        # === GOLD DECORATIVE QUOTE MARK ===
+        quote_mark_font = self._get_font(120)
+        draw.text(
+            (text_x - 15, text_y - 60),
+            "\u201C",  # Left double quotation mark "
+            font=quote_mark_font,
+            fill=(*ACCENT_GOLD, 100)  # Semi-transparent gold
+        )
+
+        # Draw quote text with shadow and emoji support
+        for line in lines:
+            self._draw_text_shadow(img, (text_x, text_y), line, quote_font, TEXT_COLOR)
+            text_y += line_height
+
+        # === GOLD SEPARATOR LINE ===
+        line_y = text_y + 15
+        draw.line(
+            [(text_x, line_y), (text_x + 80, line_y)],
+            fill=(*ACCENT_GOLD, 150),
+            width=2
+        )
+
+        # === AUTHOR SECTION ===
+        author_y = line_y + 20
+
+        # "- AuthorName" in italic with shadow
+        author_font = self._get_font(28, italic=True)
+        author_text = f"- {author_name}"
+        self._draw_text_shadow(img, (text_x, author_y), author_text, author_font, TEXT_COLOR)
+
+        # "@username" and timestamp smaller and gray
+        if username:
+            username_font = self._get_font(18)
+            username_text = f"@{username}"
+            if timestamp:
+                username_text += f"  •  {timestamp}"
+            username_y = author_y + 38
+            draw.text((text_x, username_y), username_text, font=username_font, fill=SUBTEXT_COLOR)
+
+        # === BRANDING WATERMARK ===
+        brand_font = self._get_font(14)
+        brand_text = "discord.gg/syria"
+        brand_bbox = brand_font.getbbox(brand_text)
+        brand_width = brand_bbox[2] - brand_bbox[0]
+        draw.text(
+            (IMAGE_WIDTH - brand_width - 25, IMAGE_HEIGHT - 30),
+            brand_text,
+            font=brand_font,
+            fill=(*ACCENT_GOLD, 150)  # Semi-transparent gold
+        )
+
+        # === SUBTLE FILM GRAIN - one of the pre-generated layers ===
+        grain = random.choice(self._layers.static(IMAGE_WIDTH, IMAGE_HEIGHT, SECTION_WIDTH).grain)
+        img = Image.alpha_composite(img, grain)
+
+        # Save (convert to RGB for final output)
+        output = io.BytesIO()
+        if img.mode == "RGBA":
+            # Flatten onto black background
+            rgb_img = Image.new("RGB", img.size, BG_COLOR)
+            rgb_img.paste(img, (0, 0), img.split()[3])
+            rgb_img.save(output, format="PNG")
+        else:
+            img.save(output, format="PNG")
+        output.seek(0)
+
+        return output.getvalue(), font_size
+
 
 # =============================================================================
 # Singleton
@@ -0,0 +1,194 @@
+"""
+SyriaBot - Reply Target Index
+=============================
+
+Resolves "who does this reply point at" from the gateway stream instead
+of a REST fetch per reply.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import discord
+
+from src.core.constants import (
+    REPLY_FETCH_BURST,
+    REPLY_FETCH_MAX_INFLIGHT,
+    REPLY_FETCH_RATE,
+    REPLY_TARGET_CHANNEL_SIZE,
+    REPLY_TARGET_MAX_CHANNELS,
+)
+from src.core.logger import logger
+
+
+class ReplyTarget(NamedTuple):
+    """Author of a referenced message."""
+    author_id: int
+    bot: bool
+
+
+class ReplyTargetIndex:
+    """
+    Recent message ID -> author, per channel, plus a budgeted fetcher.
+
+    DESIGN:
+        The reply/interaction counters only need the replied-to author's
+        ID, but whenever discord.py's global message cache had already
+        evicted the original, on_message paid a REST fetch to get it.
+        Every guild message now goes into a bounded per-channel ring as
+        it arrives, so replies to anything recent in that channel resolve
+        locally even in quiet channels the global cache has long rotated
+        out. Deletes are forgotten so a reply to a deleted message still
+        counts as no target. Misses go through one fetcher: concurrent
+        lookups of the same message share a single request, and requests
+        draw from a token bucket. When the bucket is empty or too many
+        fetches are in flight the lookup is dropped (the reply is simply
+        not counted) rather than queued against the global rate limit.
+    """
+
+    def __init__(self) -> None:
+        self._channels: "OrderedDict[int, OrderedDict[int, ReplyTarget]]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, int], asyncio.Future] = {}
+        self._tokens = float(REPLY_FETCH_BURST)
+        self._refilled_at = time.monotonic()
+
+        self.lookups = 0
+        self.resolved_hits = 0   # discord.py already attached the message
+        self.index_hits = 0      # Answered from the ring (a REST call avoided)
+        self.coalesced = 0       # Joined a fetch already in flight (a REST call avoided)
+        self.fetches = 0
+        self.dropped = 0         # Skipped under rate/concurrency pressure
+        self.not_found = 0
+
+    # =========================================================================
+    # Gateway Stream
+    # =========================================================================
+
+    def record(self, message: discord.Message) -> None:
+        """Remember a message's author. Called for every guild message."""
+        self._put(message.channel.id, message.id, ReplyTarget(message.author.id, message.author.bot))
+
+    def forget(self, channel_id: int, message_id: int) -> None:
+        ring = self._channels.get(channel_id)
+        if ring is not None:
+            ring.pop(message_id, None)
+
+    def forget_channel(self, channel_id: int) -> None:
+        self._channels.pop(channel_id, None)
+
+    def _put(self, channel_id: int, message_id: int, target: ReplyTarget) -> None:
+        ring = self._channels.get(channel_id)
+        if ring is None:
+            ring = self._channels[channel_id] = OrderedDict()
+            if len(self._channels) > REPLY_TARGET_MAX_CHANNELS:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(channel_id)
+        ring[message_id] = target
+        if len(ring) > REPLY_TARGET_CHANNEL_SIZE:
+            ring.popitem(last=False)
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    async def resolve(self, message: discord.Message) -> Optional[ReplyTarget]:
+        """
+        Author of the message this one replies to.
+
+        Returns None if it is not a reply, the original is gone, or the
+        lookup was dropped under pressure.
+        """
+        ref = message.reference
+        if not ref or not ref.message_id:
+            return None
+        self.lookups += 1
+
+        resolved = ref.resolved
+        if isinstance(resolved, discord.DeletedReferencedMessage):
+            return None
+        if isinstance(resolved, discord.Message):
+            self.resolved_hits += 1
+            return ReplyTarget(resolved.author.id, resolved.author.bot)
+
+        ring = self._channels.get(message.channel.id)
+        target = ring.get(ref.message_id) if ring else None
+        if target is not None:
+            self.index_hits += 1
+            return target
+
+        return await self._fetch(message.channel, ref.message_id)
+
+    async def _fetch(self, channel: discord.abc.Messageable, message_id: int) -> Optional[ReplyTarget]:
+        key = (channel.id, message_id)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        if len(self._inflight) >= REPLY_FETCH_MAX_INFLIGHT or not self._take_token():
+            self.dropped += 1
+            return None
+
+        self.fetches += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        target: Optional[ReplyTarget] = None
+        try:
+            original = await channel.fetch_message(message_id)
+            target = ReplyTarget(original.author.id, original.author.bot)
+            self._put(channel.id, message_id, target)
+        except discord.NotFound:
+            self.not_found += 1  # Original message was deleted
+        except discord.HTTPException as e:
+            logger.error_tree("Reply Fetch Failed", e, [
+                ("Channel", str(channel.id)),
+                ("Reference", str(message_id)),
+            ])
+        finally:
+            del self._inflight[key]
+            future.set_result(target)
+        return target
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(REPLY_FETCH_BURST, self._tokens + (now - self._refilled_at) * REPLY_FETCH_RATE)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    # =========================================================================
+    # Stats
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, object]:
+        local = self.resolved_hits + self.index_hits
+        return {
+            "lookups": self.lookups,
+            "resolved_hits": self.resolved_hits,
+            "index_hits": self.index_hits,
+            "coalesced": self.coalesced,
+            "fetches": self.fetches,
+            "fetches_avoided": self.index_hits + self.coalesced,
+            "dropped": self.dropped,
+            "not_found": self.not_found,
+            "hit_rate": round(local / self.lookups, 4) if self.lookups else 0.0,
+            "channels": len(self._channels),
+            "entries": sum(len(ring) for ring in self._channels.values()),
+        }
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+reply_targets = ReplyTargetIndex()
+
+__all__ = ["ReplyTarget", "ReplyTargetIndex", "reply_targets"]
@@ -3,25 +3,20 @@ SyriaBot - Roulette Graphics
 ============================
 
 Playwright-based roulette wheel renderer with elite graphics.
-Matches the rank card visual style.
+Matches the rank card visual style. Rendered from a hot template page
+(see card_templates); the wheel geometry is computed here and the page
+only places it.
 
 Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
 import math
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from src.core.logger import logger
-
-
-# Reuse the rank card's browser infrastructure
-from src.services.xp.card import (
-    _get_page,
-    _return_page,
-    get_render_semaphore,
-)
+from src.services.card_templates import CardTemplate, card_templates
 
 
 # Wheel geometry
@@ -48,55 +43,52 @@ def _get_segment_color(index: int) -> str:
     return WHEEL_COLOR_GOLD if index % 2 == 0 else WHEEL_COLOR_GREEN
 
 
-def _generate_wheel_html(
-    players: List[RoulettePlayer],
-    winner_index: Optional[int] = None,
-    spin_degrees: float = 0,
-    is_spinning: bool = False,
-    show_winner: bool = False,
-    guild_icon_url: Optional[str] = None,
-) -> str:
-    """
-    Generate HTML for the roulette wheel with weighted segments.
-
-    Each player's segment size is proportional to their weight.
-    """
-    num_players = len(players)
-    if num_players == 0:
-        return ""
-
-    # Build cumulative angles from weights
+def segment_angles(players: List[RoulettePlayer]) -> List[Tuple[float, float]]:
+    """(start, end) degrees of each player's weighted slice, clockwise from the top."""
     cumulative_angles = []
     current_angle = 0.0
     for player in players:
         start = current_angle
-        extent = player.weight * 360
-        end = start + extent
+        end = start + player.weight * 360
         cumulative_angles.append((start, end))
         current_angle = end
+    return cumulative_angles
+
 
-    # Generate conic gradient for wheel segments (strict alternating)
-    gradient_stops = []
-    for i, (start, end) in enumerate(cumulative_angles):
-        color = _get_segment_color(i)
-        gradient_stops.append(f"{color} {start:.2f}deg {end:.2f}deg")
+def landing_rotation(players: List[RoulettePlayer], winner_index: int) -> float:
+    """Wheel rotation (5 full turns plus the rest) that stops the winner's slice under the pointer."""
+    start, end = segment_angles(players)[winner_index]
+    winner_center_angle = (start + end) / 2
+    return (360 * 5) + (360 - winner_center_angle)
+
+
+def _wheel_payload(
+    players: List[RoulettePlayer],
+    title_text: str,
+    winner_index: Optional[int] = None,
+    spin_degrees: float = 0,
+    guild_icon_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Template payload for the roulette wheel with weighted segments.
 
-    conic_gradient = f"conic-gradient(from 0deg, {', '.join(gradient_stops)})"
+    Each player's segment size is proportional to their weight.
+    """
+    cumulative_angles = segment_angles(players)
 
-    # Generate divider lines between segments
-    dividers_html = ""
-    for i, (start, _end) in enumerate(cumulative_angles):
-        dividers_html += f'''
-            <div class="divider" style="transform: rotate({start:.2f}deg);"></div>
-        '''
+    # Conic gradient for wheel segments (strict alternating)
+    gradient_stops = [
+        f"{_get_segment_color(i)} {start:.2f}deg {end:.2f}deg"
+        for i, (start, end) in enumerate(cumulative_angles)
+    ]
+    conic_gradient = f"conic-gradient(from 0deg, {', '.join(gradient_stops)})" if gradient_stops else "none"
 
-    # Generate player avatars positioned on the wheel
-    avatars_html = ""
+    # Player avatars positioned on the wheel
+    avatars = []
     avatar_size = 56
     avatar_radius = 130
 
     for i, player in enumerate(players):
-        color = _get_segment_color(i)
         start, end = cumulative_angles[i]
         slice_angle = end - start
 
@@ -111,102 +103,74 @@ def _generate_wheel_html(
         avatar_x = WHEEL_CENTER + avatar_radius * math.sin(math.radians(avatar_angle))
         avatar_y = WHEEL_CENTER - avatar_radius * math.cos(math.radians(avatar_angle))
 
-        # Highlight winner
-        is_winner = show_winner and winner_index == i
-        if is_winner:
-            border = "4px solid #fff"
-            glow = "box-shadow: 0 0 15px #fff, 0 0 30px #E6B84A, 0 0 50px #E6B84A;"
-            scale = "transform: scale(1.35);"
-        else:
-            border = "3px solid rgba(255,255,255,0.25)"
-            glow = "box-shadow: 0 2px 8px rgba(0,0,0,0.6);"
-            scale = ""
-
-        # Get first letter for fallback
-        initial = player.display_name[0].upper() if player.display_name else "?"
-
-        avatars_html += f'''
-            <div class="player-avatar" style="
-                left: {avatar_x - scaled_size/2}px;
-                top: {avatar_y - scaled_size/2}px;
-                width: {scaled_size}px;
-                height: {scaled_size}px;
-                border: {border};
-                {glow}
-                {scale}
-            ">
-                <img src="{player.avatar_url}"
-                     onerror="this.style.display='none'; this.nextElementSibling.style.display='flex';">
-                <div class="avatar-fallback" style="display:none;">{initial}</div>
-            </div>
-        '''
-
-    # Spin animation CSS
-    spin_css = ""
-    if is_spinning:
-        spin_css = f'''
-            @keyframes spin {{
-                from {{ transform: rotate(0deg); }}
-                to {{ transform: rotate({spin_degrees}deg); }}
-            }}
-            .wheel-rotator {{
-                animation: spin 4s cubic-bezier(0.17, 0.67, 0.12, 0.99) forwards;
-            }}
-        '''
-    else:
-        spin_css = f'''
-            .wheel-rotator {{
-                transform: rotate({spin_degrees}deg);
-            }}
-        '''
-
-    # Center hub content (guild icon or fallback emoji)
-    if guild_icon_url:
-        center_hub_content = f'<img src="{guild_icon_url}" onerror="this.style.display=\'none\'; this.nextElementSibling.style.display=\'flex\'"><span style="display:none;">🎰</span>'
-    else:
-        center_hub_content = '<span>🎰</span>'
-
-    # Winner announcement
-    winner_html = ""
-    if show_winner and winner_index is not None:
-        winner = players[winner_index]
-        winner_html = f'''
-            <div class="winner-banner">
-                <span class="winner-icon">🎉</span>
-                <span class="winner-name">{winner.display_name[:16]}</span>
-                <span class="winner-text">WINS!</span>
-            </div>
-        '''
-
-    html = f'''
+        avatars.append({
+            "left": avatar_x - scaled_size / 2,
+            "top": avatar_y - scaled_size / 2,
+            "size": scaled_size,
+            "winner": winner_index == i,
+            "avatar": player.avatar_url,
+            # First letter for fallback
+            "initial": player.display_name[0].upper() if player.display_name else "?",
+        })
+
+    show_winner = winner_index is not None
+    return {
+        "vars": {
+            "segments": conic_gradient,
+            "spin": f"{spin_degrees}deg",
+        },
+        "text": {
+            "title": title_text,
+            "winner_name": players[winner_index].display_name[:16] if show_winner else "",
+        },
+        "show": {"winner": show_winner},
+        "wheel": {
+            "dividers": [round(start, 2) for start, _end in cumulative_angles],
+            "avatars": avatars,
+            "hub": guild_icon_url or "",
+        },
+    }
+
+
+WHEEL_TEMPLATE = CardTemplate(
+    name="roulette",
+    viewport=(520, 590),
+    selector=".card-wrapper",
+    clip_padding=6,
+    html='''
 <!DOCTYPE html>
 <html>
 <head>
     <style>
-        * {{
+        :root {
+            --segments: none;
+            --spin: 0deg;
+        }
+
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: transparent;
             display: flex;
             justify-content: center;
             align-items: center;
             min-height: 100vh;
-        }}
+        }
 
-        .card-wrapper {{
+        .card-wrapper {
             padding: 4px;
             background: linear-gradient(135deg, #E6B84A, #1F5E2E, #E6B84A);
             border-radius: 24px;
             position: relative;
             box-shadow: 0 8px 32px rgba(0,0,0,0.4), 0 0 60px rgba(230, 184, 74, 0.3);
-        }}
+        }
 
-        .card-wrapper::before {{
+        .card-wrapper::before {
             content: '';
             position: absolute;
             inset: -8px;
@@ -215,9 +179,9 @@ def _generate_wheel_html(
             filter: blur(20px);
             opacity: 0.8;
             z-index: -1;
-        }}
+        }
 
-        .card {{
+        .card {
             width: 500px;
             height: 570px;
             background: linear-gradient(135deg, #0f0f1a 0%, #1a1a2e 50%, #0f0f1a 100%);
@@ -228,9 +192,9 @@ def _generate_wheel_html(
             flex-direction: column;
             align-items: center;
             padding: 16px 20px;
-        }}
+        }
 
-        .title {{
+        .title {
             font-size: 36px;
             font-weight: 900;
             letter-spacing: 4px;
@@ -239,35 +203,29 @@ def _generate_wheel_html(
             -webkit-text-fill-color: transparent;
             margin-bottom: 8px;
             text-transform: uppercase;
-        }}
+        }
 
-        .wheel-container {{
+        .wheel-container {
             width: 440px;
             height: 440px;
             position: relative;
             display: flex;
             justify-content: center;
             align-items: center;
-        }}
+        }
 
         /* Outer ring glow */
-        .wheel-glow {{
+        .wheel-glow {
             position: absolute;
             width: 420px;
             height: 420px;
             border-radius: 50%;
             background: conic-gradient(from 0deg, #E6B84A66, #1F5E2E66, #E6B84A66, #1F5E2E66, #E6B84A66);
             filter: blur(15px);
-            animation: glowRotate 8s linear infinite;
-        }}
-
-        @keyframes glowRotate {{
-            from {{ transform: rotate(0deg); }}
-            to {{ transform: rotate(360deg); }}
-        }}
+        }
 
         /* Outer decorative ring */
-        .wheel-outer-ring {{
+        .wheel-outer-ring {
             position: absolute;
             width: 410px;
             height: 410px;
@@ -277,35 +235,36 @@ def _generate_wheel_html(
                 0 0 0 4px rgba(230, 184, 74, 0.5),
                 0 0 30px rgba(230, 184, 74, 0.2),
                 inset 0 0 30px rgba(0,0,0,0.5);
-        }}
+        }
 
         /* The wheel itself */
-        .wheel-base {{
+        .wheel-base {
             width: 396px;
             height: 396px;
             border-radius: 50%;
             position: relative;
             overflow: hidden;
             box-shadow: inset 0 0 20px rgba(0,0,0,0.3);
-        }}
+        }
 
-        .wheel-rotator {{
+        .wheel-rotator {
             width: 100%;
             height: 100%;
             position: relative;
-        }}
+            transform: rotate(var(--spin));
+        }
 
         /* Wheel segments using conic gradient */
-        .wheel-segments {{
+        .wheel-segments {
             width: 100%;
             height: 100%;
             border-radius: 50%;
-            background: {conic_gradient};
+            background: var(--segments);
             position: relative;
-        }}
+        }
 
         /* Segment divider lines */
-        .divider {{
+        .divider {
             position: absolute;
             top: 0;
             left: 50%;
@@ -318,10 +277,10 @@ def _generate_wheel_html(
                 transparent 100%);
             transform-origin: bottom center;
             margin-left: -1px;
-        }}
+        }
 
         /* Inner shadow overlay for depth */
-        .wheel-inner-shadow {{
+        .wheel-inner-shadow {
             position: absolute;
             inset: 0;
             border-radius: 50%;
@@ -331,24 +290,32 @@ def _generate_wheel_html(
                 rgba(0,0,0,0.08) 65%,
                 rgba(0,0,0,0.25) 100%);
             pointer-events: none;
-        }}
+        }
 
         /* Player avatars */
-        .player-avatar {{
+        .player-avatar {
             position: absolute;
             border-radius: 50%;
             overflow: hidden;
             z-index: 10;
             background: linear-gradient(135deg, #3a3a4a, #2a2a3a);
-        }}
+            border: 3px solid rgba(255,255,255,0.25);
+            box-shadow: 0 2px 8px rgba(0,0,0,0.6);
+        }
+
+        .player-avatar.winner {
+            border: 4px solid #fff;
+            box-shadow: 0 0 15px #fff, 0 0 30px #E6B84A, 0 0 50px #E6B84A;
+            transform: scale(1.35);
+        }
 
-        .player-avatar img {{
+        .player-avatar img {
             width: 100%;
             height: 100%;
             object-fit: cover;
-        }}
+        }
 
-        .avatar-fallback {{
+        .avatar-fallback {
             width: 100%;
             height: 100%;
             display: flex;
@@ -357,10 +324,10 @@ def _generate_wheel_html(
             font-size: 22px;
             font-weight: 700;
             color: #fff;
-        }}
+        }
 
         /* Center hub */
-        .center-hub {{
+        .center-hub {
             position: absolute;
             top: 50%;
             left: 50%;
@@ -378,38 +345,38 @@ def _generate_wheel_html(
             align-items: center;
             justify-content: center;
             overflow: hidden;
-        }}
+        }
 
-        .center-hub img {{
+        .center-hub img {
             width: 100%;
             height: 100%;
             object-fit: cover;
             border-radius: 50%;
-        }}
+        }
 
-        .center-hub span {{
+        .center-hub span {
             font-size: 26px;
-        }}
+        }
 
         /* Pointer arrow */
-        .pointer {{
+        .pointer {
             position: absolute;
             top: 0px;
             left: 50%;
             transform: translateX(-50%);
             z-index: 50;
             filter: drop-shadow(0 4px 10px rgba(0,0,0,0.7));
-        }}
+        }
 
-        .pointer-outer {{
+        .pointer-outer {
             width: 0;
             height: 0;
             border-left: 20px solid transparent;
             border-right: 20px solid transparent;
             border-top: 38px solid #fff;
-        }}
+        }
 
-        .pointer-inner {{
+        .pointer-inner {
             position: absolute;
             top: 3px;
             left: 50%;
@@ -419,10 +386,10 @@ def _generate_wheel_html(
             border-left: 13px solid transparent;
             border-right: 13px solid transparent;
             border-top: 26px solid #E6B84A;
-        }}
+        }
 
         /* Winner banner */
-        .winner-banner {{
+        .winner-banner {
             position: absolute;
             bottom: 12px;
             left: 50%;
@@ -439,33 +406,32 @@ def _generate_wheel_html(
             z-index: 100;
             border: 2px solid #E6B84A;
             white-space: nowrap;
-        }}
+        }
 
-        .winner-icon {{
+        .winner-icon {
             font-size: 26px;
-        }}
+        }
 
-        .winner-name {{
+        .winner-name {
             font-size: 22px;
             font-weight: 800;
             color: #fff;
             text-shadow: 0 2px 4px rgba(0,0,0,0.4);
-        }}
+        }
 
-        .winner-text {{
+        .winner-text {
             font-size: 20px;
             font-weight: 700;
             color: rgba(255,255,255,0.9);
             text-shadow: 0 2px 4px rgba(0,0,0,0.4);
-        }}
+        }
 
-        {spin_css}
     </style>
 </head>
 <body>
     <div class="card-wrapper">
         <div class="card">
-            <div class="title">Roulette</div>
+            <div class="title" data-text="title"></div>
 
             <div class="wheel-container">
                 <!-- Glow effect -->
@@ -483,27 +449,70 @@ def _generate_wheel_html(
                 <!-- Main wheel -->
                 <div class="wheel-base">
                     <div class="wheel-rotator">
-                        <div class="wheel-segments">
-                            {dividers_html}
-                        </div>
-                        {avatars_html}
+                        <div class="wheel-segments" id="segments"></div>
+                        <div id="avatars"></div>
                         <div class="wheel-inner-shadow"></div>
                     </div>
                 </div>
 
                 <!-- Center hub -->
-                <div class="center-hub">
-                    {center_hub_content}
-                </div>
+                <div class="center-hub" id="hub"></div>
             </div>
 
-            {winner_html}
+            <div class="winner-banner" data-show="winner">
+                <span class="winner-icon">🎉</span>
+                <span class="winner-name" data-text="winner_name"></span>
+                <span class="winner-text">WINS!</span>
+            </div>
         </div>
     </div>
+    <script>
+    (() => {
+        function el(tag, cls, text) {
+            const node = document.createElement(tag);
+            if (cls) node.className = cls;
+            if (text !== undefined) node.textContent = text;
+            return node;
+        }
+
+        function withFallback(url, fallback) {
+            const img = el('img');
+            fallback.setAttribute('data-fallback', '');
+            fallback.style.display = 'none';
+            img.onerror = () => { img.style.display = 'none'; fallback.style.display = 'flex'; };
+            img.src = url;
+            return [img, fallback];
+        }
+
+        window.renderCard = (data) => {
+            const wheel = data.wheel;
+
+            document.getElementById('segments').replaceChildren(...wheel.dividers.map(angle => {
+                const divider = el('div', 'divider');
+                divider.style.transform = `rotate(${angle}deg)`;
+                return divider;
+            }));
+
+            document.getElementById('avatars').replaceChildren(...wheel.avatars.map(p => {
+                const node = el('div', p.winner ? 'player-avatar winner' : 'player-avatar');
+                node.style.left = p.left + 'px';
+                node.style.top = p.top + 'px';
+                node.style.width = p.size + 'px';
+                node.style.height = p.size + 'px';
+                node.append(...withFallback(p.avatar, el('div', 'avatar-fallback', p.initial)));
+                return node;
+            }));
+
+            const hub = document.getElementById('hub');
+            if (wheel.hub) hub.replaceChildren(...withFallback(wheel.hub, el('span', '', '🎰')));
+            else hub.replaceChildren(el('span', '', '🎰'));
+        };
+    })();
+    </script>
 </body>
 </html>
-'''
-    return html
+''',
+)
 
 
 async def generate_wheel_static(
@@ -515,48 +524,23 @@ async def generate_wheel_static(
     Generate a static wheel image showing all players.
     Used for the announcement phase.
     """
-    async with get_render_semaphore():
-        page = None
-        try:
-            page = await _get_page()
-            await page.goto('about:blank')
-            await page.set_viewport_size({'width': 520, 'height': 590})
-
-            html = _generate_wheel_html(players, is_spinning=False, guild_icon_url=guild_icon_url)
-            # Replace title
-            html = html.replace(">Roulette<", f">{title_text}<")
-
-            await page.set_content(html, wait_until='networkidle')
-
-            # Wait for avatars
-            try:
-                await page.wait_for_timeout(500)
-            except Exception:
-                pass
-
-            screenshot = await page.screenshot(type='png', omit_background=True)
-
-            await _return_page(page)
-            page = None
-
-            logger.tree("Roulette Wheel Generated", [
-                ("Players", str(len(players))),
-                ("Type", "Static"),
-            ], emoji="🎰")
-
-            return screenshot
-
-        except Exception as e:
-            logger.error_tree("Roulette Wheel Failed", e, [
-                ("Players", str(len(players))),
-                ("Type", "Static"),
-            ])
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-            raise
+    try:
+        screenshot = await card_templates.render(
+            WHEEL_TEMPLATE, _wheel_payload(players, title_text, guild_icon_url=guild_icon_url),
+        )
+    except Exception as e:
+        logger.error_tree("Roulette Wheel Failed", e, [
+            ("Players", str(len(players))),
+            ("Type", "Static"),
+        ])
+        raise
+
+    logger.tree("Roulette Wheel Generated", [
+        ("Players", str(len(players))),
+        ("Type", "Static"),
+    ], emoji="🎰")
+
+    return screenshot
 
 
 async def generate_wheel_result(
@@ -573,62 +557,29 @@ async def generate_wheel_result(
     if num_players == 0:
         raise ValueError("No players")
 
-    # Calculate the center angle of the winner's weighted slice
-    cumulative = 0.0
-    for i in range(winner_index):
-        cumulative += players[i].weight * 360
-    winner_slice_angle = players[winner_index].weight * 360
-    winner_center_angle = cumulative + (winner_slice_angle / 2)
-
     # Rotate so winner is at top (under pointer)
-    spin_degrees = (360 * 5) + (360 - winner_center_angle)
-
-    async with get_render_semaphore():
-        page = None
-        try:
-            page = await _get_page()
-            await page.goto('about:blank')
-            await page.set_viewport_size({'width': 520, 'height': 590})
-
-            html = _generate_wheel_html(
-                players,
-                winner_index=winner_index,
-                spin_degrees=spin_degrees,
-                is_spinning=False,
-                show_winner=True,
-                guild_icon_url=guild_icon_url,
-            )
-
-            await page.set_content(html, wait_until='networkidle')
-
-            # Wait for avatars
-            try:
-                await page.wait_for_timeout(500)
-            except Exception:
-                pass
-
-            screenshot = await page.screenshot(type='png', omit_background=True)
-
-            await _return_page(page)
-            page = None
-
-            logger.tree("Roulette Result Generated", [
-                ("Players", str(num_players)),
-                ("Winner", players[winner_index].display_name),
-                ("Rotation", f"{spin_degrees:.0f}°"),
-            ], emoji="🎉")
-
-            return screenshot
-
-        except Exception as e:
-            logger.error_tree("Roulette Result Failed", e, [
-                ("Players", str(num_players)),
-                ("Winner Index", str(winner_index)),
-                ("Rotation", f"{spin_degrees:.0f}"),
-            ])
-            if page:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
-            raise
+    spin_degrees = landing_rotation(players, winner_index)
+
+    try:
+        screenshot = await card_templates.render(WHEEL_TEMPLATE, _wheel_payload(
+            players,
+            "Roulette",
+            winner_index=winner_index,
+            spin_degrees=spin_degrees,
+            guild_icon_url=guild_icon_url,
+        ))
+    except Exception as e:
+        logger.error_tree("Roulette Result Failed", e, [
+            ("Players", str(num_players)),
+            ("Winner Index", str(winner_index)),
+            ("Rotation", f"{spin_degrees:.0f}"),
+        ])
+        raise
+
+    logger.tree("Roulette Result Generated", [
+        ("Players", str(num_players)),
+        ("Winner", players[winner_index].display_name),
+        ("Rotation", f"{spin_degrees:.0f}°"),
+    ], emoji="🎉")
+
+    return screenshot
@@ -24,6 +24,7 @@ from src.services.database import db
 from src.utils.async_utils import create_safe_task
 
 from .graphics import RoulettePlayer, generate_wheel_result
+from .spin import SPIN_SECONDS, SpinRender, spin_renderer
 from .views import (
     create_announcement_embed,
     create_spinning_embed,
@@ -296,12 +297,20 @@ class RouletteService:
                 ("Win Probability", f"{winner_player.weight * 100:.1f}%"),
             ], emoji="🎯")
 
-            # 6. Send announcement embed
+            # 6. Start the spin render now: it only needs the pick, so it
+            #    runs while the announcement is sent and read
+            guild_icon = channel.guild.icon.url if channel.guild.icon else None
+            spin_task = asyncio.create_task(
+                spin_renderer.render(players, winner_index, guild_icon_url=guild_icon)
+            )
+
+            # 7. Send announcement embed
             announcement_embed = create_announcement_embed(players, XP_REWARD)
 
             try:
                 msg = await channel.send(embed=announcement_embed)
             except discord.HTTPException as e:
+                spin_task.cancel()
                 logger.error_tree("Roulette Announcement Send Failed", e, [
                     ("Game ID", game_id),
                     ("Channel", channel.name),
@@ -309,33 +318,48 @@ class RouletteService:
                 ])
                 return
 
-            # 7. Generate wheel image (happens while users read announcement)
+            # 8. Collect the spin; the HTML card still covers the result image
+            #    (without animation) if the local render fails
+            spin: Optional[SpinRender] = None
             try:
-                guild_icon = channel.guild.icon.url if channel.guild.icon else None
-                result_image = await generate_wheel_result(players, winner_index, guild_icon_url=guild_icon)
+                spin = await spin_task
+                result_image = spin.result
             except Exception as e:
-                logger.error_tree("Roulette Wheel Generation Failed", e, [
+                logger.error_tree("Roulette Spin Render Failed", e, [
                     ("Game ID", game_id),
                     ("Players", str(len(players))),
+                    ("Fallback", "HTML result card"),
                 ])
                 try:
-                    await msg.edit(embed=create_cancelled_embed("Wheel generation failed"))
-                except discord.HTTPException:
-                    pass
-                return
-
-            # 8. Transition to spinning state
+                    result_image = await generate_wheel_result(players, winner_index, guild_icon_url=guild_icon)
+                except Exception as e:
+                    logger.error_tree("Roulette Wheel Generation Failed", e, [
+                        ("Game ID", game_id),
+                        ("Players", str(len(players))),
+                    ])
+                    try:
+                        await msg.edit(embed=create_cancelled_embed("Wheel generation failed"))
+                    except discord.HTTPException:
+                        pass
+                    return
+
+            # 9. Transition to spinning state, with the spin animation when there is one
+            spinning_embed = create_spinning_embed()
+            spin_files = []
+            if spin:
+                spin_files.append(discord.File(io.BytesIO(spin.animation), filename="roulette_spin.gif"))
+                spinning_embed.set_image(url="attachment://roulette_spin.gif")
             try:
-                await msg.edit(embed=create_spinning_embed())
+                await msg.edit(embed=spinning_embed, attachments=spin_files)
             except discord.HTTPException as e:
                 logger.error_tree("Roulette Spinning Edit Failed", e, [
                     ("Game ID", game_id),
                 ])
 
-            # 9. Dramatic delay
-            await asyncio.sleep(3)
+            # 10. Dramatic delay (long enough for the animation to land)
+            await asyncio.sleep(SPIN_SECONDS + 1 if spin else 3)
 
-            # 10. Get winner member
+            # 11. Get winner member
             winner = channel.guild.get_member(winner_player.user_id)
             if not winner:
                 logger.tree("Roulette Winner Not Found", [
@@ -349,7 +373,7 @@ class RouletteService:
                     pass
                 return
 
-            # 11. Award XP
+            # 12. Award XP
             try:
                 await asyncio.to_thread(db.add_xp, winner_player.user_id, channel.guild.id, XP_REWARD, "roulette")
                 logger.tree("Roulette XP Awarded", [
@@ -366,7 +390,7 @@ class RouletteService:
                     ("XP Amount", str(XP_REWARD)),
                 ])
 
-            # 11b. Award coins via JawdatBot economy
+            # 12b. Award coins via JawdatBot economy
             coins_granted = False
             if self.bot.currency_service and self.bot.currency_service.is_enabled():
                 try:
@@ -389,7 +413,7 @@ class RouletteService:
                         ("Winner ID", str(winner_player.user_id)),
                     ])
 
-            # 12. Reveal winner with wheel image
+            # 13. Reveal winner with wheel image
             winner_embed = create_winner_embed(
                 winner=winner,
                 xp_awarded=XP_REWARD,
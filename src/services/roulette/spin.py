@@ -0,0 +1,487 @@
+"""
+SyriaBot - Roulette Spin Renderer
+=================================
+
+Browser-free roulette wheel: the wheel is drawn once per participant set
+with PIL, and the spin is encoded locally by rotating that sprite to the
+landing angle.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+import io
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from src.core.constants import FONT_PATHS
+from src.core.logger import logger
+from src.services.convert.gif import StreamingGifWriter, build_global_palette
+from src.utils.http import FAST_TIMEOUT, http_session
+
+from .graphics import (
+    WHEEL_CENTER,
+    WHEEL_COLOR_GOLD,
+    WHEEL_COLOR_GREEN,
+    WHEEL_SIZE,
+    RoulettePlayer,
+    _get_segment_color,
+    landing_rotation,
+    segment_angles,
+)
+
+
+# Spin animation
+SPIN_SECONDS = 4.0           # Matches the old CSS spin animation
+SPIN_FPS = 15
+SPIN_HOLD_MS = 3000          # Last (winner) frame duration before the GIF stops
+SPRITE_CACHE_SIZE = 4        # Participant sets kept (static + result reuse one)
+SUPERSAMPLE = 2              # Sprites are drawn at 2x and downscaled (anti-aliasing)
+
+# Card layout (same geometry as the HTML wheel card)
+CARD_WIDTH = 508             # 500px card + 4px gradient border each side
+CARD_HEIGHT = 578
+WHEEL_ORIGIN = (56, 94)      # Top-left of the 396px wheel on the card
+AVATAR_RADIUS = 130
+AVATAR_SIZE = 56
+HUB_SIZE = 64
+
+# GIF has no partial transparency: corners are flattened onto Discord's dark embed color
+GIF_MATTE = (43, 45, 49)
+
+_GOLD = (230, 184, 74)
+_GOLD_LIGHT = (240, 208, 128)
+_GREEN = (31, 94, 46)
+
+
+@dataclass
+class WheelSprite:
+    """Everything a frame needs for one participant set."""
+    wheel: Image.Image                     # RGBA, WHEEL_SIZE square, rotated per frame
+    base: Image.Image                      # RGBA card without the wheel
+    overlay: Image.Image                   # RGBA pointer + hub, drawn over the wheel
+    avatars: List[Optional[Image.Image]]   # Source avatars (winner highlight)
+
+
+@dataclass
+class SpinRender:
+    """Output of one spin."""
+    animation: bytes   # GIF, plays once and ends on the winner frame
+    result: bytes      # PNG of the winner frame
+    rotation: float
+    frames: int
+
+
+# =============================================================================
+# Drawing
+# =============================================================================
+
+def _font(size: int) -> ImageFont.FreeTypeFont:
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except (OSError, IOError):
+            pass
+    return ImageFont.load_default()
+
+
+def _hex(color: str) -> Tuple[int, int, int]:
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+def _circle(image: Image.Image, size: int) -> Image.Image:
+    """Square-crop and circle-mask an image at size (drawn at SUPERSAMPLE)."""
+    big = size * SUPERSAMPLE
+    image = image.convert("RGBA")
+    side = min(image.size)
+    left = (image.width - side) // 2
+    top = (image.height - side) // 2
+    image = image.crop((left, top, left + side, top + side)).resize((big, big), Image.Resampling.LANCZOS)
+    mask = Image.new("L", (big, big), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, big - 1, big - 1), fill=255)
+    image.putalpha(Image.composite(image.getchannel("A"), mask, mask))
+    return image.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def _avatar_disc(
+    avatar: Optional[Image.Image],
+    initial: str,
+    size: int,
+    border: int,
+    border_color: Tuple[int, int, int, int],
+) -> Image.Image:
+    """Avatar (or initial fallback) with a ring, like .player-avatar."""
+    disc = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    inner = size - 2 * border
+    if avatar is not None:
+        disc.alpha_composite(_circle(avatar, inner), (border, border))
+    else:
+        draw = ImageDraw.Draw(disc)
+        draw.ellipse((border, border, size - border - 1, size - border - 1), fill=(58, 58, 74, 255))
+        font = _font(max(12, inner * 22 // 50))
+        draw.text((size / 2, size / 2), initial, font=font, fill=(255, 255, 255, 255), anchor="mm")
+
+    ring = Image.new("RGBA", (size * SUPERSAMPLE, size * SUPERSAMPLE), (0, 0, 0, 0))
+    ImageDraw.Draw(ring).ellipse(
+        (0, 0, size * SUPERSAMPLE - 1, size * SUPERSAMPLE - 1),
+        outline=border_color, width=border * SUPERSAMPLE,
+    )
+    disc.alpha_composite(ring.resize((size, size), Image.Resampling.LANCZOS))
+    return disc
+
+
+def _glow(center: Tuple[int, int], radius: int, color: Tuple[int, int, int], alpha: int, blur: int) -> Image.Image:
+    """Soft colored disc on a card-sized layer (only the mask is blurred, so no dark fringe)."""
+    mask = Image.new("L", (CARD_WIDTH, CARD_HEIGHT), 0)
+    x, y = center
+    ImageDraw.Draw(mask).ellipse((x - radius, y - radius, x + radius, y + radius), fill=alpha)
+    layer = Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT), (*color, 0))
+    layer.putalpha(mask.filter(ImageFilter.GaussianBlur(blur)))
+    return layer
+
+
+def _avatar_box(index: int, angles: List[Tuple[float, float]]) -> Tuple[float, float, int]:
+    """(center x, center y, size) of a player's avatar on the unrotated wheel."""
+    start, end = angles[index]
+    slice_angle = end - start
+    size = AVATAR_SIZE
+    if slice_angle < 25:
+        size = max(40, int(AVATAR_SIZE * (slice_angle / 36)))
+    angle = math.radians((start + end) / 2)
+    return (
+        WHEEL_CENTER + AVATAR_RADIUS * math.sin(angle),
+        WHEEL_CENTER - AVATAR_RADIUS * math.cos(angle),
+        size,
+    )
+
+
+def _build_wheel(players: List[RoulettePlayer], avatars: List[Optional[Image.Image]]) -> Image.Image:
+    """Segments, dividers and avatars on the unrotated wheel."""
+    ss = SUPERSAMPLE
+    size = WHEEL_SIZE * ss
+    angles = segment_angles(players)
+
+    wheel = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(wheel)
+    # PIL angles start at 3 o'clock; the conic gradient starts at 12
+    for i, (start, end) in enumerate(angles):
+        draw.pieslice((0, 0, size - 1, size - 1), start - 90, end - 90, fill=_hex(_get_segment_color(i)))
+
+    dividers = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    divider_draw = ImageDraw.Draw(dividers)
+    center = size / 2
+    for start, _end in angles:
+        a = math.radians(start)
+        divider_draw.line(
+            (center, center, center + center * math.sin(a), center - center * math.cos(a)),
+            fill=(255, 255, 255, 90), width=2 * ss,
+        )
+    wheel.alpha_composite(dividers)
+    wheel = wheel.resize((WHEEL_SIZE, WHEEL_SIZE), Image.Resampling.LANCZOS)
+
+    for i, player in enumerate(players):
+        x, y, disc_size = _avatar_box(i, angles)
+        initial = player.display_name[0].upper() if player.display_name else "?"
+        disc = _avatar_disc(avatars[i], initial, disc_size, 3, (255, 255, 255, 64))
+        wheel.alpha_composite(disc, (round(x - disc_size / 2), round(y - disc_size / 2)))
+
+    # Clip to the wheel (avatars on tiny slices can overhang the rim)
+    mask = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size - 1, size - 1), fill=255)
+    mask = mask.resize((WHEEL_SIZE, WHEEL_SIZE), Image.Resampling.LANCZOS)
+    wheel.putalpha(Image.composite(wheel.getchannel("A"), mask, mask))
+    return wheel
+
+
+def _build_base(title: str) -> Image.Image:
+    """Card frame, title, glow and outer ring: everything under the wheel."""
+    base = Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT), (0, 0, 0, 0))
+
+    # Gradient border, then the dark card inside it
+    border = Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT))
+    border_draw = ImageDraw.Draw(border)
+    for y in range(CARD_HEIGHT):
+        t = abs(1 - 2 * y / (CARD_HEIGHT - 1))  # gold -> green -> gold
+        color = tuple(round(g + (r - g) * t) for g, r in zip(_GREEN, _GOLD))
+        border_draw.line((0, y, CARD_WIDTH, y), fill=(*color, 255))
+    mask = Image.new("L", (CARD_WIDTH, CARD_HEIGHT), 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, CARD_WIDTH - 1, CARD_HEIGHT - 1), radius=24, fill=255)
+    base.paste(border, (0, 0), mask)
+    ImageDraw.Draw(base).rounded_rectangle(
+        (4, 4, CARD_WIDTH - 5, CARD_HEIGHT - 5), radius=20, fill=(18, 18, 32, 255),
+    )
+
+    draw = ImageDraw.Draw(base)
+    draw.text((CARD_WIDTH / 2, 42), title.upper(), font=_font(36), fill=(*_GOLD, 255), anchor="mm")
+
+    # Glow and decorative ring around the wheel
+    cx = WHEEL_ORIGIN[0] + WHEEL_CENTER
+    cy = WHEEL_ORIGIN[1] + WHEEL_CENTER
+    base.alpha_composite(_glow((cx, cy), 210, _GOLD, 90, 15))
+
+    ring = Image.new("RGBA", (CARD_WIDTH * SUPERSAMPLE, CARD_HEIGHT * SUPERSAMPLE), (0, 0, 0, 0))
+    ring_draw = ImageDraw.Draw(ring)
+    r = 209 * SUPERSAMPLE
+    c = (cx * SUPERSAMPLE, cy * SUPERSAMPLE)
+    ring_draw.ellipse((c[0] - r, c[1] - r, c[0] + r, c[1] + r), fill=(*_GOLD, 128))
+    r = 205 * SUPERSAMPLE
+    ring_draw.ellipse((c[0] - r, c[1] - r, c[0] + r, c[1] + r), fill=(34, 34, 58, 255))
+    base.alpha_composite(ring.resize((CARD_WIDTH, CARD_HEIGHT), Image.Resampling.LANCZOS))
+    return base
+
+
+def _build_overlay(hub_icon: Optional[Image.Image]) -> Image.Image:
+    """Pointer and center hub: fixed on top of the spinning wheel."""
+    ss = SUPERSAMPLE
+    overlay = Image.new("RGBA", (CARD_WIDTH * ss, CARD_HEIGHT * ss), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    cx = (WHEEL_ORIGIN[0] + WHEEL_CENTER) * ss
+    cy = (WHEEL_ORIGIN[1] + WHEEL_CENTER) * ss
+    top = (WHEEL_ORIGIN[1] - 22) * ss
+
+    # Pointer: white triangle with a gold inner triangle
+    draw.polygon([(cx - 20 * ss, top), (cx + 20 * ss, top), (cx, top + 38 * ss)], fill=(255, 255, 255, 255))
+    draw.polygon(
+        [(cx - 13 * ss, top + 3 * ss), (cx + 13 * ss, top + 3 * ss), (cx, top + 29 * ss)],
+        fill=(*_GOLD, 255),
+    )
+
+    # Hub: gold ring around the guild icon (or a plain dark center)
+    r = HUB_SIZE // 2 * ss
+    draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(*_GOLD, 255))
+    r -= 4 * ss
+    draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(18, 18, 32, 255))
+    if hub_icon is None:
+        r //= 3
+        draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(*_GOLD_LIGHT, 255))
+
+    overlay = overlay.resize((CARD_WIDTH, CARD_HEIGHT), Image.Resampling.LANCZOS)
+    if hub_icon is not None:
+        inner = HUB_SIZE - 8
+        icon = _circle(hub_icon, inner)
+        overlay.alpha_composite(icon, (cx // ss - inner // 2, cy // ss - inner // 2))
+    return overlay
+
+
+def _winner_layer(
+    sprite: WheelSprite,
+    player: RoulettePlayer,
+    index: int,
+    players: List[RoulettePlayer],
+) -> Image.Image:
+    """Highlighted winner avatar under the pointer, plus the WINS banner."""
+    layer = Image.new("RGBA", (CARD_WIDTH, CARD_HEIGHT), (0, 0, 0, 0))
+    _, _, disc_size = _avatar_box(index, segment_angles(players))
+    disc_size = round(disc_size * 1.35)
+    cx = WHEEL_ORIGIN[0] + WHEEL_CENTER
+    cy = WHEEL_ORIGIN[1] + WHEEL_CENTER - AVATAR_RADIUS
+
+    layer.alpha_composite(_glow((cx, cy), disc_size // 2 + 10, _GOLD, 200, 12))
+
+    initial = player.display_name[0].upper() if player.display_name else "?"
+    disc = _avatar_disc(sprite.avatars[index], initial, disc_size, 4, (255, 255, 255, 255))
+    layer.alpha_composite(disc, (cx - disc_size // 2, cy - disc_size // 2))
+
+    # Banner
+    font = _font(22)
+    text = f"{player.display_name[:16]}  WINS!"
+    width = round(ImageDraw.Draw(layer).textlength(text, font=font)) + 64
+    height = 50
+    left = (CARD_WIDTH - width) // 2
+    bottom = CARD_HEIGHT - 4 - 12
+    banner = ImageDraw.Draw(layer)
+    banner.rounded_rectangle(
+        (left, bottom - height, left + width, bottom), radius=25,
+        fill=(*_GREEN, 255), outline=(*_GOLD, 255), width=2,
+    )
+    banner.text((CARD_WIDTH / 2, bottom - height / 2), text, font=font, fill=(255, 255, 255, 255), anchor="mm")
+    return layer
+
+
+def _frame(sprite: WheelSprite, rotation: float, winner: Optional[Image.Image] = None) -> Image.Image:
+    """One RGBA card with the wheel rotated clockwise by rotation degrees."""
+    frame = sprite.base.copy()
+    wheel = sprite.wheel.rotate(-rotation, resample=Image.Resampling.BICUBIC)
+    frame.alpha_composite(wheel, WHEEL_ORIGIN)
+    frame.alpha_composite(sprite.overlay)
+    if winner is not None:
+        frame.alpha_composite(winner)
+    return frame
+
+
+def _ease_out(t: float) -> float:
+    """Quartic ease-out: fast start, long slow landing."""
+    return 1 - (1 - t) ** 4
+
+
+def _flatten(frame: Image.Image) -> Image.Image:
+    matte = Image.new("RGB", frame.size, GIF_MATTE)
+    matte.paste(frame, mask=frame.getchannel("A"))
+    return matte
+
+
+def _encode_spin(
+    sprite: WheelSprite,
+    players: List[RoulettePlayer],
+    winner_index: int,
+) -> SpinRender:
+    """Winner frame first (PNG), then the spin frames streamed into a GIF."""
+    rotation = landing_rotation(players, winner_index)
+    winner = _winner_layer(sprite, players[winner_index], winner_index, players)
+    last = _frame(sprite, rotation, winner)
+
+    result = io.BytesIO()
+    last.save(result, "PNG", optimize=False)
+
+    steps = max(2, round(SPIN_SECONDS * SPIN_FPS))
+    duration = round(1000 / SPIN_FPS)
+    first = _flatten(_frame(sprite, 0))
+    mid = _flatten(_frame(sprite, rotation * _ease_out(0.5)))
+    final = _flatten(last)
+    reserved = [_GOLD, _GOLD_LIGHT, _GREEN, _hex(WHEEL_COLOR_GOLD), _hex(WHEEL_COLOR_GREEN), GIF_MATTE, (255, 255, 255)]
+    palette = build_global_palette([first, mid, final], reserved)
+
+    def _mapped(image: Image.Image) -> Image.Image:
+        return image.quantize(palette=palette, dither=Image.Dither.NONE)
+
+    animation = io.BytesIO()
+    writer = StreamingGifWriter(animation, (CARD_WIDTH, CARD_HEIGHT), palette, loop=None)
+    writer.add(_mapped(first), duration)
+    for step in range(1, steps):
+        angle = rotation * _ease_out(step / steps)
+        writer.add(_mapped(_flatten(_frame(sprite, angle))), duration)
+    writer.add(_mapped(final), SPIN_HOLD_MS)
+    writer.close()
+
+    return SpinRender(
+        animation=animation.getvalue(),
+        result=result.getvalue(),
+        rotation=rotation,
+        frames=writer.frames_written,
+    )
+
+
+# =============================================================================
+# Renderer
+# =============================================================================
+
+class SpinRenderer:
+    """
+    Local roulette renderer with a per-participant-set sprite cache.
+
+    DESIGN:
+        The wheel only changes when the participants or their weights do,
+        so it is drawn once (segments, dividers, avatars) into a sprite
+        and cached together with the fixed card layers, keyed by the
+        exact participant set. A spin is then the sprite rotated along an
+        ease-out curve to landing_rotation - the same angle the HTML
+        result card uses - composited onto the cached layers and streamed
+        into a play-once GIF on one global palette. The winner frame is
+        rendered first, so it is ready as soon as the weighted pick is
+        made and never depends on the browser. All PIL work runs in a
+        worker thread.
+    """
+
+    def __init__(self) -> None:
+        self._sprites: "OrderedDict[tuple, WheelSprite]" = OrderedDict()
+        self.sprite_hits = 0
+        self.sprite_builds = 0
+
+    @staticmethod
+    def _key(players: List[RoulettePlayer], guild_icon_url: Optional[str]) -> tuple:
+        return (
+            guild_icon_url,
+            tuple((p.user_id, p.display_name, p.avatar_url, round(p.weight, 6)) for p in players),
+        )
+
+    async def _fetch(self, url: Optional[str]) -> Optional[Image.Image]:
+        if not url:
+            return None
+        try:
+            async with http_session.get(url, timeout=FAST_TIMEOUT) as resp:
+                if resp.status != 200:
+                    return None
+                data = await resp.read()
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            return image
+        except Exception as e:
+            logger.error_tree("Roulette Image Fetch Failed", e, [
+                ("URL", url[:80]),
+            ])
+            return None
+
+    async def sprite(self, players: List[RoulettePlayer], guild_icon_url: Optional[str] = None) -> WheelSprite:
+        """Cached wheel sprite and card layers for this participant set."""
+        key = self._key(players, guild_icon_url)
+        cached = self._sprites.get(key)
+        if cached is not None:
+            self._sprites.move_to_end(key)
+            self.sprite_hits += 1
+            return cached
+
+        images = await asyncio.gather(
+            self._fetch(guild_icon_url),
+            *(self._fetch(p.avatar_url) for p in players),
+        )
+        hub_icon, avatars = images[0], list(images[1:])
+
+        def _build() -> WheelSprite:
+            return WheelSprite(
+                wheel=_build_wheel(players, avatars),
+                base=_build_base("Roulette"),
+                overlay=_build_overlay(hub_icon),
+                avatars=avatars,
+            )
+
+        sprite = await asyncio.to_thread(_build)
+        self._sprites[key] = sprite
+        if len(self._sprites) > SPRITE_CACHE_SIZE:
+            self._sprites.popitem(last=False)
+        self.sprite_builds += 1
+        return sprite
+
+    async def render(
+        self,
+        players: List[RoulettePlayer],
+        winner_index: int,
+        guild_icon_url: Optional[str] = None,
+    ) -> SpinRender:
+        """Spin animation landing on winner_index, plus the winner frame."""
+        if not players:
+            raise ValueError("No players")
+
+        start = time.perf_counter()
+        sprite = await self.sprite(players, guild_icon_url)
+        spin = await asyncio.to_thread(_encode_spin, sprite, players, winner_index)
+
+        logger.tree("Roulette Spin Rendered", [
+            ("Players", str(len(players))),
+            ("Winner", players[winner_index].display_name),
+            ("Frames", str(spin.frames)),
+            ("Size", f"{len(spin.animation) // 1024}KB"),
+            ("Time", f"{(time.perf_counter() - start) * 1000:.0f}ms"),
+        ], emoji="🎡")
+        return spin
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "sprites": len(self._sprites),
+            "sprite_hits": self.sprite_hits,
+            "sprite_builds": self.sprite_builds,
+        }
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+spin_renderer = SpinRenderer()
+
+__all__ = ["SpinRender", "SpinRenderer", "WheelSprite", "spin_renderer"]
@@ -0,0 +1,147 @@
+"""
+SyriaBot - Social Feed Extractor
+================================
+
+Long-lived yt-dlp extractor for the social monitor.
+
+Runs yt_dlp.YoutubeDL in-process on a small dedicated thread pool, so a
+poll no longer pays Python + yt-dlp start-up (and extractor import) for
+the profile listing and again for every new post.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import json
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+try:
+    import yt_dlp
+    YTDLP_MODULE_AVAILABLE = True
+except ImportError:
+    YTDLP_MODULE_AVAILABLE = False
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+EXTRACTOR_WORKERS = 3        # Threads (one YoutubeDL pair each)
+SOCKET_TIMEOUT = 30          # Per-request network timeout inside yt-dlp
+CLI_TIMEOUT = 90             # Fallback subprocess timeout
+
+_BASE_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "socket_timeout": SOCKET_TIMEOUT,
+    "noprogress": True,
+}
+
+
+class ExtractorError(Exception):
+    """yt-dlp failed to extract a profile or post."""
+
+
+class FeedExtractor:
+    """
+    yt-dlp extraction on a dedicated thread pool, reused across polls.
+
+    DESIGN:
+        YoutubeDL instances aren't thread-safe, so each worker thread
+        lazily builds its own pair (flat listing and full info) and keeps
+        it for the life of the pool; extractor classes and their compiled
+        regexes are loaded once instead of per subprocess. Profile listing
+        iterates the playlist lazily and stops as soon as the caller's
+        predicate says it reached known posts, so later pages are never
+        requested. Without the yt_dlp module it falls back to the CLI in
+        the same threads.
+    """
+
+    def __init__(self, max_workers: int = EXTRACTOR_WORKERS) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = max_workers
+        self._local = threading.local()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="social-ytdlp")
+        return self._executor
+
+    def close(self) -> None:
+        """Shut the pool down (running extractions finish in the background)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # =========================================================================
+    # Worker-Thread Helpers
+    # =========================================================================
+
+    def _ydl(self, flat: bool) -> "yt_dlp.YoutubeDL":
+        attr = "flat" if flat else "full"
+        ydl = getattr(self._local, attr, None)
+        if ydl is None:
+            opts = dict(_BASE_OPTS)
+            if flat:
+                opts["extract_flat"] = True
+            ydl = yt_dlp.YoutubeDL(opts)
+            setattr(self._local, attr, ydl)
+        return ydl
+
+    @staticmethod
+    def _run_cli(url: str, flat: bool, limit: int = 0) -> dict[str, Any]:
+        cmd = ["yt-dlp", "--dump-single-json", "--no-warnings", "--quiet", "--no-download"]
+        if flat:
+            cmd += ["--flat-playlist", "--playlist-end", str(limit)]
+        proc = subprocess.run(cmd + [url], capture_output=True, timeout=CLI_TIMEOUT)
+        if proc.returncode != 0:
+            raise ExtractorError(proc.stderr.decode(errors="ignore").strip()[:150] or "Unknown error")
+        return json.loads(proc.stdout.decode())
+
+    def list_ids(self, url: str, limit: int, stop: Callable[[int, str], bool]) -> list[str]:
+        """
+        Newest-first post IDs of a profile. Runs in a worker thread.
+
+        Iteration ends after `limit` entries or at the first entry for which
+        `stop(index, id)` is true (that entry is not included).
+        """
+        if not YTDLP_MODULE_AVAILABLE:
+            return self._collect(self._run_cli(url, flat=True, limit=limit), limit, stop)
+        try:
+            info = self._ydl(flat=True).extract_info(url, download=False, process=False)
+            # Entries are a lazy generator: pages are fetched while collecting
+            return self._collect(info, limit, stop)
+        except yt_dlp.utils.DownloadError as e:
+            raise ExtractorError(str(e)[:150]) from None
+
+    @staticmethod
+    def _collect(info: Optional[dict[str, Any]], limit: int, stop: Callable[[int, str], bool]) -> list[str]:
+        ids: list[str] = []
+        for index, entry in enumerate((info or {}).get("entries") or []):
+            if index >= limit:
+                break
+            video_id = (entry or {}).get("id", "")
+            if not video_id:
+                continue
+            if stop(index, video_id):
+                break
+            ids.append(video_id)
+        return ids
+
+    def video_info(self, url: str) -> dict[str, Any]:
+        """Full metadata for one post. Runs in a worker thread."""
+        if YTDLP_MODULE_AVAILABLE:
+            try:
+                ydl = self._ydl(flat=False)
+                return ydl.sanitize_info(ydl.extract_info(url, download=False))
+            except yt_dlp.utils.DownloadError as e:
+                raise ExtractorError(str(e)[:150]) from None
+        return self._run_cli(url, flat=False)
+
+
+__all__ = ["FeedExtractor", "ExtractorError", "YTDLP_MODULE_AVAILABLE"]
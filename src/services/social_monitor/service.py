@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, TypedDict
@@ -26,6 +27,7 @@ from src.core.emojis import EMOJI_TIKTOK_ID, EMOJI_INSTAGRAM_ID, EMOJI_TIKTOK, E
 from src.core.logger import logger
 from src.services.database import db
 from src.utils.async_utils import create_safe_task
+from .extractor import FeedExtractor, ExtractorError, YTDLP_MODULE_AVAILABLE
 
 if TYPE_CHECKING:
     from src.bot import SyriaBot
@@ -75,6 +77,28 @@ class SocialLinkView(ui.View):
         ))
 
 
+# =============================================================================
+# Feeds
+# =============================================================================
+
+@dataclass(eq=False)
+class _Feed:
+    """One monitored profile and its polling state."""
+    platform: str
+    username: str
+    profile_url: str
+    post_url: str                   # Format string with {id}
+    posted: set[str] = field(default_factory=set)
+    cursor: Optional[str] = None    # Newest post ID past the pinned slots
+    failures: int = 0
+    first_run: bool = True
+    task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def name(self) -> str:
+        return "TikTok" if self.platform == "tiktok" else "Instagram"
+
+
 # =============================================================================
 # Service
 # =============================================================================
@@ -88,6 +112,16 @@ class SocialMonitorService:
     - Posts Discord embeds with video thumbnails
     - Persists posted IDs to avoid duplicates across restarts
     - First-run detection to avoid spamming old videos
+
+    DESIGN:
+        Each feed polls in its own task with its own failure backoff, so a
+        platform that's down doesn't delay the other. Extraction runs
+        through one long-lived in-process yt-dlp (FeedExtractor) instead
+        of a subprocess per call. A poll walks the profile newest-first
+        and stops at the first known post past PINNED_SLOTS (pinned posts
+        sit on top regardless of age) or at the persisted cursor; metadata
+        for the new posts is fetched in a bounded parallel batch and they
+        are announced oldest first.
     """
 
     # Theme colors
@@ -107,6 +141,10 @@ class SocialMonitorService:
     MAX_STORED_IDS: int = 100
     MAX_VIDEOS_TO_CHECK: int = 10
 
+    # Incremental polling
+    PINNED_SLOTS: int = 3              # Top posts that may be pinned (TikTok and Instagram allow 3)
+    INFO_CONCURRENCY: int = 3          # New-post metadata fetched in parallel
+
     def __init__(self, bot: SyriaBot) -> None:
         """
         Initialize the Social Monitor service.
@@ -115,39 +153,50 @@ class SocialMonitorService:
             bot: The SyriaBot instance
         """
         self.bot: SyriaBot = bot
-        self._task: Optional[asyncio.Task[None]] = None
         self._running: bool = False
-        self._posted_tiktok: set[str] = set()
-        self._posted_instagram: set[str] = set()
-        self._first_run_tiktok: bool = True
-        self._first_run_instagram: bool = True
-        self._tiktok_failures: int = 0
-        self._instagram_failures: int = 0
+        self._extractor = FeedExtractor()
+        self._feeds: dict[str, _Feed] = {}
         self._load_data()
 
     # =========================================================================
     # Data Persistence
     # =========================================================================
 
+    def _build_feeds(self) -> dict[str, _Feed]:
+        """Feeds for the configured accounts."""
+        feeds: dict[str, _Feed] = {}
+        # TikTok disabled — account has no videos, spamming errors
+        # if config.TIKTOK_USERNAME:
+        #     username = config.TIKTOK_USERNAME.lstrip("@")
+        #     feeds["tiktok"] = _Feed(
+        #         "tiktok", username,
+        #         f"https://www.tiktok.com/@{username}",
+        #         f"https://www.tiktok.com/@{username}/video/{{id}}",
+        #     )
+        if config.INSTAGRAM_USERNAME:
+            username = config.INSTAGRAM_USERNAME.lstrip("@")
+            feeds["instagram"] = _Feed(
+                "instagram", username,
+                f"https://www.instagram.com/{username}/",
+                "https://www.instagram.com/p/{id}/",
+            )
+        return feeds
+
     def _load_data(self) -> None:
-        """Load posted video IDs from database, migrating from JSON if needed."""
+        """Load posted video IDs and cursors from database, migrating from JSON if needed."""
         self._migrate_json()
 
-        self._posted_tiktok = db.social_get_posted_ids("tiktok")
-        self._posted_instagram = db.social_get_posted_ids("instagram")
-
-        # If we have stored data, this isn't the first run
-        if self._posted_tiktok:
-            self._first_run_tiktok = False
-        if self._posted_instagram:
-            self._first_run_instagram = False
+        self._feeds = self._build_feeds()
+        for feed in self._feeds.values():
+            feed.posted = db.social_get_posted_ids(feed.platform)
+            feed.cursor = db.social_get_cursor(feed.platform)
+            # If we have stored data, this isn't the first run
+            feed.first_run = not feed.posted and feed.cursor is None
 
         logger.tree("Social Monitor Data Loaded", [
-            ("TikTok IDs", str(len(self._posted_tiktok))),
-            ("Instagram IDs", str(len(self._posted_instagram))),
-            ("First Run TikTok", str(self._first_run_tiktok)),
-            ("First Run Instagram", str(self._first_run_instagram)),
-        ], emoji="📂")
+            (f"{feed.name} IDs", f"{len(feed.posted)} (cursor {feed.cursor or 'none'})")
+            for feed in self._feeds.values()
+        ] or [("Feeds", "None configured")], emoji="📂")
 
     def _migrate_json(self) -> None:
         """One-time migration from JSON file to SQLite."""
@@ -181,12 +230,12 @@ class SocialMonitorService:
                 ("File", str(self._JSON_FILE)),
             ])
 
-    def _save_data(self) -> None:
-        """Persist current posted IDs and clean up old entries."""
-        # Add any new IDs that are in memory but not yet in DB
-        # (individual adds happen in _check_tiktok/_check_instagram)
-        db.social_cleanup("tiktok", self.MAX_STORED_IDS)
-        db.social_cleanup("instagram", self.MAX_STORED_IDS)
+    def _save_data(self, feed: _Feed) -> None:
+        """Persist the feed's cursor and clean up old posted IDs."""
+        # (individual posted-ID adds happen in _check_feed)
+        if feed.cursor:
+            db.social_set_cursor(feed.platform, feed.cursor)
+        db.social_cleanup(feed.platform, self.MAX_STORED_IDS)
 
     # =========================================================================
     # Lifecycle
@@ -201,7 +250,7 @@ class SocialMonitorService:
             ], emoji="info")
             return
 
-        if not config.TIKTOK_USERNAME and not config.INSTAGRAM_USERNAME:
+        if not self._feeds:
             logger.tree("Social Monitor", [
                 ("Status", "Disabled"),
                 ("Reason", "No accounts configured"),
@@ -209,27 +258,25 @@ class SocialMonitorService:
             return
 
         self._running = True
-        self._task = create_safe_task(self._monitor_loop(), "Social Monitor Loop")
-
-        accounts: list[str] = []
-        if config.TIKTOK_USERNAME:
-            accounts.append(f"TikTok: @{config.TIKTOK_USERNAME}")
-        if config.INSTAGRAM_USERNAME:
-            accounts.append(f"IG: @{config.INSTAGRAM_USERNAME}")
+        for feed in self._feeds.values():
+            feed.task = create_safe_task(self._feed_loop(feed), f"Social Monitor {feed.name}")
 
         logger.tree("Social Monitor", [
             ("Status", "Started"),
             ("Channel", str(config.SOCIAL_MONITOR_CH)),
-            ("Accounts", ", ".join(accounts)),
+            ("Accounts", ", ".join(f"{feed.name}: @{feed.username}" for feed in self._feeds.values())),
             ("Interval", f"{self.CHECK_INTERVAL}s"),
+            ("Extractor", "yt-dlp (in-process)" if YTDLP_MODULE_AVAILABLE else "yt-dlp (CLI)"),
         ], emoji="check")
 
     def stop(self) -> None:
         """Stop the monitoring service gracefully."""
         self._running = False
-        if self._task is not None:
-            self._task.cancel()
-            self._task = None
+        for feed in self._feeds.values():
+            if feed.task is not None:
+                feed.task.cancel()
+                feed.task = None
+        self._extractor.close()
         logger.tree("Social Monitor", [
             ("Status", "Stopped"),
         ], emoji="stop")
@@ -249,31 +296,26 @@ class SocialMonitorService:
         )
         return backoff
 
-    async def _monitor_loop(self) -> None:
-        """Main monitoring loop that periodically checks for new posts."""
+    async def _feed_loop(self, feed: _Feed) -> None:
+        """Poll one feed periodically, backing off on its own failures."""
         await asyncio.sleep(self.INITIAL_DELAY)
 
         while self._running:
             try:
-                # TikTok disabled — account has no videos, spamming errors
-                # if config.TIKTOK_USERNAME:
-                #     await self._check_tiktok()
-
-                if config.INSTAGRAM_USERNAME:
-                    await self._check_instagram()
+                await self._check_feed(feed)
 
-                # Use the highest failure count to determine wait time
-                max_failures = max(self._tiktok_failures, self._instagram_failures)
-                wait_interval = self._get_backoff_interval(max_failures)
+                wait_interval = self._get_backoff_interval(feed.failures)
 
-                if max_failures > self.MAX_CONSECUTIVE_FAILURES:
+                if feed.failures > self.MAX_CONSECUTIVE_FAILURES:
                     logger.tree("Social Monitor", [
+                        ("Platform", feed.name),
                         ("Status", "Check complete (backoff active)"),
-                        ("Consecutive Failures", str(max_failures)),
+                        ("Consecutive Failures", str(feed.failures)),
                         ("Next", f"{wait_interval}s"),
                     ], emoji="⏳")
                 else:
                     logger.tree("Social Monitor", [
+                        ("Platform", feed.name),
                         ("Status", "Check complete"),
                         ("Next", f"{wait_interval}s"),
                     ], emoji="clock")
@@ -282,11 +324,13 @@ class SocialMonitorService:
 
             except asyncio.CancelledError:
                 logger.tree("Social Monitor", [
+                    ("Platform", feed.name),
                     ("Status", "Loop cancelled"),
                 ], emoji="info")
                 break
             except Exception as e:
                 logger.error_tree("Social Monitor Loop Error", e, [
+                    ("Platform", feed.name),
                     ("Recovery", f"Retrying in {self.ERROR_RETRY_DELAY}s"),
                 ])
                 await asyncio.sleep(self.ERROR_RETRY_DELAY)
@@ -295,93 +339,77 @@ class SocialMonitorService:
     # Video Fetching
     # =========================================================================
 
-    async def _fetch_video_list(self, url: str, platform: str) -> list[str]:
+    async def _run_extractor(self, func, *args):
+        """Run an extractor call on its thread pool with the fetch timeout."""
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._extractor.executor, func, *args),
+            timeout=self.FETCH_TIMEOUT,
+        )
+
+    async def _fetch_video_list(self, feed: _Feed) -> Optional[list[str]]:
         """
-        Fetch list of video IDs from a profile using yt-dlp flat-playlist.
+        Fetch newest-first post IDs down to the first known one.
 
         Args:
-            url: The profile URL to fetch
-            platform: Platform name for logging
+            feed: The feed to poll
 
         Returns:
-            List of video IDs
+            List of post IDs (possibly empty), or None if the fetch failed
         """
-        cmd = [
-            "yt-dlp",
-            "--flat-playlist",
-            "--dump-json",
-            "--no-warnings",
-            "--quiet",
-            "--playlist-end", str(self.MAX_VIDEOS_TO_CHECK),
-            url
-        ]
+        known = frozenset(feed.posted)
+        cursor = feed.cursor
+        pinned = 0 if feed.first_run else self.PINNED_SLOTS
+
+        def reached_known(index: int, video_id: str) -> bool:
+            return index >= pinned and (video_id == cursor or video_id in known)
 
         logger.tree("Social Monitor", [
             ("Action", "Fetching video list"),
-            ("Platform", platform.title()),
-            ("URL", url),
+            ("Platform", feed.name),
+            ("URL", feed.profile_url),
         ], emoji="search")
 
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            video_ids = await self._run_extractor(
+                self._extractor.list_ids, feed.profile_url, self.MAX_VIDEOS_TO_CHECK, reached_known,
             )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(),
-                timeout=self.FETCH_TIMEOUT
-            )
-
-            if proc.returncode != 0:
-                error_msg = stderr.decode().strip()[:150] if stderr else "Unknown error"
-                logger.tree("Social Monitor", [
-                    ("Status", "Fetch failed"),
-                    ("Platform", platform.title()),
-                    ("Exit Code", str(proc.returncode)),
-                    ("Error", error_msg),
-                ], emoji="warn")
-                return []
-
-            video_ids: list[str] = []
-            for line in stdout.decode().strip().split("\n"):
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    video_id = data.get("id", "")
-                    if video_id:
-                        video_ids.append(video_id)
-                except json.JSONDecodeError:
-                    continue
 
             logger.tree("Social Monitor", [
                 ("Status", "Video list fetched"),
-                ("Platform", platform.title()),
+                ("Platform", feed.name),
                 ("Videos", str(len(video_ids))),
+                ("Stopped At Known", "Yes" if len(video_ids) < self.MAX_VIDEOS_TO_CHECK else "No"),
             ], emoji="check")
 
             return video_ids
 
+        except ExtractorError as e:
+            logger.tree("Social Monitor", [
+                ("Status", "Fetch failed"),
+                ("Platform", feed.name),
+                ("Error", str(e)),
+            ], emoji="warn")
+            return None
         except asyncio.TimeoutError:
             logger.tree("Social Monitor", [
                 ("Status", "Fetch timeout"),
-                ("Platform", platform.title()),
+                ("Platform", feed.name),
                 ("Timeout", f"{self.FETCH_TIMEOUT}s"),
             ], emoji="warn")
-            return []
+            return None
         except FileNotFoundError:
             logger.error_tree("Social Monitor Error", Exception("yt-dlp not found"), [
-                ("Platform", platform.title()),
+                ("Platform", feed.name),
                 ("Hint", "Install yt-dlp: pip install yt-dlp"),
             ])
-            return []
+            return None
         except Exception as e:
             logger.error_tree("Social Monitor Fetch Error", e, [
-                ("Platform", platform.title()),
-                ("URL", url),
+                ("Platform", feed.name),
+                ("URL", feed.profile_url),
             ])
-            return []
+            return None
 
     async def _fetch_video_info(self, url: str, platform: str) -> Optional[VideoInfo]:
         """
@@ -394,52 +422,31 @@ class SocialMonitorService:
         Returns:
             VideoInfo dict or None if fetch failed
         """
-        cmd = [
-            "yt-dlp",
-            "--dump-json",
-            "--no-warnings",
-            "--quiet",
-            "--no-download",
-            url
-        ]
-
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(),
-                timeout=self.FETCH_TIMEOUT
-            )
-
-            if proc.returncode != 0:
-                error_msg = stderr.decode().strip()[:100] if stderr else "Unknown"
-                logger.tree("Social Monitor", [
-                    ("Status", "Video info fetch failed"),
-                    ("Platform", platform.title()),
-                    ("Error", error_msg),
-                ], emoji="warn")
-                return None
-
-            data = json.loads(stdout.decode().strip())
+            data = await self._run_extractor(self._extractor.video_info, url)
 
             # Extract thumbnail - try multiple fields
             thumbnail = (
                 data.get("thumbnail") or
-                data.get("thumbnails", [{}])[-1].get("url", "") or
+                (data.get("thumbnails") or [{}])[-1].get("url", "") or
                 ""
             )
 
             return VideoInfo(
                 id=data.get("id", ""),
-                title=data.get("title", "") or data.get("description", "")[:200] or "",
+                title=data.get("title", "") or (data.get("description") or "")[:200] or "",
                 url=data.get("webpage_url", "") or data.get("url", ""),
                 thumbnail=thumbnail,
                 uploader=data.get("uploader", "") or data.get("channel", ""),
             )
 
+        except ExtractorError as e:
+            logger.tree("Social Monitor", [
+                ("Status", "Video info fetch failed"),
+                ("Platform", platform.title()),
+                ("Error", str(e)[:100]),
+            ], emoji="warn")
+            return None
         except asyncio.TimeoutError:
             logger.tree("Social Monitor", [
                 ("Status", "Video info timeout"),
@@ -457,131 +464,70 @@ class SocialMonitorService:
             ])
             return None
 
-    # =========================================================================
-    # Platform Checks
-    # =========================================================================
-
-    async def _check_tiktok(self) -> None:
-        """Check TikTok for new videos."""
-        username = config.TIKTOK_USERNAME.lstrip("@")
-        profile_url = f"https://www.tiktok.com/@{username}"
-
-        video_ids = await self._fetch_video_list(profile_url, "tiktok")
-        if not video_ids:
-            self._tiktok_failures += 1
-            return
-
-        self._tiktok_failures = 0
-
-        new_count = 0
-        for video_id in video_ids:
-            if not video_id or video_id in self._posted_tiktok:
-                continue
-
-            self._posted_tiktok.add(video_id)
-            db.social_add_posted_id("tiktok", video_id)
-
-            # Only post notifications after first run
-            if not self._first_run_tiktok:
-                video_url = f"https://www.tiktok.com/@{username}/video/{video_id}"
+    async def _fetch_video_infos(self, feed: _Feed, video_ids: list[str]) -> list[VideoInfo]:
+        """Fetch metadata for new posts in parallel (bounded); fall back to bare links."""
+        semaphore = asyncio.Semaphore(self.INFO_CONCURRENCY)
 
+        async def fetch(video_id: str) -> VideoInfo:
+            url = feed.post_url.format(id=video_id)
+            async with semaphore:
                 logger.tree("Social Monitor", [
-                    ("Action", "Fetching new video info"),
-                    ("Platform", "TikTok"),
-                    ("Video ID", video_id),
+                    ("Action", "Fetching new post info"),
+                    ("Platform", feed.name),
+                    ("Post ID", video_id),
                 ], emoji="download")
+                info = await self._fetch_video_info(url, feed.platform)
+            # Fallback: post without thumbnail
+            return info or VideoInfo(id=video_id, title="", url=url, thumbnail="", uploader=feed.username)
 
-                video_info = await self._fetch_video_info(video_url, "tiktok")
-                if video_info:
-                    await self._post_notification("tiktok", video_info, username)
-                    new_count += 1
-                else:
-                    # Fallback: post without thumbnail
-                    fallback_info = VideoInfo(
-                        id=video_id,
-                        title="",
-                        url=video_url,
-                        thumbnail="",
-                        uploader=username,
-                    )
-                    await self._post_notification("tiktok", fallback_info, username)
-                    new_count += 1
-
-        if self._first_run_tiktok:
-            logger.tree("Social Monitor", [
-                ("Platform", "TikTok"),
-                ("Status", "Initialized"),
-                ("Cached", f"{len(video_ids)} videos"),
-            ], emoji="info")
-            self._first_run_tiktok = False
-
-        if new_count > 0:
-            logger.tree("Social Monitor", [
-                ("Platform", "TikTok"),
-                ("New Posts", str(new_count)),
-            ], emoji="bell")
+        return list(await asyncio.gather(*(fetch(video_id) for video_id in video_ids)))
 
-        self._save_data()
-
-    async def _check_instagram(self) -> None:
-        """Check Instagram for new posts."""
-        username = config.INSTAGRAM_USERNAME.lstrip("@")
-        profile_url = f"https://www.instagram.com/{username}/"
+    # =========================================================================
+    # Platform Checks
+    # =========================================================================
 
-        video_ids = await self._fetch_video_list(profile_url, "instagram")
-        if not video_ids:
-            self._instagram_failures += 1
+    async def _check_feed(self, feed: _Feed) -> None:
+        """Check one feed for new posts."""
+        video_ids = await self._fetch_video_list(feed)
+        if video_ids is None:
+            feed.failures += 1
             return
 
-        self._instagram_failures = 0
+        feed.failures = 0
 
-        new_count = 0
-        for video_id in video_ids:
-            if not video_id or video_id in self._posted_instagram:
-                continue
+        new_ids = [video_id for video_id in video_ids if video_id not in feed.posted]
+        for video_id in new_ids:
+            feed.posted.add(video_id)
+            db.social_add_posted_id(feed.platform, video_id)
 
-            self._posted_instagram.add(video_id)
-            db.social_add_posted_id("instagram", video_id)
+        # Newest post below the pinned slots is where the next poll stops
+        if len(video_ids) > self.PINNED_SLOTS:
+            feed.cursor = video_ids[self.PINNED_SLOTS]
+        elif video_ids and feed.cursor is None:
+            feed.cursor = video_ids[-1]
 
-            if not self._first_run_instagram:
-                post_url = f"https://www.instagram.com/p/{video_id}/"
-
-                logger.tree("Social Monitor", [
-                    ("Action", "Fetching new post info"),
-                    ("Platform", "Instagram"),
-                    ("Post ID", video_id),
-                ], emoji="download")
-
-                video_info = await self._fetch_video_info(post_url, "instagram")
-                if video_info:
-                    await self._post_notification("instagram", video_info, username)
-                    new_count += 1
-                else:
-                    fallback_info = VideoInfo(
-                        id=video_id,
-                        title="",
-                        url=post_url,
-                        thumbnail="",
-                        uploader=username,
-                    )
-                    await self._post_notification("instagram", fallback_info, username)
-                    new_count += 1
-
-        if self._first_run_instagram:
+        if feed.first_run:
             logger.tree("Social Monitor", [
-                ("Platform", "Instagram"),
+                ("Platform", feed.name),
                 ("Status", "Initialized"),
                 ("Cached", f"{len(video_ids)} posts"),
             ], emoji="info")
-            self._first_run_instagram = False
+            feed.first_run = False
+            self._save_data(feed)
+            return
+
+        if new_ids:
+            # Announce oldest first so the channel reads in posting order
+            posts = await self._fetch_video_infos(feed, new_ids)
+            for post in reversed(posts):
+                await self._post_notification(feed.platform, post, feed.username)
 
-        if new_count > 0:
             logger.tree("Social Monitor", [
-                ("Platform", "Instagram"),
-                ("New Posts", str(new_count)),
+                ("Platform", feed.name),
+                ("New Posts", str(len(new_ids))),
             ], emoji="bell")
 
-        self._save_data()
+        self._save_data(feed)
 
     # =========================================================================
     # Discord Posting
@@ -14,7 +14,6 @@ Server: discord.gg/syria
 from __future__ import annotations
 
 import asyncio
-import time
 from typing import TYPE_CHECKING
 
 import discord
@@ -171,10 +170,8 @@ async def _create_temp_channel_inner(svc: TempVoiceService, member: discord.Memb
         return
 
     # Check cooldown to prevent spam
-    now = time.time()
-    last_join = svc._join_cooldowns.get(member.id, 0)
-    if now - last_join < JOIN_COOLDOWN:
-        remaining = JOIN_COOLDOWN - (now - last_join)
+    remaining = svc._join_cooldowns.hit(member.id)
+    if remaining:
         logger.tree("Join Cooldown", [
             ("User", f"{member.name} ({member.display_name})"),
             ("ID", str(member.id)),
@@ -190,16 +187,6 @@ async def _create_temp_channel_inner(svc: TempVoiceService, member: discord.Memb
             ])
         return
 
-    # Update cooldown timestamp
-    svc._join_cooldowns[member.id] = now
-
-    # Cleanup old cooldown entries (older than 1 minute) to prevent memory leak
-    cutoff = now - 60
-    svc._join_cooldowns = {
-        uid: ts for uid, ts in svc._join_cooldowns.items()
-        if ts > cutoff
-    }
-
     # Check if user already owns a channel
     existing = db.get_owner_channel(member.id, guild.id)
     if existing:
@@ -778,10 +765,7 @@ def cleanup_channel_cache(svc: TempVoiceService, channel_id: int) -> None:
     svc._message_counts.pop(channel_id, None)
     cleanup_channel_lock(channel_id)
     clear_voice_status_cache(channel_id)
-    # Clean up kick cooldowns for this channel
-    stale_keys = [k for k in svc._kick_cooldowns if k[0] == channel_id]
-    for k in stale_keys:
-        del svc._kick_cooldowns[k]
+    # Kick cooldowns for this channel expire on their own (channel IDs are never reused)
 
 
 def schedule_reorder(svc: TempVoiceService, guild: discord.Guild) -> None:
@@ -8,8 +8,7 @@ Author: حَـــــنَّـــــا
 Server: discord.gg/syria
 """
 
-import time
-from typing import Dict, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
 import discord
 from discord import ui
@@ -18,12 +17,14 @@ from src.core.config import config
 from src.core.colors import COLOR_SUCCESS, COLOR_ERROR, COLOR_WARNING
 from src.core.logger import logger
 from src.services.database import db
+from src.utils.cooldowns import Cooldown, cooldowns
 from .utils import extract_base_name, build_full_name, get_channel_position
 
-# Per-channel rename cooldown: {channel_id: last_rename_timestamp}
-_rename_cooldowns: Dict[int, float] = {}
 _RENAME_COOLDOWN_SECONDS = 300  # 5 minutes between renames per channel
 
+# Per-channel rename cooldown: channel_id
+_rename_cooldowns = cooldowns.namespace("tempvoice.rename", Cooldown(_RENAME_COOLDOWN_SECONDS))
+
 if TYPE_CHECKING:
     from .service import TempVoiceService
 
@@ -59,9 +60,7 @@ class NameModal(ui.Modal, title="Rename Channel"):
         ], emoji="✏️")
 
         # Check per-channel rename cooldown (prevents rate limit stacking)
-        now = time.time()
-        last_rename = _rename_cooldowns.get(self.channel.id, 0)
-        remaining = _RENAME_COOLDOWN_SECONDS - (now - last_rename)
+        remaining = _rename_cooldowns.remaining(self.channel.id)
         if remaining > 0:
             minutes = int(remaining // 60) + 1
             logger.tree("Rename Cooldown", [
@@ -89,7 +88,7 @@ class NameModal(ui.Modal, title="Rename Channel"):
                 full_name = build_full_name(position, new_base_name)
                 await self.channel.edit(name=full_name)
 
-                _rename_cooldowns[self.channel.id] = time.time()
+                _rename_cooldowns.record(self.channel.id)
                 db.update_temp_channel(self.channel.id, name=full_name, base_name=new_base_name)
                 db.save_user_settings(interaction.user.id, default_name=new_base_name)
                 embed = discord.Embed(
@@ -114,7 +113,7 @@ class NameModal(ui.Modal, title="Rename Channel"):
 
                 await self.channel.edit(name=auto_name)
 
-                _rename_cooldowns[self.channel.id] = time.time()
+                _rename_cooldowns.record(self.channel.id)
                 db.update_temp_channel(self.channel.id, name=auto_name, base_name=display_name)
                 db.save_user_settings(interaction.user.id, default_name=None)
                 embed = discord.Embed(
@@ -32,6 +32,7 @@ from src.core.constants import (
 from src.core.logger import logger
 from src.services.database import db
 from src.utils.async_utils import create_safe_task
+from src.utils.cooldowns import Cooldown, cooldowns
 from .lifecycle import (
     create_temp_channel as _lifecycle_create_temp_channel,
     check_empty_channel as _lifecycle_check_empty_channel,
@@ -112,8 +113,10 @@ class TempVoiceService:
         self.bot = bot
         self.control_panel = TempVoiceControlPanel(self)
         self._cleanup_task: asyncio.Task = None
-        self._join_cooldowns: dict[int, float] = {}  # user_id -> last join timestamp
-        self._kick_cooldowns: dict[tuple[int, int], float] = {}  # (channel_id, user_id) -> kick timestamp
+        self._join_cooldowns = cooldowns.namespace("tempvoice.join", Cooldown(JOIN_COOLDOWN))  # user_id
+        self._kick_cooldowns = cooldowns.namespace(
+            "tempvoice.kick", Cooldown(KICK_REJOIN_COOLDOWN),
+        )  # (channel_id, user_id)
         self._member_join_times: dict[int, dict[int, float]] = {}  # channel_id -> {user_id: join_time}
         self._pending_transfers: dict[int, asyncio.Task] = {}  # channel_id -> pending transfer task
         self._message_counts: dict[int, int] = {}  # channel_id -> message count since last panel
@@ -478,35 +481,30 @@ class TempVoiceService:
             if channel:
                 # Enforce kick rejoin cooldown (skip for owner, mods, and expired entries)
                 kick_key = (channel.id, member.id)
-                kick_time = self._kick_cooldowns.get(kick_key)
-                if kick_time:
-                    elapsed = time.time() - kick_time
-                    if elapsed >= KICK_REJOIN_COOLDOWN:
-                        # Expired — clean up
-                        del self._kick_cooldowns[kick_key]
-                    else:
-                        # Check if user is now the owner or has mod role — bypass cooldown
-                        channel_info = db.get_temp_channel(channel.id)
-                        is_owner = channel_info and channel_info["owner_id"] == member.id
-                        if not is_owner and not has_vc_mod_role(member):
-                            remaining = int(KICK_REJOIN_COOLDOWN - elapsed)
+                kick_remaining = self._kick_cooldowns.remaining(kick_key)
+                if kick_remaining:
+                    # Check if user is now the owner or has mod role — bypass cooldown
+                    channel_info = db.get_temp_channel(channel.id)
+                    is_owner = channel_info and channel_info["owner_id"] == member.id
+                    if not is_owner and not has_vc_mod_role(member):
+                        remaining = int(kick_remaining)
+                        try:
+                            await member.move_to(None)
                             try:
-                                await member.move_to(None)
-                                try:
-                                    await member.send(
-                                        f"You were kicked from **{channel.name}** and cannot rejoin for **{remaining // 60}m {remaining % 60}s**."
-                                    )
-                                except discord.Forbidden:
-                                    pass
-                                logger.tree("Kick Cooldown Enforced", [
-                                    ("User", f"{member.name} ({member.display_name})"),
-                                    ("ID", str(member.id)),
-                                    ("Channel", channel.name),
-                                    ("Remaining", f"{remaining}s"),
-                                ], emoji="⏳")
-                            except discord.HTTPException:
+                                await member.send(
+                                    f"You were kicked from **{channel.name}** and cannot rejoin for **{remaining // 60}m {remaining % 60}s**."
+                                )
+                            except discord.Forbidden:
                                 pass
-                            return
+                            logger.tree("Kick Cooldown Enforced", [
+                                ("User", f"{member.name} ({member.display_name})"),
+                                ("ID", str(member.id)),
+                                ("Channel", channel.name),
+                                ("Remaining", f"{remaining}s"),
+                            ], emoji="⏳")
+                        except discord.HTTPException:
+                            pass
+                        return
 
                 await self._grant_text_access(channel, member)
                 # Owner rejoined - cancel pending transfer
@@ -0,0 +1,180 @@
+"""
+SyriaBot - Translation Batcher
+==============================
+
+Coalesces concurrent translation requests into batched upstream calls and
+caps how many requests each engine may have in flight.
+
+DeepL accepts many `text` parameters per request, so requests for the same
+(source, target) pair that arrive within a short window share one round trip.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+from src.core.logger import logger
+from src.utils.async_utils import create_safe_task
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+BATCH_WINDOW = 0.05         # Seconds to wait for more requests before flushing
+BATCH_MAX_TEXTS = 50        # DeepL limit on text parameters per request
+
+# Max concurrent upstream requests per engine
+ENGINE_CONCURRENCY: Dict[str, int] = {
+    "deepl": 4,
+    "google": 4,
+    "ai": 2,
+}
+
+BatchKey = Tuple[str, str, str]
+BatchHandler = Callable[[List[str], str, str], Awaitable[List[Any]]]
+
+
+@dataclass
+class _PendingBatch:
+    """Requests collected for one (engine, source, target) key."""
+
+    texts: List[str] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class TranslationBatcher:
+    """
+    Per-engine request coalescer with concurrency limits.
+
+    DESIGN:
+        The first request for a (engine, source, target) key opens a batch
+        and schedules a flush after BATCH_WINDOW. Requests for the same key
+        that arrive before the flush join it; identical texts share a slot.
+        The flush calls the engine's registered handler once with every
+        text and resolves each waiter with its own result.
+        Each engine has a semaphore so a burst of batches (or of
+        unbatched Google/AI calls via limit()) can't flood the upstream API.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, BatchHandler] = {}
+        self._pending: Dict[BatchKey, _PendingBatch] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._flushes: Set[asyncio.Task] = set()  # Store flush tasks to prevent GC
+
+        self.requests = 0
+        self.upstream_calls = 0
+
+    def register(self, engine: str, handler: BatchHandler) -> None:
+        """Register the batch handler for an engine."""
+        self._handlers[engine] = handler
+
+    def limit(self, engine: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter for an engine."""
+        sem = self._limits.get(engine)
+        if sem is None:
+            sem = asyncio.Semaphore(ENGINE_CONCURRENCY.get(engine, 2))
+            self._limits[engine] = sem
+        return sem
+
+    async def submit(self, engine: str, text: str, source: str, target: str) -> Any:
+        """
+        Queue one text for batched translation.
+
+        Args:
+            engine: Registered engine name.
+            text: Text to translate.
+            source: Source language code (or "auto").
+            target: Target language code.
+
+        Returns:
+            The handler's result for this text.
+        """
+        key = (engine, source, target)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[key] = batch
+            task = create_safe_task(self._flush(key, batch), "Translate Batch Flush")
+            self._flushes.add(task)
+            task.add_done_callback(lambda done: self._flush_done(done, key, batch))
+
+        future = asyncio.get_running_loop().create_future()
+        batch.texts.append(text)
+        batch.futures.append(future)
+        self.requests += 1
+
+        if len(batch.texts) >= BATCH_MAX_TEXTS:
+            batch.full.set()
+            # Close the batch so later requests open a new one
+            if self._pending.get(key) is batch:
+                del self._pending[key]
+
+        return await future
+
+    def _flush_done(self, task: asyncio.Task, key: BatchKey, batch: _PendingBatch) -> None:
+        """Forget a finished flush; if it was cancelled (even before starting), release its waiters."""
+        self._flushes.discard(task)
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        for future in batch.futures:
+            if not future.done():
+                future.cancel()
+
+    async def _flush(self, key: BatchKey, batch: _PendingBatch) -> None:
+        """Wait for the window to close, then send the batch upstream."""
+        try:
+            await asyncio.wait_for(batch.full.wait(), timeout=BATCH_WINDOW)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+
+        engine, source, target = key
+
+        # Deduplicate identical texts (same announcement pasted twice)
+        unique: List[str] = list(dict.fromkeys(batch.texts))
+
+        try:
+            async with self.limit(engine):
+                self.upstream_calls += 1
+                results = await self._handlers[engine](unique, source, target)
+            by_text = dict(zip(unique, results))
+            for text, future in zip(batch.texts, batch.futures):
+                if not future.done():
+                    future.set_result(by_text[text])
+        except Exception as e:
+            logger.error_tree("Translation Batch Failed", e, [
+                ("Engine", engine),
+                ("Texts", str(len(unique))),
+                ("Target", target),
+            ])
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(unique) > 1:
+            logger.tree("Translation Batch Sent", [
+                ("Engine", engine),
+                ("Requests", str(len(batch.texts))),
+                ("Texts", str(len(unique))),
+                ("From", source),
+                ("To", target),
+            ], emoji="📦")
+
+    def get_stats(self) -> dict:
+        """Get coalescing counters."""
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "saved": max(0, self.requests - self.upstream_calls),
+        }
+
+
+__all__ = ["TranslationBatcher", "ENGINE_CONCURRENCY", "BATCH_WINDOW", "BATCH_MAX_TEXTS"]
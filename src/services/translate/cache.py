@@ -0,0 +1,232 @@
+"""
+SyriaBot - Translation Cache
+============================
+
+Bounded LRU cache for translation results with optional SQLite persistence.
+
+Popular messages (pinned rules, announcements) get translated over and over.
+Results are keyed on (normalized text hash, source, target, engine) so a
+repeat request never reaches DeepL/Google/OpenAI.
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.core.config import DATA_DIR
+from src.core.logger import logger
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+DB_PATH = DATA_DIR / "translate_cache.db"
+CACHE_MAX_ENTRIES = 2000            # In-memory LRU capacity
+CACHE_PERSIST_MAX_ENTRIES = 50000   # Rows kept on disk before pruning oldest
+CACHE_TTL_SECONDS = 30 * 86400      # Persisted rows older than this are ignored
+
+_WHITESPACE = re.compile(r"\s+")
+
+CacheKey = Tuple[str, str, str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keying (NFC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def text_hash(text: str) -> str:
+    """Hash normalized text for cache keying."""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    LRU cache of successful translations.
+
+    DESIGN:
+        Memory tier is an OrderedDict bounded by CACHE_MAX_ENTRIES.
+        Disk tier is an optional SQLite table read on memory misses and
+        written through on every put, so hot entries survive restarts.
+        Stores only (translated_text, detected_source) - language names and
+        flags are cheap to rebuild from the code tables.
+        Thread-safe: callers may use it from asyncio.to_thread workers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        db_path: Optional[Path] = DB_PATH,
+    ) -> None:
+        self._max_entries = max_entries
+        self._db_path = db_path
+        self._entries: "OrderedDict[CacheKey, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_prune = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if self._db_path:
+            self._init_db()
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a database connection."""
+        return sqlite3.connect(str(self._db_path), timeout=5)
+
+    def _init_db(self) -> None:
+        """Create the cache table, disabling persistence on failure."""
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._get_connection()
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS translations (
+                        text_hash TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        target TEXT NOT NULL,
+                        engine TEXT NOT NULL,
+                        translated TEXT NOT NULL,
+                        detected_source TEXT NOT NULL,
+                        created_at INTEGER NOT NULL,
+                        PRIMARY KEY (text_hash, source, target, engine)
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_translations_created ON translations(created_at)"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error_tree("Translation Cache DB Init Failed", e, [
+                ("Path", str(self._db_path)),
+                ("Impact", "Memory-only cache"),
+            ])
+            self._db_path = None
+
+    def _load(self, key: CacheKey) -> Optional[Tuple[str, str]]:
+        """Read a single entry from disk."""
+        try:
+            conn = self._get_connection()
+            try:
+                row = conn.execute("""
+                    SELECT translated, detected_source FROM translations
+                    WHERE text_hash = ? AND source = ? AND target = ? AND engine = ?
+                    AND created_at >= ?
+                """, (*key, int(time.time()) - CACHE_TTL_SECONDS)).fetchone()
+            finally:
+                conn.close()
+            return (row[0], row[1]) if row else None
+        except sqlite3.Error:
+            return None
+
+    def _store(self, key: CacheKey, value: Tuple[str, str]) -> None:
+        """Write a single entry to disk, pruning the oldest rows occasionally."""
+        try:
+            conn = self._get_connection()
+            try:
+                conn.execute("""
+                    INSERT OR REPLACE INTO translations
+                        (text_hash, source, target, engine, translated, detected_source, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (*key, value[0], value[1], int(time.time())))
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= 500:
+                    self._puts_since_prune = 0
+                    conn.execute("""
+                        DELETE FROM translations WHERE rowid IN (
+                            SELECT rowid FROM translations
+                            ORDER BY created_at DESC
+                            LIMIT -1 OFFSET ?
+                        )
+                    """, (CACHE_PERSIST_MAX_ENTRIES,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.tree("Translation Cache Write Failed", [
+                ("Error", str(e)[:50]),
+            ], emoji="⚠️")
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    @staticmethod
+    def make_key(text: str, source: str, target: str, engine: str) -> CacheKey:
+        """Build a cache key from raw text and language/engine identifiers."""
+        return (text_hash(text), source, target, engine)
+
+    def get(self, key: CacheKey) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached translation.
+
+        Returns:
+            (translated_text, detected_source) or None on miss.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self._db_path:
+            value = self._load(key)
+            if value is not None:
+                with self._lock:
+                    self._insert(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, translated: str, detected_source: str) -> None:
+        """Store a successful translation."""
+        value = (translated, detected_source)
+        with self._lock:
+            self._insert(key, value)
+        if self._db_path:
+            self._store(key, value)
+
+    def _insert(self, key: CacheKey, value: Tuple[str, str]) -> None:
+        """Insert into the memory tier. Caller must hold the lock."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Get cache counters."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "persistent": self._db_path is not None,
+        }
+
+
+__all__ = ["TranslationCache", "normalize_text", "text_hash"]
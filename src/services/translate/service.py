@@ -11,8 +11,10 @@ Server: discord.gg/syria
 import asyncio
 import aiohttp
 import re
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 from deep_translator import GoogleTranslator
 from deep_translator.exceptions import TranslationNotFound
 from langdetect import detect, LangDetectException
@@ -20,6 +22,12 @@ from langdetect import detect, LangDetectException
 from src.core.logger import logger
 from src.core.config import config
 from src.utils.http import http_session
+from .batch import TranslationBatcher
+from .cache import TranslationCache, text_hash
+
+
+# Memoized detections kept in memory (keyed on normalized text hash)
+DETECT_CACHE_MAX = 1000
 
 
 # =============================================================================
@@ -229,6 +237,81 @@ def _fuzzy_match(s1: str, s2: str) -> float:
     return common / max(len1, len2)
 
 
+# =============================================================================
+# Language Resolver Index
+# =============================================================================
+
+def _trigrams(s: str) -> set:
+    """Get the set of 3-character substrings of a string."""
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class _LanguageIndex:
+    """
+    Precomputed lookup tables for language resolution.
+
+    DESIGN:
+        Built once at import from LANGUAGES and LANGUAGE_ALIASES.
+        Exact code/alias lookups are plain dict hits.
+        Fuzzy lookups only score entries that can reach the 0.6 threshold
+        in _fuzzy_match: a shared 3-char prefix, a shared trigram (covers
+        containment), or enough common characters per the character
+        postings (covers transposed/misspelled input). Everything else is
+        skipped without calling _fuzzy_match.
+        Candidates are scored in the original alias-then-name order so
+        tie-breaking matches the full scan.
+    """
+
+    def __init__(self) -> None:
+        # (key, code, kind) in original scan order: aliases first, then names
+        self.entries: list = [(alias, code, "alias") for alias, code in LANGUAGE_ALIASES.items()]
+        self.entries += [(name.lower(), code, "name") for code, (name, _) in LANGUAGES.items()]
+
+        self.codes: Dict[str, str] = {code.lower(): code for code in LANGUAGES}
+        self.prefixes: Dict[str, list] = {}
+        self.postings: Dict[str, list] = {}
+        self.chars: Dict[str, list] = {}
+        self.short: list = []
+
+        for idx, (key, _, _) in enumerate(self.entries):
+            for ch, count in Counter(key).items():
+                self.chars.setdefault(ch, []).append((idx, count))
+            if len(key) < 3:
+                self.short.append(idx)
+                continue
+            self.prefixes.setdefault(key[:3], []).append(idx)
+            for gram in _trigrams(key):
+                self.postings.setdefault(gram, []).append(idx)
+
+    def candidates(self, lang_lower: str) -> list:
+        """Get entry indices worth scoring for an input, in scan order."""
+        if len(lang_lower) < 3:
+            return list(range(len(self.entries)))
+
+        found = set(self.short)
+        found.update(self.prefixes.get(lang_lower[:3], ()))
+        for gram in _trigrams(lang_lower):
+            found.update(self.postings.get(gram, ()))
+
+        # Common-character count (multiset intersection) against every entry
+        common: Dict[int, int] = {}
+        for ch, count in Counter(lang_lower).items():
+            for idx, entry_count in self.chars.get(ch, ()):
+                common[idx] = common.get(idx, 0) + min(count, entry_count)
+        for idx, shared in common.items():
+            if shared >= 0.6 * max(len(lang_lower), len(self.entries[idx][0])):
+                found.add(idx)
+
+        return sorted(found)
+
+
+_language_index = _LanguageIndex()
+
+# Memoized fuzzy results: {input_lower: match or None}
+_SIMILAR_CACHE_MAX = 512
+_similar_cache: Dict[str, Optional[Tuple[str, str, str]]] = {}
+
+
 def find_similar_language(lang_input: str) -> Optional[Tuple[str, str, str]]:
     """Find a similar language to what the user typed using fuzzy matching."""
     lang_lower = lang_input.lower().strip()
@@ -236,47 +319,34 @@ def find_similar_language(lang_input: str) -> Optional[Tuple[str, str, str]]:
     if not lang_lower:
         return None
 
-    best_match = None
-    best_score = 0.0
-    match_type = None
-
     # Check exact matches in aliases first
     if lang_lower in LANGUAGE_ALIASES:
         code = LANGUAGE_ALIASES[lang_lower]
         name, flag = LANGUAGES[code]
-        logger.tree("Language Alias Match", [
-            ("Input", lang_input),
-            ("Alias", lang_lower),
-            ("Resolved", f"{name} ({code}) {flag}"),
-        ], emoji="🌐")
         return (code, name, flag)
 
     # Check exact matches in language codes
     if lang_lower in LANGUAGES:
         name, flag = LANGUAGES[lang_lower]
-        logger.tree("Language Code Match", [
-            ("Input", lang_input),
-            ("Code", lang_lower),
-            ("Language", f"{name} {flag}"),
-        ], emoji="🌐")
         return (lang_lower, name, flag)
 
-    # Fuzzy match against aliases (includes country names)
-    for alias, code in LANGUAGE_ALIASES.items():
-        score = _fuzzy_match(lang_lower, alias)
-        if score > best_score and score >= 0.6:
-            best_score = score
-            name, flag = LANGUAGES[code]
-            best_match = (code, name, flag)
-            match_type = ("alias", alias)
+    # Repeat lookups (and repeat typos) are answered without rescoring or logging
+    if lang_lower in _similar_cache:
+        return _similar_cache[lang_lower]
+
+    best_match = None
+    best_score = 0.0
+    match_type = None
 
-    # Fuzzy match against language names
-    for code, (name, flag) in LANGUAGES.items():
-        score = _fuzzy_match(lang_lower, name.lower())
+    # Score only indexed candidates, in the original alias-then-name order
+    for idx in _language_index.candidates(lang_lower):
+        key, code, kind = _language_index.entries[idx]
+        score = _fuzzy_match(lang_lower, key)
         if score > best_score and score >= 0.6:
             best_score = score
+            name, flag = LANGUAGES[code]
             best_match = (code, name, flag)
-            match_type = ("name", name)
+            match_type = (kind, key if kind == "alias" else name)
 
     if best_match:
         logger.tree("Language Fuzzy Match", [
@@ -291,6 +361,10 @@ def find_similar_language(lang_input: str) -> Optional[Tuple[str, str, str]]:
             ("Reason", "No match found"),
         ], emoji="⚠️")
 
+    if len(_similar_cache) >= _SIMILAR_CACHE_MAX:
+        _similar_cache.pop(next(iter(_similar_cache)))
+    _similar_cache[lang_lower] = best_match
+
     return best_match
 
 
@@ -327,15 +401,24 @@ class TranslateService:
         - Fallback: Google Translate (wider language support)
         - Optional: GPT-4o-mini for AI-enhanced translation with dialect awareness
         Supports fuzzy language matching (accepts typos, country names).
+        Caches successful translations per (text hash, source, target, engine).
+        Concurrent DeepL requests are coalesced into one multi-text call.
     """
 
     def __init__(self) -> None:
         """
         Initialize the translation service.
 
-        No setup required - APIs are called on-demand.
+        APIs are called on-demand. Results are cached in a bounded LRU
+        (persisted to SQLite), and language detection runs on a dedicated
+        worker thread so langdetect never blocks the event loop.
         """
-        pass
+        self.cache = TranslationCache()
+        # Single worker: langdetect's lazy profile loading isn't thread-safe
+        self._detect_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="langdetect")
+        self._detect_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.batcher = TranslationBatcher()
+        self.batcher.register("deepl", self._translate_deepl_batch)
 
     def resolve_language(self, lang_input: str) -> Optional[str]:
         """Resolve a language input to a language code using fuzzy matching."""
@@ -351,36 +434,18 @@ class TranslateService:
             ], emoji="⚠️")
             return None
 
-        # Exact match on language codes
+        # Exact or case-insensitive match on language codes
         if lang_input in LANGUAGES:
-            logger.tree("Language Resolved", [
-                ("Input", lang_input),
-                ("Type", "Exact code match"),
-                ("Code", lang_input),
-            ], emoji="✅")
             return lang_input
-
-        for code in LANGUAGES:
-            if code.lower() == lang_lower:
-                logger.tree("Language Resolved", [
-                    ("Input", lang_input),
-                    ("Type", "Case-insensitive code match"),
-                    ("Code", code),
-                ], emoji="✅")
-                return code
+        code = _language_index.codes.get(lang_lower)
+        if code:
+            return code
 
         # Exact match on aliases (includes country names)
         if lang_lower in LANGUAGE_ALIASES:
-            code = LANGUAGE_ALIASES[lang_lower]
-            name, flag = LANGUAGES[code]
-            logger.tree("Language Resolved", [
-                ("Input", lang_input),
-                ("Type", "Alias/country match"),
-                ("Resolved", f"{name} ({code}) {flag}"),
-            ], emoji="✅")
-            return code
+            return LANGUAGE_ALIASES[lang_lower]
 
-        # Fuzzy match using find_similar_language (logs internally)
+        # Fuzzy match using find_similar_language (memoized, logs on first miss)
         similar = find_similar_language(lang_input)
         if similar:
             return similar[0]  # Return the code
@@ -413,6 +478,73 @@ class TranslateService:
         except LangDetectException:
             return None
 
+    async def detect_language_async(self, text: str) -> Optional[str]:
+        """Detect the language of text off the event loop (memoized)."""
+        key = text_hash(text)
+        if key in self._detect_cache:
+            self._detect_cache.move_to_end(key)
+            return self._detect_cache[key]
+
+        loop = asyncio.get_running_loop()
+        detected = await loop.run_in_executor(self._detect_executor, self.detect_language, text)
+
+        self._detect_cache[key] = detected
+        if len(self._detect_cache) > DETECT_CACHE_MAX:
+            self._detect_cache.popitem(last=False)
+        return detected
+
+    def _cached_result(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        engine: str,
+    ) -> Optional[TranslationResult]:
+        """Build a TranslationResult from the cache, or None on miss."""
+        cached = self.cache.get(TranslationCache.make_key(text, source_lang, target_lang, engine))
+        if cached is None:
+            return None
+
+        translated, detected_source = cached
+        source_name, source_flag = self.get_language_info(detected_source)
+        target_name, target_flag = self.get_language_info(target_lang)
+
+        logger.tree("Translation Cache Hit", [
+            ("Engine", engine),
+            ("From", f"{source_name} {source_flag}"),
+            ("To", f"{target_name} {target_flag}"),
+        ], emoji="⚡")
+
+        return TranslationResult(
+            success=True,
+            original_text=text,
+            translated_text=translated,
+            source_lang=detected_source,
+            target_lang=target_lang,
+            source_name=source_name,
+            target_name=target_name,
+            source_flag=source_flag,
+            target_flag=target_flag,
+        )
+
+    async def _store_result(
+        self,
+        text: str,
+        source_lang: str,
+        engine: str,
+        result: TranslationResult,
+    ) -> None:
+        """Store a successful translation in the cache."""
+        if not result.success:
+            return
+        key = TranslationCache.make_key(text, source_lang, result.target_lang, engine)
+        try:
+            await asyncio.to_thread(self.cache.put, key, result.translated_text, result.source_lang)
+        except Exception as e:
+            logger.error_tree("Translation Cache Store Failed", e, [
+                ("Engine", engine),
+            ])
+
     async def translate(
         self,
         text: str,
@@ -439,9 +571,18 @@ class TranslateService:
         cleaned_text = strip_discord_tokens(text)
 
         if source_lang == "auto":
-            detected = self.detect_language(cleaned_text)
+            detected = await self.detect_language_async(cleaned_text)
             source_lang = detected or "auto"
 
+        # Serve repeat translations (pinned rules, announcements) from cache
+        engines = ("deepl", "google") if config.DEEPL_API_KEY else ("google",)
+        for engine in engines:
+            cached = await asyncio.to_thread(
+                self._cached_result, cleaned_text, source_lang, resolved_target, engine
+            )
+            if cached:
+                return cached
+
         logger.tree("Translating", [
             ("Text", cleaned_text[:50] + "..." if len(cleaned_text) > 50 else cleaned_text),
             ("From", source_lang),
@@ -452,10 +593,13 @@ class TranslateService:
         if config.DEEPL_API_KEY:
             result = await self._translate_deepl(cleaned_text, source_lang, resolved_target)
             if result.success:
+                await self._store_result(cleaned_text, source_lang, "deepl", result)
                 return result
 
         # Google Translate fallback
-        return await self._translate_google(cleaned_text, source_lang, resolved_target)
+        result = await self._translate_google(cleaned_text, source_lang, resolved_target)
+        await self._store_result(cleaned_text, source_lang, "google", result)
+        return result
 
 
     # DeepL language code mapping (DeepL uses different codes)
@@ -488,24 +632,56 @@ class TranslateService:
         "sv": "SV",
     }
 
+    def _error_result(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        error: str,
+    ) -> TranslationResult:
+        """Build a failed TranslationResult."""
+        return TranslationResult(
+            success=False,
+            original_text=text,
+            translated_text="",
+            source_lang=source_lang,
+            target_lang=target_lang,
+            source_name="",
+            target_name="",
+            source_flag="",
+            target_flag="",
+            error=error
+        )
+
     async def _translate_deepl(
         self,
         text: str,
         source_lang: str,
         target_lang: str
     ) -> TranslationResult:
-        """Translate using DeepL API (higher quality)."""
+        """Translate using DeepL API (coalesced with concurrent requests)."""
+        try:
+            return await self.batcher.submit("deepl", text, source_lang, target_lang)
+        except Exception as e:
+            return self._error_result(text, source_lang, target_lang, str(e))
+
+    async def _translate_deepl_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str
+    ) -> List[TranslationResult]:
+        """Translate several texts with one DeepL request (higher quality)."""
         # Map to DeepL language codes
         deepl_target = self.DEEPL_LANG_MAP.get(target_lang, target_lang.upper())
         deepl_source = self.DEEPL_LANG_MAP.get(source_lang) if source_lang != "auto" else None
 
         try:
-            params = {
-                "text": text,
-                "target_lang": deepl_target,
-            }
+            # DeepL accepts the text parameter repeated once per input
+            params = [("text", text) for text in texts]
+            params.append(("target_lang", deepl_target))
             if deepl_source:
-                params["source_lang"] = deepl_source
+                params.append(("source_lang", deepl_source))
 
             async with http_session.session.post(
                 "https://api-free.deepl.com/v2/translate",
@@ -517,132 +693,99 @@ class TranslateService:
                 timeout=aiohttp.ClientTimeout(total=15),
             ) as resp:
                 if resp.status != 200:
-                    error_text = await resp.text()
                     logger.tree("DeepL Unavailable", [
                         ("Status", str(resp.status)),
+                        ("Texts", str(len(texts))),
                         ("Fallback", "Google Translate"),
                     ], emoji="🔄")
-                    return TranslationResult(
-                        success=False,
-                        original_text=text,
-                        translated_text="",
-                        source_lang=source_lang,
-                        target_lang=target_lang,
-                        source_name="",
-                        target_name="",
-                        source_flag="",
-                        target_flag="",
-                        error=f"DeepL API error: {resp.status}"
-                    )
+                    return [
+                        self._error_result(text, source_lang, target_lang, f"DeepL API error: {resp.status}")
+                        for text in texts
+                    ]
 
                 data = await resp.json()
                 translations = data.get("translations", [])
-                if not translations:
-                    return TranslationResult(
-                        success=False,
-                        original_text=text,
-                        translated_text="",
-                        source_lang=source_lang,
-                        target_lang=target_lang,
-                        source_name="",
-                        target_name="",
-                        source_flag="",
-                        target_flag="",
-                        error="DeepL returned no translation"
-                    )
-
-                translated = translations[0].get("text", "")
-                detected_source = translations[0].get("detected_source_language", "").lower()
-
-                # Map DeepL detected language back to our codes
-                if detected_source == "he":
-                    detected_source = "iw"
-                elif detected_source == "nb":
-                    detected_source = "no"
-                elif detected_source == "zh":
-                    detected_source = "zh-CN"
-
-                if source_lang == "auto" and detected_source:
-                    source_lang = detected_source
-
-                source_name, source_flag = self.get_language_info(source_lang)
-                target_name, target_flag = self.get_language_info(target_lang)
-
-                # Verify DeepL actually returned the target language
-                # DeepL sometimes returns English when it can't translate to target
-                result_lang = self.detect_language(translated)
-                if result_lang and result_lang != target_lang:
-                    # Check if result is English but we wanted something else
-                    if result_lang == "en" and target_lang != "en":
-                        logger.tree("DeepL Wrong Language", [
-                            ("Expected", f"{target_name} ({target_lang})"),
-                            ("Got", f"English ({result_lang})"),
-                            ("Fallback", "Google Translate"),
-                        ], emoji="⚠️")
-                        return TranslationResult(
-                            success=False,
-                            original_text=text,
-                            translated_text="",
-                            source_lang=source_lang,
-                            target_lang=target_lang,
-                            source_name="",
-                            target_name="",
-                            source_flag="",
-                            target_flag="",
-                            error="DeepL returned wrong language"
-                        )
-
-                logger.tree("DeepL Translation Complete", [
-                    ("From", f"{source_name} {source_flag}"),
-                    ("To", f"{target_name} {target_flag}"),
-                    ("Chars Used", str(len(text))),
-                    ("Result Length", str(len(translated))),
-                ], emoji="✅")
-
-                return TranslationResult(
-                    success=True,
-                    original_text=text,
-                    translated_text=translated,
-                    source_lang=source_lang,
-                    target_lang=target_lang,
-                    source_name=source_name,
-                    target_name=target_name,
-                    source_flag=source_flag,
-                    target_flag=target_flag,
-                )
 
         except asyncio.TimeoutError:
             logger.tree("DeepL Timeout", [
-                ("Text Length", str(len(text))),
+                ("Texts", str(len(texts))),
+                ("Text Length", str(sum(len(t) for t in texts))),
             ], emoji="⏳")
-            return TranslationResult(
-                success=False,
-                original_text=text,
-                translated_text="",
-                source_lang=source_lang,
-                target_lang=target_lang,
-                source_name="",
-                target_name="",
-                source_flag="",
-                target_flag="",
-                error="DeepL request timed out"
-            )
+            return [
+                self._error_result(text, source_lang, target_lang, "DeepL request timed out")
+                for text in texts
+            ]
         except Exception as e:
             logger.error_tree("DeepL Translation Failed", e, [
-                ("Text", text[:50]),
+                ("Text", texts[0][:50]),
+                ("Texts", str(len(texts))),
             ])
-            return TranslationResult(
-                success=False,
-                original_text=text,
-                translated_text="",
-                source_lang=source_lang,
-                target_lang=target_lang,
-                source_name="",
-                target_name="",
-                source_flag="",
-                target_flag="",
-                error=str(e)
-            )
+            return [self._error_result(text, source_lang, target_lang, str(e)) for text in texts]
+
+        results = []
+        for i, text in enumerate(texts):
+            if i >= len(translations):
+                results.append(self._error_result(text, source_lang, target_lang, "DeepL returned no translation"))
+                continue
+            results.append(await self._build_deepl_result(text, translations[i], source_lang, target_lang))
+        return results
+
+    async def _build_deepl_result(
+        self,
+        text: str,
+        translation: dict,
+        source_lang: str,
+        target_lang: str
+    ) -> TranslationResult:
+        """Convert one entry of a DeepL response into a TranslationResult."""
+        translated = translation.get("text", "")
+        detected_source = translation.get("detected_source_language", "").lower()
+
+        # Map DeepL detected language back to our codes
+        if detected_source == "he":
+            detected_source = "iw"
+        elif detected_source == "nb":
+            detected_source = "no"
+        elif detected_source == "zh":
+            detected_source = "zh-CN"
+
+        if source_lang == "auto" and detected_source:
+            source_lang = detected_source
+
+        source_name, source_flag = self.get_language_info(source_lang)
+        target_name, target_flag = self.get_language_info(target_lang)
+
+        # Verify DeepL actually returned the target language
+        # DeepL sometimes returns English when it can't translate to target
+        result_lang = await self.detect_language_async(translated)
+        if result_lang and result_lang != target_lang:
+            # Check if result is English but we wanted something else
+            if result_lang == "en" and target_lang != "en":
+                logger.tree("DeepL Wrong Language", [
+                    ("Expected", f"{target_name} ({target_lang})"),
+                    ("Got", f"English ({result_lang})"),
+                    ("Fallback", "Google Translate"),
+                ], emoji="⚠️")
+                return self._error_result(text, source_lang, target_lang, "DeepL returned wrong language")
+
+        logger.tree("DeepL Translation Complete", [
+            ("From", f"{source_name} {source_flag}"),
+            ("To", f"{target_name} {target_flag}"),
+            ("Chars Used", str(len(text))),
+            ("Result Length", str(len(translated))),
+        ], emoji="✅")
+
+        return TranslationResult(
+            success=True,
+            original_text=text,
+            translated_text=translated,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            source_name=source_name,
+            target_name=target_name,
+            source_flag=source_flag,
+            target_flag=target_flag,
+        )
 
     # GoogleTranslator uses ISO codes, not legacy Google codes
     GOOGLE_LANG_MAP = {
@@ -663,7 +806,8 @@ class TranslateService:
 
         try:
             translator = GoogleTranslator(source=google_source, target=google_target)
-            translated = await asyncio.to_thread(translator.translate, text)
+            async with self.batcher.limit("google"):
+                translated = await asyncio.to_thread(translator.translate, text)
 
             source_name, source_flag = self.get_language_info(source_lang)
             target_name, target_flag = self.get_language_info(target_lang)
@@ -806,10 +950,14 @@ class TranslateService:
         target_name, target_flag = self.get_language_info(resolved_target)
 
         # Detect source language
-        detected = self.detect_language(text)
+        detected = await self.detect_language_async(text)
         source_lang = detected or "auto"
         source_name, source_flag = self.get_language_info(source_lang)
 
+        cached = await asyncio.to_thread(self._cached_result, text, source_lang, resolved_target, "ai")
+        if cached:
+            return cached
+
         logger.tree("AI Translating", [
             ("Text", text[:50] + "..." if len(text) > 50 else text),
             ("From", source_lang),
@@ -837,7 +985,7 @@ class TranslateService:
         system_prompt = self._build_ai_prompt(source_name, target_name, source_lang, resolved_target)
 
         try:
-            async with http_session.session.post(
+            async with self.batcher.limit("ai"), http_session.session.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {config.OPENAI_API_KEY}",
@@ -888,7 +1036,7 @@ class TranslateService:
                     ("Result Length", str(len(translated))),
                 ], emoji="✅")
 
-                return TranslationResult(
+                result = TranslationResult(
                     success=True,
                     original_text=text,
                     translated_text=translated,
@@ -899,6 +1047,8 @@ class TranslateService:
                     source_flag=source_flag,
                     target_flag=target_flag,
                 )
+                await self._store_result(text, source_lang, "ai", result)
+                return result
 
         except asyncio.TimeoutError:
             logger.tree("AI Translation Timeout", [
@@ -10,12 +10,12 @@ Server: discord.gg/syria
 
 import discord
 from discord import ui
-from typing import Optional
+from typing import Dict, Optional
 
 from src.core.logger import logger
 from src.core.config import config
 from src.core.colors import COLOR_GOLD, COLOR_SUCCESS, EMOJI_AI
-from src.services.translate.service import translate_service, LANGUAGES
+from src.services.translate.service import translate_service, TranslationResult, LANGUAGES
 
 
 # Priority languages for quick buttons
@@ -110,6 +110,8 @@ class TranslateView(ui.View):
         self.current_lang = current_lang
         self.source_lang = source_lang
         self.message: Optional[discord.Message] = None
+        # Languages already translated in this view: {lang_code: TranslationResult}
+        self._results: Dict[str, TranslationResult] = {}
 
         self._rebuild_buttons()
 
@@ -316,11 +318,17 @@ class TranslateView(ui.View):
 
         await interaction.response.defer()
 
-        result = await translate_service.translate(
-            self.original_text,
-            target_lang=target_lang,
-            source_lang="auto"
-        )
+        # Only the requested language is translated - flipping back to one
+        # already shown reuses its result instead of spending quota again
+        result = self._results.get(target_lang)
+        if result is None:
+            result = await translate_service.translate(
+                self.original_text,
+                target_lang=target_lang,
+                source_lang="auto"
+            )
+            if result.success:
+                self._results[target_lang] = result
 
         if not result.success:
             error_msg = "Translation failed. Please try again."
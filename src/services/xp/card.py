@@ -104,7 +104,7 @@ async def _check_render_restart() -> None:
         _render_count = 0
 
 
-async def _force_reset() -> None:
+async def reset_browser() -> None:
     """Force reset all browser state on crash. Closes old processes to prevent leaks."""
     global _browser, _context, _playwright, _render_count
 
@@ -213,7 +213,7 @@ async def _get_page(retry: bool = True) -> "Page":
     except PlaywrightError as e:
         error_msg = str(e).lower()
         if ("closed" in error_msg or "target" in error_msg) and retry:
-            await _force_reset()
+            await reset_browser()
             return await _get_page(retry=False)
         raise
 
@@ -237,6 +237,31 @@ async def _return_page(page: "Page") -> None:
                 pass
 
 
+# =============================================================================
+# Shared Render Context
+# =============================================================================
+
+async def get_render_context() -> "BrowserContext":
+    """
+    Browser context for a render on the shared browser.
+
+    Runs the idle and restart-after-N-renders checks first, like _get_page
+    does for pooled pages. Callers that manage their own pages (the card
+    template runtime) get the context here and call count_render() once
+    per screenshot.
+    """
+    await _check_idle_timeout()
+    await _check_render_restart()
+    return await _get_context()
+
+
+def count_render() -> int:
+    """Count one screenshot towards the periodic browser restart. Returns the count."""
+    global _render_count
+    _render_count += 1
+    return _render_count
+
+
 async def prewarm() -> None:
     """Pre-warm the Playwright browser so the first /rank card is fast."""
     try:
@@ -781,8 +806,7 @@ async def generate_rank_card(
             screenshot = await page.screenshot(type='png', omit_background=True)
 
             # Increment render count for memory management
-            global _render_count
-            _render_count += 1
+            renders = count_render()
 
             # Return page to pool instead of closing
             await _return_page(page)
@@ -794,7 +818,7 @@ async def generate_rank_card(
             logger.tree("Rank Card Generated", [
                 ("User", display_name),
                 ("Level", str(level)),
-                ("Renders", str(_render_count)),
+                ("Renders", str(renders)),
             ], emoji="🎨")
 
             return screenshot
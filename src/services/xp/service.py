@@ -25,7 +25,7 @@ import time
 from collections import OrderedDict
 from datetime import datetime, time as dt_time
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 import discord
 from discord.ext import tasks
@@ -34,6 +34,7 @@ from src.core.config import config
 from src.core.colors import COLOR_GOLD
 from src.core.constants import TIMEZONE_EST, XP_COOLDOWN_CACHE_MAX_SIZE, SECONDS_PER_HOUR, XP_MAX_LEVEL
 from src.utils.async_utils import create_safe_task
+from src.utils.cooldowns import Cooldown, cooldowns
 from src.core.logger import logger
 from src.services.database import db
 from src.services.birthday import has_birthday_bonus, BIRTHDAY_XP_MULTIPLIER
@@ -87,13 +88,15 @@ class XPService:
         self._voice_sessions: Dict[int, Dict[int, float]] = {}
         self._voice_sessions_lock: asyncio.Lock = asyncio.Lock()
 
-        # In-memory message cooldown cache: {(user_id, guild_id): timestamp}
-        # Uses OrderedDict for O(1) LRU eviction instead of O(n log n) sorting
+        # In-memory message cooldown: (user_id, guild_id)
         # Avoids DB query on every message - most will fail cooldown check
-        self._message_cooldowns: OrderedDict[tuple, int] = OrderedDict()
+        self._message_cooldowns = cooldowns.namespace(
+            "xp.message", Cooldown(config.XP_MESSAGE_COOLDOWN), max_keys=XP_COOLDOWN_CACHE_MAX_SIZE,
+        )
 
         # Track last message content per user to prevent duplicate spam
-        self._last_messages: Dict[tuple, str] = {}  # {(user_id, guild_id): content_hash}
+        # {(user_id, guild_id): (content_hash, timestamp)}, oldest first for O(1) eviction
+        self._last_messages: OrderedDict[tuple, Tuple[str, int]] = OrderedDict()
 
         # Track daily unique users to avoid duplicate DAU counts
         self._dau_cache: set = set()  # {(user_id, guild_id, date)}
@@ -236,40 +239,24 @@ class XPService:
         cache_key = (user_id, guild_id)
 
         async with self._cooldown_lock:
-            last_xp = self._message_cooldowns.get(cache_key, 0)
-
-            if now - last_xp < config.XP_MESSAGE_COOLDOWN:
+            if self._message_cooldowns.remaining(cache_key):
                 return  # Still on cooldown
 
             # Check for duplicate message (anti-spam) using hash for memory efficiency
             content_hash = hashlib.md5(
                 message.content.lower().strip().encode(), usedforsecurity=False
             ).hexdigest()[:16]  # 16 chars is enough for duplicate detection
-            last_hash = self._last_messages.get(cache_key)
-            if last_hash and last_hash == content_hash:
+            last = self._last_messages.get(cache_key)
+            if last and last[0] == content_hash:
                 return  # Same message as before, no XP
 
             # Update last message tracker with hash (not full content)
-            self._last_messages[cache_key] = content_hash
-
-            # Update cache - move to end for LRU ordering
-            if cache_key in self._message_cooldowns:
-                self._message_cooldowns.move_to_end(cache_key)
-            self._message_cooldowns[cache_key] = now
-
-            # Hard limit enforcement - O(1) eviction using OrderedDict
-            # Evict oldest entries (front of OrderedDict) when over limit
-            evicted = 0
-            while len(self._message_cooldowns) > XP_COOLDOWN_CACHE_MAX_SIZE:
-                oldest_key, _ = self._message_cooldowns.popitem(last=False)  # O(1)
-                self._last_messages.pop(oldest_key, None)
-                evicted += 1
-
-            if evicted > 0:
-                logger.tree("XP Cache LRU Eviction", [
-                    ("Evicted", str(evicted)),
-                    ("Size", str(len(self._message_cooldowns))),
-                ], emoji="🧹")
+            self._last_messages[cache_key] = (content_hash, now)
+            self._last_messages.move_to_end(cache_key)
+            if len(self._last_messages) > XP_COOLDOWN_CACHE_MAX_SIZE:
+                self._last_messages.popitem(last=False)  # O(1)
+
+            self._message_cooldowns.record(cache_key)
 
         # Calculate XP with potential multipliers
         base_xp = random.randint(config.XP_MESSAGE_MIN, config.XP_MESSAGE_MAX)
@@ -644,7 +631,7 @@ class XPService:
                 await asyncio.sleep(SECONDS_PER_HOUR)
 
                 now = time.time()
-                cleaned = {"mute": 0, "cooldowns": 0, "dau": 0}
+                cleaned = {"mute": 0, "messages": 0, "dau": 0}
 
                 # Clean stale mute timestamps (> 2 hours old)
                 # These can accumulate if voice events are missed
@@ -657,16 +644,16 @@ class XPService:
                     self._mute_timestamps.pop(uid, None)
                     cleaned["mute"] += 1
 
-                # Clean old cooldown entries (> cooldown period)
+                # Clean old duplicate-message hashes (> cooldown period)
                 # Remove from front of OrderedDict (oldest first) until we hit valid entries
+                # (cooldowns themselves expire inside the cooldown engine)
                 cooldown_cutoff = now - config.XP_MESSAGE_COOLDOWN
-                while self._message_cooldowns:
+                while self._last_messages:
                     # Peek at oldest entry (first item)
-                    oldest_key = next(iter(self._message_cooldowns))
-                    if self._message_cooldowns[oldest_key] <= cooldown_cutoff:
-                        self._message_cooldowns.popitem(last=False)  # O(1)
-                        self._last_messages.pop(oldest_key, None)
-                        cleaned["cooldowns"] += 1
+                    oldest_key = next(iter(self._last_messages))
+                    if self._last_messages[oldest_key][1] <= cooldown_cutoff:
+                        self._last_messages.popitem(last=False)  # O(1)
+                        cleaned["messages"] += 1
                     else:
                         break  # All remaining entries are valid
 
@@ -681,9 +668,9 @@ class XPService:
                 if any(v > 0 for v in cleaned.values()):
                     logger.tree("XP Cache Cleanup (Hourly)", [
                         ("Mute Timestamps", str(cleaned["mute"])),
-                        ("Cooldowns + Messages", str(cleaned["cooldowns"])),
+                        ("Message Hashes", str(cleaned["messages"])),
                         ("DAU Entries", str(cleaned["dau"])),
-                        ("Remaining", f"{len(self._message_cooldowns)} cooldowns, {len(self._mute_timestamps)} mutes, {len(self._dau_cache)} dau"),
+                        ("Remaining", f"{len(self._message_cooldowns)} cooldowns, {len(self._last_messages)} hashes, {len(self._mute_timestamps)} mutes, {len(self._dau_cache)} dau"),
                     ], emoji="🧹")
 
             except asyncio.CancelledError:
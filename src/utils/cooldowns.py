@@ -0,0 +1,272 @@
+"""
+SyriaBot - Cooldown Engine
+==========================
+
+Shared in-memory cooldowns and anti-spam limits.
+
+Every handler used to keep its own {key: timestamp} dict with its own
+cleanup (sorting the dict, rebuilding it, or scanning it hourly). Here
+each use gets a namespace with a policy, and expired keys are reclaimed a
+few at a time as the namespace is used.
+
+Usage:
+    from src.utils.cooldowns import Cooldown, cooldowns
+
+    _action_cooldowns = cooldowns.namespace("action", Cooldown(60), max_keys=500)
+
+    remaining = _action_cooldowns.hit(user_id)   # check-and-set
+    if remaining:
+        ...  # on cooldown for `remaining` more seconds
+
+Author: حَـــــنَّـــــا
+Server: discord.gg/syria
+"""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from src.core.constants import COOLDOWN_EXPIRE_BATCH, COOLDOWN_MAX_KEYS
+
+
+# =============================================================================
+# Policies
+# =============================================================================
+
+@dataclass(frozen=True)
+class Cooldown:
+    """One use, then wait `seconds`. State: time of last use."""
+    seconds: float
+
+    @property
+    def ttl(self) -> float:
+        return self.seconds
+
+    def wait(self, state: Optional[float], now: float) -> float:
+        return 0.0 if state is None else max(0.0, state + self.seconds - now)
+
+    def consume(self, state: Optional[float], now: float) -> float:
+        return now
+
+
+@dataclass(frozen=True)
+class SlidingWindow:
+    """At most `limit` uses in any `window` seconds. State: deque of use times."""
+    limit: int
+    window: float
+
+    @property
+    def ttl(self) -> float:
+        return self.window
+
+    def _prune(self, state: Deque[float], now: float) -> None:
+        cutoff = now - self.window
+        while state and state[0] <= cutoff:
+            state.popleft()
+
+    def wait(self, state: Optional[Deque[float]], now: float) -> float:
+        if state is None:
+            return 0.0
+        self._prune(state, now)
+        if len(state) < self.limit:
+            return 0.0
+        return state[0] + self.window - now
+
+    def consume(self, state: Optional[Deque[float]], now: float) -> Deque[float]:
+        if state is None:
+            state = deque(maxlen=self.limit)
+        self._prune(state, now)
+        state.append(now)
+        return state
+
+
+@dataclass(frozen=True)
+class TokenBucket:
+    """Bursts of up to `capacity`, refilled at `rate` per second. State: (tokens, updated)."""
+    capacity: float
+    rate: float
+
+    @property
+    def ttl(self) -> float:
+        # An untouched bucket is full again by then, i.e. indistinguishable from no state
+        return self.capacity / self.rate
+
+    def _tokens(self, state: Optional[Tuple[float, float]], now: float) -> float:
+        if state is None:
+            return self.capacity
+        tokens, updated = state
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def wait(self, state: Optional[Tuple[float, float]], now: float) -> float:
+        tokens = self._tokens(state, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def consume(self, state: Optional[Tuple[float, float]], now: float) -> Tuple[float, float]:
+        return max(0.0, self._tokens(state, now) - 1), now
+
+
+# =============================================================================
+# Namespace
+# =============================================================================
+
+class CooldownNamespace:
+    """
+    Keys of one kind under one policy.
+
+    DESIGN:
+        An expiring LRU: an OrderedDict of key -> [expires_at, state] where
+        every write moves the key to the end and sets expires_at to
+        now + policy.ttl. The TTL is fixed per namespace and the clock is
+        monotonic, so the dict is always in expiry order and expired keys
+        sit at the front. Each write reclaims at most COOLDOWN_EXPIRE_BATCH
+        of them, which outpaces the one key a write can add, without ever
+        scanning or sorting the whole namespace; an expired key not yet
+        reclaimed simply reads as absent. max_keys bounds memory by
+        dropping the least recently written key. All operations are O(1)
+        amortized and synchronous, so a check-and-set can never be
+        interleaved by another coroutine.
+    """
+
+    __slots__ = ("name", "policy", "max_keys", "_clock", "_entries", "_ttl", "_wait", "_consume",
+                 "allowed", "denied", "expired", "evicted")
+
+    def __init__(
+        self,
+        name: str,
+        policy: Any,
+        max_keys: int = COOLDOWN_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.policy = policy
+        self.max_keys = max_keys
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        # Bound once: these run on every check
+        self._ttl = policy.ttl
+        self._wait = policy.wait
+        self._consume = policy.consume
+        self.allowed = 0
+        self.denied = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _state(self, key: Hashable, now: float) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def _store(self, key: Hashable, state: Any, now: float) -> None:
+        entries = self._entries
+
+        # Reclaim a few expired keys from the front on every write
+        for _ in range(COOLDOWN_EXPIRE_BATCH):
+            if not entries:
+                break
+            oldest = next(iter(entries))
+            if entries[oldest][0] > now:
+                break
+            del entries[oldest]
+            self.expired += 1
+
+        entry = entries.get(key)
+        if entry is None:
+            entries[key] = [now + self._ttl, state]
+            if len(entries) > self.max_keys:
+                entries.popitem(last=False)
+                self.evicted += 1
+        else:
+            entry[0] = now + self._ttl
+            entry[1] = state
+            entries.move_to_end(key)
+
+    def hit(self, key: Hashable) -> float:
+        """
+        Check-and-set: use the key if the policy allows it.
+
+        Returns:
+            0.0 if allowed (and recorded), else seconds until it would be.
+        """
+        now = self._clock()
+        entry = self._entries.get(key)
+        state = None if entry is None or entry[0] <= now else entry[1]
+        remaining = self._wait(state, now)
+        if remaining > 0:
+            self.denied += 1
+            return remaining
+        self._store(key, self._consume(state, now), now)
+        self.allowed += 1
+        return 0.0
+
+    def remaining(self, key: Hashable) -> float:
+        """Seconds until the key may be used (0.0 = now), without using it."""
+        now = self._clock()
+        return self._wait(self._state(key, now), now)
+
+    def record(self, key: Hashable) -> None:
+        """Record a use unconditionally (for cooldowns applied only after success)."""
+        now = self._clock()
+        self._store(key, self._consume(self._state(key, now), now), now)
+
+    def reset(self, key: Hashable) -> None:
+        """Forget a key (e.g. the command didn't actually run)."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._entries),
+            "max_keys": self.max_keys,
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+class CooldownEngine:
+    """Registry of cooldown namespaces, so every limit in the bot is in one place."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._namespaces: Dict[str, CooldownNamespace] = {}
+
+    def namespace(self, name: str, policy: Any, max_keys: int = COOLDOWN_MAX_KEYS) -> CooldownNamespace:
+        """Get or create a namespace. Re-registering a name with another policy is an error."""
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = CooldownNamespace(name, policy, max_keys, self._clock)
+            self._namespaces[name] = ns
+        elif ns.policy != policy:
+            raise ValueError(f"Cooldown namespace {name!r} already registered with {ns.policy!r}")
+        return ns
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: ns.get_stats() for name, ns in self._namespaces.items()}
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+cooldowns = CooldownEngine()
+
+__all__ = [
+    "Cooldown",
+    "CooldownEngine",
+    "CooldownNamespace",
+    "SlidingWindow",
+    "TokenBucket",
+    "cooldowns",
+]
@@ -0,0 +1,18 @@
+"""
+Shared test setup.
+
+Puts the repo root on sys.path and points the database at a throwaway
+file, before any service module opens data/syria.db.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.config import config  # noqa: E402
+
+_DB_DIR = Path(tempfile.mkdtemp(prefix="syria-tests-"))
+object.__setattr__(config, "DATABASE_PATH", str(_DB_DIR / "syria.db"))
@@ -0,0 +1,74 @@
+"""
+Offline stand-in for the action GIF providers.
+
+An aiohttp.web app that mimics the four provider APIs and a CDN serving
+distinct synthetic GIFs, with configurable latency and an optional
+failing primary. Used by tests/test_action_gif_pool.py and by
+scripts/bench_action_gifs.py.
+"""
+
+import asyncio
+import random
+from typing import List
+
+from aiohttp import web
+
+from src.services.actions.pool import GifProvider, default_providers
+from src.services.actions.service import (
+    NEKOS_BEST_ACTIONS,
+    OTAKUGIFS_ACTIONS,
+    PURRBOT_ACTIONS,
+)
+
+
+# =============================================================================
+# Fake Providers
+# =============================================================================
+
+def fake_server(latency_ms: float, primary_down: bool) -> web.Application:
+    """Four provider APIs plus a CDN serving distinct synthetic GIFs."""
+    rng = random.Random(0)
+    delay = latency_ms / 1000
+
+    async def gif_url(request: web.Request) -> str:
+        return f"http://{request.host}/cdn/{rng.randrange(10_000)}.gif"
+
+    async def nekos_best(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        if primary_down:
+            return web.Response(status=503)
+        return web.json_response({"results": [{"url": await gif_url(request)}]})
+
+    async def purrbot(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({"error": False, "link": await gif_url(request)})
+
+    async def plain(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({"url": await gif_url(request)})
+
+    async def cdn(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        seed = int(request.match_info["name"])
+        body = b"GIF89a" + random.Random(seed).randbytes(300_000)
+        return web.Response(body=body, content_type="image/gif")
+
+    app = web.Application()
+    app.router.add_get("/nekos/{endpoint}", nekos_best)
+    app.router.add_get("/purrbot/{endpoint}/gif", purrbot)
+    app.router.add_get("/otakugifs", plain)
+    app.router.add_get("/waifu/{endpoint}", plain)
+    app.router.add_get("/cdn/{name}.gif", cdn)
+    return app
+
+
+def providers(base: str) -> List[GifProvider]:
+    return default_providers(
+        base + "/nekos",
+        base + "/purrbot",
+        base + "/otakugifs",
+        base + "/waifu",
+        frozenset(NEKOS_BEST_ACTIONS),
+        frozenset(PURRBOT_ACTIONS),
+        frozenset(OTAKUGIFS_ACTIONS),
+    )
@@ -0,0 +1,165 @@
+"""
+Golden cases and reference matcher for the FAQ topic matcher.
+
+GOLDEN lists expected (topic, was_fuzzy) results. ReferenceMatcher is the
+per-pattern loop and Levenshtein scan the auto-responder ran before
+FAQMatcher. build_corpus mixes the golden questions with chatter and
+injects typos. Used by tests/test_faq_matcher.py and by
+scripts/bench_faq_matcher.py.
+"""
+
+import random
+import re
+from typing import List, Optional, Tuple
+
+from src.handlers.faq import FAQ_PATTERNS, FUZZY_KEYWORDS
+
+
+# =============================================================================
+# Golden Cases
+# =============================================================================
+
+GOLDEN: List[Tuple[str, Optional[str], bool]] = [
+    ("how do i get xp in this server?", "xp", False),
+    ("How does the leveling system work?", "xp", False),
+    ("how to earn level fast", "xp", False),
+    ("how do i get a custom role", "roles", False),
+    ("where can i buy a role?", "roles", False),
+    ("how do i create a private vc", "tempvoice", False),
+    ("how does temp voice work?", "tempvoice", False),
+    ("what is tempvoice", "tempvoice", False),
+    ("how do i report someone here", "report", False),
+    ("how do we contact the mods?", "report", False),
+    ("how do i send an anonymous confession", "confess", False),
+    ("where can i confess?", "confess", False),
+    ("how do i earn coins", "economy", False),
+    ("where can i check my balance", "economy", False),
+    ("how do i play the casino", "casino", False),
+    ("how to play blackjack?", "casino", False),
+    ("what is the server invite link?", "invite", False),
+    ("can i have the invite link", "invite", False),
+    ("how do i request a partnership", "partnership", False),
+    ("can partner with this server?", "partnership", False),
+    # Typos that only match after correction
+    ("how does tempvocie work?", "tempvoice", True),
+    ("how does the casnio work", "casino", True),
+    ("how do i earn monney", "economy", True),
+    ("how does the economi system work", "economy", True),
+    ("how do i reprot someone", "report", True),
+    ("how do i get a custom rple", "roles", True),
+    # Corrected to the canonical "partner", which no pattern asks for
+    ("how does the partnershp work?", None, False),
+    # Earlier topics win when several match
+    ("how do i get xp and how do i get a role", "xp", False),
+    ("how do i get a role or how to earn xp", "xp", False),
+    # Nothing to match
+    ("what time is it in damascus?", None, False),
+    ("how is everyone doing today", None, False),
+    ("where is the nearest falafel place?", None, False),
+]
+
+
+# =============================================================================
+# Reference Matcher (before the compiled matcher)
+# =============================================================================
+
+def _levenshtein(s1: str, s2: str) -> int:
+    if len(s1) < len(s2):
+        return _levenshtein(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    prev_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        curr_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            curr_row.append(min(prev_row[j + 1] + 1, curr_row[j] + 1, prev_row[j] + (c1 != c2)))
+        prev_row = curr_row
+    return prev_row[-1]
+
+
+def _fuzzy_correct(text: str) -> str:
+    corrected = []
+    for word in text.lower().split():
+        if len(word) < 4:
+            corrected.append(word)
+            continue
+        best_match, best_distance = word, float("inf")
+        for correct, variants in FUZZY_KEYWORDS.items():
+            for variant in variants:
+                if abs(len(word) - len(variant)) > 2:
+                    continue
+                distance = _levenshtein(word, variant)
+                threshold = 1 if len(variant) <= 5 else 2
+                if distance <= threshold and distance < best_distance:
+                    best_distance, best_match = distance, correct
+        corrected.append(best_match)
+    return " ".join(corrected)
+
+
+class ReferenceMatcher:
+    """The per-pattern loop FAQAutoResponder used to run for every message."""
+
+    def __init__(self) -> None:
+        self._compiled = {
+            topic: [re.compile(p, re.IGNORECASE) for p in patterns]
+            for topic, patterns in FAQ_PATTERNS.items()
+        }
+
+    def _search(self, text: str) -> Optional[str]:
+        for topic, patterns in self._compiled.items():
+            for pattern in patterns:
+                if pattern.search(text):
+                    return topic
+        return None
+
+    def match(self, content: str) -> Tuple[Optional[str], bool]:
+        topic = self._search(content)
+        if not topic:
+            corrected = _fuzzy_correct(content)
+            if corrected != content.lower():
+                topic = self._search(corrected)
+        if not topic:
+            return None, False
+        # handle() then corrected and searched every pattern again for was_fuzzy
+        corrected = _fuzzy_correct(content)
+        was_fuzzy = corrected != content.lower() and self._search(content) is None
+        return topic, was_fuzzy
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+_CHATTER = [
+    "what is going on in general chat", "how was your day", "can we play something later?",
+    "where did everyone go?", "what is this emoji called", "how old is this server",
+    "what song is playing in the music channel", "how do you say hello in arabic",
+    "where are you from?", "what happened to the old announcements channel",
+    "how long until the next event?", "can i dm you about the tournament",
+]
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    if len(word) < 4:
+        return word
+    i = rng.randrange(len(word) - 1)
+    op = rng.randrange(3)
+    if op == 0:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if op == 1:
+        return word[:i] + word[i + 1:]
+    return word[:i] + rng.choice("aeiourstn") + word[i:]
+
+
+def build_corpus(size: int, seed: int) -> List[str]:
+    """Golden questions and chatter, about a third with one typo injected."""
+    rng = random.Random(seed)
+    base = [text for text, _, _ in GOLDEN] + _CHATTER
+    corpus = []
+    for _ in range(size):
+        words = rng.choice(base).split()
+        if rng.random() < 0.35:
+            k = rng.randrange(len(words))
+            words[k] = _typo(words[k], rng)
+        corpus.append(" ".join(words))
+    return corpus
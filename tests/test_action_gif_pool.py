@@ -0,0 +1,165 @@
+"""
+Offline tests for the action GIF pool.
+
+A local aiohttp.web server (fake_server from tests/fake_gif_providers.py)
+stands in for the four provider APIs and their CDN, so refills, provider
+benching and serving with every provider down run without the network.
+"""
+
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+
+from fake_gif_providers import fake_server, providers
+from src.core.constants import ACTION_GIF_POOL_SIZE, ACTION_PROVIDER_FAILURES
+from src.services.actions import pool as pool_module
+from src.services.actions.pool import ActionGifPool
+from src.utils.http import http_session
+
+
+async def _with_server(primary_down: bool, body) -> None:
+    """Run body(runner, base) against a fresh fake provider server."""
+    runner = web.AppRunner(fake_server(0, primary_down))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    try:
+        await body(runner, base)
+    finally:
+        await runner.cleanup()
+        # The session is bound to this test's event loop
+        await http_session.close()
+
+
+# =============================================================================
+# Serving
+# =============================================================================
+
+def test_warm_pool_serves_bytes_with_every_provider_down(tmp_path: Path):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await pool._refill("hug")
+        assert pool.get_stats()["gifs"] == ACTION_GIF_POOL_SIZE
+
+        await pool.close()
+        await runner.cleanup()
+        for _ in range(3 * ACTION_GIF_POOL_SIZE):
+            buf, source = await pool.get_bytes("hug")
+            assert source == "pool"
+            assert buf.getvalue().startswith(b"GIF89a")
+        assert pool.misses == 0
+
+    asyncio.run(_with_server(False, body))
+
+
+def test_pooled_url_points_at_provider_cdn(tmp_path: Path):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await pool._refill("hug")
+        await pool.close()
+        url, source = await pool.get_url("hug")
+        assert source == "pool"
+        assert url.startswith(base + "/cdn/")
+
+    asyncio.run(_with_server(False, body))
+
+
+def test_missing_file_is_dropped_and_next_gif_served(tmp_path: Path, monkeypatch):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await pool._refill("hug")
+        await pool.close()
+        victim = pool._pools["hug"][0]
+        pool._path(victim.digest).unlink()
+
+        # Pick the victim whenever it is a candidate, so it is hit on the first serve
+        monkeypatch.setattr(pool_module.random, "choice", lambda seq: victim if victim in seq else seq[0])
+        buf, source = await pool.get_bytes("hug")
+        assert source == "pool"
+        assert buf.getvalue().startswith(b"GIF89a")
+        assert victim not in pool._pools["hug"]
+        assert len(pool._pools["hug"]) == ACTION_GIF_POOL_SIZE - 1
+        assert (await pool.get_bytes("hug"))[1] == "pool"
+        assert pool.misses == 0
+
+    asyncio.run(_with_server(False, body))
+
+
+def test_empty_pool_with_every_provider_down_returns_none(tmp_path: Path):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await runner.cleanup()
+        assert await pool.get_bytes("hug") is None
+        assert await pool.get_url("hug") is None
+        assert pool.misses == 2
+
+    asyncio.run(_with_server(False, body))
+
+
+# =============================================================================
+# Provider Health
+# =============================================================================
+
+def test_failing_primary_is_benched_and_chain_falls_through(tmp_path: Path):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await pool._refill("hug")
+        stats = pool.get_stats()
+        assert stats["gifs"] == ACTION_GIF_POOL_SIZE
+
+        # 503s count against nekos.best until it is benched, then it is skipped
+        nekos = stats["providers"]["nekos.best"]
+        assert nekos["benched"]
+        assert nekos["failures"] == ACTION_PROVIDER_FAILURES
+        assert nekos["successes"] == 0
+        fallbacks = [h for name, h in stats["providers"].items() if name != "nekos.best"]
+        assert sum(h["successes"] for h in fallbacks) == ACTION_GIF_POOL_SIZE
+        assert "nekos.best" not in [p.name for p in pool._candidates("hug")]
+
+    asyncio.run(_with_server(True, body))
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+def test_manifest_survives_reload(tmp_path: Path):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await pool._refill("hug")
+        await pool._refill("pat")
+        await pool.close()
+        await runner.cleanup()
+
+        reloaded = ActionGifPool(providers(base), store_dir=tmp_path)
+        reloaded._pools = await asyncio.to_thread(reloaded._load_manifest)
+        for endpoint in ("hug", "pat"):
+            assert [(g.digest, g.url, g.size) for g in reloaded._pools[endpoint]] == [
+                (g.digest, g.url, g.size) for g in pool._pools[endpoint]
+            ]
+        await reloaded.close()
+        assert (await reloaded.get_bytes("pat"))[1] == "pool"
+
+    asyncio.run(_with_server(False, body))
+
+
+def test_reload_drops_orphans_and_missing_files(tmp_path: Path):
+    async def body(runner: web.AppRunner, base: str) -> None:
+        pool = ActionGifPool(providers(base), store_dir=tmp_path)
+        await pool._refill("hug")
+        await pool.close()
+        gone = pool._pools["hug"][0]
+        pool._path(gone.digest).unlink()
+        (tmp_path / "orphan.gif").write_bytes(b"GIF89a")
+        (tmp_path / "leftover.tmp").write_bytes(b"")
+
+        reloaded = ActionGifPool(providers(base), store_dir=tmp_path)
+        reloaded._pools = await asyncio.to_thread(reloaded._load_manifest)
+        assert gone.digest not in {g.digest for g in reloaded._pools["hug"]}
+        assert len(reloaded._pools["hug"]) == ACTION_GIF_POOL_SIZE - 1
+        assert not (tmp_path / "orphan.gif").exists()
+        assert not (tmp_path / "leftover.tmp").exists()
+
+    asyncio.run(_with_server(False, body))
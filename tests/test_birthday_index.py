@@ -0,0 +1,95 @@
+"""
+Tests for the birthday calendar index: leap days, the server timezone
+and role expiry order.
+"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.services.birthday.index import (
+    BIRTHDAY_ROLE_DURATION,
+    BirthdayIndex,
+    celebrated_keys,
+    local_date,
+)
+
+
+# =============================================================================
+# Leap Day
+# =============================================================================
+
+@pytest.mark.parametrize("year", [2025, 2026, 2027, 2100])
+def test_leap_birthday_celebrated_on_feb_28_in_common_years(year):
+    assert celebrated_keys(date(year, 2, 28)) == [(2, 28), (2, 29)]
+    assert celebrated_keys(date(year, 3, 1)) == [(3, 1)]
+
+
+@pytest.mark.parametrize("year", [2024, 2028, 2000])
+def test_leap_birthday_celebrated_on_feb_29_in_leap_years(year):
+    assert celebrated_keys(date(year, 2, 28)) == [(2, 28)]
+    assert celebrated_keys(date(year, 2, 29)) == [(2, 29)]
+
+
+def test_leap_birthday_celebrated_once_per_year():
+    index = BirthdayIndex()
+    index.add(1, 2, 29)
+    index.add(2, 2, 28)
+    for year in range(2023, 2030):
+        days = [date.fromordinal(o) for o in range(date(year, 1, 1).toordinal(), date(year + 1, 1, 1).toordinal())]
+        assert sum(1 in index.birthdays_on(d) for d in days) == 1
+        assert sum(2 in index.birthdays_on(d) for d in days) == 1
+
+
+# =============================================================================
+# Timezone
+# =============================================================================
+
+def test_local_date_before_midnight_in_new_york():
+    # 03:30 UTC on Mar 15 is still Mar 14 in New York (EDT, UTC-4)
+    assert local_date(datetime(2026, 3, 15, 3, 30, tzinfo=timezone.utc)) == date(2026, 3, 14)
+    # 04:30 UTC in winter is still the previous day too (EST, UTC-5)
+    assert local_date(datetime(2026, 1, 10, 4, 30, tzinfo=timezone.utc)) == date(2026, 1, 9)
+
+
+def test_local_date_after_midnight_in_new_york():
+    assert local_date(datetime(2026, 3, 15, 4, 30, tzinfo=timezone.utc)) == date(2026, 3, 15)
+    assert local_date(datetime(2026, 1, 10, 5, 30, tzinfo=timezone.utc)) == date(2026, 1, 10)
+
+
+def test_local_date_leap_day_boundary():
+    # 02:00 UTC on Mar 1 2028 is still Feb 29 in New York
+    moment = datetime(2028, 3, 1, 2, 0, tzinfo=timezone.utc)
+    assert local_date(moment) == date(2028, 2, 29)
+    assert celebrated_keys(local_date(moment)) == [(2, 29)]
+
+
+def test_local_date_rejects_naive_datetime():
+    with pytest.raises(ValueError):
+        local_date(datetime(2026, 3, 15, 3, 30))
+
+
+# =============================================================================
+# Role Expiry
+# =============================================================================
+
+def test_expiries_pop_in_order():
+    index = BirthdayIndex()
+    index.grant(1, 300)
+    index.grant(2, 100)
+    index.grant(3, 200)
+    assert index.next_expiry() == 100 + BIRTHDAY_ROLE_DURATION
+    assert index.pop_expired(200 + BIRTHDAY_ROLE_DURATION) == [2, 3]
+    assert index.active() == [1]
+
+
+def test_cleared_and_regranted_roles_skip_stale_heap_entries():
+    index = BirthdayIndex()
+    index.grant(1, 100)
+    index.grant(2, 150)
+    index.clear(1)
+    index.grant(2, 500)  # Regranted: the 150 entry is stale
+    assert index.next_expiry() == 500 + BIRTHDAY_ROLE_DURATION
+    assert index.pop_expired(400 + BIRTHDAY_ROLE_DURATION) == []
+    assert index.pop_expired(500 + BIRTHDAY_ROLE_DURATION) == [2]
+    assert index.next_expiry() is None
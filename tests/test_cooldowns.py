@@ -0,0 +1,198 @@
+"""
+Tests for the cooldown engine: each policy, expiry reclaim order and the
+max_keys bound, all driven by an injected clock.
+"""
+
+import pytest
+
+from src.core.constants import COOLDOWN_EXPIRE_BATCH
+from src.utils.cooldowns import (
+    Cooldown,
+    CooldownEngine,
+    CooldownNamespace,
+    SlidingWindow,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# =============================================================================
+# Cooldown
+# =============================================================================
+
+def test_cooldown_blocks_until_elapsed(clock):
+    ns = CooldownNamespace("test", Cooldown(5), clock=clock)
+    assert ns.hit(1) == 0.0
+    assert ns.hit(1) == pytest.approx(5.0)
+    clock.advance(3)
+    assert ns.hit(1) == pytest.approx(2.0)
+    assert ns.remaining(1) == pytest.approx(2.0)
+    clock.advance(2)
+    assert ns.hit(1) == 0.0
+    assert (ns.allowed, ns.denied) == (2, 2)
+
+
+def test_cooldown_keys_are_independent(clock):
+    ns = CooldownNamespace("test", Cooldown(5), clock=clock)
+    assert ns.hit(1) == 0.0
+    assert ns.hit(2) == 0.0
+    assert ns.hit(1) > 0
+
+
+def test_denied_hit_does_not_extend_cooldown(clock):
+    ns = CooldownNamespace("test", Cooldown(5), clock=clock)
+    ns.hit(1)
+    clock.advance(4)
+    ns.hit(1)
+    clock.advance(1)
+    assert ns.hit(1) == 0.0
+
+
+def test_record_remaining_and_reset(clock):
+    ns = CooldownNamespace("test", Cooldown(10), clock=clock)
+    assert ns.remaining(1) == 0.0
+    ns.record(1)
+    assert ns.remaining(1) == pytest.approx(10.0)
+    ns.reset(1)
+    assert ns.remaining(1) == 0.0
+    assert ns.hit(1) == 0.0
+
+
+# =============================================================================
+# Sliding Window
+# =============================================================================
+
+def test_sliding_window_allows_limit_per_window(clock):
+    ns = CooldownNamespace("test", SlidingWindow(limit=3, window=10), clock=clock)
+    for _ in range(3):
+        assert ns.hit(1) == 0.0
+        clock.advance(1)
+    # Oldest use was at t=0, so the window frees up at t=10 (now t=3)
+    assert ns.hit(1) == pytest.approx(7.0)
+    clock.advance(7)
+    assert ns.hit(1) == 0.0
+    # Uses at t=1, 2, 10: the next frees up at t=11
+    assert ns.hit(1) == pytest.approx(1.0)
+
+
+def test_sliding_window_forgets_old_uses(clock):
+    ns = CooldownNamespace("test", SlidingWindow(limit=2, window=5), clock=clock)
+    ns.hit(1)
+    ns.hit(1)
+    clock.advance(5)
+    assert ns.hit(1) == 0.0
+    assert ns.hit(1) == 0.0
+    assert ns.hit(1) > 0
+
+
+# =============================================================================
+# Token Bucket
+# =============================================================================
+
+def test_token_bucket_bursts_then_refills(clock):
+    ns = CooldownNamespace("test", TokenBucket(capacity=3, rate=0.5), clock=clock)
+    for _ in range(3):
+        assert ns.hit(1) == 0.0
+    # Empty: one token takes 1 / 0.5 = 2 seconds
+    assert ns.hit(1) == pytest.approx(2.0)
+    clock.advance(1)
+    assert ns.hit(1) == pytest.approx(1.0)
+    clock.advance(1)
+    assert ns.hit(1) == 0.0
+    assert ns.hit(1) > 0
+
+
+def test_token_bucket_caps_at_capacity(clock):
+    ns = CooldownNamespace("test", TokenBucket(capacity=2, rate=1), clock=clock)
+    ns.hit(1)
+    clock.advance(100)
+    assert ns.hit(1) == 0.0
+    assert ns.hit(1) == 0.0
+    assert ns.hit(1) > 0
+
+
+# =============================================================================
+# Expiry and Eviction
+# =============================================================================
+
+def test_expired_keys_read_as_absent(clock):
+    ns = CooldownNamespace("test", Cooldown(5), clock=clock)
+    ns.hit(1)
+    clock.advance(5)
+    assert ns.remaining(1) == 0.0
+    assert len(ns) == 1  # Not reclaimed until a write
+
+
+def test_writes_reclaim_expired_keys_oldest_first(clock):
+    ns = CooldownNamespace("test", Cooldown(100), clock=clock)
+    for key in range(20):
+        ns.hit(key)
+        clock.advance(1)
+    clock.advance(90)
+    # now = 110: keys 0..10 have expired, 11..19 are live
+    ns.hit("new")
+    assert ns.expired == COOLDOWN_EXPIRE_BATCH
+    assert list(ns._entries)[:3] == [COOLDOWN_EXPIRE_BATCH, COOLDOWN_EXPIRE_BATCH + 1, COOLDOWN_EXPIRE_BATCH + 2]
+    ns.hit("other")
+    # Reclaiming stops at the first live key
+    assert ns.expired == 11
+    assert list(ns._entries)[0] == 11
+    assert list(ns._entries)[-2:] == ["new", "other"]
+
+
+def test_rewrite_moves_key_to_expiry_order(clock):
+    ns = CooldownNamespace("test", SlidingWindow(limit=5, window=10), clock=clock)
+    ns.hit(1)
+    clock.advance(1)
+    ns.hit(2)
+    clock.advance(1)
+    ns.hit(1)  # Key 1 now expires last
+    assert list(ns._entries) == [2, 1]
+    clock.advance(10)  # now = 12: key 2 expired at 11, key 1 at 12
+    ns.hit(3)
+    assert list(ns._entries) == [3]
+    assert ns.expired == 2
+
+
+def test_max_keys_evicts_least_recently_written(clock):
+    ns = CooldownNamespace("test", Cooldown(60), max_keys=3, clock=clock)
+    for key in (1, 2, 3):
+        ns.hit(key)
+    ns.record(1)
+    ns.hit(4)
+    assert list(ns._entries) == [3, 1, 4]
+    assert ns.evicted == 1
+    # The evicted key simply reads as never used
+    assert ns.hit(2) == 0.0
+    assert len(ns) == 3
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+def test_engine_shares_namespaces_and_rejects_policy_change(clock):
+    engine = CooldownEngine(clock)
+    ns = engine.namespace("wave", Cooldown(5))
+    assert engine.namespace("wave", Cooldown(5)) is ns
+    with pytest.raises(ValueError):
+        engine.namespace("wave", Cooldown(10))
+    ns.hit(1)
+    ns.hit(1)
+    assert engine.get_stats()["wave"]["allowed"] == 1
+    assert engine.get_stats()["wave"]["denied"] == 1
@@ -0,0 +1,127 @@
+"""
+Property tests: the in-memory family graph always agrees with SQLite.
+
+Random sequences of marry / divorce / adopt / disown / runaway / leave
+are applied through FamilyGraphService (DB first, graph after commit),
+including operations the DB rejects. After every step the graph must
+mirror the family tables row for row; every CHECK_EVERY steps each
+query is also compared against the SQL implementation for every user.
+A graph freshly loaded from the DB must equal the live one.
+"""
+
+import asyncio
+import random
+import sqlite3
+
+import pytest
+
+from src.services.database import db
+from src.services.family_graph import FamilyGraphService
+
+GUILD_ID = 1
+OTHER_GUILD_ID = 2
+USERS = list(range(1, 13))
+STEPS = 300
+CHECK_EVERY = 25
+
+
+@pytest.fixture
+def service():
+    with db._get_conn() as conn:
+        for table in ("family_marriages", "family_adoptions", "family_divorce_cooldowns"):
+            conn.execute(f"DELETE FROM {table}")
+    service = FamilyGraphService()
+    asyncio.run(service.setup())
+    return service
+
+
+def random_op(rng: random.Random, service: FamilyGraphService, guild_id: int) -> None:
+    """One random mutation; constraint violations must leave the graph untouched."""
+    a, b = rng.choice(USERS), rng.choice(USERS)
+    kind = rng.choice(["marry", "marry", "divorce", "adopt", "adopt", "adopt", "disown", "runaway", "leave"])
+    try:
+        if kind == "marry":
+            service.marry(a, b, guild_id)
+        elif kind == "divorce":
+            service.divorce(a, guild_id)
+        elif kind == "adopt":
+            # Handlers refuse cycles; the DB only refuses a second parent
+            if a != b and not service.is_ancestor(b, a, guild_id):
+                service.adopt(a, b, guild_id)
+        elif kind == "disown":
+            service.disown(a, b, guild_id)
+        elif kind == "runaway":
+            service.runaway(a, guild_id)
+        else:
+            service.cleanup_on_leave(a, guild_id)
+    except sqlite3.IntegrityError:
+        pass
+
+
+def assert_mirrors_tables(service: FamilyGraphService, guild_id: int) -> None:
+    with db._get_conn() as conn:
+        marriages = conn.execute(
+            "SELECT user_id, spouse_id, married_at FROM family_marriages WHERE guild_id = ?", (guild_id,)
+        ).fetchall()
+        adoptions = conn.execute(
+            "SELECT parent_id, child_id, adopted_at FROM family_adoptions WHERE guild_id = ?", (guild_id,)
+        ).fetchall()
+    graph = service._graph(guild_id)
+    assert graph.spouse == {row[0]: row[1] for row in marriages}
+    assert graph.married_at == {row[0]: row[2] for row in marriages}
+    assert graph.parent == {row[1]: row[0] for row in adoptions}
+    assert graph.adopted_at == {row[1]: row[2] for row in adoptions}
+    assert {p: sorted(c) for p, c in graph.children.items()} == {
+        p: sorted(row[1] for row in adoptions if row[0] == p) for p in {row[0] for row in adoptions}
+    }
+
+
+def assert_matches_db(service: FamilyGraphService, guild_id: int) -> None:
+    for user in USERS:
+        assert service.get_spouse(user, guild_id) == db.get_spouse(user, guild_id)
+        assert service.get_parent(user, guild_id) == db.get_parent(user, guild_id)
+        assert service.get_children(user, guild_id) == db.get_children(user, guild_id)
+        assert service.get_household_children(user, guild_id) == db.get_household_children(user, guild_id)
+        assert service.get_siblings(user, guild_id) == db.get_siblings(user, guild_id)
+        assert service.get_marriage_timestamp(user, guild_id) == db.get_marriage_timestamp(user, guild_id)
+        assert service.get_adoption_timestamp(user, guild_id) == db.get_adoption_timestamp(user, guild_id)
+        for target in USERS:
+            assert service.is_ancestor(target, user, guild_id) == db.is_ancestor(target, user, guild_id)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_graph_matches_db_after_every_mutation(service, seed):
+    rng = random.Random(seed)
+    for step in range(1, STEPS + 1):
+        random_op(rng, service, GUILD_ID)
+        assert_mirrors_tables(service, GUILD_ID)
+        if step % CHECK_EVERY == 0:
+            assert_matches_db(service, GUILD_ID)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_reloaded_graph_equals_live_graph(service, seed):
+    rng = random.Random(seed)
+    for _ in range(STEPS):
+        random_op(rng, service, rng.choice([GUILD_ID, OTHER_GUILD_ID]))
+
+    reloaded = FamilyGraphService()
+    asyncio.run(reloaded.setup())
+    for guild_id in (GUILD_ID, OTHER_GUILD_ID):
+        live, fresh = service._graph(guild_id), reloaded._graph(guild_id)
+        assert live.spouse == fresh.spouse
+        assert live.parent == fresh.parent
+        assert live.children == fresh.children
+        assert live.married_at == fresh.married_at
+        assert live.adopted_at == fresh.adopted_at
+
+
+def test_ancestry_is_acyclic_and_bounded(service):
+    # A chain 1 <- 2 <- ... <- 12: each user's ancestors are exactly the lower ids
+    for parent, child in zip(USERS, USERS[1:]):
+        service.adopt(parent, child, GUILD_ID)
+    for user in USERS:
+        for target in USERS:
+            assert service.is_ancestor(target, user, GUILD_ID) == (target < user)
+    assert not service.is_ancestor(1, 12, GUILD_ID, max_depth=5)
+    assert service.is_ancestor(7, 12, GUILD_ID, max_depth=5)
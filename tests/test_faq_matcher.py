@@ -0,0 +1,47 @@
+"""
+Golden tests for the compiled FAQ matcher.
+
+The golden cases (expected topic and whether it only matched after typo
+correction) and the reference matcher - the per-pattern loop and
+Levenshtein scan the auto-responder used before FAQMatcher - live in
+tests/faq_golden.py; scripts/bench_faq_matcher.py times them.
+"""
+
+import pytest
+
+from faq_golden import GOLDEN, ReferenceMatcher, build_corpus
+from src.handlers.faq import FAQ_PATTERNS, FUZZY_KEYWORDS
+from src.services.faq.matcher import FAQMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return FAQMatcher(FAQ_PATTERNS, FUZZY_KEYWORDS)
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return ReferenceMatcher()
+
+
+@pytest.mark.parametrize("text,topic,fuzzy", GOLDEN)
+def test_golden(matcher, text, topic, fuzzy):
+    assert matcher.match(text) == (topic, fuzzy)
+
+
+@pytest.mark.parametrize("text,topic,fuzzy", GOLDEN)
+def test_golden_reference(reference, text, topic, fuzzy):
+    # Guards the golden list itself: it describes the behavior before the rewrite
+    assert reference.match(text) == (topic, fuzzy)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_reference_on_typo_corpus(matcher, reference, seed):
+    for text in build_corpus(1000, seed):
+        assert matcher.match(text) == reference.match(text), text
+
+
+def test_word_cache_does_not_change_results(matcher):
+    first = [matcher.match(text) for text, _, _ in GOLDEN]
+    second = [matcher.match(text) for text, _, _ in GOLDEN]
+    assert first == second